@@ -0,0 +1,6 @@
+"""
+Benchmarks - LSP System
+Suite de benchmarks de rendimiento de las rutas críticas del sistema
+"""
+
+__version__ = "2.0.0"
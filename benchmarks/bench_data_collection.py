@@ -0,0 +1,106 @@
+"""
+Benchmarks - Recolección de Datos
+Extracción de features, análisis de movimiento, augmentación,
+formato binario de envío (wire_format) y almacenamiento HDF5 del DataManager
+"""
+
+import json
+
+from benchmarks.harness import suite
+
+
+AUGMENTATION_TECHNIQUES = [
+    'temporal_light', 'temporal_medium', 'spatial_light',
+    'spatial_medium', 'noise_light', 'hand_variations'
+]
+
+
+@suite.case('feature_extractor.extract_advanced_landmarks', group='data_collection', repeats=200, number=5)
+def bench_extract_advanced_landmarks(ctx):
+    from src.data_collection.feature_extractor import FeatureExtractor
+
+    extractor = FeatureExtractor()
+    frames = [ctx.generator.frame_results() for _ in range(16)]
+    state = {'i': 0}
+
+    def step():
+        hand_results, pose_results = frames[state['i'] % len(frames)]
+        state['i'] += 1
+        extractor.extract_advanced_landmarks(hand_results, pose_results)
+
+    return step
+
+
+@suite.case('motion_analyzer.calculate_motion_features', group='data_collection', repeats=100, number=5)
+def bench_calculate_motion_features(ctx):
+    from src.data_collection.motion_analyzer import MotionAnalyzer
+
+    analyzer = MotionAnalyzer()
+    sequence = ctx.generator.sequence()
+    return lambda: analyzer.calculate_motion_features(sequence)
+
+
+@suite.case('augmenter.apply_augmentation', group='data_collection', repeats=30)
+def bench_augmentation_techniques(ctx):
+    from src.data_collection.data_augmentation import LSPDataAugmenter
+
+    augmenter = LSPDataAugmenter()
+    sequence = ctx.generator.sequence()
+    return {
+        technique: (lambda t=technique: augmenter._apply_augmentation(sequence, t))
+        for technique in AUGMENTATION_TECHNIQUES
+    }
+
+
+@suite.case('wire_format.encode_decode', group='data_collection', repeats=200, number=5)
+def bench_wire_format(ctx):
+    from src.data_collection.wire_format import FrameDecoder, FrameEncoder
+
+    # Ventana de 60 frames: lo que envía un cliente ligero por predicción
+    window = ctx.generator.sequence()
+    variants = {}
+    for layout in ('features', 'landmarks'):
+        encoder = FrameEncoder(layout)
+        message = encoder.encode_frames(window)
+        ctx.annotate(f"wire_format.encode_decode[{layout}_encode]", bytes_per_frame=len(message) // len(window))
+        variants[f"{layout}_encode"] = (lambda e=encoder: e.encode_frames(window))
+        variants[f"{layout}_decode"] = (lambda m=message: FrameDecoder().decode_frames(m))
+
+    message = json.dumps({'sequence': window.tolist()})
+    ctx.annotate('wire_format.encode_decode[json_encode]', bytes_per_frame=len(message) // len(window))
+    variants['json_encode'] = lambda: json.dumps({'sequence': window.tolist()})
+    variants['json_decode'] = lambda: json.loads(message)
+    return variants
+
+
+@suite.case('data_manager.save_sequence', group='storage', repeats=50)
+def bench_save_sequence(ctx):
+    from src.data_collection.data_manager import DataManager
+
+    manager = DataManager(data_dir=ctx.directory('save_sequence'))
+    sequence = ctx.generator.sequence()
+    metadata = {'sign': 'HOLA', 'quality_score': 90.0, 'quality_level': 'EXCELENTE'}
+    state = {'id': 0}
+
+    def step():
+        state['id'] += 1
+        manager.save_sequence(sequence, 'HOLA', state['id'], metadata)
+
+    return step
+
+
+@suite.case('data_manager.load_keras_dataset', group='storage', repeats=10)
+def bench_load_keras_dataset(ctx):
+    from src.data_collection.data_manager import DataManager
+
+    manager = DataManager(data_dir=ctx.directory('load_keras'))
+    num_sequences = ctx.scale(500, 60)
+    X, y = ctx.generator.dataset(num_sequences, num_classes=5)
+    signs = ['A', 'B', 'C', 'HOLA', 'GRACIAS']
+    for i, (sequence, label) in enumerate(zip(X, y)):
+        manager.save_sequence(sequence, signs[label], i + 1, {'sign': signs[label]})
+
+    return {
+        'all': lambda: manager.load_keras_dataset(),
+        'subset': lambda: manager.load_keras_dataset(signs=['A', 'HOLA'])
+    }
@@ -0,0 +1,168 @@
+"""
+Benchmarks - Inferencia
+Paso de ventana deslizante del traductor: añadir frame, construir la
+ventana (1, 60, 157), normalizar, predecir y suavizar; con el modelo en
+modo eager, con la tf.function de KerasInferenceEngine y compilada con XLA;
+y predicción por backend (Keras / TFLite float16 / TFLite int8 / ONNX / NumPy);
+flujo continuo con ventana deslizante frente al segmentador de señas
+"""
+
+import os
+from collections import deque
+
+import numpy as np
+
+from benchmarks.harness import suite
+from benchmarks.bench_training import require_tensorflow
+
+
+@suite.case('inference.window_step', group='inference', warmup=5, repeats=30)
+def bench_inference_window_step(ctx):
+    require_tensorflow()
+    from src.inference.inference_engine import KerasInferenceEngine
+    from src.training.model_builder import GRUModelBuilder
+
+    sequence_length = 60
+    model = GRUModelBuilder().build_model(input_shape=(sequence_length, 157), num_classes=10)
+    frames = ctx.generator.sequence(length=120)
+    mean = frames.mean(axis=0)
+    std = frames.std(axis=0) + 1e-6
+
+    window = deque(frames[:sequence_length], maxlen=sequence_length)
+    prediction_buffer = deque(maxlen=5)
+    state = {'i': sequence_length}
+
+    def make_step(predict):
+        def step():
+            window.append(frames[state['i'] % len(frames)])
+            state['i'] += 1
+            x = (np.asarray(window, dtype=np.float32) - mean) / std
+            probabilities = predict(x[np.newaxis])[0]
+            prediction_buffer.append(int(np.argmax(probabilities)))
+        return step
+
+    preprocessing_info = {'normalization': {'mean': mean, 'std': std}}
+    compiled = KerasInferenceEngine(model, preprocessing_info)
+    xla = KerasInferenceEngine(model, preprocessing_info, jit_compile=True)
+    ctx.annotate('inference.window_step[compiled]', warmup_ms=round(compiled.warmup_seconds[1] * 1000, 1))
+    ctx.annotate('inference.window_step[xla]', warmup_ms=round(xla.warmup_seconds[1] * 1000, 1))
+
+    return {
+        'eager': make_step(lambda x: model(x, training=False).numpy()),
+        'compiled': make_step(lambda x: compiled.predict_proba(x, normalize=False)),
+        'xla': make_step(lambda x: xla.predict_proba(x, normalize=False))
+    }
+
+
+@suite.case('inference.backend_predict', group='inference', warmup=5, repeats=30)
+def bench_inference_backends(ctx):
+    require_tensorflow()
+    from src.inference.inference_engine import KerasInferenceEngine, NumpyInferenceEngine, TFLiteInferenceEngine
+    from src.inference.model_export import TFLITE_QUANTIZATIONS, convert_to_tflite
+    from src.inference.numpy_gru import export_numpy_weights
+    from src.training.model_builder import GRUModelBuilder
+
+    model = GRUModelBuilder().build_model(input_shape=(60, 157), num_classes=10)
+    model_path = os.path.join(ctx.directory('export'), 'model.h5')
+    model.save(model_path)
+    sequence = ctx.generator.sequence()
+
+    engines = {'keras': KerasInferenceEngine(model)}
+    ctx.annotate('inference.backend_predict[keras]', size_mb=round(os.path.getsize(model_path) / 1024**2, 3))
+    for quantization in TFLITE_QUANTIZATIONS:
+        path = os.path.join(ctx.directory('export'), f"model_{quantization}.tflite")
+        with open(path, 'wb') as f:
+            f.write(convert_to_tflite(model, quantization))
+        engines[f"tflite_{quantization}"] = TFLiteInferenceEngine(path)
+        ctx.annotate(f"inference.backend_predict[tflite_{quantization}]",
+                     size_mb=round(os.path.getsize(path) / 1024**2, 3))
+
+    path = os.path.join(ctx.directory('export'), 'model.npz')
+    export_numpy_weights(model, path)
+    engines['numpy'] = NumpyInferenceEngine(path)
+    ctx.annotate('inference.backend_predict[numpy]', size_mb=round(os.path.getsize(path) / 1024**2, 3))
+
+    # ONNX solo si tf2onnx y onnxruntime están instalados (dependencias opcionales)
+    try:
+        from src.inference.inference_engine import OnnxInferenceEngine
+        from src.inference.model_export import convert_to_onnx
+        path = convert_to_onnx(model, os.path.join(ctx.directory('export'), 'model.onnx'))
+        engines['onnx'] = OnnxInferenceEngine(path)
+        ctx.annotate('inference.backend_predict[onnx]', size_mb=round(os.path.getsize(path) / 1024**2, 3))
+    except ImportError:
+        pass
+
+    return {name: (lambda e=engine: e.predict_proba(sequence)) for name, engine in engines.items()}
+
+
+@suite.case('inference.stream_segmentation', group='inference', warmup=1, repeats=5)
+def bench_stream_segmentation(ctx):
+    require_tensorflow()
+    from src.inference.inference_engine import KerasInferenceEngine
+    from src.inference.sign_segmenter import StreamingSignSegmenter
+    from src.training.model_builder import GRUModelBuilder
+
+    # Conversación: señas de 20-40 frames separadas por pausas de 30-60 frames con las manos quietas
+    rng = np.random.default_rng(ctx.seed)
+    parts = []
+    for _ in range(ctx.scale(8, 3)):
+        pause = np.repeat(ctx.generator.sequence(length=1), rng.integers(30, 61), axis=0)
+        parts += [pause, ctx.generator.sequence(length=int(rng.integers(20, 41)), motion_scale=0.03)]
+    stream = np.concatenate(parts)
+
+    engine = KerasInferenceEngine(GRUModelBuilder().build_model(input_shape=(60, 157), num_classes=10))
+    segmenter = StreamingSignSegmenter(engine, confidence_threshold=0.0)
+    segmenter.process(stream)
+    summary = segmenter.summary()
+    ctx.annotate('inference.stream_segmentation[segmenter]', frames=summary['frames'],
+                 classified=summary['classified'], idle_ratio=round(summary['idle_ratio'], 3))
+
+    def sliding_window():
+        window = deque(maxlen=60)
+        for frame in stream:
+            window.append(frame)
+            if len(window) == 60:
+                engine.predict(np.asarray(window))
+
+    def segmented():
+        segmenter.reset()
+        segmenter.process(stream)
+
+    return {'sliding_window': sliding_window, 'segmenter': segmented}
+
+
+@suite.case('evaluation.test_split', group='inference', warmup=1, repeats=3)
+def bench_evaluation_test_split(ctx):
+    require_tensorflow()
+    import h5py
+    from src.evaluation.evaluate_model import ModelEvaluator
+    from src.inference.inference_engine import KerasInferenceEngine
+    from src.training.data_loader import HDF5DataLoader
+    from src.training.model_builder import GRUModelBuilder
+
+    data_path, models_path = ctx.directory('evaluation', 'data'), ctx.directory('evaluation', 'models')
+    X, y = ctx.generator.dataset(ctx.scale(2000, 300), num_classes=10)
+    with h5py.File(os.path.join(data_path, 'sequences.h5'), 'w') as f:
+        f.create_dataset('X', data=X, chunks=(64,) + X.shape[1:])
+        f.create_dataset('y', data=y)
+    model = GRUModelBuilder().build_model(input_shape=(60, 157), num_classes=10)
+    model.save(os.path.join(models_path, 'model.h5'))
+
+    evaluator = ModelEvaluator()
+    evaluator.models_path, evaluator.data_path = models_path, data_path
+    evaluator.cache_path = ctx.directory('evaluation', 'cache')
+    test_rows = HDF5DataLoader(data_path).get_split_indices()['test']
+    ctx.annotate('evaluation.test_split[batched]', samples=len(test_rows))
+    engine = KerasInferenceEngine(model)
+
+    def per_sequence():
+        # Referencia: una secuencia por llamada, como evaluate_engine de model_export
+        with h5py.File(os.path.join(data_path, 'sequences.h5'), 'r') as f:
+            for row in test_rows:
+                engine.predict_proba(f['X'][row])
+
+    return {
+        'per_sequence': per_sequence,
+        'batched': lambda: evaluator.evaluate('model.h5', measure_latency=False, force=True),
+        'cached': lambda: evaluator.evaluate('model.h5', measure_latency=False)
+    }
@@ -0,0 +1,31 @@
+"""
+Benchmarks - Profiler por etapas
+Costo de instrumentar una etapa con el profiler desactivado y activado
+"""
+
+from benchmarks.harness import suite
+
+
+@suite.case('stage_profiler.stage', group='profiling', repeats=50, number=1000)
+def bench_stage_profiler(ctx):
+    from src.utils.profiler import StageProfiler
+
+    disabled = StageProfiler(enabled=False)
+    enabled = StageProfiler(enabled=True)
+
+    def instrumented(profiler):
+        profiler.begin_frame()
+        with profiler.stage('camera_read'):
+            pass
+        with profiler.stage('feature_extraction'):
+            pass
+        profiler.end_frame()
+
+    def baseline():
+        pass
+
+    return {
+        'baseline': baseline,
+        'disabled': lambda: instrumented(disabled),
+        'enabled': lambda: instrumented(enabled)
+    }
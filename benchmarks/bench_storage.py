@@ -0,0 +1,67 @@
+"""
+Benchmarks - Layout de sequences.h5
+Compromiso entre tamaño en disco y velocidad de lectura aleatoria para
+distintos chunkings, filtros de compresión y tipos de almacenamiento
+"""
+
+import h5py
+import numpy as np
+
+from benchmarks.harness import suite
+
+
+# (chunking, compresión, shuffle, dtype) por variante
+LAYOUT_VARIANTS = {
+    'auto_chunks': ('auto', 'none', False, 'float32'),
+    'row_chunks': ('row', 'none', False, 'float32'),
+    'gzip4+shuffle': ('row', 'gzip', True, 'float32'),
+    'lzf+shuffle': ('row', 'lzf', True, 'float32'),
+    'lz4+shuffle': ('row', 'lz4', True, 'float32'),
+    'gzip4+shuffle+float16': ('row', 'gzip', True, 'float16'),
+}
+
+RANDOM_READ_ROWS = 64
+
+
+def write_layout(path: str, X: np.ndarray, chunking: str, compression: str, shuffle: bool, dtype: str):
+    """Escribe X con el layout indicado (auto_chunks reproduce el layout anterior)"""
+    from src.data_collection.dataset_tools import sequence_dataset_kwargs
+
+    with h5py.File(path, 'w') as f:
+        if chunking == 'auto':
+            f.create_dataset('X', data=X, maxshape=(None,) + X.shape[1:], chunks=True, dtype=dtype)
+        else:
+            dataset = f.create_dataset('X', **sequence_dataset_kwargs(X.shape[1:], dtype, compression,
+                                                                      shuffle=shuffle))
+            dataset.resize(len(X), axis=0)
+            dataset[:] = X
+
+
+@suite.case('hdf5_layout.random_read', group='storage', warmup=2, repeats=20)
+def bench_layout_random_read(ctx):
+    num_sequences = ctx.scale(2000, 200)
+    X, _ = ctx.generator.dataset(num_sequences, num_classes=5)
+    rng = np.random.default_rng(ctx.seed)
+
+    variants = {}
+    baseline_size = None
+    for name, (chunking, compression, shuffle, dtype) in LAYOUT_VARIANTS.items():
+        path = ctx.path('layouts', f"{name}.h5")
+        write_layout(path, X, chunking, compression, shuffle, dtype)
+
+        with h5py.File(path, 'r') as f:
+            size_mb = f['X'].id.get_storage_size() / 1024**2
+        baseline_size = baseline_size or size_mb
+        ctx.annotate(f"hdf5_layout.random_read[{name}]", size_mb=round(size_mb, 2),
+                     ratio=round(baseline_size / size_mb, 2),
+                     rows_per_read=RANDOM_READ_ROWS)
+
+        def read(path=path):
+            rows = np.sort(rng.choice(num_sequences, RANDOM_READ_ROWS, replace=False))
+            with h5py.File(path, 'r') as f:
+                dataset = f['X']
+                for row in rows:
+                    dataset[row]
+
+        variants[name] = read
+    return variants
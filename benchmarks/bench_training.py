@@ -0,0 +1,185 @@
+"""
+Benchmarks - Entrenamiento
+Carga del dataset con HDF5DataLoader (en memoria y en streaming), paso de
+entrenamiento por perfil de modelo y forward pass del modelo GRU
+"""
+
+import os
+import time
+
+import numpy as np
+
+from benchmarks.harness import suite, BenchmarkSkipped
+
+
+FORWARD_BATCH_SIZES = [1, 8, 32, 128]
+
+
+def require_tensorflow():
+    """Importa TensorFlow o marca el caso como omitido"""
+    try:
+        import tensorflow as tf
+    except ImportError:
+        raise BenchmarkSkipped("TensorFlow no instalado")
+    return tf
+
+
+def write_grouped_dataset(path: str, X: np.ndarray, y: np.ndarray, signs):
+    """Escribe un archivo con un grupo por seña ('<seña>/sequences', '<seña>/labels')"""
+    import h5py
+
+    with h5py.File(path, 'w') as f:
+        for label, sign in enumerate(signs):
+            group = f.create_group(sign)
+            group.create_dataset('sequences', data=X[y == label])
+            group.create_dataset('labels', data=np.array([sign] * int(np.sum(y == label)), dtype='S'))
+
+
+@suite.case('hdf5_data_loader.load_dataset', group='training', warmup=1, repeats=5)
+def bench_load_dataset(ctx):
+    from src.training.data_loader import HDF5DataLoader
+
+    data_path = ctx.directory('loader')
+    num_sequences = ctx.scale(1000, 100)
+    X, y = ctx.generator.dataset(num_sequences, num_classes=5)
+    write_grouped_dataset(os.path.join(data_path, 'sequences.h5'), X, y, ['A', 'B', 'C', 'HOLA', 'GRACIAS'])
+
+    loader = HDF5DataLoader(data_path=data_path)
+    return lambda: loader.load_dataset()
+
+
+def write_flat_dataset(data_path: str, X: np.ndarray, y: np.ndarray, signs):
+    """Escribe el formato plano de DataManager ('X', 'y' y labels_map.json)"""
+    import json
+    import h5py
+
+    os.makedirs(os.path.join(data_path, 'metadata'), exist_ok=True)
+    with h5py.File(os.path.join(data_path, 'sequences.h5'), 'w') as f:
+        f.create_dataset('X', data=X, maxshape=(None,) + X.shape[1:], chunks=True, dtype='float32')
+        f.create_dataset('y', data=y, maxshape=(None,), chunks=True, dtype='int32')
+    labels_map = {'sign_to_index': {s: i for i, s in enumerate(signs)},
+                  'index_to_sign': {str(i): s for i, s in enumerate(signs)},
+                  'num_classes': len(signs)}
+    with open(os.path.join(data_path, 'metadata', 'labels_map.json'), 'w', encoding='utf-8') as f:
+        json.dump(labels_map, f)
+
+
+@suite.case('hdf5_streaming.train_epoch', group='training', warmup=1, repeats=5)
+def bench_streaming_epoch(ctx):
+    from src.training.data_loader import HDF5DataLoader
+
+    data_path = ctx.directory('streaming')
+    X, y = ctx.generator.dataset(ctx.scale(2000, 200), num_classes=5)
+    write_flat_dataset(data_path, X, y, ['A', 'B', 'C', 'HOLA', 'GRACIAS'])
+
+    loader = HDF5DataLoader(data_path=data_path)
+    streams = loader.create_streaming_datasets(batch_size=32)
+
+    def in_memory():
+        X_train, X_val, X_test, _, _, _ = loader.load_dataset()
+        loader.normalize_data(X_train, X_val, X_test)
+
+    def streaming():
+        for _ in streams['train'].iter_batches():
+            pass
+
+    return {'in_memory': in_memory, 'streaming': streaming}
+
+
+@suite.case('training_pipeline.prepare_data', group='training', warmup=1, repeats=5)
+def bench_prepare_data(ctx):
+    require_tensorflow()
+    from src.training.training_pipeline import TrainingPipeline
+
+    data_path = ctx.directory('prepare')
+    X, y = ctx.generator.dataset(ctx.scale(2000, 200), num_classes=5)
+    write_flat_dataset(data_path, X, y, ['A', 'B', 'C', 'HOLA', 'GRACIAS'])
+
+    pipeline = TrainingPipeline(data_path=data_path, models_path=ctx.directory('prepare_models'),
+                                logs_path=ctx.directory('prepare_logs'))
+    pipeline.prepare_data()
+
+    return {'cold': lambda: pipeline.prepare_data(use_cache=False),
+            'cached': lambda: pipeline.prepare_data()}
+
+
+@suite.case('gru_model.train_step', group='model', warmup=2, repeats=10)
+def bench_train_step_profiles(ctx):
+    tf = require_tensorflow()
+    from src.training.model_builder import GRUModelBuilder, MODEL_PROFILES
+
+    X, y = ctx.generator.dataset(ctx.scale(600, 120), num_classes=5)
+    split = int(len(X) * 0.8)
+    batch_X, batch_y = tf.constant(X[:32]), tf.constant(y[:32])
+    epochs = ctx.scale(5, 2)
+
+    variants = {}
+    for profile in MODEL_PROFILES:
+        tf.keras.utils.set_random_seed(ctx.seed)
+        model = GRUModelBuilder().build_model(input_shape=X.shape[1:], num_classes=5, gru_units=64,
+                                              profile=profile)
+        start = time.perf_counter()
+        model.fit(X[:split], y[:split], batch_size=32, epochs=epochs, verbose=0)
+        fit_seconds = time.perf_counter() - start
+        accuracy = model.evaluate(X[split:], y[split:], verbose=0)[1]
+        ctx.annotate(f"gru_model.train_step[{profile}]", val_accuracy=round(float(accuracy), 4),
+                     epochs=epochs, fit_seconds=round(fit_seconds, 2))
+        variants[profile] = (lambda m=model: m.train_on_batch(batch_X, batch_y))
+
+    # Paso compilado con XLA (solo tiempo; la primera llamada incluye la compilación)
+    tf.keras.utils.set_random_seed(ctx.seed)
+    model = GRUModelBuilder().build_model(input_shape=X.shape[1:], num_classes=5, gru_units=64,
+                                          profile='standard', jit_compile=True)
+    start = time.perf_counter()
+    model.train_on_batch(batch_X, batch_y)
+    ctx.annotate('gru_model.train_step[standard+xla]', compile_seconds=round(time.perf_counter() - start, 2))
+    variants['standard+xla'] = (lambda m=model: m.train_on_batch(batch_X, batch_y))
+    return variants
+
+
+@suite.case('gru_model.train_epoch_lengths', group='model', warmup=1, repeats=3)
+def bench_variable_length_epoch(ctx):
+    tf = require_tensorflow()
+    from src.training.data_loader import adjust_sequence_length
+    from src.training.model_builder import GRUModelBuilder
+    from src.training.ragged_dataset import PAD_VALUE, bucket_boundaries
+
+    # Mezcla típica: muchas señas estáticas cortas y pocas frases largas
+    rng = np.random.default_rng(ctx.seed)
+    lengths = rng.choice([12, 20, 30, 60], size=ctx.scale(512, 96), p=[0.4, 0.3, 0.2, 0.1])
+    sequences = [ctx.generator.sequence(length=int(length)) for length in lengths]
+    labels = rng.integers(0, 5, len(sequences)).astype(np.int32)
+    num_features = sequences[0].shape[1]
+    ctx.annotate('gru_model.train_epoch_lengths[ragged]',
+                 real_frame_ratio=round(float(lengths.sum() / (60 * len(lengths))), 3))
+
+    fixed = np.concatenate([adjust_sequence_length(s[np.newaxis], 60) for s in sequences])
+    fixed_dataset = tf.data.Dataset.from_tensor_slices((fixed, labels)).batch(32).cache()
+    boundaries = bucket_boundaries(lengths)
+    ragged_dataset = tf.data.Dataset.from_generator(
+        lambda: zip(sequences, labels),
+        output_signature=(tf.TensorSpec((None, num_features), tf.float32), tf.TensorSpec((), tf.int32))
+    ).bucket_by_sequence_length(lambda s, y: tf.shape(s)[0], boundaries, [32] * (len(boundaries) + 1),
+                                padding_values=(PAD_VALUE, 0)).cache()
+
+    variants = {}
+    for name, dataset, input_shape in (('fixed_60', fixed_dataset, (60, num_features)),
+                                       ('ragged', ragged_dataset, (None, num_features))):
+        tf.keras.utils.set_random_seed(ctx.seed)
+        model = GRUModelBuilder().build_model(input_shape=input_shape, num_classes=5, gru_units=64,
+                                              profile='fast')
+        variants[name] = (lambda m=model, d=dataset: m.fit(d, epochs=1, verbose=0))
+    return variants
+
+
+@suite.case('gru_model.forward', group='model', warmup=3, repeats=20)
+def bench_model_forward(ctx):
+    tf = require_tensorflow()
+    from src.training.model_builder import GRUModelBuilder
+
+    model = GRUModelBuilder().build_model(input_shape=(60, 157), num_classes=10)
+    variants = {}
+    for batch_size in FORWARD_BATCH_SIZES:
+        batch = tf.constant(np.random.rand(batch_size, 60, 157).astype(np.float32))
+        variants[f"batch={batch_size}"] = (lambda b=batch: model(b, training=False))
+    return variants
@@ -0,0 +1,328 @@
+"""
+Benchmark Harness - Medición de Rendimiento del Sistema LSP
+Registro de casos, medición con warmup/repeticiones, salida JSON y
+comparación entre ejecuciones para detectar regresiones
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class BenchmarkSkipped(Exception):
+    """Se lanza desde un caso cuando falta una dependencia opcional"""
+
+
+class BenchmarkContext:
+    """Recursos compartidos por los casos: directorio temporal y datos sintéticos"""
+
+    def __init__(self, work_dir: str, quick: bool = False, seed: int = 42):
+        from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+        self.work_dir = work_dir
+        self.quick = quick
+        self.seed = seed
+        self.generator = SyntheticLandmarkGenerator(seed=seed)
+        self.annotations: Dict[str, Dict[str, Any]] = {}
+
+    def annotate(self, key: str, **info):
+        """Adjunta datos no temporales a un resultado (p. ej. tamaño en disco)"""
+        self.annotations.setdefault(key, {}).update(info)
+
+    def path(self, *parts: str) -> str:
+        """Devuelve una ruta dentro del directorio de trabajo, creando el padre"""
+        full_path = os.path.join(self.work_dir, *parts)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return full_path
+
+    def directory(self, *parts: str) -> str:
+        """Devuelve (y crea) un subdirectorio del directorio de trabajo"""
+        full_path = os.path.join(self.work_dir, *parts)
+        os.makedirs(full_path, exist_ok=True)
+        return full_path
+
+    def scale(self, full: int, quick: int) -> int:
+        """Elige el tamaño del problema según el modo rápido"""
+        return quick if self.quick else full
+
+
+class BenchmarkCase:
+    """Definición de un caso registrado en la suite"""
+
+    def __init__(self, name: str, group: str, factory: Callable,
+                 warmup: int, repeats: int, number: int):
+        self.name = name
+        self.group = group
+        self.factory = factory
+        self.warmup = warmup
+        self.repeats = repeats
+        self.number = number
+
+
+def measure(func: Callable[[], Any],
+            warmup: int = 3,
+            repeats: int = 20,
+            number: int = 1) -> Dict[str, float]:
+    """
+    Mide el tiempo de ejecución de una función
+
+    Args:
+        func: Función sin argumentos a medir
+        warmup: Llamadas previas descartadas (cachés, trazado, JIT)
+        repeats: Número de muestras
+        number: Llamadas por muestra (para funciones muy rápidas)
+
+    Returns:
+        Estadísticas en milisegundos por llamada
+    """
+    for _ in range(warmup):
+        func()
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    samples = np.empty(repeats, dtype=np.float64)
+    try:
+        for i in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples[i] = (time.perf_counter() - start) / number
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples_ms = samples * 1000.0
+    median_ms = float(np.median(samples_ms))
+    return {
+        'mean_ms': float(np.mean(samples_ms)),
+        'median_ms': median_ms,
+        'p95_ms': float(np.percentile(samples_ms, 95)),
+        'min_ms': float(np.min(samples_ms)),
+        'max_ms': float(np.max(samples_ms)),
+        'std_ms': float(np.std(samples_ms)),
+        'ops_per_sec': 1000.0 / median_ms if median_ms > 0 else float('inf'),
+        'repeats': repeats,
+        'number': number,
+        'warmup': warmup
+    }
+
+
+class BenchmarkSuite:
+    """
+    Suite de benchmarks con registro por decorador
+
+    Un caso es una función que recibe un BenchmarkContext, hace la
+    preparación (no medida) y devuelve la función a medir, o un diccionario
+    {variante: función} para casos parametrizados.
+    """
+
+    def __init__(self):
+        self.cases: List[BenchmarkCase] = []
+
+    def case(self, name: str, group: str, warmup: int = 3, repeats: int = 20, number: int = 1):
+        """Decorador para registrar un caso de benchmark"""
+        def decorator(factory: Callable):
+            self.cases.append(BenchmarkCase(name, group, factory, warmup, repeats, number))
+            return factory
+        return decorator
+
+    def run(self,
+            filters: Optional[List[str]] = None,
+            quick: bool = False,
+            repeats: Optional[int] = None,
+            warmup: Optional[int] = None,
+            quiet: bool = True,
+            work_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ejecuta los casos registrados
+
+        Args:
+            filters: Subcadenas; solo se ejecutan casos cuyo nombre o grupo coincida
+            quick: Modo rápido (menos repeticiones y datos más pequeños)
+            repeats: Fuerza el número de repeticiones
+            warmup: Fuerza el número de llamadas de calentamiento
+            quiet: Silencia el stdout del código medido
+            work_dir: Directorio temporal (por defecto uno nuevo)
+
+        Returns:
+            Diccionario serializable con metadatos, resultados y casos omitidos
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        skipped: Dict[str, str] = {}
+
+        with contextlib.ExitStack() as stack:
+            if work_dir is None:
+                work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='lsp_bench_'))
+            context = BenchmarkContext(work_dir, quick=quick)
+
+            for case in self.cases:
+                if filters and not any(f in case.name or f in case.group for f in filters):
+                    continue
+
+                case_repeats = repeats or (max(3, case.repeats // 4) if quick else case.repeats)
+                case_warmup = warmup if warmup is not None else (min(1, case.warmup) if quick else case.warmup)
+
+                print(f"⏱️  {case.name} ...", flush=True)
+                try:
+                    with _silenced(quiet):
+                        target = case.factory(context)
+                        variants = target if isinstance(target, dict) else {None: target}
+                        case_results = {}
+                        for variant, func in variants.items():
+                            key = case.name if variant is None else f"{case.name}[{variant}]"
+                            stats = measure(func, warmup=case_warmup, repeats=case_repeats, number=case.number)
+                            stats['group'] = case.group
+                            case_results[key] = stats
+                except BenchmarkSkipped as e:
+                    skipped[case.name] = str(e)
+                    print(f"   ⏭️  Omitido: {e}")
+                    continue
+                except Exception as e:
+                    skipped[case.name] = f"error: {e}"
+                    print(f"   ❌ Error: {e}")
+                    continue
+
+                for key, stats in case_results.items():
+                    results[key] = stats
+                    print(f"   ✅ {key}: mediana {stats['median_ms']:.3f} ms | p95 {stats['p95_ms']:.3f} ms")
+                    if key in context.annotations:
+                        details = ', '.join(f"{k}={v}" for k, v in context.annotations[key].items())
+                        print(f"      ℹ️  {details}")
+
+        return {
+            'metadata': collect_metadata(quick=quick),
+            'results': results,
+            'skipped': skipped,
+            'annotations': context.annotations
+        }
+
+
+@contextlib.contextmanager
+def _silenced(enabled: bool):
+    """Redirige stdout a un buffer (el código del proyecto imprime mucho)"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def collect_metadata(quick: bool = False) -> Dict[str, Any]:
+    """Recopila información del entorno para poder comparar ejecuciones"""
+    metadata = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'quick': quick,
+        'git_commit': None
+    }
+    try:
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        metadata['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=repo_root, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return metadata
+
+
+def save_results(report: Dict[str, Any], output_path: str) -> str:
+    """Guarda el reporte en JSON"""
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+    return output_path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Carga un reporte JSON generado por save_results"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    threshold: float = 0.10,
+                    metric: str = 'median_ms') -> List[Dict[str, Any]]:
+    """
+    Compara dos reportes caso por caso
+
+    Args:
+        baseline: Reporte de referencia
+        current: Reporte nuevo
+        threshold: Cambio relativo a partir del cual se marca regresión/mejora
+        metric: Métrica a comparar
+
+    Returns:
+        Lista de filas con nombre, valores, ratio y estado
+        ('regression', 'improvement', 'ok', 'new', 'missing')
+    """
+    base_results = baseline.get('results', {})
+    curr_results = current.get('results', {})
+    rows = []
+
+    for name in sorted(set(base_results) | set(curr_results)):
+        base = base_results.get(name, {}).get(metric)
+        curr = curr_results.get(name, {}).get(metric)
+
+        if base is None:
+            rows.append({'name': name, 'baseline': None, 'current': curr, 'ratio': None, 'status': 'new'})
+            continue
+        if curr is None:
+            rows.append({'name': name, 'baseline': base, 'current': None, 'ratio': None, 'status': 'missing'})
+            continue
+
+        ratio = curr / base if base > 0 else float('inf')
+        if ratio > 1.0 + threshold:
+            status = 'regression'
+        elif ratio < 1.0 - threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': base, 'current': curr, 'ratio': ratio, 'status': status})
+
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], threshold: float, metric: str = 'median_ms'):
+    """Muestra la tabla de comparación en consola"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '⚪', 'new': '🆕', 'missing': '❔'}
+
+    print("\n" + "="*90)
+    print(f"⚖️  COMPARACIÓN DE BENCHMARKS ({metric}, umbral ±{threshold:.0%})")
+    print("="*90)
+    print(f"{'Caso':<52} {'Base':>10} {'Actual':>10} {'Ratio':>8}")
+    print("-"*90)
+    for row in rows:
+        base = f"{row['baseline']:.3f}" if row['baseline'] is not None else '-'
+        curr = f"{row['current']:.3f}" if row['current'] is not None else '-'
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        print(f"{icons[row['status']]} {row['name'][:50]:<50} {base:>10} {curr:>10} {ratio:>8}")
+
+    regressions = [r for r in rows if r['status'] == 'regression']
+    improvements = [r for r in rows if r['status'] == 'improvement']
+    print("-"*90)
+    print(f"🔴 Regresiones: {len(regressions)} | 🟢 Mejoras: {len(improvements)} | Total: {len(rows)}")
+
+
+# Suite global donde se registran los casos de los módulos bench_*.py
+suite = BenchmarkSuite()
@@ -0,0 +1,87 @@
+"""
+🏁 Suite de Benchmarks - Sistema LSP
+Ejecuta los benchmarks de rutas críticas y compara resultados entre commits
+
+Uso:
+    python benchmarks/run_benchmarks.py                      # ejecutar todo
+    python benchmarks/run_benchmarks.py --quick -o base.json # ejecución rápida
+    python benchmarks/run_benchmarks.py -k storage -k model  # filtrar casos
+    python benchmarks/run_benchmarks.py --compare base.json nuevo.json --threshold 0.15
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Raíz del repositorio en el path para importar 'src' y 'benchmarks'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.harness import suite, save_results, load_results, compare_results, print_comparison
+
+# Los módulos registran sus casos en la suite al importarse
+from benchmarks import bench_data_collection, bench_storage, bench_training, bench_inference, bench_profiler  # noqa: F401
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento del sistema LSP")
+    parser.add_argument('-k', '--filter', action='append', default=None,
+                        help="Ejecutar solo casos cuyo nombre o grupo contenga el texto (repetible)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="Archivo JSON de salida (por defecto benchmarks/results/bench_<fecha>.json)")
+    parser.add_argument('--quick', action='store_true', help="Modo rápido: menos repeticiones y datos")
+    parser.add_argument('--repeats', type=int, default=None, help="Forzar número de repeticiones")
+    parser.add_argument('--warmup', type=int, default=None, help="Forzar llamadas de calentamiento")
+    parser.add_argument('--verbose', action='store_true', help="No silenciar la salida del código medido")
+    parser.add_argument('--list', action='store_true', help="Listar casos registrados y salir")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'ACTUAL'),
+                        help="Comparar dos reportes JSON en lugar de ejecutar")
+    parser.add_argument('--baseline', default=None,
+                        help="Tras ejecutar, comparar contra este reporte JSON")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Cambio relativo que se considera regresión (0.10 = 10%%)")
+    parser.add_argument('--metric', default='median_ms', help="Métrica a comparar (median_ms, p95_ms, ...)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.list:
+        for case in suite.cases:
+            print(f"   [{case.group}] {case.name}")
+        return 0
+
+    if args.compare:
+        rows = compare_results(load_results(args.compare[0]), load_results(args.compare[1]),
+                               threshold=args.threshold, metric=args.metric)
+        print_comparison(rows, args.threshold, args.metric)
+        return 1 if any(r['status'] == 'regression' for r in rows) else 0
+
+    print("🏁 EJECUTANDO BENCHMARKS DEL SISTEMA LSP")
+    print("="*60)
+    report = suite.run(filters=args.filter, quick=args.quick, repeats=args.repeats,
+                       warmup=args.warmup, quiet=not args.verbose)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results',
+        f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_results(report, output)
+    print(f"\n💾 Resultados guardados en: {output}")
+    print(f"   ✅ Casos medidos: {len(report['results'])} | ⏭️ Omitidos: {len(report['skipped'])}")
+
+    if args.baseline:
+        rows = compare_results(load_results(args.baseline), report,
+                               threshold=args.threshold, metric=args.metric)
+        print_comparison(rows, args.threshold, args.metric)
+        return 1 if any(r['status'] == 'regression' for r in rows) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
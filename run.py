@@ -8,10 +8,19 @@ Este archivo coordina todos los módulos del sistema:
 - Evaluación de modelos
 - Traducción en tiempo real
 
+Las dependencias pesadas (TensorFlow, MediaPipe, OpenCV...) solo se
+importan al ejecutar el módulo que las usa: el menú comprueba su
+disponibilidad con importlib.util.find_spec.
+
+    python run.py                   # Menú principal
+    python run.py --import-report   # Tiempos de importación (-X importtime)
+
 Autor: LSP Team
 Versión: 2.0 - Julio 2025
 """
 
+import argparse
+import importlib.util
 import sys
 import os
 from typing import Optional
@@ -19,6 +28,14 @@ from typing import Optional
 # Agregar el directorio src al path para importaciones
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+def is_available(module_name: str) -> bool:
+    """Indica si un módulo se puede importar, sin importarlo (find_spec)"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 class LSPMainSystem:
     """Sistema principal que coordina todos los módulos de LSP"""
     
@@ -28,24 +45,32 @@ class LSPMainSystem:
                 'name': 'Recolección de Datos',
                 'description': 'Recolectar datos de señas usando MediaPipe',
                 'module': 'data_collection',
+                'entry': 'src.data_collection.main_collector',
+                'requires': ('cv2', 'mediapipe', 'h5py'),
                 'icon': '📊'
             },
             '2': {
                 'name': 'Entrenamiento de Modelos',
                 'description': 'Entrenar modelos GRU con los datos recolectados',
                 'module': 'training',
+                'entry': 'src.training.train_gru',
+                'requires': ('tensorflow', 'h5py', 'sklearn'),
                 'icon': '🧠'
             },
             '3': {
                 'name': 'Evaluación de Modelos',
                 'description': 'Evaluar el rendimiento de modelos entrenados',
                 'module': 'evaluation',
+                'entry': 'src.evaluation.evaluate_model',
+                'requires': ('numpy',),
                 'icon': '📈'
             },
             '4': {
                 'name': 'Traducción en Tiempo Real',
                 'description': 'Usar modelos entrenados para traducir señas en vivo',
                 'module': 'inference',
+                'entry': 'src.inference.real_time_translator',
+                'requires': ('numpy',),
                 'icon': '🎯'
             }
         }
@@ -72,27 +97,14 @@ class LSPMainSystem:
         print("-"*50)
     
     def _check_module_status(self, module_name: str) -> str:
-        """Verifica el estado de un módulo"""
-        try:
-            if module_name == 'data_collection':
-                from src.data_collection.main_collector import LSPDataCollector
-                return "✅"
-            elif module_name == 'training':
-                # Verificar si existe el módulo de entrenamiento
-                training_path = os.path.join('src', 'training', 'train_gru.py')
-                return "✅" if os.path.exists(training_path) else "⚠️"
-            elif module_name == 'evaluation':
-                # Verificar si existe el módulo de evaluación
-                eval_path = os.path.join('src', 'evaluation', 'evaluate_model.py')
-                return "✅" if os.path.exists(eval_path) else "⚠️"
-            elif module_name == 'inference':
-                # Verificar si existe el módulo de inferencia
-                inference_path = os.path.join('src', 'inference', 'real_time_translator.py')
-                return "✅" if os.path.exists(inference_path) else "⚠️"
-            else:
-                return "❌"
-        except ImportError:
-            return "❌"
+        """
+        Verifica el estado de un módulo sin importarlo: ✅ listo, ⚠️ no
+        implementado, ❌ faltan dependencias
+        """
+        module = next((m for m in self.modules.values() if m['module'] == module_name), None)
+        if module is None or not is_available(module['entry']):
+            return "⚠️" if module else "❌"
+        return "✅" if all(is_available(package) for package in module['requires']) else "❌"
     
     def run_module(self, module_key: str):
         """Ejecuta un módulo específico"""
@@ -195,10 +207,9 @@ class LSPMainSystem:
         
         missing_packages = []
         for package in required_packages:
-            try:
-                __import__(package)
+            if is_available(package):
                 print(f"   ✅ {package}")
-            except ImportError:
+            else:
                 print(f"   ❌ {package} - No instalado")
                 missing_packages.append(package)
         
@@ -283,8 +294,19 @@ class LSPMainSystem:
                 input("\n📌 Presiona Enter para continuar...")
 
 
-def main():
+def main(argv=None):
     """Punto de entrada principal"""
+    parser = argparse.ArgumentParser(description="Sistema LSP - Lenguaje de Señas Peruano")
+    parser.add_argument('--import-report', action='store_true',
+                        help="Medir los tiempos de importación del menú y de cada módulo y salir")
+    args = parser.parse_args(argv)
+    
+    if args.import_report:
+        from src.utils.import_report import main as import_report
+        modules = ['run'] + [module['entry'] for module in LSPMainSystem().modules.values()]
+        import_report(modules, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return
+    
     try:
         print("🚀 Iniciando Sistema LSP - Versión Modular 2.0...")
         
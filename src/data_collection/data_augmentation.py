@@ -6,11 +6,17 @@ Técnicas especializadas para aumentar el dataset de señas sin perder semántic
 import numpy as np
 import random
 import os
-import glob
 from typing import List, Tuple, Dict, Optional
 import copy
 import json
 
+import h5py
+
+try:
+    from .dataset_tools import read_row_tables
+except ImportError:
+    from src.data_collection.dataset_tools import read_row_tables
+
 
 class LSPDataAugmenter:
     """
@@ -58,7 +64,8 @@ class LSPDataAugmenter:
         }
     
     def augment_sequence(self, sequence: np.ndarray, sign_type: str, 
-                        metadata: Dict, num_augmentations: int = 3) -> List[Tuple[np.ndarray, Dict]]:
+                        metadata: Dict, num_augmentations: int = 3,
+                        sequence_id: Optional[int] = None) -> List[Tuple[np.ndarray, Dict]]:
         """
         Genera múltiples versiones aumentadas de una secuencia
         
@@ -67,6 +74,8 @@ class LSPDataAugmenter:
             sign_type: Tipo de seña ('static_letter', 'dynamic_letter', etc.)
             metadata: Metadatos originales
             num_augmentations: Número de variaciones a generar
+            sequence_id: ID de la secuencia original (por defecto metadata['sequence_id'],
+                que DataManager.save_sequence guarda en los metadatos)
             
         Returns:
             Lista de tuplas (secuencia_aumentada, metadatos_actualizados)
@@ -80,9 +89,11 @@ class LSPDataAugmenter:
             
             # Aplicar augmentación
             aug_sequence = self._apply_augmentation(sequence, aug_technique)
+            # La interpolación temporal devuelve float64: conservar el tipo de entrada
+            aug_sequence = aug_sequence.astype(sequence.dtype, copy=False)
             
             # Actualizar metadatos
-            aug_metadata = self._update_metadata(metadata, aug_technique, i)
+            aug_metadata = self._update_metadata(metadata, aug_technique, i, sequence_id)
             
             augmented_sequences.append((aug_sequence, aug_metadata))
         
@@ -263,16 +274,21 @@ class LSPDataAugmenter:
         
         return augmented
     
-    def _update_metadata(self, original_metadata: Dict, technique: str, aug_id: int) -> Dict:
+    def _update_metadata(self, original_metadata: Dict, technique: str, aug_id: int,
+                         original_sequence_id: Optional[int] = None) -> Dict:
         """Actualiza metadatos para secuencia aumentada"""
         aug_metadata = copy.deepcopy(original_metadata)
+        # El ID propio de la augmentación lo asigna DataManager.save_sequence
+        aug_metadata.pop('sequence_id', None)
+        if original_sequence_id is None:
+            original_sequence_id = original_metadata.get('sequence_id', 'unknown')
         
         # Agregar información de augmentación
         aug_metadata['augmentation'] = {
             'is_augmented': True,
             'technique': technique,
             'augmentation_id': aug_id,
-            'original_sequence_id': original_metadata.get('sequence_id', 'unknown')
+            'original_sequence_id': original_sequence_id
         }
         
         # Actualizar quality_score (puede ser ligeramente menor)
@@ -383,16 +399,16 @@ class AugmentationIntegrator:
         augmented_count = 0
         augmentations_per_sequence = max(1, target_augmentations // len(sign_sequences))
         
-        for sequence_data, metadata in sign_sequences:
-            # Generar augmentaciones
+        for sequence_data, metadata, sequence_id in sign_sequences:
+            # Generar augmentaciones (source_id apunta a la fila original)
             augmented_sequences = self.augmenter.augment_sequence(
-                sequence_data, sign_type, metadata, augmentations_per_sequence
+                sequence_data, sign_type, metadata, augmentations_per_sequence, sequence_id=sequence_id
             )
             
             # Guardar augmentaciones
             for aug_sequence, aug_metadata in augmented_sequences:
-                # Generar ID único para augmentación
-                aug_id = augmented_count + 1000  # Offset para distinguir de originales
+                # ID único de la seña también entre ejecuciones sucesivas
+                aug_id = self.data_manager.get_next_sequence_id(sign)
                 
                 self.data_manager.save_sequence(
                     aug_sequence, sign, aug_id, aug_metadata
@@ -407,29 +423,32 @@ class AugmentationIntegrator:
         
         return augmented_count
     
-    def _load_sign_sequences(self, sign: str) -> List[Tuple[np.ndarray, Dict]]:
-        """Carga secuencias existentes de una seña"""
+    def _load_sign_sequences(self, sign: str) -> List[Tuple[np.ndarray, Dict, int]]:
+        """Carga las secuencias originales de una seña desde el HDF5 con su sequence_id"""
+        label_index = self.data_manager.labels_map['sign_to_index'].get(sign)
+        if label_index is None or not os.path.exists(self.data_manager.dataset_file):
+            return []
+        
+        try:
+            X, _ = self.data_manager.load_keras_dataset(signs=[sign])
+            with h5py.File(self.data_manager.dataset_file, 'r') as hf:
+                tables = read_row_tables(hf)
+        except Exception as e:
+            print(f"⚠️ Error cargando secuencias de {sign}: {e}")
+            return []
+        
+        # Mismo orden de filas que load_keras_dataset; las augmentaciones no se vuelven a aumentar
+        rows = tables['y'] == label_index
         sequences = []
-        
-        # Buscar archivos de la seña en el directorio de datos
-        import glob
-        pattern = f"data/*{sign}_*.npy"
-        sequence_files = glob.glob(pattern)
-        
-        for seq_file in sequence_files:
-            try:
-                # Cargar secuencia
-                sequence = np.load(seq_file)
-                
-                # Cargar metadatos correspondientes
-                metadata_file = seq_file.replace('.npy', '_metadata.json')
-                metadata = {}
-                if os.path.exists(metadata_file):
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                
-                sequences.append((sequence, metadata))
-            except Exception as e:
-                print(f"⚠️ Error cargando {seq_file}: {e}")
+        for sequence, sequence_id, augmented in zip(X, tables['sequence_id'][rows].tolist(),
+                                                    tables['augmented'][rows].tolist()):
+            if augmented:
+                continue
+            metadata_file = os.path.join(self.data_manager.metadata_dir, f"{sign}_{sequence_id}_metadata.json")
+            metadata = {}
+            if os.path.exists(metadata_file):
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            sequences.append((sequence, metadata, sequence_id))
         
         return sequences
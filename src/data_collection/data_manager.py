@@ -7,13 +7,49 @@ import json
 import numpy as np
 import h5py
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import Callable, List, Optional, Tuple, Dict, Any
+
+try:
+    from ..utils.dtype_policy import FEATURE_DTYPE, resolve_storage_dtype
+    from .dataset_tools import (DEFAULT_COMPRESSION, DEFAULT_COMPRESSION_LEVEL,
+                                sequence_dataset_kwargs, row_dataset_kwargs, frame_dataset_kwargs,
+                                RAGGED_ROW_TABLES, RAGGED_FILE_KWARGS, is_ragged_layout,
+                                ensure_row_tables, read_row_tables, compact_sequences_file)
+    from .sharded_storage import default_session_id, shard_path
+except ImportError:
+    from src.utils.dtype_policy import FEATURE_DTYPE, resolve_storage_dtype
+    from src.data_collection.dataset_tools import (DEFAULT_COMPRESSION, DEFAULT_COMPRESSION_LEVEL,
+                                                   sequence_dataset_kwargs, row_dataset_kwargs,
+                                                   frame_dataset_kwargs, RAGGED_ROW_TABLES,
+                                                   RAGGED_FILE_KWARGS, is_ragged_layout, ensure_row_tables,
+                                                   read_row_tables, compact_sequences_file)
+    from src.data_collection.sharded_storage import default_session_id, shard_path
 
 class DataManager:
     """Gestiona el almacenamiento y metadatos de las secuencias en formato HDF5"""
     
-    def __init__(self, data_dir='data'):
+    def __init__(self, data_dir='data', storage_dtype='float32', compression=DEFAULT_COMPRESSION,
+                 compression_level=DEFAULT_COMPRESSION_LEVEL, shuffle=True, session_id=None,
+                 variable_length=False):
+        # Con session_id cada estación escribe en su propio shard (data/shards/<sesión>/),
+        # con el mismo layout que la carpeta principal; 'auto' genera un ID único
+        self.root_dir = data_dir
+        self.session_id = default_session_id() if session_id == 'auto' else session_id
+        if self.session_id:
+            data_dir = shard_path(data_dir, self.session_id)
         self.data_dir = data_dir
+        # Tipo en disco de 'X' (float16 reduce el archivo a la mitad); en memoria siempre FEATURE_DTYPE
+        self.storage_dtype = resolve_storage_dtype(storage_dtype)
+        # Filtros de los archivos nuevos ('none', 'gzip', 'lzf', 'lz4'); los existentes se
+        # convierten con dataset_tools repack
+        self.compression = compression
+        self.compression_level = compression_level
+        self.shuffle = shuffle
+        # Con variable_length los archivos nuevos guardan cada secuencia con sus frames reales
+        # (layout frames + offset/length); un archivo existente conserva su layout
+        if variable_length and self.session_id:
+            raise ValueError("Los shards por sesión solo admiten secuencias de longitud fija")
+        self.variable_length = variable_length
         # El directorio 'sequences' ya no es necesario, se usará un único archivo HDF5
         self.metadata_dir = os.path.join(data_dir, 'metadata')
         
@@ -85,34 +121,62 @@ class DataManager:
         return int(count)
 
     def get_next_sequence_id(self, sign):
-        """Obtiene el siguiente ID de secuencia para una seña"""
-        return self.get_collected_sequences_count(sign) + 1
+        """
+        Obtiene el siguiente ID de secuencia para una seña
+
+        Es el mayor sequence_id guardado + 1 (no el conteo): tras compactar
+        quedan huecos y un conteo reutilizaría IDs que siguen existiendo.
+        """
+        label_index = self.labels_map['sign_to_index'].get(sign)
+        if label_index is None or not os.path.exists(self.dataset_file):
+            return 1
+
+        try:
+            with h5py.File(self.dataset_file, 'r') as hf:
+                if 'y' not in hf:
+                    return 1
+                tables = read_row_tables(hf)
+        except Exception as e:
+            print(f"Error al leer los IDs de secuencia de HDF5: {e}")
+            return self.get_collected_sequences_count(sign) + 1
+        sequence_ids = tables['sequence_id'][tables['y'] == label_index]
+        return int(sequence_ids.max()) + 1 if len(sequence_ids) else 1
     
     def save_sequence(self, sequence_data, sign, sequence_id, metadata):
         """Guarda una secuencia en el dataset HDF5"""
         label_index = self.add_sign_to_labels(sign)
+        # El ID queda en los metadatos: las augmentaciones lo copian como original_sequence_id
+        metadata = dict(metadata or {}, sequence_id=sequence_id)
         
         # Asegurar que sequence_data tenga la forma correcta (sequence_length, features)
         if len(sequence_data.shape) == 3 and sequence_data.shape[0] == 1:
             sequence_data = sequence_data.reshape(sequence_data.shape[1], sequence_data.shape[2])
         
         try:
+            if self.variable_length and not os.path.exists(self.dataset_file):
+                h5py.File(self.dataset_file, 'w', **RAGGED_FILE_KWARGS).close()
             with h5py.File(self.dataset_file, 'a') as hf:
-                # Crear datasets si no existen
-                if 'X' not in hf:
-                    hf.create_dataset('X', data=[sequence_data], 
-                                      maxshape=(None, sequence_data.shape[0], sequence_data.shape[1]), 
-                                      chunks=True, dtype='float32')
-                    hf.create_dataset('y', data=[label_index], 
-                                      maxshape=(None,), 
-                                      chunks=True, dtype='int32')
+                if is_ragged_layout(hf) or ('y' not in hf and self.variable_length):
+                    self._append_ragged_sequence(hf, sequence_data)
                 else:
+                    # Crear datasets si no existen
+                    if 'X' not in hf:
+                        # Un chunk por secuencia: cada append escribe exactamente un chunk
+                        hf.create_dataset('X', **sequence_dataset_kwargs(
+                            sequence_data.shape, self.storage_dtype,
+                            self.compression, self.compression_level, self.shuffle))
+                        hf.create_dataset('y', **row_dataset_kwargs(
+                            (), 'int32', self.compression, self.compression_level, self.shuffle))
+
                     # Añadir nuevos datos
                     hf['X'].resize((hf['X'].shape[0] + 1), axis=0)
                     hf['X'][-1] = sequence_data
-                    
-                    hf['y'].resize((hf['y'].shape[0] + 1), axis=0)
-                    hf['y'][-1] = label_index
+                ensure_row_tables(hf, self.compression, self.compression_level, self.shuffle)
+                
+                row_values = self._row_table_values(label_index, sequence_id, metadata)
+                for name, value in row_values.items():
+                    hf[name].resize((hf[name].shape[0] + 1), axis=0)
+                    hf[name][-1] = value
         except Exception as e:
             print(f"Error al guardar la secuencia en HDF5: {e}")
             # Aquí se podría implementar una lógica de recuperación o limpieza
@@ -128,6 +192,47 @@ class DataManager:
         
         return self.dataset_file, metadata_file
 
+    def _append_ragged_sequence(self, hf, sequence_data):
+        """Añade los frames de una secuencia a 'frames' y su posición a 'offset'/'length'"""
+        if 'frames' not in hf:
+            hf.create_dataset('frames', **frame_dataset_kwargs(
+                sequence_data.shape[-1], self.storage_dtype,
+                self.compression, self.compression_level, self.shuffle))
+            hf.create_dataset('y', **row_dataset_kwargs(
+                (), 'int32', self.compression, self.compression_level, self.shuffle))
+            for name, dtype in RAGGED_ROW_TABLES.items():
+                hf.create_dataset(name, **row_dataset_kwargs(
+                    (), dtype, self.compression, self.compression_level, self.shuffle))
+
+        frames = hf['frames']
+        offset = frames.shape[0]
+        frames.resize(offset + len(sequence_data), axis=0)
+        frames[offset:] = sequence_data
+        for name, value in (('offset', offset), ('length', len(sequence_data))):
+            hf[name].resize((hf[name].shape[0] + 1), axis=0)
+            hf[name][-1] = value
+
+    @staticmethod
+    def _row_table_values(label_index, sequence_id, metadata):
+        """Valores de 'y' y de las tablas por fila para una secuencia nueva"""
+        metadata = metadata or {}
+        augmentation = metadata.get('augmentation') or {}
+        is_augmented = bool(augmentation.get('is_augmented')) or metadata.get('collection_mode') == 'AUGMENTED'
+
+        def as_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return -1
+
+        return {
+            'y': label_index,
+            'quality': float(metadata.get('quality_score', np.nan)),
+            'augmented': int(is_augmented),
+            'sequence_id': as_int(sequence_id),
+            'source_id': as_int(augmentation.get('original_sequence_id')) if is_augmented else -1,
+        }
+
     def _update_dataset_info(self, sign, sequence_id, metadata):
         """Actualiza la información general del dataset"""
         dataset_info = self._load_dataset_info()
@@ -181,17 +286,30 @@ class DataManager:
         return metadata
 
     def load_keras_dataset(self, signs: List[str] = None):
-        """Carga el dataset completo o un subconjunto desde el archivo HDF5"""
+        """
+        Carga el dataset completo o un subconjunto desde el archivo HDF5
+
+        En el layout de longitud variable X es un array de objetos con una
+        secuencia (frames, features) por fila.
+        """
         if not os.path.exists(self.dataset_file):
             return np.array([]), np.array([])
 
         with h5py.File(self.dataset_file, 'r') as hf:
+            if is_ragged_layout(hf):
+                y_all = hf['y'][:]
+                rows = np.arange(len(y_all))
+                if signs is not None:
+                    label_indices = [self.labels_map['sign_to_index'][s] for s in signs if s in self.labels_map['sign_to_index']]
+                    rows = rows[np.isin(y_all, label_indices)]
+                return self._read_ragged_sequences(hf, rows), y_all[rows]
+
             if 'X' not in hf or 'y' not in hf:
                 return np.array([]), np.array([])
 
             if signs is None:
                 # Cargar todo el dataset
-                X_all = hf['X'][:]
+                X_all = hf['X'][:].astype(FEATURE_DTYPE, copy=False)
                 y_all = hf['y'][:]
                 return X_all, y_all
             else:
@@ -204,11 +322,22 @@ class DataManager:
                 # Encontrar los índices de las filas que corresponden a las señas deseadas
                 mask = np.isin(y_all, label_indices)
                 
-                X_filtered = hf['X'][mask]
+                X_filtered = hf['X'][mask].astype(FEATURE_DTYPE, copy=False)
                 y_filtered = y_all[mask]
                 
                 return X_filtered, y_filtered
 
+    @staticmethod
+    def _read_ragged_sequences(hf, rows):
+        """Secuencias de las filas dadas del layout de longitud variable (array de objetos)"""
+        offsets = hf['offset'][:]
+        lengths = hf['length'][:]
+        frames = hf['frames']
+        sequences = np.empty(len(rows), dtype=object)
+        for i, row in enumerate(rows):
+            sequences[i] = frames[offsets[row]:offsets[row] + lengths[row]].astype(FEATURE_DTYPE, copy=False)
+        return sequences
+
     def get_keras_dataset_info(self):
         """Obtiene información del dataset desde el archivo HDF5"""
         info = {
@@ -251,17 +380,21 @@ class DataManager:
 
         try:
             with h5py.File(self.dataset_file, 'r') as hf:
-                if 'X' not in hf or 'y' not in hf:
+                ragged = is_ragged_layout(hf)
+                if not ragged and ('X' not in hf or 'y' not in hf):
                     return None, None
                 
-                y_data = hf['y'][:]
-                # Encontrar los índices de todas las secuencias para esta seña
-                sign_indices = np.where(y_data == label_index)[0]
+                tables = read_row_tables(hf)
+                # Buscar la fila por el ID guardado (en archivos anteriores, el ordinal)
+                matches = np.flatnonzero((tables['y'] == label_index) & (tables['sequence_id'] == sequence_id))
                 
-                if sequence_id <= len(sign_indices):
+                if len(matches) > 0:
                     # Obtener el índice real en el dataset HDF5
-                    actual_index = sign_indices[sequence_id - 1]
-                    sequence_data = hf['X'][actual_index]
+                    actual_index = matches[-1]
+                    if ragged:
+                        sequence_data = self._read_ragged_sequences(hf, [actual_index])[0]
+                    else:
+                        sequence_data = hf['X'][actual_index].astype(FEATURE_DTYPE, copy=False)
                     
                     # Cargar metadatos
                     metadata_file = os.path.join(self.metadata_dir, f"{sign}_{sequence_id}_metadata.json")
@@ -319,6 +452,8 @@ class DataManager:
 
         try:
             with h5py.File(self.dataset_file, 'r') as hf:
+                if is_ragged_layout(hf):
+                    return self._validate_ragged_layout(hf)
                 if 'X' not in hf:
                     issues.append("Dataset 'X' no encontrado en el archivo HDF5.")
                 if 'y' not in hf:
@@ -332,12 +467,152 @@ class DataManager:
             
         return issues
 
-    def cleanup_keras_dataset(self):
-        """Informa sobre la limpieza de datasets HDF5."""
-        print("La limpieza de archivos HDF5 no se realiza in-situ.")
-        print("Para eliminar datos corruptos o no deseados, se recomienda")
-        print("crear un script que lea los datos válidos y los escriba en un nuevo archivo HDF5.")
-        return 0
+    @staticmethod
+    def _validate_ragged_layout(hf):
+        """Problemas del layout de longitud variable: tablas desalineadas o fuera de 'frames'"""
+        issues = []
+        num_rows = hf['y'].shape[0]
+        for name in RAGGED_ROW_TABLES:
+            if hf[name].shape[0] != num_rows:
+                issues.append(f"Inconsistencia de datos: '{name}' tiene {hf[name].shape[0]} filas, y tiene {num_rows} etiquetas.")
+        if issues:
+            return issues
+
+        offsets = hf['offset'][:]
+        lengths = hf['length'][:].astype(np.int64)
+        if np.any(lengths <= 0):
+            issues.append(f"{int(np.sum(lengths <= 0))} secuencias sin frames.")
+        if np.any(offsets < 0) or np.any(offsets + lengths > hf['frames'].shape[0]):
+            issues.append(f"Hay secuencias fuera de 'frames' ({hf['frames'].shape[0]} frames).")
+        return issues
+
+    def compact_dataset(self,
+                        min_quality: Optional[float] = None,
+                        drop_augmented: bool = False,
+                        drop_orphaned_augmented: bool = False,
+                        drop_signs: Optional[List[str]] = None,
+                        predicate: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None,
+                        dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Elimina secuencias por criterio y reescribe sequences.h5 compactado
+
+        Los criterios se evalúan sobre 'y' y las tablas por fila (sin leer X);
+        las filas que sobreviven se copian por bloques a un archivo nuevo que
+        reemplaza al original de forma atómica. Después se reconstruyen el
+        mapeo de etiquetas (índices contiguos), dataset_info.json y se borran
+        los metadatos de las secuencias eliminadas.
+
+        Args:
+            min_quality: Eliminar filas con quality_score menor (sin score se conservan)
+            drop_augmented: Eliminar todas las secuencias aumentadas
+            drop_orphaned_augmented: Eliminar augmentaciones cuya original ya no existe
+            drop_signs: Señas a eliminar por completo
+            predicate: Función tablas → máscara booleana de filas a eliminar
+            dry_run: Solo calcular el reporte, sin modificar nada
+
+        Returns:
+            Reporte con filas antes/después y eliminadas por seña
+        """
+        report = {'rows_before': 0, 'rows_after': 0, 'removed_by_sign': {}, 'dry_run': dry_run}
+        if not os.path.exists(self.dataset_file):
+            return report
+
+        with h5py.File(self.dataset_file, 'r') as hf:
+            if 'y' not in hf:
+                return report
+            tables = read_row_tables(hf)
+
+        labels = tables['y']
+        index_to_sign = self.labels_map['index_to_sign']
+        drop = np.zeros(len(labels), dtype=bool)
+
+        if min_quality is not None:
+            drop |= tables['quality'] < min_quality
+        if drop_augmented:
+            drop |= tables['augmented'].astype(bool)
+        if drop_signs:
+            drop_indices = [self.labels_map['sign_to_index'][s] for s in drop_signs
+                            if s in self.labels_map['sign_to_index']]
+            drop |= np.isin(labels, drop_indices)
+        if predicate is not None:
+            drop |= np.asarray(predicate(tables), dtype=bool)
+        if drop_orphaned_augmented:
+            # Se evalúa al final: una original eliminada arriba deja huérfanas sus augmentaciones
+            augmented = tables['augmented'].astype(bool)
+            originals = set(zip(labels[~augmented & ~drop].tolist(),
+                                tables['sequence_id'][~augmented & ~drop].tolist()))
+            # source_id < 0: origen desconocido (augmentaciones antiguas), no huérfana
+            orphaned = np.array([is_aug and source >= 0 and (label, source) not in originals
+                                 for is_aug, label, source in zip(augmented, labels.tolist(),
+                                                                  tables['source_id'].tolist())], dtype=bool)
+            drop |= orphaned
+
+        keep = ~drop
+        removed = np.bincount(labels[drop], minlength=max(1, self.labels_map['num_classes']))
+        report['rows_before'] = int(len(labels))
+        report['rows_after'] = int(keep.sum())
+        report['removed_by_sign'] = {index_to_sign.get(str(i), str(i)): int(count)
+                                     for i, count in enumerate(removed) if count > 0}
+        if dry_run or keep.all():
+            return report
+
+        # Índices contiguos para las señas que conservan al menos una fila
+        kept_counts = np.bincount(labels[keep], minlength=len(removed))
+        surviving = [i for i in range(len(kept_counts)) if kept_counts[i] > 0]
+        label_remap = np.full(len(kept_counts), -1, dtype=np.int32)
+        label_remap[surviving] = np.arange(len(surviving), dtype=np.int32)
+
+        report.update(compact_sequences_file(self.dataset_file, keep, label_remap))
+        self._remove_dropped_metadata(labels[drop], tables['sequence_id'][drop])
+        self._rewrite_labels_after_compaction(surviving, kept_counts)
+
+        # La partición guardada se refiere a filas que ya no existen
+        split_file = os.path.join(self.metadata_dir, 'split_indices.npz')
+        if os.path.exists(split_file):
+            os.remove(split_file)
+
+        return report
+
+    def _rewrite_labels_after_compaction(self, surviving: List[int], kept_counts: np.ndarray):
+        """Reconstruye labels_map.json y dataset_info.json tras compactar"""
+        signs = [self.labels_map['index_to_sign'][str(i)] for i in surviving]
+        self.labels_map['sign_to_index'] = {sign: i for i, sign in enumerate(signs)}
+        self.labels_map['index_to_sign'] = {str(i): sign for i, sign in enumerate(signs)}
+        self.labels_map['num_classes'] = len(signs)
+        self.labels_map['last_updated'] = datetime.now().isoformat()
+        self._save_labels_map(self.labels_map)
+
+        dataset_info = self._load_dataset_info()
+        previous = dataset_info.get('signs', {})
+        dataset_info['signs'] = {
+            sign: {'count': int(kept_counts[old]), 'last_updated': previous.get(sign, {}).get('last_updated')}
+            for sign, old in zip(signs, surviving)
+        }
+        dataset_info['total_sequences'] = int(sum(kept_counts))
+        dataset_info['last_updated'] = datetime.now().isoformat()
+        with open(self.dataset_info_file, 'w', encoding='utf-8') as f:
+            json.dump(dataset_info, f, indent=4, ensure_ascii=False)
+
+    def _remove_dropped_metadata(self, labels: np.ndarray, sequence_ids: np.ndarray):
+        """Borra los JSON de metadatos de las filas eliminadas (antes de reescribir las etiquetas)"""
+        for label, sequence_id in zip(labels.tolist(), sequence_ids.tolist()):
+            sign = self.labels_map['index_to_sign'].get(str(label))
+            metadata_file = os.path.join(self.metadata_dir, f"{sign}_{sequence_id}_metadata.json")
+            if sign is not None and os.path.exists(metadata_file):
+                os.remove(metadata_file)
+
+    def cleanup_keras_dataset(self, **filters):
+        """
+        Limpia el dataset HDF5 compactándolo (ver compact_dataset)
+
+        Sin filtros elimina las augmentaciones huérfanas.
+
+        Returns:
+            Número de secuencias eliminadas
+        """
+        filters = filters or {'drop_orphaned_augmented': True}
+        report = self.compact_dataset(**filters)
+        return report['rows_before'] - report['rows_after']
 
     def export_dataset_summary(self, output_file='dataset_summary.json'):
         """Exporta un resumen completo del dataset en formato HDF5"""
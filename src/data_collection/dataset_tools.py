@@ -0,0 +1,564 @@
+"""
+Dataset Tools - Layout y mantenimiento del archivo sequences.h5
+Chunking explícito por secuencia, filtros de compresión opcionales,
+tablas de metadatos por fila y herramientas de reempaquetado y compactación
+
+Layout de longitud variable (DataManager(variable_length=True)): los frames
+de todas las secuencias se concatenan en 'frames' (total_frames × features)
+y cada fila guarda su posición en 'offset' y su número de frames en 'length'
+
+Uso:
+    python -m src.data_collection.dataset_tools repack data/sequences.h5 --compression gzip
+    python -m src.data_collection.dataset_tools info data/sequences.h5
+    python -m src.data_collection.dataset_tools compact data --min-quality 70 --drop-orphaned
+    python -m src.data_collection.dataset_tools shards data
+    python -m src.data_collection.dataset_tools merge data --remove
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import h5py
+import numpy as np
+
+try:
+    from ..utils.dtype_policy import resolve_storage_dtype
+except ImportError:
+    from src.utils.dtype_policy import resolve_storage_dtype
+
+# Filas por bloque al copiar datasets fila a fila
+COPY_BLOCK_ROWS = 256
+
+# Chunk de los datasets por fila pequeños (y, metadatos por secuencia)
+ROW_CHUNK_ROWS = 1024
+
+# Chunk de 'frames' en el layout de longitud variable (frames por chunk)
+FRAME_CHUNK_ROWS = 256
+
+COMPRESSION_OPTIONS = ('none', 'gzip', 'lzf', 'lz4')
+
+DEFAULT_COMPRESSION = 'gzip'
+DEFAULT_COMPRESSION_LEVEL = 4
+
+# Tablas por fila junto a X/y: (dtype, valor por defecto)
+ROW_TABLES = {
+    'quality': ('float32', np.nan),     # quality_score de la secuencia
+    'augmented': ('uint8', 0),          # 1 si la fila es una augmentación
+    'sequence_id': ('int32', -1),       # ID de secuencia usado en los metadatos
+    'source_id': ('int32', -1),         # sequence_id de la original (augmentaciones)
+}
+
+# Índice de las filas en el layout de longitud variable: posición y frames en 'frames'
+RAGGED_ROW_TABLES = {
+    'offset': 'int64',
+    'length': 'int32',
+}
+
+# Cada append reescribe el último chunk comprimido de 'frames' en un sitio nuevo;
+# con el gestor de espacio libre persistente ese hueco se reutiliza entre aperturas
+# (sin él el archivo crece ~3x el tamaño de los datos)
+RAGGED_FILE_KWARGS = {'fs_strategy': 'fsm', 'fs_persist': True}
+
+
+def _load_hdf5plugin():
+    """Importa hdf5plugin (necesario para lz4) si está instalado"""
+    try:
+        import hdf5plugin
+        return hdf5plugin
+    except ImportError:
+        return None
+
+
+def compression_kwargs(compression: Optional[str] = DEFAULT_COMPRESSION,
+                       level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                       shuffle: bool = True) -> Dict[str, Any]:
+    """
+    Argumentos de filtro para h5py.create_dataset
+
+    Args:
+        compression: 'none', 'gzip', 'lzf' o 'lz4' (requiere hdf5plugin)
+        level: Nivel de gzip (0-9); se ignora en los demás
+        shuffle: Si aplicar el filtro shuffle de bytes (mejora la compresión de floats;
+                 sin compresión no se aplica)
+
+    Returns:
+        Diccionario con compression / compression_opts / shuffle
+    """
+    compression = (compression or 'none').lower()
+    if compression not in COMPRESSION_OPTIONS:
+        raise ValueError(f"Compresión no soportada: {compression} (opciones: {', '.join(COMPRESSION_OPTIONS)})")
+
+    if compression == 'lz4':
+        hdf5plugin = _load_hdf5plugin()
+        if hdf5plugin is None:
+            print("⚠️ hdf5plugin no instalado: lz4 no disponible, usando lzf")
+            compression = 'lzf'
+        else:
+            return {'shuffle': shuffle, **hdf5plugin.LZ4()}
+
+    if compression == 'none':
+        return {}
+    if compression == 'gzip':
+        return {'compression': 'gzip', 'compression_opts': level, 'shuffle': shuffle}
+    return {'compression': compression, 'shuffle': shuffle}
+
+
+def sequence_dataset_kwargs(frame_shape: Tuple[int, int],
+                            dtype,
+                            compression: Optional[str] = DEFAULT_COMPRESSION,
+                            level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                            shuffle: bool = True) -> Dict[str, Any]:
+    """
+    Layout del dataset 'X': una secuencia por chunk (1 × frames × features)
+
+    Un chunk por fila alinea cada append con un chunk nuevo y permite leer
+    filas aleatorias sin descomprimir secuencias vecinas.
+
+    Args:
+        frame_shape: (frames, features) de cada secuencia
+        dtype: Tipo de almacenamiento
+        compression, level, shuffle: Ver compression_kwargs
+
+    Returns:
+        Argumentos para h5py.create_dataset
+    """
+    return {
+        'shape': (0,) + tuple(frame_shape),
+        'maxshape': (None,) + tuple(frame_shape),
+        'chunks': (1,) + tuple(frame_shape),
+        'dtype': dtype,
+        **compression_kwargs(compression, level, shuffle)
+    }
+
+
+def row_dataset_kwargs(item_shape: Tuple[int, ...],
+                       dtype,
+                       compression: Optional[str] = DEFAULT_COMPRESSION,
+                       level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                       shuffle: bool = True) -> Dict[str, Any]:
+    """Layout de los datasets pequeños por fila (y, metadatos): chunks grandes, mismos filtros"""
+    return {
+        'shape': (0,) + tuple(item_shape),
+        'maxshape': (None,) + tuple(item_shape),
+        'chunks': (ROW_CHUNK_ROWS,) + tuple(item_shape),
+        'dtype': dtype,
+        **compression_kwargs(compression, level, shuffle)
+    }
+
+
+def frame_dataset_kwargs(num_features: int,
+                         dtype,
+                         compression: Optional[str] = DEFAULT_COMPRESSION,
+                         level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                         shuffle: bool = True) -> Dict[str, Any]:
+    """
+    Layout del dataset 'frames' del formato de longitud variable: frames
+    concatenados (total_frames × features) en chunks de FRAME_CHUNK_ROWS frames
+
+    Una secuencia típica ocupa uno o dos chunks, así que leer una fila
+    descomprime poco más que sus propios frames.
+
+    Args:
+        num_features: Características por frame
+        dtype: Tipo de almacenamiento
+        compression, level, shuffle: Ver compression_kwargs
+
+    Returns:
+        Argumentos para h5py.create_dataset
+    """
+    return {
+        'shape': (0, num_features),
+        'maxshape': (None, num_features),
+        'chunks': (FRAME_CHUNK_ROWS, num_features),
+        'dtype': dtype,
+        **compression_kwargs(compression, level, shuffle)
+    }
+
+
+def is_ragged_layout(hf: h5py.File) -> bool:
+    """Indica si el archivo usa el layout de longitud variable (frames + offset/length)"""
+    return all(isinstance(hf.get(name), h5py.Dataset) for name in ('frames', 'y', *RAGGED_ROW_TABLES))
+
+
+def ragged_file_kwargs(path: str) -> Dict[str, Any]:
+    """Argumentos de h5py.File para reescribir path con su mismo layout"""
+    with h5py.File(path, 'r') as hf:
+        return dict(RAGGED_FILE_KWARGS) if is_ragged_layout(hf) else {}
+
+
+def describe_layout(path: str) -> Dict[str, Any]:
+    """
+    Describe el layout de los datasets de un archivo HDF5
+
+    Returns:
+        {'file_size_mb', 'datasets': {nombre: {shape, dtype, chunks, compression, shuffle, stored_mb}}}
+    """
+    info = {'file_size_mb': os.path.getsize(path) / 1024**2, 'datasets': {}}
+    with h5py.File(path, 'r') as f:
+        def visit(name, obj):
+            if isinstance(obj, h5py.Dataset):
+                info['datasets'][name] = {
+                    'shape': obj.shape,
+                    'dtype': str(obj.dtype),
+                    'chunks': obj.chunks,
+                    'compression': obj.compression,
+                    'shuffle': obj.shuffle,
+                    'stored_mb': obj.id.get_storage_size() / 1024**2
+                }
+        f.visititems(visit)
+    return info
+
+
+def repack_sequences_file(source_path: str,
+                          output_path: Optional[str] = None,
+                          compression: Optional[str] = DEFAULT_COMPRESSION,
+                          level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+                          shuffle: bool = True,
+                          storage_dtype: Optional[str] = None,
+                          block_rows: int = COPY_BLOCK_ROWS) -> Dict[str, Any]:
+    """
+    Reescribe sequences.h5 con chunking por secuencia y los filtros elegidos
+
+    Los datasets se copian por bloques, por lo que la memoria usada no
+    depende del tamaño del archivo. Sin output_path se reemplaza el archivo
+    original de forma atómica.
+
+    Args:
+        source_path: Archivo a reempaquetar
+        output_path: Archivo de salida (por defecto, reemplazar el original)
+        compression, level, shuffle: Ver compression_kwargs
+        storage_dtype: Nuevo tipo para 'X' o 'frames' ('float32'/'float16'); por defecto el actual
+        block_rows: Filas copiadas por bloque
+
+    Returns:
+        Tamaños antes/después y layout resultante
+    """
+    in_place = output_path is None or os.path.abspath(output_path) == os.path.abspath(source_path)
+    if in_place:
+        fd, target_path = tempfile.mkstemp(suffix='.h5', dir=os.path.dirname(os.path.abspath(source_path)))
+        os.close(fd)
+    else:
+        target_path = output_path
+
+    size_before = os.path.getsize(source_path)
+    try:
+        with h5py.File(source_path, 'r') as src, \
+                h5py.File(target_path, 'w', **ragged_file_kwargs(source_path)) as dst:
+            for key, value in src.attrs.items():
+                dst.attrs[key] = value
+
+            for name, obj in src.items():
+                if not isinstance(obj, h5py.Dataset) or obj.ndim == 0:
+                    src.copy(obj, dst, name=name)
+                    continue
+
+                if name == 'X':
+                    dtype = resolve_storage_dtype(storage_dtype) if storage_dtype else obj.dtype
+                    kwargs = sequence_dataset_kwargs(obj.shape[1:], dtype, compression, level, shuffle)
+                elif name == 'frames':
+                    dtype = resolve_storage_dtype(storage_dtype) if storage_dtype else obj.dtype
+                    kwargs = frame_dataset_kwargs(obj.shape[1], dtype, compression, level, shuffle)
+                else:
+                    kwargs = row_dataset_kwargs(obj.shape[1:], obj.dtype, compression, level, shuffle)
+                out = dst.create_dataset(name, **kwargs)
+                out.resize(obj.shape[0], axis=0)
+                for key, value in obj.attrs.items():
+                    out.attrs[key] = value
+
+                for start in range(0, obj.shape[0], block_rows):
+                    stop = min(start + block_rows, obj.shape[0])
+                    out[start:stop] = obj[start:stop]
+
+        if in_place:
+            os.replace(target_path, source_path)
+            target_path = source_path
+    except Exception:
+        if in_place and os.path.exists(target_path):
+            os.remove(target_path)
+        raise
+
+    size_after = os.path.getsize(target_path)
+    return {
+        'path': target_path,
+        'size_before_mb': size_before / 1024**2,
+        'size_after_mb': size_after / 1024**2,
+        'ratio': size_before / max(size_after, 1),
+        'layout': describe_layout(target_path)
+    }
+
+
+def ensure_row_tables(hf: h5py.File, compression: Optional[str] = DEFAULT_COMPRESSION,
+                      level: Optional[int] = DEFAULT_COMPRESSION_LEVEL, shuffle: bool = True):
+    """
+    Crea las tablas por fila que falten, rellenando las filas existentes
+
+    En archivos anteriores sequence_id se reconstruye como el ordinal de la
+    fila dentro de su seña (1, 2, ...), que es como se numeraban.
+    """
+    num_rows = hf['y'].shape[0] if 'y' in hf else 0
+    for name, (dtype, default) in ROW_TABLES.items():
+        if name in hf:
+            continue
+        dataset = hf.create_dataset(name, **row_dataset_kwargs((), dtype, compression, level, shuffle))
+        dataset.resize(num_rows, axis=0)
+        if num_rows == 0:
+            continue
+        if name == 'sequence_id':
+            dataset[:] = per_label_ordinal(hf['y'][:])
+        else:
+            dataset[:] = default
+
+
+def per_label_ordinal(labels: np.ndarray) -> np.ndarray:
+    """Posición (desde 1) de cada fila entre las filas de su misma etiqueta"""
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    group_sizes = np.diff(np.r_[group_start, len(labels)])
+    ordinal_sorted = np.arange(len(labels)) - np.repeat(group_start, group_sizes) + 1
+    ordinal = np.empty(len(labels), dtype=np.int32)
+    ordinal[order] = ordinal_sorted
+    return ordinal
+
+
+def read_row_tables(hf: h5py.File) -> Dict[str, np.ndarray]:
+    """Lee y y las tablas por fila (con valores por defecto si faltan)"""
+    labels = hf['y'][:]
+    tables = {'y': labels}
+    for name, (dtype, default) in ROW_TABLES.items():
+        if name in hf:
+            tables[name] = hf[name][:]
+        elif name == 'sequence_id':
+            tables[name] = per_label_ordinal(labels)
+        else:
+            tables[name] = np.full(len(labels), default, dtype=dtype)
+    return tables
+
+
+def _like_dataset_kwargs(obj: h5py.Dataset) -> Dict[str, Any]:
+    """
+    Argumentos para crear un dataset vacío con el mismo layout que obj
+
+    Se copia la lista de propiedades de creación completa: la cadena de
+    filtros (incluidos los de hdf5plugin como lz4, con sus opciones), el
+    valor de relleno y fletcher32, no solo gzip/lzf.
+    """
+    return {'shape': (0,) + obj.shape[1:], 'maxshape': (None,) + obj.shape[1:],
+            'dtype': obj.dtype, 'chunks': obj.chunks or True, 'dcpl': obj.id.get_create_plist()}
+
+
+def compact_sequences_file(path: str,
+                           keep_mask: np.ndarray,
+                           label_remap: Optional[np.ndarray] = None,
+                           block_rows: int = COPY_BLOCK_ROWS) -> Dict[str, Any]:
+    """
+    Reescribe el archivo conservando solo las filas marcadas
+
+    Las filas supervivientes se copian bloque a bloque a un archivo temporal
+    con el mismo layout, y luego se reemplaza el original con os.replace: la
+    memoria usada para X es la de un bloque, sin importar el tamaño del
+    dataset, y el original queda intacto si algo falla. En el layout de
+    longitud variable también se compacta 'frames' y se recalculan los offsets.
+
+    Args:
+        path: Archivo sequences.h5
+        keep_mask: Booleano por fila; True = conservar
+        label_remap: Array índice viejo → índice nuevo aplicado a 'y'
+        block_rows: Filas por bloque de lectura
+
+    Returns:
+        Filas y tamaños antes/después
+    """
+    keep_mask = np.asarray(keep_mask, dtype=bool)
+    size_before = os.path.getsize(path)
+    fd, temp_path = tempfile.mkstemp(suffix='.h5', dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+
+    try:
+        with h5py.File(path, 'r') as src, h5py.File(temp_path, 'w', **ragged_file_kwargs(path)) as dst:
+            num_rows = src['y'].shape[0]
+            if len(keep_mask) != num_rows:
+                raise ValueError(f"La máscara tiene {len(keep_mask)} filas, el archivo {num_rows}")
+            for key, value in src.attrs.items():
+                dst.attrs[key] = value
+
+            ragged = is_ragged_layout(src)
+            for name, obj in src.items():
+                if ragged and name in ('frames', 'offset'):
+                    continue
+                row_aligned = isinstance(obj, h5py.Dataset) and obj.ndim > 0 and obj.shape[0] == num_rows
+                if not row_aligned:
+                    src.copy(obj, dst, name=name)
+                    continue
+
+                out = dst.create_dataset(name, **_like_dataset_kwargs(obj))
+                for key, value in obj.attrs.items():
+                    out.attrs[key] = value
+
+                written = 0
+                for start in range(0, num_rows, block_rows):
+                    block_mask = keep_mask[start:start + block_rows]
+                    count = int(block_mask.sum())
+                    if count == 0:
+                        continue
+                    rows = obj[start:start + block_rows][block_mask]
+                    if name == 'y' and label_remap is not None:
+                        rows = label_remap[rows].astype(obj.dtype)
+                    out.resize(written + count, axis=0)
+                    out[written:written + count] = rows
+                    written += count
+
+            if ragged:
+                _compact_frames(src, dst, keep_mask, block_rows)
+
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return {
+        'rows_before': int(len(keep_mask)),
+        'rows_after': int(keep_mask.sum()),
+        'size_before_mb': size_before / 1024**2,
+        'size_after_mb': os.path.getsize(path) / 1024**2
+    }
+
+
+def _compact_frames(src: h5py.File, dst: h5py.File, keep_mask: np.ndarray, block_rows: int):
+    """Copia los frames de las filas conservadas y escribe sus nuevos offsets"""
+    offsets = src['offset'][:]
+    lengths = src['length'][:].astype(np.int64)
+    frames = src['frames']
+    out = dst.create_dataset('frames', **_like_dataset_kwargs(frames))
+    for key, value in frames.attrs.items():
+        out.attrs[key] = value
+
+    new_offsets = []
+    written = 0
+    for start in range(0, len(keep_mask), block_rows):
+        rows = start + np.flatnonzero(keep_mask[start:start + block_rows])
+        if len(rows) == 0:
+            continue
+        # Una sola lectura por bloque de filas: el tramo de 'frames' que las cubre
+        first = int(offsets[rows].min())
+        span = frames[first:int((offsets[rows] + lengths[rows]).max())]
+        block = np.concatenate([span[offsets[row] - first:offsets[row] - first + lengths[row]]
+                                for row in rows])
+        new_offsets.append(written + np.concatenate([[0], np.cumsum(lengths[rows])[:-1]]))
+        out.resize(written + len(block), axis=0)
+        out[written:] = block
+        written += len(block)
+    new_offsets = np.concatenate(new_offsets) if new_offsets else np.zeros(0)
+
+    offset_out = dst.create_dataset('offset', **_like_dataset_kwargs(src['offset']))
+    offset_out.resize(len(new_offsets), axis=0)
+    offset_out[:] = new_offsets.astype(offsets.dtype)
+
+
+def _print_layout(path: str):
+    info = describe_layout(path)
+    print(f"📦 {path}: {info['file_size_mb']:.2f} MB")
+    for name, ds in info['datasets'].items():
+        print(f"   {name}: shape={ds['shape']} dtype={ds['dtype']} chunks={ds['chunks']} "
+              f"compression={ds['compression']} shuffle={ds['shuffle']} ({ds['stored_mb']:.2f} MB)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Herramientas del archivo sequences.h5")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help="Mostrar layout y tamaño")
+    info_parser.add_argument('path')
+
+    repack_parser = subparsers.add_parser('repack', help="Reempaquetar con chunking por secuencia")
+    repack_parser.add_argument('path')
+    repack_parser.add_argument('-o', '--output', default=None, help="Archivo de salida (por defecto reemplaza)")
+    repack_parser.add_argument('--compression', default=DEFAULT_COMPRESSION, choices=COMPRESSION_OPTIONS)
+    repack_parser.add_argument('--level', type=int, default=DEFAULT_COMPRESSION_LEVEL, help="Nivel de gzip")
+    repack_parser.add_argument('--no-shuffle', action='store_true', help="Desactivar el filtro shuffle")
+    repack_parser.add_argument('--dtype', default=None, choices=['float32', 'float16'],
+                               help="Tipo de almacenamiento de X")
+    repack_parser.add_argument('--backup', action='store_true', help="Copiar el original a .bak antes")
+
+    compact_parser = subparsers.add_parser('compact', help="Eliminar filas por criterio y compactar")
+    compact_parser.add_argument('data_dir', help="Carpeta de datos (con sequences.h5 y metadata/)")
+    compact_parser.add_argument('--min-quality', type=float, default=None,
+                                help="Eliminar filas con quality_score menor")
+    compact_parser.add_argument('--drop-augmented', action='store_true', help="Eliminar todas las augmentaciones")
+    compact_parser.add_argument('--drop-orphaned', action='store_true',
+                                help="Eliminar augmentaciones cuya secuencia original ya no existe")
+    compact_parser.add_argument('--drop-sign', action='append', default=None, help="Eliminar una seña (repetible)")
+    compact_parser.add_argument('--dry-run', action='store_true', help="Solo mostrar qué se eliminaría")
+
+    shards_parser = subparsers.add_parser('shards', help="Actualizar el manifiesto y la vista virtual de los shards")
+    shards_parser.add_argument('data_dir', help="Carpeta de datos principal")
+
+    merge_parser = subparsers.add_parser('merge', help="Integrar los shards en sequences.h5")
+    merge_parser.add_argument('data_dir', help="Carpeta de datos principal")
+    merge_parser.add_argument('--remove', action='store_true', help="Borrar los shards integrados")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ('shards', 'merge'):
+        try:
+            from . import sharded_storage
+        except ImportError:
+            from src.data_collection import sharded_storage
+
+        if args.command == 'merge':
+            summary = sharded_storage.merge_shards(args.data_dir, remove=args.remove)
+            print(f"✅ {summary['merged_rows']} secuencias integradas desde {len(summary['shards'])} shards")
+            return 0
+
+        manifest = sharded_storage.build_manifest(args.data_dir)
+        for shard in manifest['shards']:
+            print(f"   📦 {shard['session_id']}: {shard['rows']} secuencias ({shard['size_mb']:.2f} MB)")
+        if manifest['total_rows'] > 0:
+            view_dir = sharded_storage.build_virtual_view(args.data_dir, manifest)
+            print(f"✅ Vista virtual: {view_dir} ({manifest['total_rows']} secuencias, "
+                  f"{len(manifest['signs'])} señas)")
+        return 0
+
+    if args.command == 'info':
+        _print_layout(args.path)
+        return 0
+
+    if args.command == 'compact':
+        try:
+            from .data_manager import DataManager
+        except ImportError:
+            from src.data_collection.data_manager import DataManager
+
+        report = DataManager(data_dir=args.data_dir).compact_dataset(
+            min_quality=args.min_quality,
+            drop_augmented=args.drop_augmented,
+            drop_orphaned_augmented=args.drop_orphaned,
+            drop_signs=args.drop_sign,
+            dry_run=args.dry_run
+        )
+        print(f"{'🔍 Simulación' if args.dry_run else '✅ Compactado'}: "
+              f"{report['rows_before']} → {report['rows_after']} filas")
+        for sign, count in report['removed_by_sign'].items():
+            print(f"   🗑️ {sign}: {count}")
+        return 0
+
+    if args.backup:
+        shutil.copy2(args.path, args.path + '.bak')
+        print(f"💾 Copia de seguridad: {args.path}.bak")
+
+    print(f"🔧 Reempaquetando {args.path} (compresión={args.compression}, shuffle={not args.no_shuffle})")
+    result = repack_sequences_file(args.path, args.output, args.compression, args.level,
+                                   not args.no_shuffle, args.dtype)
+    print(f"✅ {result['size_before_mb']:.2f} MB → {result['size_after_mb']:.2f} MB "
+          f"(x{result['ratio']:.2f})")
+    _print_layout(result['path'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
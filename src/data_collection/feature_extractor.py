@@ -5,6 +5,11 @@ Maneja la extracción de características optimizadas para GRU
 import numpy as np
 from collections import deque
 
+try:
+    from ..utils.dtype_policy import FEATURE_DTYPE
+except ImportError:
+    from src.utils.dtype_policy import FEATURE_DTYPE
+
 
 class FeatureExtractor:
     """Extrae y procesa características optimizadas para GRU bidireccional"""
@@ -25,7 +30,7 @@ class FeatureExtractor:
         for lm in landmarks_list:
             hand_landmarks.extend([lm.x, lm.y, lm.z])
         
-        landmarks_array = np.array(hand_landmarks).reshape(-1, 3)
+        landmarks_array = np.array(hand_landmarks, dtype=FEATURE_DTYPE).reshape(-1, 3)
         
         # Si es mano izquierda, invertir en X para normalizar
         if handedness == 'Left':
@@ -40,9 +45,9 @@ class FeatureExtractor:
     def extract_advanced_landmarks(self, hand_results, pose_results):
         """Extrae landmarks optimizados para GRU bidireccional"""
         # Inicializar arrays optimizados para GRU
-        hand_data = np.zeros(126)  # 2 manos * 63 features cada una
-        pose_data = np.zeros(24)   # 8 puntos clave * 3 coordenadas
-        velocity_data = np.zeros(6)  # Velocidades base: 2 manos (2 valores) + 4 reserved
+        hand_data = np.zeros(126, dtype=FEATURE_DTYPE)  # 2 manos * 63 features cada una
+        pose_data = np.zeros(24, dtype=FEATURE_DTYPE)   # 8 puntos clave * 3 coordenadas
+        velocity_data = np.zeros(7, dtype=FEATURE_DTYPE)  # 2 manos (2 valores) + 4 reserved + pose
         hands_info = {'count': 0, 'handedness': [], 'confidence': []}
 
         # Procesar manos con normalización precisa y cálculo de velocidades
@@ -90,15 +95,15 @@ class FeatureExtractor:
                     extracted_pose_landmarks.extend([lm.x, lm.y, lm.z])
             
             if len(extracted_pose_landmarks) >= 24:  # 8 puntos * 3 coordenadas
-                pose_data = np.array(extracted_pose_landmarks[:24])
+                pose_data = np.array(extracted_pose_landmarks[:24], dtype=FEATURE_DTYPE)
                 
                 # Calcular velocidad de pose para información temporal
                 if self.prev_pose is not None:
                     pose_velocity = np.linalg.norm(pose_data - self.prev_pose)
                 self.prev_pose = pose_data
 
-        # Asegurar tamaño consistente añadiendo velocidad de pose a velocity_data
-        velocity_data = np.append(velocity_data, pose_velocity)
+        # Velocidad de pose en la última posición (np.append promovería a float64)
+        velocity_data[6] = pose_velocity
         
         # Combinar features optimizadas para GRU - tamaño fijo garantizado
         combined_features = np.concatenate([hand_data, pose_data, velocity_data])
@@ -114,7 +119,7 @@ class FeatureExtractor:
             # Asegurar tamaño correcto
             if len(combined_features) < expected_size:
                 # Rellenar con zeros
-                padded_features = np.zeros(expected_size)
+                padded_features = np.zeros(expected_size, dtype=FEATURE_DTYPE)
                 padded_features[:len(combined_features)] = combined_features
                 combined_features = padded_features
             else:
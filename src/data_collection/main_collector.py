@@ -3,11 +3,13 @@
 Main Data Collector - Modular Version
 Clase principal que coordina todos los módulos para la recolección de datos
 """
+import os
 import cv2
 import time
 import numpy as np
 import mediapipe as mp
 from collections import deque
+from datetime import datetime
 
 # Importaciones relativas corregidas
 try:
@@ -18,6 +20,8 @@ try:
     from .data_manager import DataManager
     from .sign_config import SignConfig
     from .data_augmentation import AugmentationIntegrator
+    from ..utils.profiler import StageProfiler
+    from ..utils.dtype_policy import FEATURE_DTYPE
 except ImportError:
     from src.data_collection.mediapipe_manager import MediaPipeManager
     from src.data_collection.feature_extractor import FeatureExtractor
@@ -26,6 +30,8 @@ except ImportError:
     from src.data_collection.data_manager import DataManager
     from src.data_collection.sign_config import SignConfig
     from src.data_collection.data_augmentation import AugmentationIntegrator
+    from src.utils.profiler import StageProfiler
+    from src.utils.dtype_policy import FEATURE_DTYPE
 
 class LSPDataCollector:
     """
@@ -33,10 +39,14 @@ class LSPDataCollector:
     Versión 2.4 - Flujo Manos Libres Corregido
     """
     
-    def __init__(self, sequence_length=60, num_sequences=50):
+    def __init__(self, sequence_length=60, num_sequences=50, enable_profiling=False, profile_dir='logs/profiles'):
         self.sequence_length = sequence_length
         self.num_sequences = num_sequences
-        self.mediapipe_manager = MediaPipeManager()
+        # Profiler por etapas: desactivado no añade costo apreciable al bucle
+        self.profiler = StageProfiler(enabled=enable_profiling)
+        self.profile_dir = profile_dir
+        self.show_profiler_overlay = enable_profiling
+        self.mediapipe_manager = MediaPipeManager(profiler=self.profiler)
         self.feature_extractor = FeatureExtractor()
         self.motion_analyzer = MotionAnalyzer()
         self.ui_manager = UIManager()
@@ -65,18 +75,24 @@ class LSPDataCollector:
         countdown = 3
         last_countdown_time = 0
 
+        profiler = self.profiler
         while cap.isOpened():
-            ret, frame = cap.read()
+            profiler.begin_frame()
+            with profiler.stage('camera_read'):
+                ret, frame = cap.read()
             if not ret: break
             
-            frame = cv2.flip(frame, 1)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            timestamp = int(time.time() * 1000)
+            with profiler.stage('preprocess'):
+                frame = cv2.flip(frame, 1)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                timestamp = int(time.time() * 1000)
             
-            self.mediapipe_manager.process_frame(mp_image, timestamp)
-            hand_results, pose_results = self.mediapipe_manager.get_current_results()
-            combined_data, hands_info = self.feature_extractor.extract_advanced_landmarks(hand_results, pose_results)
-            execution_issues = self.sign_config.validate_sign_execution(hands_info, sign_config)
+            with profiler.stage('mediapipe_submit'):
+                self.mediapipe_manager.process_frame(mp_image, timestamp)
+                hand_results, pose_results = self.mediapipe_manager.get_current_results()
+            with profiler.stage('feature_extraction'):
+                combined_data, hands_info = self.feature_extractor.extract_advanced_landmarks(hand_results, pose_results)
+                execution_issues = self.sign_config.validate_sign_execution(hands_info, sign_config)
 
             if hands_free:
                 if state == "waiting":
@@ -107,7 +123,7 @@ class LSPDataCollector:
                         # Ajustar al tamaño esperado
                         if len(combined_data) < expected_size:
                             # Rellenar con zeros
-                            padded_data = np.zeros(expected_size)
+                            padded_data = np.zeros(expected_size, dtype=FEATURE_DTYPE)
                             padded_data[:len(combined_data)] = combined_data
                             combined_data = padded_data
                         else:
@@ -119,28 +135,52 @@ class LSPDataCollector:
                     frame_count += 1
                     self.ui_manager.draw_progress_bar(frame, frame_count, self.sequence_length)
                     if frame_count >= self.sequence_length:
-                        cap.release()
-                        cv2.destroyAllWindows()
+                        profiler.end_frame()
+                        self._finish_capture(cap)
                         return sequence_buffer, hands_info_history, execution_issues
                 else:
                     print("⚠️ Warning: combined_data es None o no válido, saltando frame")
 
-            self.ui_manager.draw_landmarks_on_frame(frame, hand_results)
-            self.ui_manager.display_hud(frame, state=="collecting", hands_info, self.sequence_length)
-            if execution_issues: self.ui_manager.draw_execution_issues(frame, execution_issues)
+            with profiler.stage('drawing'):
+                self.ui_manager.draw_landmarks_on_frame(frame, hand_results)
+                self.ui_manager.display_hud(frame, state=="collecting", hands_info, self.sequence_length)
+                if execution_issues: self.ui_manager.draw_execution_issues(frame, execution_issues)
+                if profiler.enabled and self.show_profiler_overlay:
+                    self.ui_manager.draw_profiler_overlay(frame, profiler.get_stats(), profiler.get_fps())
 
-            cv2.imshow('Recolector de Datos LSP', frame)
-            key = cv2.waitKey(5) & 0xFF
+            with profiler.stage('display'):
+                cv2.imshow('Recolector de Datos LSP', frame)
+                key = cv2.waitKey(5) & 0xFF
+            profiler.end_frame()
             if key == ord('q'):
-                cap.release()
-                cv2.destroyAllWindows()
+                self._finish_capture(cap)
                 return None, None, "quit"
             if not hands_free and key == ord(' '): state = "collecting" if state != "collecting" else "waiting"
             if hands_free and key == ord('p'): state = 'paused' if state != 'paused' else 'waiting'
+            if key == ord('o'): self.show_profiler_overlay = not self.show_profiler_overlay
 
+        self._finish_capture(cap)
+        return None, None, None
+
+    def _finish_capture(self, cap):
+        """Libera la cámara y, si el profiler está activo, exporta el trace"""
         cap.release()
         cv2.destroyAllWindows()
-        return None, None, None
+        if self.profiler.enabled and self.profiler.frame_count > 0:
+            self.export_profile_trace()
+
+    def export_profile_trace(self, output_path=None):
+        """Exporta las etapas medidas a Chrome trace-event JSON (chrome://tracing)"""
+        if output_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(self.profile_dir, f"capture_trace_{timestamp}.json")
+        self.profiler.export_chrome_trace(output_path)
+        summary = self.profiler.summary()
+        print(f"⏱️ Profiler: {summary['frames']} frames, {summary['fps']:.1f} FPS -> {output_path}")
+        for stage, stats in summary['stages'].items():
+            print(f"   • {stage:<20} p50 {stats['p50']:6.2f} ms | p95 {stats['p95']:6.2f} ms")
+        self.profiler.reset()
+        return output_path
 
     def collect_single_sequence(self, sign, sequence_id, collection_mode="NORMAL"):
         sign_config = self.sign_config.get_sign_config(sign)
@@ -225,14 +265,14 @@ class LSPDataCollector:
                         normalized_buffer.append(item[:most_common_size])
                     elif hasattr(item, '__len__') and len(item) < most_common_size:
                         # Rellenar con zeros si es más corto
-                        padded_item = np.zeros(most_common_size)
+                        padded_item = np.zeros(most_common_size, dtype=FEATURE_DTYPE)
                         padded_item[:len(item)] = item
                         normalized_buffer.append(padded_item)
                 
                 sequence_buffer = normalized_buffer
                 print(f"✅ Buffer normalizado a tamaño: {most_common_size}")
             
-            sequence_data = np.array(sequence_buffer)
+            sequence_data = np.array(sequence_buffer, dtype=FEATURE_DTYPE)
             print(f"📊 Shape de sequence_data: {sequence_data.shape}")
             
         except Exception as e:
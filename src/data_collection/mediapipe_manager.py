@@ -5,6 +5,7 @@ Maneja la inicialización y configuración de los modelos de MediaPipe
 import cv2
 import mediapipe as mp
 import threading
+import time
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
@@ -12,12 +13,14 @@ from mediapipe.tasks.python import vision
 class MediaPipeManager:
     """Gestiona la configuración y inicialización de MediaPipe"""
     
-    def __init__(self):
+    def __init__(self, profiler=None):
         self.hand_landmarker = None
         self.pose_landmarker = None
         self.latest_hand_results = None
         self.latest_pose_results = None
         self.lock = threading.Lock()
+        # Profiler opcional: recibe la latencia asíncrona de cada landmarker
+        self.profiler = profiler
         
     def setup_mediapipe_tasks(self):
         """Inicializa los modelos de MediaPipe usando la API de Tareas."""
@@ -59,11 +62,19 @@ class MediaPipeManager:
         """Callback para procesar resultados de detección de manos"""
         with self.lock:
             self.latest_hand_results = result
+        self._record_latency('mediapipe_hands', timestamp_ms)
 
     def _process_pose_results(self, result, output_image, timestamp_ms: int):
         """Callback para procesar resultados de detección de pose"""
         with self.lock:
             self.latest_pose_results = result
+        self._record_latency('mediapipe_pose', timestamp_ms)
+
+    def _record_latency(self, stage, timestamp_ms):
+        """Registra la latencia desde el envío del frame hasta el callback"""
+        if self.profiler is not None and self.profiler.enabled:
+            latency_ms = time.time() * 1000 - timestamp_ms
+            self.profiler.record(stage, max(0.0, latency_ms), thread='mediapipe')
             
     def process_frame(self, mp_image, timestamp):
         """Procesa un frame con los landmarkers de MediaPipe."""
@@ -4,6 +4,12 @@ Calcula métricas de movimiento y evalúa la calidad de las secuencias
 """
 import numpy as np
 
+# Bloques de landmarks del vector de features (ver FeatureExtractor):
+# 2 manos x 21 puntos y 8 puntos de pose, cada uno (x, y, z)
+HAND_BLOCKS = (slice(0, 63), slice(63, 126))
+POSE_BLOCK = slice(126, 150)
+
+
 class MotionAnalyzer:
     """Analiza movimiento y calidad de secuencias para GRU."""
     
@@ -54,6 +60,28 @@ class MotionAnalyzer:
 
         return True, "¡Listo!"
 
+    def hands_present(self, frame):
+        """Indica si el frame de features tiene al menos una mano detectada."""
+        return any(np.any(frame[block] != 0) for block in HAND_BLOCKS)
+
+    def frame_motion_energy(self, prev_frame, frame):
+        """
+        Energía de movimiento entre dos frames de features: desplazamiento
+        medio por landmark de las manos y la pose presentes en ambos frames.
+
+        Los landmarks de mano son relativos a la muñeca (su canal de velocidad
+        queda en cero), así que la traslación de la mano se mide con la pose
+        (hombros, codos, muñecas) y la forma de la mano con sus landmarks.
+        """
+        displacements = []
+        for block in HAND_BLOCKS + (POSE_BLOCK,):
+            if np.any(prev_frame[block] != 0) and np.any(frame[block] != 0):
+                delta = (frame[block] - prev_frame[block]).reshape(-1, 3)
+                displacements.append(np.linalg.norm(delta, axis=1))
+        if not displacements:
+            return 0.0
+        return float(np.mean(np.concatenate(displacements)))
+
     def calculate_motion_features(self, sequence_data):
         """Calcula un conjunto de métricas de movimiento optimizadas para GRU."""
         if len(sequence_data) < 5:
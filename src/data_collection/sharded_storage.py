@@ -0,0 +1,557 @@
+"""
+Sharded Storage - Un archivo HDF5 por sesión de captura
+Varias estaciones pueden grabar a la vez (h5py admite un solo escritor por
+archivo): cada sesión escribe en data/shards/<sesión>/ con el mismo layout
+que la carpeta de datos principal. Un manifiesto ligero registra los shards,
+una vista virtual (HDF5 VDS) los presenta como un único dataset para el
+entrenamiento y merge_shards los integra en sequences.h5.
+
+Uso:
+    python -m src.data_collection.dataset_tools shards data
+    python -m src.data_collection.dataset_tools merge data --remove
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import h5py
+import numpy as np
+
+try:
+    from .dataset_tools import (COPY_BLOCK_ROWS, ROW_TABLES, read_row_tables, ensure_row_tables,
+                                is_ragged_layout, _like_dataset_kwargs)
+    from ..utils.dtype_policy import FEATURE_DTYPE
+except ImportError:
+    from src.data_collection.dataset_tools import (COPY_BLOCK_ROWS, ROW_TABLES, read_row_tables,
+                                                   ensure_row_tables, is_ragged_layout,
+                                                   _like_dataset_kwargs)
+    from src.utils.dtype_policy import FEATURE_DTYPE
+
+SHARDS_DIRNAME = 'shards'
+MANIFEST_NAME = 'manifest.json'
+VIEW_DIRNAME = '_view'
+
+
+def default_session_id() -> str:
+    """ID de sesión único por estación y arranque: <host>_<fecha>_<pid>"""
+    host = ''.join(c if c.isalnum() else '-' for c in socket.gethostname()) or 'station'
+    return f"{host}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+def shards_dir(data_dir: str) -> str:
+    return os.path.join(data_dir, SHARDS_DIRNAME)
+
+
+def shard_path(data_dir: str, session_id: str) -> str:
+    """Carpeta de datos de una sesión (sequences.h5 + metadata/)"""
+    return os.path.join(shards_dir(data_dir), session_id)
+
+
+def list_shards(data_dir: str) -> List[str]:
+    """Sesiones con archivo sequences.h5, en orden alfabético"""
+    root = shards_dir(data_dir)
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root)
+                  if not name.startswith('_')
+                  and os.path.exists(os.path.join(root, name, 'sequences.h5')))
+
+
+def _write_json_atomic(path: str, payload: Dict[str, Any]):
+    fd, temp_path = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(path))
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=4, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _load_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _shard_signs(session_dir: str) -> List[str]:
+    """Señas de un shard en el orden de sus índices locales"""
+    labels_map = _load_json(os.path.join(session_dir, 'metadata', 'labels_map.json')) or {}
+    index_to_sign = labels_map.get('index_to_sign', {})
+    return [index_to_sign[str(i)] for i in range(len(index_to_sign))]
+
+
+def build_manifest(data_dir: str) -> Dict[str, Any]:
+    """
+    Registra los shards existentes en data/shards/manifest.json
+
+    El orden de los shards ya registrados se conserva y los nuevos se añaden
+    al final, de modo que las filas de la vista virtual solo crecen por el
+    final. El mapeo global de señas parte de labels_map.json principal y
+    añade las señas nuevas en orden de aparición.
+
+    Returns:
+        Manifiesto con shards (filas, señas, conteos) y mapeo global de señas
+    """
+    manifest_path = os.path.join(shards_dir(data_dir), MANIFEST_NAME)
+    previous = _load_json(manifest_path) or {}
+    previous_order = [shard['session_id'] for shard in previous.get('shards', [])]
+
+    main_labels = _load_json(os.path.join(data_dir, 'metadata', 'labels_map.json')) or {}
+    signs = [main_labels['index_to_sign'][str(i)] for i in range(len(main_labels.get('index_to_sign', {})))]
+    for sign in previous.get('signs', []):
+        if sign not in signs:
+            signs.append(sign)
+
+    available = list_shards(data_dir)
+    order = [s for s in previous_order if s in available] + [s for s in available if s not in previous_order]
+
+    shards = []
+    offset = 0
+    for session_id in order:
+        session_dir = shard_path(data_dir, session_id)
+        file_path = os.path.join(session_dir, 'sequences.h5')
+        local_signs = _shard_signs(session_dir)
+        with h5py.File(file_path, 'r') as hf:
+            if 'X' not in hf or 'y' not in hf:
+                continue
+            rows = int(hf['y'].shape[0])
+            frame_shape = list(hf['X'].shape[1:])
+            dtype = str(hf['X'].dtype)
+            counts = np.bincount(hf['y'][:], minlength=len(local_signs)) if rows else np.zeros(len(local_signs))
+
+        for sign in local_signs:
+            if sign not in signs:
+                signs.append(sign)
+
+        shards.append({
+            'session_id': session_id,
+            'path': os.path.relpath(file_path, shards_dir(data_dir)),
+            'rows': rows,
+            'offset': offset,
+            'frame_shape': frame_shape,
+            'dtype': dtype,
+            'signs': local_signs,
+            'counts': {sign: int(counts[i]) for i, sign in enumerate(local_signs) if counts[i] > 0},
+            'size_mb': os.path.getsize(file_path) / 1024**2,
+            'modified': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
+        })
+        offset += rows
+
+    manifest = {
+        'version': '2.1.0',
+        'updated': datetime.now().isoformat(),
+        'total_rows': offset,
+        'signs': signs,
+        'shards': shards
+    }
+    os.makedirs(shards_dir(data_dir), exist_ok=True)
+    _write_json_atomic(manifest_path, manifest)
+    return manifest
+
+
+def _global_labels(shard: Dict[str, Any], signs: List[str]) -> np.ndarray:
+    """Remapeo índice local del shard → índice global del manifiesto"""
+    lookup = {sign: i for i, sign in enumerate(signs)}
+    return np.array([lookup[sign] for sign in shard['signs']], dtype=np.int32)
+
+
+def build_virtual_view(data_dir: str, manifest: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Crea una carpeta de datos virtual sobre todos los shards
+
+    'X' es un dataset virtual (VDS) que referencia los shards sin copiarlos;
+    'y' y las tablas por fila (pequeñas) se materializan con las etiquetas ya
+    remapeadas al índice global. La carpeta incluye metadata/labels_map.json,
+    así que HDF5DataLoader(data_path=vista) funciona sin cambios, también en
+    modo streaming.
+
+    Args:
+        data_dir: Carpeta de datos principal
+        manifest: Manifiesto ya construido (por defecto se reconstruye)
+
+    Returns:
+        Ruta de la carpeta de la vista
+    """
+    manifest = manifest or build_manifest(data_dir)
+    shards = [shard for shard in manifest['shards'] if shard['rows'] > 0]
+    if not shards:
+        raise ValueError(f"No hay shards con datos en {shards_dir(data_dir)}")
+
+    frame_shape = tuple(shards[0]['frame_shape'])
+    if any(tuple(shard['frame_shape']) != frame_shape for shard in shards):
+        raise ValueError("Los shards tienen formas de secuencia distintas")
+
+    view_dir = os.path.join(shards_dir(data_dir), VIEW_DIRNAME)
+    metadata_dir = os.path.join(view_dir, 'metadata')
+    os.makedirs(metadata_dir, exist_ok=True)
+    view_file = os.path.join(view_dir, 'sequences.h5')
+
+    # Si un shard que no es el último cambió de tamaño, las filas se desplazan
+    previous_rows = None
+    if os.path.exists(view_file):
+        with h5py.File(view_file, 'r') as hf:
+            previous_rows = json.loads(hf.attrs.get('shard_rows', '{}'))
+    for shard in shards[:-1]:
+        if previous_rows is not None and previous_rows.get(shard['session_id'], shard['rows']) != shard['rows']:
+            split_file = os.path.join(metadata_dir, 'split_indices.npz')
+            if os.path.exists(split_file):
+                os.remove(split_file)
+            break
+
+    total_rows = sum(shard['rows'] for shard in shards)
+    layout = h5py.VirtualLayout(shape=(total_rows,) + frame_shape, dtype=np.dtype(shards[0]['dtype']))
+    tables = {name: [] for name in ('y',) + tuple(ROW_TABLES)}
+    start = 0
+    for shard in shards:
+        source_file = os.path.join(shards_dir(data_dir), shard['path'])
+        # Ruta relativa a la vista: HDF5 la resuelve desde la carpeta del archivo virtual
+        relative = os.path.relpath(source_file, view_dir)
+        layout[start:start + shard['rows']] = h5py.VirtualSource(relative, 'X', shape=(shard['rows'],) + frame_shape)
+        start += shard['rows']
+
+        with h5py.File(source_file, 'r') as hf:
+            shard_tables = read_row_tables(hf)
+        shard_tables = {name: values[:shard['rows']] for name, values in shard_tables.items()}
+        shard_tables['y'] = _global_labels(shard, manifest['signs'])[shard_tables['y']]
+        for name in tables:
+            tables[name].append(shard_tables[name])
+
+    fd, temp_path = tempfile.mkstemp(suffix='.h5', dir=view_dir)
+    os.close(fd)
+    with h5py.File(temp_path, 'w') as hf:
+        hf.create_virtual_dataset('X', layout)
+        for name, parts in tables.items():
+            hf.create_dataset(name, data=np.concatenate(parts), maxshape=(None,))
+        hf.attrs['shard_rows'] = json.dumps({shard['session_id']: shard['rows'] for shard in shards})
+        hf.attrs['version'] = manifest['version']
+    os.replace(temp_path, view_file)
+
+    signs = manifest['signs']
+    counts = np.bincount(np.concatenate(tables['y']), minlength=len(signs))
+    _write_json_atomic(os.path.join(metadata_dir, 'labels_map.json'), {
+        'sign_to_index': {sign: i for i, sign in enumerate(signs)},
+        'index_to_sign': {str(i): sign for i, sign in enumerate(signs)},
+        'num_classes': len(signs),
+        'version': manifest['version'],
+        'created': manifest['updated']
+    })
+    _write_json_atomic(os.path.join(metadata_dir, 'dataset_info.json'), {
+        'version': manifest['version'],
+        'created': manifest['updated'],
+        'total_sequences': int(total_rows),
+        'signs': {sign: {'count': int(counts[i]), 'last_updated': manifest['updated']}
+                  for i, sign in enumerate(signs) if counts[i] > 0},
+        'format': 'hdf5-virtual'
+    })
+    return view_dir
+
+
+def _read_shard_rows(file_path: str, rows: np.ndarray) -> np.ndarray:
+    """Lee filas de un shard (se ejecuta en un proceso del pool)"""
+    try:
+        from ..training.streaming_dataset import read_rows
+    except ImportError:
+        from src.training.streaming_dataset import read_rows
+    with h5py.File(file_path, 'r') as hf:
+        return read_rows(hf['X'], rows)
+
+
+class ShardedDatasetReader:
+    """
+    Lector de todos los shards como un único dataset (según el manifiesto)
+
+    Las lecturas se reparten por shard entre procesos: cada proceso abre y
+    descomprime su propio archivo, sin competir por el lock global de h5py.
+    """
+
+    def __init__(self, data_dir: str, manifest: Optional[Dict[str, Any]] = None):
+        self.data_dir = data_dir
+        self.manifest = manifest or build_manifest(data_dir)
+        self.shards = [shard for shard in self.manifest['shards'] if shard['rows'] > 0]
+        self.signs = self.manifest['signs']
+        self.offsets = np.array([shard['offset'] for shard in self.shards] + [self.manifest['total_rows']],
+                                dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self.manifest['total_rows'])
+
+    def _file(self, shard: Dict[str, Any]) -> str:
+        return os.path.join(shards_dir(self.data_dir), shard['path'])
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Etiquetas globales de todas las filas, en orden"""
+        parts = []
+        for shard in self.shards:
+            with h5py.File(self._file(shard), 'r') as hf:
+                local = hf['y'][:shard['rows']]
+            parts.append(_global_labels(shard, self.signs)[local])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+    def read(self, indices: Optional[np.ndarray] = None, max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Lee filas globales (por defecto todas) repartiendo la lectura por shard
+
+        Args:
+            indices: Índices globales de fila ordenados ascendentemente
+            max_workers: Procesos de lectura (None = uno por shard, hasta os.cpu_count();
+                         1 = lectura secuencial en el proceso actual)
+
+        Returns:
+            Array float32 con las filas en el orden de `indices`
+        """
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.int64)
+        shard_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        jobs = [(shard_id, np.flatnonzero(shard_ids == shard_id)) for shard_id in np.unique(shard_ids)]
+
+        frame_shape = tuple(self.shards[0]['frame_shape']) if self.shards else ()
+        out = np.empty((len(indices),) + frame_shape, dtype=FEATURE_DTYPE)
+        args = [(self._file(self.shards[shard_id]), indices[positions] - self.offsets[shard_id])
+                for shard_id, positions in jobs]
+
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            results = [_read_shard_rows(*job) for job in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_read_shard_rows, *zip(*args)))
+
+        for (_, positions), rows in zip(jobs, results):
+            out[positions] = rows
+        return out
+
+
+def merge_shards(data_dir: str, remove: bool = False, block_rows: int = COPY_BLOCK_ROWS) -> Dict[str, Any]:
+    """
+    Integra todos los shards en el sequences.h5 principal
+
+    Las filas se copian por bloques; las etiquetas se remapean al
+    labels_map.json principal y los sequence_id se renumeran por seña para
+    no chocar con los existentes (el source_id de las augmentaciones apunta
+    al nuevo ID de la original).
+
+    Es idempotente: sequences.h5 guarda cuántas filas de cada sesión ya
+    integró y al repetir solo se añaden las grabadas después. Las filas se
+    añaden en el propio archivo (sin copiarlo) y un shard que falla a medias
+    se deshace.
+
+    Args:
+        data_dir: Carpeta de datos principal
+        remove: Borrar los shards ya integrados
+        block_rows: Filas por bloque de copia
+
+    Returns:
+        Resumen con filas integradas por shard
+    """
+    try:
+        from .data_manager import DataManager
+    except ImportError:
+        from src.data_collection.data_manager import DataManager
+
+    manager = DataManager(data_dir=data_dir)
+    manifest = build_manifest(data_dir)
+    summary = {'merged_rows': 0, 'shards': {}}
+
+    pending = []
+    merged = {}
+    if os.path.exists(manager.dataset_file):
+        with h5py.File(manager.dataset_file, 'r') as hf:
+            merged = json.loads(hf.attrs.get('merged_shards', '{}'))
+    for shard in manifest['shards']:
+        done = merged.get(shard['session_id'], 0)
+        summary['shards'][shard['session_id']] = max(shard['rows'] - done, 0)
+        if shard['rows'] > done:
+            pending.append((shard, done))
+
+    if pending:
+        # merged_shards registra lo integrado y merge_pending marca el shard en
+        # curso para deshacer una integración interrumpida
+        with h5py.File(manager.dataset_file, 'a') as dst:
+            _rollback_pending_merge(dst)
+            for shard, done in pending:
+                summary['merged_rows'] += _merge_shard(manager, dst, shard, done, block_rows)
+
+    if remove:
+        for session_id in summary['shards']:
+            shutil.rmtree(shard_path(data_dir, session_id))
+    if summary['merged_rows']:
+        _rebuild_dataset_info(manager)
+    view_dir = os.path.join(shards_dir(data_dir), VIEW_DIRNAME)
+    if remove and os.path.isdir(view_dir):
+        # La vista referencia shards que ya no existen
+        shutil.rmtree(view_dir)
+    build_manifest(data_dir)
+    return summary
+
+
+def _merge_shard(manager, dst: h5py.File, shard: Dict[str, Any], done: int, block_rows: int) -> int:
+    """
+    Añade a dst las filas done: de un shard y confirma su progreso
+
+    labels_map.json y los JSON de metadatos se escriben solo después de
+    confirmar las filas: si la copia falla, el archivo vuelve a su tamaño
+    anterior y el mapeo de señas no cambia.
+
+    Returns:
+        Filas integradas
+    """
+    session_dir = shard_path(manager.data_dir, shard['session_id'])
+    # Índices globales sin persistir: las señas nuevas van tras las existentes, en orden
+    known = manager.labels_map['sign_to_index']
+    new_signs = [sign for sign in shard['signs'] if sign not in known]
+    label_remap = np.array([known[sign] if sign in known
+                            else manager.labels_map['num_classes'] + new_signs.index(sign)
+                            for sign in shard['signs']], dtype=np.int32)
+
+    dst.attrs['merge_pending'] = json.dumps({
+        'session_id': shard['session_id'],
+        'rows': int(dst['y'].shape[0]) if 'y' in dst else 0,
+        'frames': int(dst['frames'].shape[0]) if 'frames' in dst else 0
+    })
+    dst.flush()
+    try:
+        with h5py.File(os.path.join(session_dir, 'sequences.h5'), 'r') as src:
+            # Solo las filas grabadas desde la última integración
+            tables = {name: values[done:shard['rows']] for name, values in read_row_tables(src).items()}
+            new_tables = _append_shard_rows(manager, src, dst, tables, label_remap, done, block_rows)
+        merged = json.loads(dst.attrs.get('merged_shards', '{}'))
+        merged[shard['session_id']] = shard['rows']
+        dst.attrs['merged_shards'] = json.dumps(merged)
+        del dst.attrs['merge_pending']
+        dst.flush()
+    except BaseException:
+        _rollback_pending_merge(dst)
+        raise
+
+    for sign in shard['signs']:
+        manager.add_sign_to_labels(sign)
+    # Los JSON van con el ID nuevo: si se repite la integración se sobrescriben igual
+    _copy_shard_metadata(manager, session_dir, shard['signs'], tables, new_tables)
+    return shard['rows'] - done
+
+
+def _rollback_pending_merge(dst: h5py.File):
+    """Devuelve los datasets al tamaño previo a una integración que no se confirmó"""
+    if 'merge_pending' not in dst.attrs:
+        return
+    state = json.loads(dst.attrs['merge_pending'])
+    for name, dataset in dst.items():
+        if isinstance(dataset, h5py.Dataset) and dataset.maxshape and dataset.maxshape[0] is None:
+            size = state['frames'] if name == 'frames' else state['rows']
+            if dataset.shape[0] > size:
+                dataset.resize(size, axis=0)
+    del dst.attrs['merge_pending']
+    dst.flush()
+    print(f"⚠️ Integración incompleta de {state['session_id']} deshecha")
+
+
+def _append_shard_rows(manager, src: h5py.File, dst: h5py.File, tables: Dict[str, np.ndarray],
+                       label_remap: np.ndarray, first_row: int, block_rows: int) -> Dict[str, np.ndarray]:
+    """
+    Añade las filas first_row: del shard al final de dst; devuelve sus tablas renumeradas
+
+    Si el archivo principal usa el layout de longitud variable, cada fila se
+    añade a 'frames' con su offset y su longitud fija.
+    """
+    ragged = is_ragged_layout(dst)
+    if ragged and dst['frames'].shape[1:] != src['X'].shape[2:]:
+        raise ValueError(f"Los frames del shard ({src['X'].shape[2:]}) no coinciden con los de "
+                         f"sequences.h5 ({dst['frames'].shape[1:]})")
+    if not ragged and 'X' not in dst:
+        dst.create_dataset('X', **_like_dataset_kwargs(src['X']))
+        dst.create_dataset('y', **_like_dataset_kwargs(src['y']))
+    ensure_row_tables(dst, manager.compression, manager.compression_level, manager.shuffle)
+
+    new_tables = _renumber_sequences(read_row_tables(dst), tables, label_remap)
+    num_rows = len(tables['y'])
+    start = dst['y'].shape[0]
+    if ragged:
+        sequence_length = src['X'].shape[1]
+        frame_start = dst['frames'].shape[0]
+        new_tables['offset'] = frame_start + np.arange(num_rows, dtype=np.int64) * sequence_length
+        new_tables['length'] = np.full(num_rows, sequence_length, dtype=np.int32)
+        dst['frames'].resize(frame_start + num_rows * sequence_length, axis=0)
+    else:
+        dst['X'].resize(start + num_rows, axis=0)
+    # Todos los datasets crecen a la vez para que los datos y las tablas tengan siempre las mismas filas
+    for name, values in new_tables.items():
+        dst[name].resize(start + num_rows, axis=0)
+        dst[name][start:] = values
+    for block_start in range(0, num_rows, block_rows):
+        block = src['X'][first_row + block_start:first_row + min(block_start + block_rows, num_rows)]
+        if ragged:
+            begin = frame_start + block_start * sequence_length
+            dst['frames'][begin:begin + block.shape[0] * sequence_length] = block.reshape(-1, block.shape[2])
+        else:
+            dst['X'][start + block_start:start + block_start + len(block)] = block
+    new_tables.pop('offset', None)
+    new_tables.pop('length', None)
+    return new_tables
+
+
+def _renumber_sequences(existing: Dict[str, np.ndarray], tables: Dict[str, np.ndarray],
+                        label_remap: np.ndarray) -> Dict[str, np.ndarray]:
+    """Tablas por fila del shard con etiquetas globales y sequence_id sin colisiones"""
+    new_tables = dict(tables)
+    new_tables['y'] = label_remap[tables['y']]
+    new_ids = np.empty(len(tables['y']), dtype=np.int32)
+
+    # Un único contador por seña, como DataManager.get_next_sequence_id
+    next_id = {}
+    for label, sequence_id in zip(existing['y'].tolist(), existing['sequence_id'].tolist()):
+        next_id[label] = max(next_id.get(label, 0), sequence_id)
+
+    id_map = {}
+    # Primero las originales, para poder remapear el source_id de las augmentaciones
+    for augmented_pass in (False, True):
+        for row in np.flatnonzero(tables['augmented'].astype(bool) == augmented_pass):
+            label = int(new_tables['y'][row])
+            next_id[label] = next_id.get(label, 0) + 1
+            new_ids[row] = next_id[label]
+            if not augmented_pass:
+                id_map[(int(tables['y'][row]), int(tables['sequence_id'][row]))] = next_id[label]
+
+    new_tables['sequence_id'] = new_ids
+    new_tables['source_id'] = np.array([id_map.get((int(label), int(source)), -1) if source >= 0 else -1
+                                        for label, source in zip(tables['y'], tables['source_id'])],
+                                       dtype=np.int32)
+    return new_tables
+
+
+def _copy_shard_metadata(manager, session_dir: str, signs: List[str],
+                         tables: Dict[str, np.ndarray], new_tables: Dict[str, np.ndarray]):
+    """Copia los JSON de metadatos del shard con el nuevo sequence_id"""
+    for label, old_id, new_id, new_source in zip(tables['y'].tolist(), tables['sequence_id'].tolist(),
+                                                 new_tables['sequence_id'].tolist(),
+                                                 new_tables['source_id'].tolist()):
+        sign = signs[label]
+        metadata = _load_json(os.path.join(session_dir, 'metadata', f"{sign}_{old_id}_metadata.json"))
+        if metadata is None:
+            continue
+        if 'sequence_id' in metadata:
+            metadata['sequence_id'] = new_id
+        if new_source >= 0 and isinstance(metadata.get('augmentation'), dict):
+            metadata['augmentation']['original_sequence_id'] = new_source
+        with open(os.path.join(manager.metadata_dir, f"{sign}_{new_id}_metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=4, ensure_ascii=False)
+
+
+def _rebuild_dataset_info(manager):
+    """Recalcula los conteos de dataset_info.json desde el archivo principal"""
+    with h5py.File(manager.dataset_file, 'r') as hf:
+        counts = np.bincount(hf['y'][:], minlength=manager.labels_map['num_classes'])
+    dataset_info = manager._load_dataset_info()
+    now = datetime.now().isoformat()
+    dataset_info['signs'] = {manager.labels_map['index_to_sign'][str(i)]: {'count': int(count), 'last_updated': now}
+                             for i, count in enumerate(counts) if count > 0}
+    dataset_info['total_sequences'] = int(counts.sum())
+    dataset_info['last_updated'] = now
+    with open(manager.dataset_info_file, 'w', encoding='utf-8') as f:
+        json.dump(dataset_info, f, indent=4, ensure_ascii=False)
@@ -67,6 +67,21 @@ class UIManager:
         for i, issue in enumerate(issues[:3]):
             cv2.putText(frame, f"ADVERTENCIA: {issue}", (10, frame.shape[0] - 60 + i*20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 165, 255), 1, cv2.LINE_AA)
 
+    def draw_profiler_overlay(self, frame, stage_stats, fps):
+        """Dibuja p50/p95 (ms) por etapa del profiler en la esquina superior derecha"""
+        if not stage_stats: return
+        lines = [f"FPS: {fps:.1f}  (p50/p95 ms)"]
+        lines += [f"{name}: {s['p50']:.1f}/{s['p95']:.1f}" for name, s in stage_stats.items()]
+        h, w, _ = frame.shape
+        box_w, line_h = 250, 18
+        x0, y0 = max(0, w - box_w - 10), 10
+        y1 = min(h, y0 + line_h * len(lines) + 8)
+        roi = frame[y0:y1, x0:x0 + box_w]
+        roi[:] = (roi * 0.35).astype(roi.dtype)
+        for i, line in enumerate(lines):
+            color = (0, 255, 255) if i == 0 else (255, 255, 255)
+            cv2.putText(frame, line, (x0 + 6, y0 + 16 + i * line_h), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1, cv2.LINE_AA)
+
     def show_menu(self, signs_to_collect, data_manager, sign_config):
         print("\n" + "="*80)
         print("🚀 RECOLECTOR DE DATOS LSP - V2.4")
@@ -0,0 +1,219 @@
+"""
+Wire Format - Formato binario compacto de features por frame
+Los clientes ligeros extraen los landmarks localmente (FeatureExtractor) y
+envían al servidor de inferencia ~300 bytes por frame en lugar de imágenes
+JPEG. Cada mensaje es de tamaño fijo: cabecera de 10 bytes con número de
+secuencia + valores float16.
+
+Layouts:
+    'features'  : vector completo de 157 features            (324 bytes)
+    'landmarks' : 2 manos x 21 x 3 + pose 8 x 3 = 150 valores (310 bytes);
+                  los 7 canales de velocidad se reconstruyen al decodificar
+                  igual que FeatureExtractor (a partir del frame anterior)
+
+Cabecera (little-endian): magic b'LW', versión u8, flags u8 (bits 0-1:
+layout, bit 2: features normalizadas), secuencia u32, número de valores u16.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    from ..utils.dtype_policy import FEATURE_DTYPE
+except ImportError:
+    from src.utils.dtype_policy import FEATURE_DTYPE
+
+
+WIRE_MAGIC = b'LW'
+WIRE_VERSION = 1
+WIRE_LAYOUTS = {'features': 0, 'landmarks': 1}
+WIRE_LAYOUT_SIZES = {'features': 157, 'landmarks': 150}
+FLAG_NORMALIZED = 0x04
+LAYOUT_MASK = 0x03
+HEADER_SIZE = 10
+SEQUENCE_MODULO = 2 ** 32
+
+# Canales de velocidad de FeatureExtractor: (columna, bloque que indica
+# presencia, valores cuyo desplazamiento se mide). Mano derecha y mano
+# izquierda usan la muñeca; la pose, sus 8 puntos
+VELOCITY_SOURCES = (
+    (0, slice(0, 63), slice(0, 3)),
+    (3, slice(63, 126), slice(63, 66)),
+    (6, slice(126, 150), slice(126, 150)),
+)
+POSE_COLUMN = 6
+NUM_VELOCITY_FEATURES = 7
+
+
+def message_dtype(layout: str) -> np.dtype:
+    """dtype estructurado de un mensaje (permite codificar/decodificar N frames sin bucles)"""
+    return np.dtype([('magic', 'S2'), ('version', 'u1'), ('flags', 'u1'), ('sequence', '<u4'),
+                     ('count', '<u2'), ('values', '<f2', (WIRE_LAYOUT_SIZES[layout],))])
+
+
+def message_size(layout: str) -> int:
+    """Bytes por frame de un layout"""
+    return message_dtype(layout).itemsize
+
+
+class FrameEncoder:
+    """
+    Codifica frames de features en mensajes binarios numerados
+
+    El número de secuencia avanza con cada frame codificado, de modo que el
+    receptor puede detectar frames perdidos.
+    """
+
+    def __init__(self, layout: str = 'features', normalized: bool = True, start_sequence: int = 0):
+        """
+        Args:
+            layout: 'features' (157 valores) o 'landmarks' (150, sin velocidades)
+            normalized: Si las features vienen de un FeatureExtractor con
+                feature_normalization=True (el decodificador lo necesita para
+                reconstruir las velocidades)
+            start_sequence: Número de secuencia del primer frame
+        """
+        if layout not in WIRE_LAYOUTS:
+            raise ValueError(f"Layout desconocido: {layout}. Opciones: {', '.join(WIRE_LAYOUTS)}")
+        self.layout = layout
+        self.normalized = normalized
+        self.sequence = start_sequence % SEQUENCE_MODULO
+        self.dtype = message_dtype(layout)
+        self.flags = WIRE_LAYOUTS[layout] | (FLAG_NORMALIZED if normalized else 0)
+
+    def encode(self, features: np.ndarray) -> bytes:
+        """Codifica un frame (157,)"""
+        return self.encode_frames(np.asarray(features)[np.newaxis])
+
+    def encode_frames(self, frames: np.ndarray) -> bytes:
+        """
+        Codifica varios frames consecutivos
+
+        Args:
+            frames: Array (N, 157) de features
+
+        Returns:
+            N mensajes concatenados
+        """
+        frames = np.asarray(frames)
+        if frames.ndim != 2 or frames.shape[1] != WIRE_LAYOUT_SIZES['features']:
+            raise ValueError(f"Se esperaban frames (N, {WIRE_LAYOUT_SIZES['features']}); recibido {frames.shape}")
+        count = WIRE_LAYOUT_SIZES[self.layout]
+
+        messages = np.empty(len(frames), dtype=self.dtype)
+        messages['magic'] = WIRE_MAGIC
+        messages['version'] = WIRE_VERSION
+        messages['flags'] = self.flags
+        messages['sequence'] = (self.sequence + np.arange(len(frames), dtype=np.int64)) % SEQUENCE_MODULO
+        messages['count'] = count
+        messages['values'] = frames[:, :count]
+        self.sequence = (self.sequence + len(frames)) % SEQUENCE_MODULO
+        return messages.tobytes()
+
+
+class FrameDecoder:
+    """
+    Decodifica mensajes de un mismo flujo
+
+    Conserva el último frame con cada mano / pose para reconstruir las
+    velocidades del layout 'landmarks' entre llamadas, y cuenta los frames
+    perdidos según los huecos en la numeración.
+    """
+
+    def __init__(self):
+        self.last_sequence = None
+        self.dropped_frames = 0
+        self._last_points: Dict[int, np.ndarray] = {}
+
+    def decode(self, message: bytes) -> Tuple[int, np.ndarray]:
+        """Decodifica un mensaje → (número de secuencia, features (157,))"""
+        sequences, frames = self.decode_frames(message)
+        return int(sequences[0]), frames[0]
+
+    def decode_frames(self, buffer: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decodifica mensajes concatenados (todos del mismo layout)
+
+        Args:
+            buffer: Bytes recibidos
+
+        Returns:
+            (números de secuencia (N,), features float32 (N, 157))
+        """
+        if len(buffer) < HEADER_SIZE or buffer[:2] != WIRE_MAGIC:
+            raise ValueError("Mensaje inválido: cabecera ausente o magic incorrecto")
+        layout_id = buffer[3] & LAYOUT_MASK
+        layout = next((name for name, value in WIRE_LAYOUTS.items() if value == layout_id), None)
+        if layout is None:
+            raise ValueError(f"Layout desconocido en la cabecera: {layout_id}")
+        dtype = message_dtype(layout)
+        if len(buffer) % dtype.itemsize:
+            raise ValueError(f"Tamaño {len(buffer)} no es múltiplo del mensaje '{layout}' ({dtype.itemsize} bytes)")
+
+        messages = np.frombuffer(buffer, dtype=dtype)
+        if (np.any(messages['magic'] != WIRE_MAGIC) or np.any(messages['version'] != WIRE_VERSION)
+                or np.any(messages['flags'] != buffer[3])
+                or np.any(messages['count'] != WIRE_LAYOUT_SIZES[layout])):
+            raise ValueError("Mensajes inconsistentes: magic, versión, flags o tamaño distintos")
+
+        sequences = messages['sequence']
+        self._track_sequences(sequences)
+        values = messages['values'].astype(FEATURE_DTYPE)
+        if layout == 'features':
+            return sequences, values
+        velocities = self._rebuild_velocities(values, bool(buffer[3] & FLAG_NORMALIZED))
+        return sequences, np.concatenate([values, velocities], axis=1)
+
+    def _track_sequences(self, sequences: np.ndarray):
+        """Acumula los frames perdidos (huecos en la numeración, con vuelta a cero)"""
+        previous = np.concatenate([[self.last_sequence], sequences[:-1]]) if self.last_sequence is not None \
+            else sequences[:-1]
+        current = sequences if self.last_sequence is not None else sequences[1:]
+        gaps = (current.astype(np.int64) - previous.astype(np.int64) - 1) % SEQUENCE_MODULO
+        self.dropped_frames += int(gaps[gaps < SEQUENCE_MODULO // 2].sum())
+        self.last_sequence = int(sequences[-1])
+
+    def _rebuild_velocities(self, blocks: np.ndarray, normalized: bool) -> np.ndarray:
+        """
+        Canales de velocidad de FeatureExtractor.extract_advanced_landmarks:
+        desplazamiento respecto al último frame en que estaba presente la
+        misma mano / la pose (normalizados por su máximo si normalized)
+        """
+        velocities = np.zeros((len(blocks), NUM_VELOCITY_FEATURES), dtype=FEATURE_DTYPE)
+        for column, presence, values in VELOCITY_SOURCES:
+            present = np.any(blocks[:, presence] != 0, axis=1)
+            points = blocks[:, values]
+            if column == POSE_COLUMN and normalized:
+                # La normalización de la pose es (p - 0.5) * 2; la velocidad se mide sin ella
+                points = np.where(present[:, np.newaxis], points / 2 + 0.5, 0.0)
+
+            # Se antepone el último punto visto en la llamada anterior
+            previous = self._last_points.get(column)
+            offset = 0 if previous is None else 1
+            if previous is not None:
+                points = np.vstack([previous[np.newaxis], points])
+                present = np.concatenate([[True], present])
+
+            positions = np.where(present, np.arange(len(present)), -1)
+            last_seen = np.maximum.accumulate(positions)
+            prior = np.concatenate([[-1], last_seen[:-1]])
+            valid = present & (prior >= 0)
+            speeds = np.zeros(len(present), dtype=FEATURE_DTYPE)
+            speeds[valid] = np.linalg.norm(points[valid] - points[prior[valid]], axis=1)
+            velocities[:, column] = speeds[offset:]
+            if last_seen[-1] >= 0:
+                self._last_points[column] = points[last_seen[-1]]
+
+        if normalized:
+            peak = velocities.max(axis=1, keepdims=True)
+            velocities = np.where(peak > 0, np.clip(velocities / np.where(peak > 0, peak, 1), 0, 1), velocities)
+        return velocities.astype(FEATURE_DTYPE)
+
+
+def decode_window(buffer: bytes) -> np.ndarray:
+    """Decodifica una ventana completa con un decodificador nuevo → features (N, 157)"""
+    return FrameDecoder().decode_frames(buffer)[1]
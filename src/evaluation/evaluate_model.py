@@ -8,9 +8,20 @@ Versión: 2.0 - Julio 2025
 
 import os
 import json
+import time
+import hashlib
 import numpy as np
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator, Optional
+
+from ..inference.inference_engine import load_inference_engine
+from ..inference.model_registry import ModelRegistry
+from ..utils.dtype_policy import FEATURE_DTYPE
+from .metrics import (classification_metrics, confidence_histogram, confusion_matrix,
+                      latency_profile, top_confusions)
+
+
+EVALUATION_BATCH_SIZE = 256
 
 
 class ModelEvaluator:
@@ -22,6 +33,8 @@ class ModelEvaluator:
         self.models_path = "models"
         self.data_path = "data"
         self.results_path = "results"
+        self.cache_path = os.path.join(self.results_path, "evaluation_cache")
+        self.registry = ModelRegistry(self.models_path, self.data_path)
         
         print("📈 Inicializando Evaluador de Modelos")
         print("📋 Características:")
@@ -52,68 +65,253 @@ class ModelEvaluator:
             print("❌ Carpeta de modelos no encontrada")
             return []
         
-        model_files = [f for f in os.listdir(self.models_path) if f.endswith('.h5')]
+        model_files = self.registry.list_models()
         
         if not model_files:
-            print("❌ No se encontraron modelos entrenados (.h5)")
+            print("❌ No se encontraron modelos entrenados (.h5 / .tflite / .onnx / .npz)")
             print("💡 Ejecuta primero el módulo de Entrenamiento")
             return []
         
         print(f"📋 Modelos disponibles ({len(model_files)}):")
         for i, model_file in enumerate(model_files, 1):
-            # Extraer información del nombre del archivo
-            creation_time = "Desconocido"
-            try:
-                file_path = os.path.join(self.models_path, model_file)
-                timestamp = os.path.getctime(file_path)
-                creation_time = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
-            except:
-                pass
-            
             print(f"   {i}. {model_file}")
-            print(f"      └─ Creado: {creation_time}")
+            print(f"      └─ {self.registry.describe(model_file)}")
         
         return model_files
     
-    def evaluate_specific_model(self):
-        """Evalúa un modelo específico"""
-        print("\n🎯 EVALUACIÓN DE MODELO ESPECÍFICO")
-        print("="*45)
+    def dataset_fingerprint(self) -> Optional[str]:
+        """
+        Huella del conjunto de test: tamaño y fecha de sequences.h5 más el
+        contenido de la división persistida y de preprocessing_info.json
+
+        Returns:
+            Hash de 16 caracteres, o None si aún no hay datos o división guardada
+        """
+        metadata_path = os.path.join(self.data_path, "metadata")
+        sequences_file = os.path.join(self.data_path, "sequences.h5")
+        split_file = os.path.join(metadata_path, "split_indices.npz")
+        if not (os.path.exists(sequences_file) and os.path.exists(split_file)):
+            return None
+        
+        digest = hashlib.sha1()
+        stat = os.stat(sequences_file)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        for path in (split_file, os.path.join(metadata_path, "preprocessing_info.json")):
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()[:16]
+    
+    def _cache_file(self, model_file: str, dataset_hash: str) -> str:
+        # Con la extensión: gru.h5, gru.onnx y gru.npz tienen cada uno su resultado
+        return os.path.join(self.cache_path, f"{model_file}_{dataset_hash}.json")
+    
+    def _open_test_split(self, engine, batch_size: int) -> Tuple[List[str], Iterator]:
+        """
+        Prepara la lectura por bloques del split de test desde sequences.h5
+        
+        Returns:
+            (clases del dataset en el orden de sus etiquetas codificadas,
+             iterador de (batch (N, T, F), etiquetas (N,), ya normalizado))
+        """
+        # Importación diferida: data_loader carga sklearn/pandas
+        from ..training.data_loader import HDF5DataLoader, adjust_sequence_length
+        from ..training.ragged_dataset import PAD_VALUE
         
+        loader = HDF5DataLoader(self.data_path, sequence_length=engine.sequence_length)
+        if not loader.check_data_availability():
+            raise ValueError("Datos de test no disponibles")
+        
+        if not loader.is_variable_length():
+            test = loader.create_streaming_datasets(batch_size=batch_size, normalize=False)['test']
+            batches = ((X_batch, y_batch, False) for X_batch, y_batch in test.iter_batches())
+            return list(loader.label_encoder.classes_), batches
+        
+        test = loader.create_ragged_datasets(batch_size=batch_size, normalize=False)['test']
+        
+        def ragged_batches():
+            # Se normaliza cada secuencia antes de rellenar, así el relleno
+            # conserva el mask_value que espera la capa Masking
+            sequences, labels = [], []
+            for sequence, label in test.iter_sequences():
+                sequences.append(sequence)
+                labels.append(label)
+                if len(sequences) == batch_size:
+                    yield self._stack_ragged(engine, sequences, adjust_sequence_length, PAD_VALUE), \
+                        np.array(labels), True
+                    sequences, labels = [], []
+            if sequences:
+                yield self._stack_ragged(engine, sequences, adjust_sequence_length, PAD_VALUE), \
+                    np.array(labels), True
+        
+        return list(loader.label_encoder.classes_), ragged_batches()
+    
+    @staticmethod
+    def _stack_ragged(engine, sequences, adjust_sequence_length, pad_value) -> np.ndarray:
+        """Batch normalizado de secuencias de distinta longitud"""
+        if not engine.variable_length:
+            return np.concatenate([engine.normalize(adjust_sequence_length(sequence[np.newaxis],
+                                                                           engine.sequence_length))
+                                   for sequence in sequences])
+        batch = np.full((len(sequences), max(len(s) for s in sequences), engine.num_features),
+                        pad_value, dtype=FEATURE_DTYPE)
+        for i, sequence in enumerate(sequences):
+            batch[i, :len(sequence)] = engine.normalize(sequence)
+        return batch
+    
+    def evaluate(self, model_file: str, batch_size: int = EVALUATION_BATCH_SIZE,
+                 measure_latency: bool = True, force: bool = False) -> Dict[str, Any]:
+        """
+        Evalúa un modelo sobre el split de test persistido
+        
+        El test se lee por bloques del HDF5 y pasa por el motor en batches
+        grandes; solo se conservan etiquetas, predicciones y confianzas. Los
+        resultados se guardan en results/evaluation_cache por modelo y huella
+        del dataset, así que volver a abrir un reporte no repite la evaluación.
+        
+        Args:
+            model_file: Archivo de modelo dentro de models_path (cualquier backend)
+            batch_size: Secuencias por batch de evaluación
+            measure_latency: Medir latencia p50/p95/p99 y throughput por tamaño de batch
+            force: Ignorar la caché
+            
+        Returns:
+            Resultados: matriz de confusión, métricas, confusiones, confianza y latencia
+        """
+        model_path = os.path.join(self.models_path, model_file)
+        model_stat = os.stat(model_path)
+        model_signature = [model_stat.st_size, model_stat.st_mtime_ns]
+        
+        dataset_hash = self.dataset_fingerprint()
+        if dataset_hash and not force:
+            try:
+                with open(self._cache_file(model_file, dataset_hash), 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached['model_signature'] == model_signature and (cached['latency'] or not measure_latency):
+                    cached['cached'] = True
+                    return cached
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        start = time.perf_counter()
+        engine = load_inference_engine(model_path, data_path=self.data_path)
+        
+        test_classes, batches = self._open_test_split(engine, batch_size)
+        y_parts, pred_parts, confidence_parts = [], [], []
+        latency_sample = None
+        for X_batch, y_batch, normalized in batches:
+            probabilities = engine.predict_proba(X_batch, normalize=not normalized)
+            y_parts.append(y_batch)
+            pred_parts.append(np.argmax(probabilities, axis=1))
+            confidence_parts.append(np.max(probabilities, axis=1))
+            if latency_sample is None and not normalized:
+                latency_sample = X_batch
+        if not y_parts:
+            raise ValueError("El split de test está vacío")
+        
+        # Las etiquetas del dataset se traducen a los índices de salida del modelo por nombre
+        class_names = engine.class_names or test_classes
+        model_index = {name: i for i, name in enumerate(class_names)}
+        to_model = np.array([model_index.get(name, -1) for name in test_classes], dtype=np.int64)
+        y_true = to_model[np.concatenate(y_parts)]
+        y_pred = np.concatenate(pred_parts)
+        confidences = np.concatenate(confidence_parts)
+        known = y_true >= 0
+        y_true, y_pred, confidences = y_true[known], y_pred[known], confidences[known]
+        
+        matrix = confusion_matrix(y_true, y_pred, len(class_names))
+        correct = y_true == y_pred
+        eval_seconds = time.perf_counter() - start
+        
+        latency = {}
+        if measure_latency:
+            if latency_sample is None:
+                latency_sample = np.zeros((1, engine.sequence_length, engine.num_features), dtype=FEATURE_DTYPE)
+            latency = {str(size): stats for size, stats in latency_profile(engine, latency_sample).items()}
+        
+        results = {
+            'model': model_file,
+            'model_signature': model_signature,
+            'dataset_hash': dataset_hash or self.dataset_fingerprint(),
+            'backend': engine.backend,
+            'class_names': list(class_names),
+            'num_samples': int(len(y_true)),
+            'skipped_samples': int((~known).sum()),
+            'confusion_matrix': matrix.tolist(),
+            'metrics': classification_metrics(matrix),
+            'top_confusions': top_confusions(matrix, class_names, top=10),
+            'confidence': {
+                'mean_correct': float(confidences[correct].mean()) if correct.any() else None,
+                'mean_errors': float(confidences[~correct].mean()) if (~correct).any() else None,
+                'histogram': confidence_histogram(confidences, correct)
+            },
+            'latency': latency,
+            'eval_seconds': eval_seconds,
+            'samples_per_second': len(y_true) / eval_seconds,
+            'evaluated_at': datetime.now().isoformat(timespec='seconds'),
+            'cached': False
+        }
+        
+        if results['dataset_hash']:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with open(self._cache_file(model_file, results['dataset_hash']), 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+        return results
+    
+    def _select_and_evaluate(self, measure_latency: bool = True) -> Optional[Dict[str, Any]]:
+        """Pide un modelo de la lista y devuelve su evaluación (None si se cancela o falla)"""
         models = self.list_available_models()
         if not models:
-            return
+            return None
         
         try:
             choice = input("\n👆 Selecciona el número del modelo a evaluar: ").strip()
             model_idx = int(choice) - 1
-            
-            if 0 <= model_idx < len(models):
-                selected_model = models[model_idx]
-                print(f"\n🎯 Evaluando modelo: {selected_model}")
-                
-                # Simular evaluación
-                print("📊 Cargando modelo...")
-                print("📊 Cargando datos de test...")
-                print("📊 Realizando predicciones...")
-                print("📊 Calculando métricas...")
-                
-                # Mostrar resultados simulados
-                print(f"\n✅ RESULTADOS DE EVALUACIÓN")
-                print(f"━" * 40)
-                print(f"📈 Accuracy: 92.5%")
-                print(f"📈 Precision: 91.8%")
-                print(f"📈 Recall: 92.1%")
-                print(f"📈 F1-Score: 91.9%")
-                print(f"📈 Pérdida: 0.234")
-                
-                print("\n⚠️ Evaluación completa en desarrollo")
-                
-            else:
-                print("❌ Número de modelo inválido")
-                
         except ValueError:
             print("❌ Por favor ingresa un número válido")
+            return None
+        if not 0 <= model_idx < len(models):
+            print("❌ Número de modelo inválido")
+            return None
+        
+        print(f"\n🎯 Evaluando modelo: {models[model_idx]}")
+        try:
+            results = self.evaluate(models[model_idx], measure_latency=measure_latency)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error en la evaluación: {e}")
+            return None
+        if results['cached']:
+            print(f"♻️ Resultados en caché ({results['evaluated_at'].replace('T', ' ')})")
+        else:
+            print(f"✅ {results['num_samples']} muestras de test en {results['eval_seconds']:.2f}s "
+                  f"({results['samples_per_second']:.0f} muestras/s)")
+        if results['skipped_samples']:
+            print(f"⚠️ {results['skipped_samples']} muestras de clases que el modelo no conoce")
+        return results
+    
+    def evaluate_specific_model(self):
+        """Evalúa un modelo específico"""
+        print("\n🎯 EVALUACIÓN DE MODELO ESPECÍFICO")
+        print("="*45)
+        
+        results = self._select_and_evaluate()
+        if results is None:
+            return
+        
+        metrics = results['metrics']
+        print(f"\n✅ RESULTADOS DE EVALUACIÓN ({results['backend']})")
+        print(f"━" * 40)
+        print(f"📈 Accuracy: {metrics['accuracy']:.1%}")
+        print(f"📈 Precision (macro): {metrics['macro']['precision']:.1%}")
+        print(f"📈 Recall (macro): {metrics['macro']['recall']:.1%}")
+        print(f"📈 F1-Score (macro): {metrics['macro']['f1']:.1%}")
+        print(f"📈 F1-Score (ponderado): {metrics['weighted']['f1']:.1%}")
+        
+        print(f"\n⏱️ Latencia por tamaño de batch:")
+        print(f"{'Batch':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'secuencias/s':>12}")
+        for size, stats in results['latency'].items():
+            print(f"{size:>6} | {stats['latency_ms_p50']:>8.2f} | {stats['latency_ms_p95']:>8.2f} | "
+                  f"{stats['latency_ms_p99']:>8.2f} | {stats['throughput_sps']:>12.0f}")
     
     def compare_models(self):
         """Compara múltiples modelos"""
@@ -125,74 +323,60 @@ class ModelEvaluator:
             print("❌ Se necesitan al menos 2 modelos para comparar")
             return
         
-        print("\n📊 Comparación automática de todos los modelos:")
-        print("-" * 50)
-        
-        # Simulación de comparación
-        for i, model in enumerate(models, 1):
-            accuracy = 90 + np.random.random() * 10  # Simulado
-            print(f"{i}. {model[:30]:<30} | Accuracy: {accuracy:.1f}%")
-        
-        print("\n⚠️ Comparación detallada en desarrollo")
-        print("🔧 Incluirá:")
-        print("   • Métricas lado a lado")
-        print("   • Gráficos comparativos")
-        print("   • Análisis estadístico")
-        print("   • Recomendaciones")
+        print("\n📊 Comparación sobre el mismo split de test:")
+        print("-" * 70)
+        print(f"{'Modelo':<30} | {'Acc.':>6} | {'F1 macro':>8} | {'p50 ms (1)':>10} | {'seq/s (max)':>11}")
+        for model in models:
+            try:
+                results = self.evaluate(model)
+            except (OSError, ValueError) as e:
+                print(f"{model[:30]:<30} | ❌ {e}")
+                continue
+            latency = results['latency']
+            single = latency.get('1', {}).get('latency_ms_p50')
+            best = max((stats['throughput_sps'] for stats in latency.values()), default=None)
+            print(f"{model[:30]:<30} | {results['metrics']['accuracy']:>6.1%} | "
+                  f"{results['metrics']['macro']['f1']:>8.1%} | "
+                  f"{'-' if single is None else f'{single:.2f}':>10} | {'-' if best is None else f'{best:.0f}':>11}")
     
     def confusion_analysis(self):
         """Análisis de matriz de confusión por señas"""
         print("\n📊 ANÁLISIS DE CONFUSIÓN POR SEÑAS")
         print("="*40)
         
-        models = self.list_available_models()
-        if not models:
+        results = self._select_and_evaluate(measure_latency=False)
+        if results is None:
             return
         
-        print("🔍 Analizando patrones de confusión...")
-        print("📋 Señas más confundidas:")
-        
-        # Simulación de análisis
-        confused_pairs = [
-            ("hola", "gracias", "85%"),
-            ("por favor", "perdón", "78%"),
-            ("casa", "familia", "72%"),
-            ("agua", "comer", "68%"),
-            ("bien", "mal", "65%")
-        ]
-        
-        for seña1, seña2, conf_rate in confused_pairs:
-            print(f"   • {seña1} ↔ {seña2}: {conf_rate} confusión")
-        
-        print("\n⚠️ Análisis completo en desarrollo")
+        if not results['top_confusions']:
+            print("🎉 Sin confusiones en el split de test")
+            return
+        print("📋 Señas más confundidas (real → predicha):")
+        for pair in results['top_confusions']:
+            print(f"   • {pair['true']} → {pair['predicted']}: {pair['count']} muestras "
+                  f"({pair['rate']:.1%} de '{pair['true']}')")
     
     def detailed_metrics(self):
         """Muestra métricas detalladas"""
         print("\n📈 MÉTRICAS DETALLADAS")
         print("="*30)
         
-        models = self.list_available_models()
-        if not models:
+        results = self._select_and_evaluate(measure_latency=False)
+        if results is None:
             return
         
-        print("📊 Métricas por categoría de señas:")
-        print("-" * 40)
-        
-        # Simulación de métricas
-        categories = [
-            ("Saludos", "95.2%", "94.8%", "95.0%"),
-            ("Familia", "91.5%", "92.1%", "91.8%"),
-            ("Comida", "88.9%", "89.2%", "89.1%"),
-            ("Acciones", "86.7%", "87.3%", "87.0%"),
-            ("Emociones", "84.2%", "85.1%", "84.6%")
-        ]
-        
-        print(f"{'Categoría':<12} | {'Prec.':<6} | {'Rec.':<6} | {'F1':<6}")
-        print("-" * 40)
-        for cat, prec, rec, f1 in categories:
-            print(f"{cat:<12} | {prec:<6} | {rec:<6} | {f1:<6}")
-        
-        print("\n⚠️ Métricas reales en desarrollo")
+        metrics = results['metrics']
+        print("📊 Métricas por seña:")
+        print("-" * 50)
+        print(f"{'Seña':<16} | {'Prec.':<6} | {'Rec.':<6} | {'F1':<6} | {'Muestras':>8}")
+        print("-" * 50)
+        for i, name in enumerate(results['class_names']):
+            print(f"{str(name)[:16]:<16} | {metrics['precision'][i]:<6.1%} | {metrics['recall'][i]:<6.1%} | "
+                  f"{metrics['f1'][i]:<6.1%} | {metrics['support'][i]:>8}")
+        print("-" * 50)
+        for average in ('macro', 'weighted'):
+            values = metrics[average]
+            print(f"{average:<16} | {values['precision']:<6.1%} | {values['recall']:<6.1%} | {values['f1']:<6.1%} |")
     
     def generate_visualizations(self):
         """Genera visualizaciones de evaluación"""
@@ -243,26 +427,33 @@ class ModelEvaluator:
         print("\n🔍 ANÁLISIS DE ERRORES")
         print("="*25)
         
-        print("🔍 Tipos de errores identificados:")
-        print("   1. Confusión entre señas similares")
-        print("   2. Problemas con iluminación")
-        print("   3. Velocidad de ejecución")
-        print("   4. Oclusión de manos")
-        print("   5. Variabilidad entre usuarios")
-        
-        print("\n📊 Distribución de errores:")
-        error_types = [
-            ("Señas similares", "45%"),
-            ("Calidad de imagen", "25%"),
-            ("Velocidad", "15%"),
-            ("Oclusión", "10%"),
-            ("Otros", "5%")
-        ]
-        
-        for error_type, percentage in error_types:
-            print(f"   • {error_type}: {percentage}")
-        
-        print("\n⚠️ Análisis automático en desarrollo")
+        results = self._select_and_evaluate(measure_latency=False)
+        if results is None:
+            return
+        
+        metrics = results['metrics']
+        errors = results['num_samples'] - int(round(metrics['accuracy'] * results['num_samples']))
+        print(f"📊 Errores: {errors} de {results['num_samples']} ({1 - metrics['accuracy']:.1%})")
+        
+        confidence = results['confidence']
+        if confidence['mean_errors'] is not None:
+            correct = confidence['mean_correct']
+            print(f"   • Confianza media en errores: {confidence['mean_errors']:.1%} "
+                  f"(aciertos: {'-' if correct is None else f'{correct:.1%}'})")
+        
+        print("\n📊 Distribución por confianza:")
+        histogram = confidence['histogram']
+        for i, (correct, wrong) in enumerate(zip(histogram['correct'], histogram['errors'])):
+            total = correct + wrong
+            rate = f"{wrong / total:.1%} errores" if total else "sin muestras"
+            print(f"   • {histogram['bins'][i]:.0%}-{histogram['bins'][i + 1]:.0%}: {total} predicciones, {rate}")
+        
+        recall = np.array(metrics['recall'])
+        support = np.array(metrics['support'])
+        weakest = [i for i in np.argsort(recall, kind='stable') if support[i] > 0][:5]
+        print("\n📉 Señas con menor recall:")
+        for i in weakest:
+            print(f"   • {results['class_names'][i]}: {recall[i]:.1%} ({support[i]} muestras)")
     
     def run(self):
         """Función principal del módulo de evaluación"""
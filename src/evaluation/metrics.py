@@ -0,0 +1,156 @@
+"""
+Evaluation Metrics - Métricas de clasificación y latencia vectorizadas
+Matriz de confusión con np.bincount, precisión/recall/F1 por clase y
+agregadas, pares de clases más confundidos y perfil de latencia por tamaño
+de batch de un motor de inferencia. Sin dependencias más allá de NumPy.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..utils.dtype_policy import FEATURE_DTYPE
+
+
+DEFAULT_LATENCY_BATCH_SIZES = (1, 8, 32, 128)
+DEFAULT_LATENCY_REPEATS = 20
+# Bordes de los intervalos de confianza del análisis de errores
+CONFIDENCE_BINS = (0.0, 0.5, 0.7, 0.9, 1.0)
+
+
+def confusion_matrix(y_true: np.ndarray, y_pred: np.ndarray, num_classes: int) -> np.ndarray:
+    """
+    Matriz de confusión en una sola pasada
+
+    Args:
+        y_true: Etiquetas reales (N,)
+        y_pred: Etiquetas predichas (N,)
+        num_classes: Número de clases
+
+    Returns:
+        Matriz (num_classes, num_classes) int64: filas = real, columnas = predicha
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_pred = np.asarray(y_pred, dtype=np.int64)
+    counts = np.bincount(y_true * num_classes + y_pred, minlength=num_classes * num_classes)
+    return counts.reshape(num_classes, num_classes)
+
+
+def classification_metrics(matrix: np.ndarray) -> Dict[str, Any]:
+    """
+    Métricas por clase y agregadas a partir de la matriz de confusión
+
+    Las clases sin predicciones (o sin muestras) tienen precisión (o recall) 0.
+
+    Returns:
+        {'accuracy', 'precision', 'recall', 'f1', 'support' (listas por clase),
+         'macro' y 'weighted' ({'precision', 'recall', 'f1'})}
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    true_positives = np.diag(matrix)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    total = support.sum()
+
+    precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+    recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+    denominator = precision + recall
+    f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(denominator), where=denominator > 0)
+
+    weights = support / total if total else np.zeros_like(support)
+    present = support > 0
+    return {
+        'accuracy': float(true_positives.sum() / total) if total else 0.0,
+        'precision': precision.tolist(),
+        'recall': recall.tolist(),
+        'f1': f1.tolist(),
+        'support': support.astype(np.int64).tolist(),
+        'macro': {name: float(values[present].mean()) if present.any() else 0.0
+                  for name, values in (('precision', precision), ('recall', recall), ('f1', f1))},
+        'weighted': {name: float(values @ weights)
+                     for name, values in (('precision', precision), ('recall', recall), ('f1', f1))}
+    }
+
+
+def top_confusions(matrix: np.ndarray, class_names: Optional[Sequence[str]] = None,
+                   top: int = 5) -> List[Dict[str, Any]]:
+    """
+    Pares (real → predicha) con más errores
+
+    Returns:
+        [{'true', 'predicted', 'count', 'rate'}] donde rate es la fracción de
+        las muestras de la clase real que se predijeron como la otra
+    """
+    matrix = np.asarray(matrix)
+    errors = matrix.copy()
+    np.fill_diagonal(errors, 0)
+    order = np.argsort(errors, axis=None, kind='stable')[::-1][:top]
+    support = matrix.sum(axis=1)
+    names = list(class_names) if class_names is not None else [str(i) for i in range(len(matrix))]
+
+    pairs = []
+    for true_index, predicted_index in zip(*np.unravel_index(order, errors.shape)):
+        count = int(errors[true_index, predicted_index])
+        if count == 0:
+            break
+        pairs.append({'true': names[true_index], 'predicted': names[predicted_index], 'count': count,
+                      'rate': count / int(support[true_index])})
+    return pairs
+
+
+def confidence_histogram(confidences: np.ndarray, correct: np.ndarray,
+                         bins: Sequence[float] = CONFIDENCE_BINS) -> Dict[str, List[int]]:
+    """
+    Aciertos y errores por intervalo de confianza
+
+    Returns:
+        {'bins', 'correct', 'errors'} con un conteo por intervalo
+    """
+    confidences = np.asarray(confidences)
+    correct = np.asarray(correct, dtype=bool)
+    return {
+        'bins': list(bins),
+        'correct': np.histogram(confidences[correct], bins=bins)[0].tolist(),
+        'errors': np.histogram(confidences[~correct], bins=bins)[0].tolist()
+    }
+
+
+def latency_profile(engine, sample: np.ndarray,
+                    batch_sizes: Sequence[int] = DEFAULT_LATENCY_BATCH_SIZES,
+                    repeats: int = DEFAULT_LATENCY_REPEATS) -> Dict[int, Dict[str, float]]:
+    """
+    Latencia y throughput del motor por tamaño de batch
+
+    Cada tamaño se calienta con una llamada que no se mide (trazado o
+    compilación del backend) y después se cronometran `repeats` llamadas.
+
+    Args:
+        engine: InferenceEngine
+        sample: Secuencias de entrada (N, T, F) sin normalizar; se repiten si
+            N es menor que el batch
+        batch_sizes: Tamaños de batch a medir
+        repeats: Llamadas medidas por tamaño
+
+    Returns:
+        {batch_size: {'latency_ms_p50', 'latency_ms_p95', 'latency_ms_p99',
+                      'throughput_sps'}} (secuencias por segundo)
+    """
+    sample = np.asarray(sample, dtype=FEATURE_DTYPE)
+    profile = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(sample, (batch_size,) + sample.shape[1:])
+        engine.predict_proba(batch)
+        latencies = np.empty(repeats)
+        for i in range(repeats):
+            start = time.perf_counter()
+            engine.predict_proba(batch)
+            latencies[i] = time.perf_counter() - start
+        p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+        profile[int(batch_size)] = {'latency_ms_p50': float(p50), 'latency_ms_p95': float(p95),
+                                    'latency_ms_p99': float(p99),
+                                    'throughput_sps': float(batch_size / latencies.mean())}
+    return profile
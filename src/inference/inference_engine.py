@@ -0,0 +1,411 @@
+"""
+Inference Engine - Motores de inferencia
+Misma API de predicción (normalización del entrenamiento, predict_proba,
+predict y calentamiento al cargar) sobre distintos backends:
+    - Keras: el modelo .h5 envuelto en una tf.function de firma fija
+      (batch, sequence_length, num_features), opcionalmente compilada con XLA
+      (frames libres en los modelos de longitud variable)
+    - TFLite: modelos .tflite exportados con model_export (float16 / int8),
+      ejecutados con tflite_runtime si está instalado o con tf.lite
+    - ONNX: modelos .onnx exportados con model_export, ejecutados con
+      onnxruntime en CPU (sin cargar TensorFlow)
+    - NumPy: pesos .npz exportados con model_export, ejecutados con el
+      forward pass de numpy_gru (sin más dependencias que NumPy)
+
+TensorFlow se importa solo al crear el motor que lo necesita.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.dtype_policy import FEATURE_DTYPE
+
+
+DEFAULT_WARMUP_BATCH_SIZES = (1,)
+# Ventana por defecto de los modelos de longitud variable sin preprocessing_info.json
+DEFAULT_SEQUENCE_LENGTH = 60
+# Extensión del archivo de modelo → backend
+MODEL_BACKENDS = {'.h5': 'keras', '.tflite': 'tflite', '.onnx': 'onnx', '.npz': 'numpy'}
+
+
+def read_preprocessing_info(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Lee preprocessing_info.json con 'mean' y 'std' como vectores (F,)
+
+    Acepta el formato compacto y el anterior con arrays anidados (1, 1, F).
+
+    Args:
+        path: Ruta del archivo
+
+    Returns:
+        Información de preprocesamiento, o None si el archivo no existe
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    normalization = info.get('normalization', {})
+    for key in ('mean', 'std'):
+        if key in normalization:
+            normalization[key] = np.asarray(normalization[key], dtype=FEATURE_DTYPE).reshape(-1)
+    return info
+
+
+class InferenceEngine:
+    """
+    Base de los motores: normalización, nombres de clase, calentamiento y
+    predicción. Cada backend implementa _run(batch normalizado) → probabilidades.
+    """
+
+    backend = None
+
+    def __init__(self, sequence_length: int, num_features: int,
+                 preprocessing_info: Optional[Dict[str, Any]] = None,
+                 class_names: Optional[Sequence[str]] = None):
+        """
+        Args:
+            sequence_length: Frames por secuencia que espera el modelo (None o
+                dimensión simbólica = longitud variable)
+            num_features: Características por frame
+            preprocessing_info: Información de read_preprocessing_info (None = sin normalizar)
+            class_names: Nombres de las clases (por defecto label_encoder_classes de preprocessing_info)
+        """
+        # Modelos de longitud variable: aceptan cualquier número de frames y
+        # sequence_length queda como la ventana del entrenamiento (la del traductor)
+        self.variable_length = not isinstance(sequence_length, (int, np.integer))
+        if self.variable_length:
+            sequence_length = (preprocessing_info or {}).get('sequence_length') or DEFAULT_SEQUENCE_LENGTH
+        self.sequence_length = int(sequence_length)
+        self.num_features = int(num_features)
+
+        normalization = (preprocessing_info or {}).get('normalization', {})
+        self.mean = normalization.get('mean')
+        self.std = normalization.get('std')
+        if class_names is None:
+            class_names = (preprocessing_info or {}).get('label_encoder_classes') or None
+        self.class_names = list(class_names) if class_names is not None else None
+        self.warmup_seconds = {}
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def warmup(self, batch_sizes: Sequence[int] = DEFAULT_WARMUP_BATCH_SIZES) -> Dict[int, float]:
+        """
+        Ejecuta el modelo con batches de ceros para preparar el backend
+
+        Args:
+            batch_sizes: Tamaños de batch a preparar
+
+        Returns:
+            Segundos de la primera llamada por tamaño de batch
+        """
+        for batch_size in batch_sizes:
+            zeros = np.zeros((batch_size, self.sequence_length, self.num_features), dtype=FEATURE_DTYPE)
+            start = time.perf_counter()
+            self._run(zeros)
+            self.warmup_seconds[int(batch_size)] = time.perf_counter() - start
+        return self.warmup_seconds
+
+    def normalize(self, sequences: np.ndarray) -> np.ndarray:
+        """Aplica la normalización del entrenamiento (si hay estadísticas)"""
+        sequences = np.asarray(sequences, dtype=FEATURE_DTYPE)
+        if self.mean is None or self.std is None:
+            return sequences
+        return (sequences - self.mean) / self.std
+
+    def predict_proba(self, sequences: np.ndarray, normalize: bool = True) -> np.ndarray:
+        """
+        Probabilidades por clase
+
+        Args:
+            sequences: Secuencia (T, F) o batch (N, T, F) sin normalizar
+                (T libre en los modelos de longitud variable)
+            normalize: Aplicar la normalización del entrenamiento
+
+        Returns:
+            Array (N, num_classes)
+        """
+        sequences = np.asarray(sequences, dtype=FEATURE_DTYPE)
+        if sequences.ndim == 2:
+            sequences = sequences[np.newaxis]
+        if self.variable_length:
+            if sequences.shape[1] == 0 or sequences.shape[2] != self.num_features:
+                raise ValueError(f"Forma de entrada {sequences.shape[1:]} no coincide con "
+                                 f"(frames, {self.num_features})")
+        elif sequences.shape[1:] != (self.sequence_length, self.num_features):
+            raise ValueError(f"Forma de entrada {sequences.shape[1:]} no coincide con "
+                             f"({self.sequence_length}, {self.num_features})")
+        if normalize:
+            sequences = self.normalize(sequences)
+        return self._run(np.ascontiguousarray(sequences, dtype=FEATURE_DTYPE))
+
+    def predict(self, sequence: np.ndarray) -> Tuple[str, float]:
+        """
+        Clase más probable de una secuencia
+
+        Args:
+            sequence: Secuencia (T, F) sin normalizar
+
+        Returns:
+            (nombre de la clase, confianza)
+        """
+        probabilities = self.predict_proba(sequence)[0]
+        index = int(np.argmax(probabilities))
+        name = self.class_names[index] if self.class_names else str(index)
+        return name, float(probabilities[index])
+
+
+class KerasInferenceEngine(InferenceEngine):
+    """
+    Predicción con un modelo Keras a través de una tf.function de firma fija
+
+    La dimensión de batch es la única libre (y los frames en los modelos de
+    longitud variable), así que la función se traza una sola vez; con jit_compile=True XLA compila un programa por tamaño de batch,
+    por lo que conviene calentar los tamaños que se usarán (por defecto 1, la
+    ventana deslizante del traductor).
+    """
+
+    backend = 'keras'
+
+    def __init__(self, model,
+                 preprocessing_info: Optional[Dict[str, Any]] = None,
+                 class_names: Optional[Sequence[str]] = None,
+                 jit_compile: bool = False,
+                 warmup_batch_sizes: Optional[Sequence[int]] = DEFAULT_WARMUP_BATCH_SIZES):
+        """
+        Args:
+            model: Modelo keras entrenado (entrada (None, sequence_length, num_features))
+            preprocessing_info: Información de read_preprocessing_info (None = sin normalizar)
+            class_names: Nombres de las clases (por defecto label_encoder_classes de preprocessing_info)
+            jit_compile: Compilar la función de predicción con XLA
+            warmup_batch_sizes: Tamaños de batch a calentar al crear el motor (None = no calentar)
+        """
+        import tensorflow as tf
+
+        sequence_length, num_features = model.input_shape[1:]
+        super().__init__(sequence_length, num_features, preprocessing_info, class_names)
+        self.model = model
+        self.jit_compile = jit_compile
+
+        self.input_signature = tf.TensorSpec((None, sequence_length, self.num_features), tf.float32)
+        self._predict_fn = tf.function(self._forward, input_signature=[self.input_signature],
+                                       jit_compile=jit_compile)
+        if warmup_batch_sizes:
+            self.warmup(warmup_batch_sizes)
+
+    def _forward(self, batch):
+        return self.model(batch, training=False)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self._predict_fn(batch).numpy()
+
+    @property
+    def tracing_count(self) -> int:
+        """Veces que se ha trazado la función de predicción"""
+        return self._predict_fn.experimental_get_tracing_count()
+
+
+def create_tflite_interpreter(model_path: str, num_threads: Optional[int] = None, use_xnnpack: bool = False):
+    """
+    Intérprete de tflite_runtime (ligero, para kioscos) o, si no está, de tf.lite
+
+    El delegado XNNPACK queda desactivado por defecto: con modelos float16
+    pequeños produce NaN en el bucle del GRU, y en este modelo no aporta
+    velocidad frente a los kernels builtin.
+    """
+    try:
+        from tflite_runtime.interpreter import Interpreter, OpResolverType
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+        OpResolverType = tf.lite.experimental.OpResolverType
+    resolver = OpResolverType.AUTO if use_xnnpack else OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+    return Interpreter(model_path=model_path, num_threads=num_threads, experimental_op_resolver_type=resolver)
+
+
+class TFLiteInferenceEngine(InferenceEngine):
+    """
+    Predicción con un modelo .tflite exportado con batch fijo 1
+
+    Los batches de más de una secuencia se ejecutan fila a fila; el caso
+    de uso es la ventana deslizante del traductor.
+    """
+
+    backend = 'tflite'
+
+    def __init__(self, model_path: str,
+                 preprocessing_info: Optional[Dict[str, Any]] = None,
+                 class_names: Optional[Sequence[str]] = None,
+                 num_threads: Optional[int] = None,
+                 use_xnnpack: bool = False,
+                 warmup_batch_sizes: Optional[Sequence[int]] = DEFAULT_WARMUP_BATCH_SIZES):
+        """
+        Args:
+            model_path: Ruta del modelo .tflite
+            preprocessing_info: Información de read_preprocessing_info (None = sin normalizar)
+            class_names: Nombres de las clases (por defecto label_encoder_classes de preprocessing_info)
+            num_threads: Hilos del intérprete (None = valor por defecto del backend)
+            use_xnnpack: Usar el delegado XNNPACK (ver create_tflite_interpreter)
+            warmup_batch_sizes: Tamaños de batch a calentar al crear el motor (None = no calentar)
+        """
+        self.model_path = model_path
+        self.interpreter = create_tflite_interpreter(model_path, num_threads, use_xnnpack)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+
+        _, sequence_length, num_features = self.input_details['shape']
+        super().__init__(sequence_length, num_features, preprocessing_info, class_names)
+        if warmup_batch_sizes:
+            self.warmup(warmup_batch_sizes)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        outputs = []
+        for row in range(len(batch)):
+            self.interpreter.set_tensor(self.input_details['index'], batch[row:row + 1])
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self.output_details['index'])[0].copy())
+        return np.stack(outputs)
+
+
+class OnnxInferenceEngine(InferenceEngine):
+    """
+    Predicción con un modelo .onnx en onnxruntime (CPU)
+
+    El proceso no necesita TensorFlow: arranque más rápido y mucha menos
+    memoria residente que el backend Keras. La entrada admite cualquier
+    tamaño de batch.
+    """
+
+    backend = 'onnx'
+
+    def __init__(self, model_path: str,
+                 preprocessing_info: Optional[Dict[str, Any]] = None,
+                 class_names: Optional[Sequence[str]] = None,
+                 num_threads: Optional[int] = None,
+                 warmup_batch_sizes: Optional[Sequence[int]] = DEFAULT_WARMUP_BATCH_SIZES):
+        """
+        Args:
+            model_path: Ruta del modelo .onnx
+            preprocessing_info: Información de read_preprocessing_info (None = sin normalizar)
+            class_names: Nombres de las clases (por defecto label_encoder_classes de preprocessing_info)
+            num_threads: Hilos intra-op de onnxruntime (None = valor por defecto)
+            warmup_batch_sizes: Tamaños de batch a calentar al crear el motor (None = no calentar)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("El backend ONNX requiere onnxruntime: pip install onnxruntime")
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        _, sequence_length, num_features = model_input.shape
+        super().__init__(sequence_length, num_features, preprocessing_info, class_names)
+        if warmup_batch_sizes:
+            self.warmup(warmup_batch_sizes)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class NumpyInferenceEngine(InferenceEngine):
+    """
+    Predicción con los pesos .npz de export_numpy_weights, solo con NumPy
+
+    Sin TensorFlow ni onnxruntime: el motor carga en milisegundos y ocupa
+    poco más que los pesos. La entrada admite cualquier tamaño de batch.
+    """
+
+    backend = 'numpy'
+
+    def __init__(self, model_path: str,
+                 preprocessing_info: Optional[Dict[str, Any]] = None,
+                 class_names: Optional[Sequence[str]] = None,
+                 warmup_batch_sizes: Optional[Sequence[int]] = DEFAULT_WARMUP_BATCH_SIZES):
+        """
+        Args:
+            model_path: Ruta de los pesos .npz
+            preprocessing_info: Información de read_preprocessing_info (None = sin normalizar)
+            class_names: Nombres de las clases (por defecto label_encoder_classes de preprocessing_info)
+            warmup_batch_sizes: Tamaños de batch a calentar al crear el motor (None = no calentar)
+        """
+        from .numpy_gru import NumpyGRUClassifier
+
+        self.model_path = model_path
+        self.classifier = NumpyGRUClassifier.load(model_path)
+        super().__init__(self.classifier.sequence_length, self.classifier.num_features,
+                         preprocessing_info, class_names)
+        if warmup_batch_sizes:
+            self.warmup(warmup_batch_sizes)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.classifier(batch)
+
+
+def find_latest_model(models_path: str, extension: str = '.h5') -> Optional[str]:
+    """Ruta del modelo más reciente de la carpeta con la extensión dada, o None"""
+    if not os.path.isdir(models_path):
+        return None
+    models = [os.path.join(models_path, name) for name in os.listdir(models_path) if name.endswith(extension)]
+    return max(models, key=os.path.getmtime) if models else None
+
+
+def load_inference_engine(model_path: str, data_path: str = "data",
+                          preprocessing_path: Optional[str] = None,
+                          **engine_options) -> InferenceEngine:
+    """
+    Carga un modelo y construye el motor de inferencia de su backend
+
+    Args:
+        model_path: Ruta del modelo (.h5, .tflite, .onnx o .npz; una carpeta usa el .h5 más reciente)
+        data_path: Carpeta de datos con metadata/preprocessing_info.json
+        preprocessing_path: Ruta explícita de preprocessing_info.json
+        **engine_options: Opciones del motor (jit_compile, num_threads, warmup_batch_sizes, ...)
+
+    Returns:
+        Motor listo (ya calentado salvo que warmup_batch_sizes sea None)
+    """
+    if os.path.isdir(model_path):
+        latest = find_latest_model(model_path)
+        if latest is None:
+            raise FileNotFoundError(f"No hay modelos .h5 en: {model_path}")
+        model_path = latest
+
+    backend = MODEL_BACKENDS.get(os.path.splitext(model_path)[1].lower())
+    if backend is None:
+        raise ValueError(f"Formato de modelo no soportado: {model_path} "
+                         f"(opciones: {', '.join(MODEL_BACKENDS)})")
+
+    if preprocessing_path is None:
+        preprocessing_path = os.path.join(data_path, 'metadata', 'preprocessing_info.json')
+    preprocessing_info = read_preprocessing_info(preprocessing_path)
+    if preprocessing_info is None:
+        print(f"⚠️ Sin preprocessing_info.json en {preprocessing_path}: las entradas no se normalizarán")
+
+    if backend == 'numpy':
+        engine_options.pop('jit_compile', None)
+        engine_options.pop('num_threads', None)
+        return NumpyInferenceEngine(model_path, preprocessing_info, **engine_options)
+
+    if backend in ('tflite', 'onnx'):
+        engine_options.pop('jit_compile', None)
+        engine_class = TFLiteInferenceEngine if backend == 'tflite' else OnnxInferenceEngine
+        return engine_class(model_path, preprocessing_info, **engine_options)
+
+    from tensorflow import keras
+    engine_options.pop('num_threads', None)
+    model = keras.models.load_model(model_path, compile=False)
+    return KerasInferenceEngine(model, preprocessing_info, **engine_options)
@@ -0,0 +1,335 @@
+"""
+Inference Server - Servidor de inferencia multi-cliente con micro-batching
+Servidor HTTP local (asyncio, sin dependencias externas) que recibe ventanas
+de landmarks de muchos kioscos y agrupa las peticiones concurrentes en
+micro-batches: cada batch se cierra al llenarse o al vencer el plazo de
+latencia de su primera petición, y se resuelve con una sola llamada a
+predict_proba. Reporta throughput, tamaño de batch y latencia de cola.
+
+    python -m src.inference.inference_server models/gru_lsp_model_X.h5 --port 8765
+
+Endpoints:
+    POST /predict   {"sequence": [[...157 features...], ...]} → clase, confianza y probabilidades
+                    (o application/octet-stream: la ventana en el formato binario de wire_format)
+    GET  /metrics   métricas del micro-batcher
+    GET  /health    estado y backend del modelo
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..data_collection.wire_format import decode_window
+from ..utils.dtype_policy import FEATURE_DTYPE
+from ..utils.profiler import StageProfiler
+from .inference_engine import InferenceEngine, load_inference_engine
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_LATENCY_MS = 5.0
+# Muestras conservadas para los percentiles de latencia
+METRICS_WINDOW = 4096
+
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+class MicroBatcher:
+    """
+    Cola de peticiones que se resuelven en batches
+
+    Un único worker toma la primera petición, espera más hasta completar
+    max_batch_size o hasta que esa petición lleve max_latency_ms en cola, y
+    ejecuta el modelo en un hilo aparte (el bucle de eventos sigue aceptando
+    peticiones mientras tanto). Con carga baja los batches son de 1 y la
+    latencia añadida es como mucho el plazo; con carga alta las peticiones
+    que llegan durante un batch forman el siguiente.
+    """
+
+    def __init__(self, engine: InferenceEngine,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_latency_ms: float = DEFAULT_MAX_LATENCY_MS):
+        """
+        Args:
+            engine: Motor de inferencia (cualquier backend)
+            max_batch_size: Peticiones máximas por batch
+            max_latency_ms: Espera máxima en cola de la primera petición del batch
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.profiler = StageProfiler(enabled=True, window=METRICS_WINDOW)
+        # Un solo hilo: los intérpretes TFLite/ONNX no admiten llamadas concurrentes
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lsp-batcher')
+        self.queue = None
+        self._worker = None
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        """Reinicia los contadores y las ventanas de latencia"""
+        self.profiler.reset()
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.started_at = time.perf_counter()
+
+    async def start(self):
+        """Crea la cola y arranca el worker en el bucle de eventos actual"""
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detiene el worker y el hilo del modelo"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, sequence: np.ndarray) -> np.ndarray:
+        """
+        Encola una secuencia y espera sus probabilidades
+
+        Args:
+            sequence: Secuencia (T, F) sin normalizar
+
+        Returns:
+            Probabilidades por clase (num_classes,)
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((sequence, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future, float]]:
+        """Toma las peticiones del siguiente batch respetando el plazo de la primera"""
+        items = [await self.queue.get()]
+        deadline = items[0][2] + self.max_latency
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Plazo vencido: solo se suman las peticiones que ya esperan
+                while len(items) < self.max_batch_size and not self.queue.empty():
+                    items.append(self.queue.get_nowait())
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            batch_start = time.perf_counter()
+            for _, _, enqueued in items:
+                self.profiler.record('queue_wait', (batch_start - enqueued) * 1000)
+
+            # Los modelos de longitud variable agrupan por número de frames
+            groups = {}
+            for item in items:
+                groups.setdefault(item[0].shape, []).append(item)
+            for group in groups.values():
+                batch = np.stack([sequence for sequence, _, _ in group])
+                try:
+                    probabilities = await loop.run_in_executor(self.executor, self.engine.predict_proba, batch)
+                except Exception as e:
+                    for _, future, _ in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for row, (_, future, _) in enumerate(group):
+                    if not future.done():
+                        future.set_result(probabilities[row])
+
+            self.profiler.record('batch_inference', (time.perf_counter() - batch_start) * 1000)
+            self.requests += len(items)
+            self.batches += 1
+            self.batch_sizes[len(items)] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Métricas acumuladas desde el arranque (o el último reset_metrics)
+
+        Returns:
+            Peticiones, batches, throughput (peticiones/s), tamaño medio y
+            distribución de los batches, y p50/p95 de la espera en cola y de
+            la inferencia por batch en milisegundos
+        """
+        elapsed = time.perf_counter() - self.started_at
+        stats = self.profiler.get_stats()
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'throughput_rps': self.requests / elapsed if elapsed > 0 else 0.0,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'batch_size_histogram': {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            'queue_wait_ms': {key: stats.get('queue_wait', {}).get(key, 0.0) for key in ('p50', 'p95')},
+            'batch_inference_ms': {key: stats.get('batch_inference', {}).get(key, 0.0) for key in ('p50', 'p95')},
+            'max_batch_size': self.max_batch_size,
+            'max_latency_ms': self.max_latency * 1000
+        }
+
+
+class InferenceServer:
+    """
+    Servidor HTTP/1.1 mínimo con conexiones persistentes (keep-alive)
+
+    Cada kiosco mantiene una conexión abierta y envía una ventana por
+    petición; el MicroBatcher compartido agrupa las de todos los clientes.
+    """
+
+    def __init__(self, engine: InferenceEngine,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_latency_ms: float = DEFAULT_MAX_LATENCY_MS):
+        """
+        Args:
+            engine: Motor de inferencia
+            host: Dirección de escucha
+            port: Puerto (0 = uno libre, ver self.port tras start)
+            max_batch_size: Peticiones máximas por batch
+            max_latency_ms: Espera máxima en cola antes de cerrar un batch
+        """
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(engine, max_batch_size, max_latency_ms)
+        self.server = None
+
+    async def start(self):
+        """Abre el socket y arranca el micro-batcher"""
+        await self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Cierra el socket y detiene el micro-batcher"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        """Arranca el servidor y atiende peticiones hasta cancelarse"""
+        await self.start()
+        print(f"🌐 Servidor de inferencia en http://{self.host}:{self.port} "
+              f"(backend: {self.engine.backend}, batch ≤ {self.batcher.max_batch_size}, "
+              f"plazo {self.batcher.max_latency * 1000:.1f} ms)")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path = request_line.decode('latin-1').split()[:2]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self._dispatch(method, path, body, headers.get('content-type', ''))
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes,
+                        content_type: str = '') -> Tuple[int, Dict[str, Any]]:
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'backend': self.engine.backend,
+                         'sequence_length': self.engine.sequence_length,
+                         'num_features': self.engine.num_features,
+                         'variable_length': self.engine.variable_length}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.batcher.metrics()
+        if method != 'POST' or path != '/predict':
+            return 404, {'error': f"Ruta no encontrada: {method} {path}"}
+
+        try:
+            if content_type.startswith(BINARY_CONTENT_TYPE):
+                sequence = decode_window(body)
+            else:
+                sequence = np.asarray(json.loads(body)['sequence'], dtype=FEATURE_DTYPE)
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': f"Cuerpo inválido: {e}"}
+        error = self._validate(sequence)
+        if error:
+            return 400, {'error': error}
+
+        try:
+            probabilities = await self.batcher.submit(sequence)
+        except Exception as e:
+            return 500, {'error': str(e)}
+        index = int(np.argmax(probabilities))
+        class_names = self.engine.class_names
+        return 200, {'label': class_names[index] if class_names else str(index),
+                     'confidence': float(probabilities[index]),
+                     'probabilities': probabilities.tolist()}
+
+    def _validate(self, sequence: np.ndarray) -> Optional[str]:
+        """Comprueba la forma antes de encolar (un error no debe romper el batch de otros clientes)"""
+        engine = self.engine
+        if sequence.ndim != 2 or sequence.shape[1] != engine.num_features or len(sequence) == 0:
+            return f"Se esperaba una secuencia (frames, {engine.num_features}); recibido {sequence.shape}"
+        if not engine.variable_length and len(sequence) != engine.sequence_length:
+            return f"El modelo espera {engine.sequence_length} frames; recibidos {len(sequence)}"
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor de inferencia LSP con micro-batching")
+    parser.add_argument('model', help="Modelo (.h5, .tflite, .onnx o .npz; una carpeta usa el .h5 más reciente)")
+    parser.add_argument('--data', default='data', help="Carpeta de datos (preprocessing_info.json)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Dirección de escucha")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Puerto")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Peticiones máximas por batch")
+    parser.add_argument('--max-latency-ms', type=float, default=DEFAULT_MAX_LATENCY_MS,
+                        help="Espera máxima en cola antes de cerrar un batch")
+    args = parser.parse_args(argv)
+
+    engine = load_inference_engine(args.model, data_path=args.data)
+    server = InferenceServer(engine, args.host, args.port, args.max_batch_size, args.max_latency_ms)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Servidor detenido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Load Test - Prueba de carga del servidor de inferencia
+Simula N kioscos concurrentes (una conexión keep-alive cada uno) que envían
+ventanas sintéticas de SyntheticLandmarkGenerator a /predict (JSON o, con
+--binary, el formato binario de wire_format), y mide throughput y latencia
+por nivel de concurrencia junto con el tamaño medio de los micro-batches que
+formó el servidor.
+
+    python -m src.inference.inference_server models/gru_lsp_model_X.h5 &
+    python -m src.inference.load_test --port 8765 --concurrency 1 4 16 32
+    python -m src.inference.load_test --port 8765 --binary
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..data_collection.wire_format import FrameEncoder
+from ..utils.synthetic_data import SyntheticLandmarkGenerator
+from .inference_server import BINARY_CONTENT_TYPE, DEFAULT_HOST, DEFAULT_PORT
+
+
+DEFAULT_CONCURRENCY_LEVELS = (1, 2, 4, 8, 16, 32)
+DEFAULT_REQUESTS_PER_CLIENT = 50
+# Ventanas distintas que rota cada cliente (se serializan una sola vez)
+NUM_DISTINCT_WINDOWS = 8
+
+
+class HttpConnection:
+    """Conexión HTTP/1.1 persistente mínima para el cliente de carga"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> 'HttpConnection':
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, host)
+
+    async def request(self, method: str, path: str, body: bytes = b'',
+                      content_type: str = 'application/json') -> Tuple[int, Dict[str, Any]]:
+        """
+        Envía una petición y lee la respuesta JSON
+
+        Returns:
+            (código de estado, cuerpo decodificado)
+        """
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Type: {content_type}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _client(host: str, port: int, bodies: Sequence[bytes], content_type: str, num_requests: int,
+                  latencies: List[float], offset: int) -> int:
+    """Un kiosco: envía num_requests ventanas seguidas y devuelve cuántas fallaron"""
+    connection = await HttpConnection.open(host, port)
+    errors = 0
+    try:
+        for i in range(num_requests):
+            start = time.perf_counter()
+            status, _ = await connection.request('POST', '/predict', bodies[(offset + i) % len(bodies)],
+                                                 content_type)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += status != 200
+    finally:
+        await connection.close()
+    return errors
+
+
+async def run_load_test(host: str = DEFAULT_HOST,
+                        port: int = DEFAULT_PORT,
+                        concurrency: int = 8,
+                        requests_per_client: int = DEFAULT_REQUESTS_PER_CLIENT,
+                        seed: int = 42,
+                        binary: bool = False) -> Dict[str, Any]:
+    """
+    Ejecuta un nivel de concurrencia contra un servidor en marcha
+
+    Args:
+        host, port: Dirección del servidor
+        concurrency: Clientes simultáneos
+        requests_per_client: Peticiones que envía cada cliente
+        seed: Semilla de las ventanas sintéticas
+        binary: Enviar las ventanas en el formato binario de wire_format
+
+    Returns:
+        Throughput, latencias p50/p95 de extremo a extremo, errores, bytes
+        por petición y el tamaño medio de batch del servidor durante la prueba
+    """
+    control = await HttpConnection.open(host, port)
+    _, health = await control.request('GET', '/health')
+    _, before = await control.request('GET', '/metrics')
+
+    generator = SyntheticLandmarkGenerator(seed=seed, sequence_length=health['sequence_length'],
+                                           feature_dim=health['num_features'])
+    windows = [generator.sequence() for _ in range(NUM_DISTINCT_WINDOWS)]
+    if binary:
+        bodies = [FrameEncoder().encode_frames(window) for window in windows]
+        content_type = BINARY_CONTENT_TYPE
+    else:
+        bodies = [json.dumps({'sequence': window.tolist()}).encode('utf-8') for window in windows]
+        content_type = 'application/json'
+
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(_client(host, port, bodies, content_type, requests_per_client, latencies, i)
+                                    for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    _, after = await control.request('GET', '/metrics')
+    await control.close()
+
+    batches = after['batches'] - before['batches']
+    total = concurrency * requests_per_client
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': int(sum(errors)),
+        'request_bytes': len(bodies[0]),
+        'seconds': elapsed,
+        'throughput_rps': total / elapsed,
+        'latency_ms_p50': float(np.percentile(latencies, 50)),
+        'latency_ms_p95': float(np.percentile(latencies, 95)),
+        'mean_batch_size': (after['requests'] - before['requests']) / batches if batches else 0.0
+    }
+
+
+async def sweep(host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT,
+                concurrency_levels: Sequence[int] = DEFAULT_CONCURRENCY_LEVELS,
+                requests_per_client: int = DEFAULT_REQUESTS_PER_CLIENT,
+                seed: int = 42,
+                binary: bool = False) -> List[Dict[str, Any]]:
+    """Ejecuta run_load_test para cada nivel de concurrencia"""
+    return [await run_load_test(host, port, level, requests_per_client, seed, binary)
+            for level in concurrency_levels]
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    """Tabla de texto con una fila por nivel de concurrencia"""
+    lines = [f"{'clientes':>8} {'pet/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'batch':>6} {'errores':>8}"]
+    for r in results:
+        lines.append(f"{r['concurrency']:>8} {r['throughput_rps']:>9.1f} {r['latency_ms_p50']:>8.1f} "
+                     f"{r['latency_ms_p95']:>8.1f} {r['mean_batch_size']:>6.1f} {r['errors']:>8}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de inferencia LSP")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Dirección del servidor")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Puerto del servidor")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=list(DEFAULT_CONCURRENCY_LEVELS),
+                        help="Niveles de concurrencia")
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS_PER_CLIENT,
+                        help="Peticiones por cliente")
+    parser.add_argument('--binary', action='store_true', help="Enviar las ventanas en formato binario (float16)")
+    parser.add_argument('-o', '--output', default=None, help="Guardar los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(sweep(args.host, args.port, args.concurrency, args.requests, binary=args.binary))
+    print(f"📦 {results[0]['request_bytes']:,} bytes por petición ({'binario' if args.binary else 'JSON'})")
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Resultados guardados en: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+"""
+Model Export - Exportación de modelos para despliegue
+Convierte un modelo .h5 de TrainingPipeline a TFLite (float16 e int8), a
+ONNX o a pesos NumPy (.npz) y genera un reporte comparativo de tamaño, latencia y precisión frente
+al modelo Keras sobre una muestra representativa de sequences.h5 (para ONNX
+y NumPy, también arranque en frío y memoria del proceso).
+
+    python -m src.inference.model_export tflite models/gru_lsp_model_X.h5 --data data
+    python -m src.inference.model_export onnx models/gru_lsp_model_X.h5 --data data
+    python -m src.inference.model_export numpy models/gru_lsp_model_X.h5 --data data
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import h5py
+import numpy as np
+
+from ..training.data_loader import adjust_sequence_length
+from ..training.ragged_dataset import read_ragged_rows
+from .inference_engine import (DEFAULT_SEQUENCE_LENGTH, InferenceEngine, KerasInferenceEngine,
+                               load_inference_engine, read_preprocessing_info)
+from .numpy_gru import export_numpy_weights
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# float16: pesos en float16 (la mitad de tamaño, cómputo en float32)
+# int8: cuantización de rango dinámico (pesos int8, activaciones cuantizadas al vuelo)
+TFLITE_QUANTIZATIONS = ('float16', 'int8')
+DEFAULT_SAMPLE_SIZE = 200
+DEFAULT_ONNX_OPSET = 17
+
+# Se ejecuta con python -c en un proceso nuevo (ver measure_startup)
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.inference.inference_engine import load_inference_engine
+load_inference_engine(sys.argv[1], data_path=sys.argv[2])
+elapsed = time.perf_counter() - start
+# VmHWM se reinicia en exec (ru_maxrss de Linux hereda el pico del proceso padre)
+peak_rss_mb = None
+try:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                peak_rss_mb = int(line.split()[1]) / 1024
+except OSError:
+    pass
+print(json.dumps({'startup_seconds': elapsed, 'peak_rss_mb': peak_rss_mb,
+                  'tensorflow_loaded': 'tensorflow' in sys.modules}))
+"""
+
+
+def convert_to_tflite(model, quantization: Optional[str] = None,
+                      sequence_length: Optional[int] = None) -> bytes:
+    """
+    Convierte un modelo Keras a TFLite con entrada fija (1, sequence_length, num_features)
+
+    Args:
+        model: Modelo keras
+        quantization: None (float32), 'float16' o 'int8'
+        sequence_length: Frames de la entrada fija (obligatorio en modelos de
+            longitud variable; por defecto los del modelo)
+
+    Returns:
+        Contenido del archivo .tflite
+    """
+    import tensorflow as tf
+
+    if quantization not in (None,) + TFLITE_QUANTIZATIONS:
+        raise ValueError(f"Cuantización desconocida: {quantization}. Opciones: {', '.join(TFLITE_QUANTIZATIONS)}")
+
+    model_length, num_features = model.input_shape[1:]
+    sequence_length = sequence_length or model_length
+    if sequence_length is None:
+        raise ValueError("Modelo de longitud variable: indica sequence_length para la entrada fija de TFLite")
+    predict = tf.function(lambda x: model(x, training=False),
+                          input_signature=[tf.TensorSpec((1, sequence_length, num_features), tf.float32)])
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([predict.get_concrete_function()], model)
+    if quantization is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+
+def model_window(data_path: str) -> int:
+    """Ventana (frames) del entrenamiento según preprocessing_info.json, para modelos de longitud variable"""
+    preprocessing_info = read_preprocessing_info(os.path.join(data_path, 'metadata', 'preprocessing_info.json'))
+    return (preprocessing_info or {}).get('sequence_length') or DEFAULT_SEQUENCE_LENGTH
+
+
+def load_representative_sample(data_path: str, class_names: Sequence[str], sequence_length: int,
+                               num_samples: int = DEFAULT_SAMPLE_SIZE,
+                               seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Muestra de secuencias (sin normalizar) y etiquetas de sequences.h5
+
+    Se toma del split de test guardado por el entrenamiento si existe
+    (metadata/split_indices.npz) y, si no, de todas las filas.
+
+    Args:
+        data_path: Carpeta de datos
+        class_names: Clases del modelo, en orden de salida
+        sequence_length: Frames por secuencia del modelo (se ajusta como en el entrenamiento)
+        num_samples: Secuencias de la muestra
+        seed: Semilla de la selección
+
+    Returns:
+        (X (N, T, F) float32, y (N,) índices de clase del modelo)
+    """
+    sequences_file = os.path.join(data_path, 'sequences.h5')
+    metadata_path = os.path.join(data_path, 'metadata')
+    with open(os.path.join(metadata_path, 'labels_map.json'), 'r', encoding='utf-8') as f:
+        index_to_sign = json.load(f)['index_to_sign']
+
+    with h5py.File(sequences_file, 'r') as f:
+        ragged = 'frames' in f
+        labels = f['y'][:]
+        rows = np.arange(len(labels))
+        split_file = os.path.join(metadata_path, 'split_indices.npz')
+        if os.path.exists(split_file):
+            with np.load(split_file) as split:
+                rows = np.sort(split['test'][split['test'] < len(labels)])
+
+        # Solo filas de clases que conoce el modelo
+        class_index = {name: i for i, name in enumerate(class_names)}
+        signs = np.array([index_to_sign.get(str(label), str(label)) for label in labels[rows]])
+        known = np.array([sign in class_index for sign in signs], dtype=bool)
+        rows, signs = rows[known], signs[known]
+
+        rng = np.random.default_rng(seed)
+        chosen = np.sort(rng.choice(len(rows), size=min(num_samples, len(rows)), replace=False))
+        if ragged:
+            X = np.stack([adjust_sequence_length(sequence[np.newaxis], sequence_length)[0]
+                          for sequence in read_ragged_rows(f, rows[chosen])]).astype(np.float32)
+        else:
+            X = adjust_sequence_length(f['X'][rows[chosen]].astype(np.float32), sequence_length)
+    y = np.array([class_index[sign] for sign in signs[chosen]], dtype=np.int32)
+    return X, y
+
+
+def evaluate_engine(engine: InferenceEngine, X: np.ndarray, y: np.ndarray,
+                    repeats: int = 1) -> Dict[str, Any]:
+    """
+    Precisión y latencia de una secuencia a la vez (carga del traductor)
+
+    Args:
+        engine: Motor de inferencia
+        X: Secuencias sin normalizar
+        y: Etiquetas
+        repeats: Pasadas sobre la muestra para medir la latencia
+
+    Returns:
+        Métricas del motor (incluye 'probabilities' para comparar backends)
+    """
+    latencies = []
+    probabilities = None
+    for _ in range(max(1, repeats)):
+        outputs = []
+        for sequence in X:
+            start = time.perf_counter()
+            outputs.append(engine.predict_proba(sequence)[0])
+            latencies.append(time.perf_counter() - start)
+        probabilities = np.stack(outputs) if outputs else np.empty((0, 0))
+
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        'backend': engine.backend,
+        'accuracy': float(np.mean(np.argmax(probabilities, axis=1) == y)) if len(y) else None,
+        'latency_ms_p50': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+        'latency_ms_p95': float(np.percentile(latencies_ms, 95)) if len(latencies_ms) else None,
+        'probabilities': probabilities
+    }
+
+
+def compare_engines(engines: Dict[str, Tuple[InferenceEngine, str]], X: np.ndarray, y: np.ndarray,
+                    reference: str = 'keras', repeats: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Compara motores contra uno de referencia
+
+    Args:
+        engines: {nombre: (motor, ruta del archivo del modelo)}
+        X, y: Muestra de evaluación
+        reference: Nombre del motor de referencia
+        repeats: Pasadas para medir la latencia
+
+    Returns:
+        {nombre: métricas}, con tamaño, coincidencia con la referencia,
+        diferencia máxima de probabilidad, aceleración y reducción de tamaño
+    """
+    results = {}
+    for name, (engine, path) in engines.items():
+        metrics = evaluate_engine(engine, X, y, repeats)
+        metrics['path'] = path
+        metrics['size_mb'] = os.path.getsize(path) / 1024**2
+        results[name] = metrics
+
+    probabilities = {name: metrics.pop('probabilities') for name, metrics in results.items()}
+    base = results[reference]
+    for name, metrics in results.items():
+        if name != reference:
+            metrics['agreement'] = float(np.mean(np.argmax(probabilities[name], axis=1) ==
+                                                 np.argmax(probabilities[reference], axis=1)))
+            metrics['max_abs_diff'] = float(np.max(np.abs(probabilities[name] - probabilities[reference])))
+        metrics['speedup'] = base['latency_ms_p50'] / metrics['latency_ms_p50']
+        metrics['size_reduction'] = base['size_mb'] / metrics['size_mb']
+    return results
+
+
+def format_comparison(results: Dict[str, Dict[str, Any]]) -> str:
+    """Tabla de texto del reporte de compare_engines"""
+    lines = [f"{'Modelo':<10} {'MB':>7} {'x tamaño':>9} {'p50 ms':>8} {'p95 ms':>8} {'x veloc.':>9} "
+             f"{'Acc':>6} {'Coinc.':>7}"]
+    for name, m in results.items():
+        accuracy = f"{m['accuracy']:.3f}" if m['accuracy'] is not None else '-'
+        agreement = f"{m['agreement']:.3f}" if 'agreement' in m else '-'
+        lines.append(f"{name:<10} {m['size_mb']:>7.2f} {m['size_reduction']:>9.1f} {m['latency_ms_p50']:>8.2f} "
+                     f"{m['latency_ms_p95']:>8.2f} {m['speedup']:>9.1f} {accuracy:>6} {agreement:>7}")
+    return "\n".join(lines)
+
+
+def export_tflite(model_path: str, data_path: str = "data", output_dir: Optional[str] = None,
+                  quantizations: Sequence[str] = TFLITE_QUANTIZATIONS,
+                  num_samples: int = DEFAULT_SAMPLE_SIZE, report: bool = True) -> Dict[str, Any]:
+    """
+    Exporta un modelo .h5 a TFLite y, opcionalmente, genera el reporte comparativo
+
+    Args:
+        model_path: Modelo .h5 entrenado
+        data_path: Carpeta de datos (preprocessing_info.json y muestra representativa)
+        output_dir: Carpeta de salida (por defecto la del modelo)
+        quantizations: Variantes a exportar
+        num_samples: Secuencias de la muestra del reporte
+        report: Comparar las variantes con el modelo Keras
+
+    Returns:
+        {'models': {variante: ruta}, 'report': métricas o None, 'report_path': ruta o None}
+    """
+    from tensorflow import keras
+
+    output_dir = output_dir or os.path.dirname(os.path.abspath(model_path))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+
+    print(f"\n📦 EXPORTANDO {stem} A TFLITE")
+    model = keras.models.load_model(model_path, compile=False)
+    # Longitud variable: TFLite usa la ventana fija del traductor
+    sequence_length = model.input_shape[1] or model_window(data_path)
+
+    exported = {}
+    for quantization in quantizations:
+        start = time.perf_counter()
+        content = convert_to_tflite(model, quantization, sequence_length)
+        path = os.path.join(output_dir, f"{stem}_{quantization}.tflite")
+        with open(path, 'wb') as f:
+            f.write(content)
+        exported[quantization] = path
+        print(f"   ✅ {quantization}: {path} ({len(content) / 1024**2:.2f} MB, "
+              f"{time.perf_counter() - start:.1f}s)")
+
+    result = {'models': exported, 'report': None, 'report_path': None}
+    if report:
+        result.update(write_export_report(model, model_path, exported, data_path, output_dir,
+                                          f"{stem}_export_report.json", num_samples))
+    return result
+
+
+def convert_to_onnx(model, output_path: str, opset: int = DEFAULT_ONNX_OPSET) -> str:
+    """
+    Convierte un modelo Keras a ONNX con entrada 'sequences' (batch libre)
+
+    Args:
+        model: Modelo keras
+        output_path: Ruta del archivo .onnx
+        opset: Versión del opset ONNX
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    try:
+        import tf2onnx
+    except ImportError:
+        raise ImportError("La exportación ONNX requiere tf2onnx: pip install tf2onnx onnxruntime")
+    import tensorflow as tf
+
+    sequence_length, num_features = model.input_shape[1:]
+    signature = [tf.TensorSpec((None, sequence_length, num_features), tf.float32, name='sequences')]
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=opset, output_path=output_path)
+    return output_path
+
+
+def measure_startup(model_path: str, data_path: str = "data") -> Dict[str, Any]:
+    """
+    Arranque en frío de un backend en un proceso nuevo: importar, cargar el
+    modelo y calentarlo (lo que paga el traductor al iniciar)
+
+    Args:
+        model_path: Modelo a cargar con load_inference_engine
+        data_path: Carpeta de datos
+
+    Returns:
+        {'startup_seconds', 'peak_rss_mb' (None sin /proc), 'tensorflow_loaded'}
+    """
+    completed = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT, os.path.abspath(model_path), os.path.abspath(data_path)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def export_onnx(model_path: str, data_path: str = "data", output_dir: Optional[str] = None,
+                opset: int = DEFAULT_ONNX_OPSET, num_samples: int = DEFAULT_SAMPLE_SIZE,
+                report: bool = True, startup: bool = True) -> Dict[str, Any]:
+    """
+    Exporta un modelo .h5 a ONNX y, opcionalmente, genera el reporte comparativo
+
+    Args:
+        model_path: Modelo .h5 entrenado
+        data_path: Carpeta de datos (preprocessing_info.json y muestra representativa)
+        output_dir: Carpeta de salida (por defecto la del modelo)
+        opset: Versión del opset ONNX
+        num_samples: Secuencias de la muestra del reporte
+        report: Comparar con el modelo Keras
+        startup: Incluir en el reporte el arranque y la memoria de cada backend
+
+    Returns:
+        {'models': {'onnx': ruta}, 'report': métricas o None, 'report_path': ruta o None}
+    """
+    from tensorflow import keras
+
+    output_dir = output_dir or os.path.dirname(os.path.abspath(model_path))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+
+    print(f"\n📦 EXPORTANDO {stem} A ONNX")
+    model = keras.models.load_model(model_path, compile=False)
+    start = time.perf_counter()
+    path = convert_to_onnx(model, os.path.join(output_dir, f"{stem}.onnx"), opset)
+    print(f"   ✅ onnx: {path} ({os.path.getsize(path) / 1024**2:.2f} MB, {time.perf_counter() - start:.1f}s)")
+
+    exported = {'onnx': path}
+    result = {'models': exported, 'report': None, 'report_path': None}
+    if report:
+        result.update(write_export_report(model, model_path, exported, data_path, output_dir,
+                                          f"{stem}_onnx_report.json", num_samples, startup))
+    return result
+
+
+def export_numpy(model_path: str, data_path: str = "data", output_dir: Optional[str] = None,
+                 num_samples: int = DEFAULT_SAMPLE_SIZE, report: bool = True,
+                 startup: bool = True) -> Dict[str, Any]:
+    """
+    Exporta los pesos de un modelo .h5 a un NPZ para el backend NumPy y,
+    opcionalmente, genera el reporte comparativo
+
+    Args:
+        model_path: Modelo .h5 entrenado
+        data_path: Carpeta de datos (preprocessing_info.json y muestra representativa)
+        output_dir: Carpeta de salida (por defecto la del modelo)
+        num_samples: Secuencias de la muestra del reporte
+        report: Comparar con el modelo Keras
+        startup: Incluir en el reporte el arranque y la memoria de cada backend
+
+    Returns:
+        {'models': {'numpy': ruta}, 'report': métricas o None, 'report_path': ruta o None}
+    """
+    from tensorflow import keras
+
+    output_dir = output_dir or os.path.dirname(os.path.abspath(model_path))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+
+    print(f"\n📦 EXPORTANDO {stem} A NUMPY")
+    model = keras.models.load_model(model_path, compile=False)
+    path = os.path.join(output_dir, f"{stem}.npz")
+    export_numpy_weights(model, path)
+    print(f"   ✅ numpy: {path} ({os.path.getsize(path) / 1024**2:.2f} MB)")
+
+    exported = {'numpy': path}
+    result = {'models': exported, 'report': None, 'report_path': None}
+    if report:
+        result.update(write_export_report(model, model_path, exported, data_path, output_dir,
+                                          f"{stem}_numpy_report.json", num_samples, startup))
+    return result
+
+
+def write_export_report(model, model_path: str, exported: Dict[str, str], data_path: str, output_dir: str,
+                        report_name: str, num_samples: int = DEFAULT_SAMPLE_SIZE,
+                        startup: bool = False) -> Dict[str, Any]:
+    """
+    Compara los modelos exportados con el modelo Keras y guarda el reporte JSON
+
+    Args:
+        model: Modelo keras cargado
+        model_path: Ruta del modelo .h5
+        exported: {variante: ruta del modelo exportado}
+        data_path: Carpeta de datos
+        output_dir: Carpeta del reporte
+        report_name: Nombre del archivo del reporte
+        num_samples: Secuencias de la muestra
+        startup: Medir arranque en frío y memoria de cada backend (un proceso por modelo)
+
+    Returns:
+        {'report': métricas o None, 'report_path': ruta o None}
+    """
+    preprocessing_info = read_preprocessing_info(os.path.join(data_path, 'metadata', 'preprocessing_info.json'))
+    class_names = (preprocessing_info or {}).get('label_encoder_classes')
+    if not class_names:
+        print("⚠️ Sin clases en preprocessing_info.json: no se genera el reporte")
+        return {'report': None, 'report_path': None}
+
+    X, y = load_representative_sample(data_path, class_names, model.input_shape[1] or model_window(data_path),
+                                      num_samples)
+    engines = {'keras': (KerasInferenceEngine(model, preprocessing_info), model_path)}
+    for name, path in exported.items():
+        engines[name] = (load_inference_engine(path, data_path=data_path), path)
+    comparison = compare_engines(engines, X, y)
+
+    print(f"\n📊 COMPARACIÓN ({len(X)} secuencias de {data_path}):")
+    print(format_comparison(comparison))
+
+    if startup:
+        print("\n⏱️ Arranque en frío (proceso nuevo: importar + cargar + calentar):")
+        for name, (_, path) in engines.items():
+            comparison[name].update(measure_startup(path, data_path))
+            rss = comparison[name]['peak_rss_mb']
+            print(f"   {name:<10} {comparison[name]['startup_seconds']:6.2f}s  "
+                  f"{'-' if rss is None else f'{rss:.0f} MB':>8}  "
+                  f"TensorFlow: {'sí' if comparison[name]['tensorflow_loaded'] else 'no'}")
+
+    report_path = os.path.join(output_dir, report_name)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'model': model_path, 'samples': int(len(X)), 'created': datetime.now().isoformat(),
+                   'results': comparison}, f, indent=2, ensure_ascii=False)
+    print(f"💾 Reporte guardado en: {report_path}")
+    return {'report': comparison, 'report_path': report_path}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exportación de modelos GRU para despliegue")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    tflite_parser = subparsers.add_parser('tflite', help="Exportar a TFLite (float16 / int8) con reporte")
+    tflite_parser.add_argument('model', help="Modelo .h5 entrenado")
+    tflite_parser.add_argument('--data', default='data', help="Carpeta de datos")
+    tflite_parser.add_argument('-o', '--output-dir', default=None, help="Carpeta de salida (por defecto la del modelo)")
+    tflite_parser.add_argument('--quantization', action='append', choices=TFLITE_QUANTIZATIONS, default=None,
+                               help="Variante a exportar (repetible; por defecto todas)")
+    tflite_parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_SIZE,
+                               help="Secuencias de la muestra del reporte")
+    tflite_parser.add_argument('--no-report', action='store_true', help="Solo exportar")
+
+    onnx_parser = subparsers.add_parser('onnx', help="Exportar a ONNX (onnxruntime) con reporte")
+    onnx_parser.add_argument('model', help="Modelo .h5 entrenado")
+    onnx_parser.add_argument('--data', default='data', help="Carpeta de datos")
+    onnx_parser.add_argument('-o', '--output-dir', default=None, help="Carpeta de salida (por defecto la del modelo)")
+    onnx_parser.add_argument('--opset', type=int, default=DEFAULT_ONNX_OPSET, help="Versión del opset ONNX")
+    onnx_parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_SIZE,
+                             help="Secuencias de la muestra del reporte")
+    onnx_parser.add_argument('--no-report', action='store_true', help="Solo exportar")
+    onnx_parser.add_argument('--no-startup', action='store_true', help="No medir arranque ni memoria")
+
+    numpy_parser = subparsers.add_parser('numpy', help="Exportar los pesos a NPZ (backend NumPy) con reporte")
+    numpy_parser.add_argument('model', help="Modelo .h5 entrenado")
+    numpy_parser.add_argument('--data', default='data', help="Carpeta de datos")
+    numpy_parser.add_argument('-o', '--output-dir', default=None, help="Carpeta de salida (por defecto la del modelo)")
+    numpy_parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_SIZE,
+                              help="Secuencias de la muestra del reporte")
+    numpy_parser.add_argument('--no-report', action='store_true', help="Solo exportar")
+    numpy_parser.add_argument('--no-startup', action='store_true', help="No medir arranque ni memoria")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'numpy':
+        export_numpy(args.model, data_path=args.data, output_dir=args.output_dir,
+                     num_samples=args.samples, report=not args.no_report, startup=not args.no_startup)
+        return 0
+
+    if args.command == 'onnx':
+        export_onnx(args.model, data_path=args.data, output_dir=args.output_dir, opset=args.opset,
+                    num_samples=args.samples, report=not args.no_report, startup=not args.no_startup)
+        return 0
+
+    export_tflite(args.model, data_path=args.data, output_dir=args.output_dir,
+                  quantizations=args.quantization or TFLITE_QUANTIZATIONS,
+                  num_samples=args.samples, report=not args.no_report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+Model Registry - Registro de modelos, caché LRU y cambio en caliente
+Mantiene un índice (models/model_index.json) con los metadatos de cada
+modelo (backend, forma de entrada, clases, accuracy, fecha de creación) que
+solo se recalculan cuando el archivo cambia; una caché LRU de motores ya
+cargados y calentados con límite de memoria; y un puntero al modelo activo
+que se cambia sin cortar el servicio: el nuevo modelo se carga en segundo
+plano y se publica con una sola asignación.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .inference_engine import MODEL_BACKENDS, InferenceEngine, load_inference_engine, read_preprocessing_info
+
+
+INDEX_FILE = 'model_index.json'
+INDEX_VERSION = 1
+DEFAULT_CACHE_MB = 512.0
+
+
+def read_model_signature(path: str) -> Dict[str, Any]:
+    """
+    Forma de entrada y número de clases sin cargar el modelo
+
+    Lee model_config de los .h5 de Keras y la configuración de los .npz de
+    export_numpy_weights; los .tflite/.onnx heredan la de su .h5 de origen.
+
+    Returns:
+        {'input_shape': [T, F] (T None = longitud variable), 'num_classes'} o {} si no se puede leer
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == '.h5':
+            import h5py  # Importación diferida: solo al indexar un .h5 nuevo
+            with h5py.File(path, 'r') as f:
+                config = f.attrs.get('model_config')
+            if config is None:
+                return {}
+            layers = json.loads(config if isinstance(config, str) else config.decode('utf-8'))['config']['layers']
+            input_shape = layers[0]['config']['batch_input_shape'][1:]
+            units = next(layer['config']['units'] for layer in reversed(layers) if 'units' in layer['config'])
+            return {'input_shape': list(input_shape), 'num_classes': int(units)}
+        if extension == '.npz':
+            from .numpy_gru import CONFIG_KEY
+            with np.load(path) as saved:
+                config = json.loads(str(saved[CONFIG_KEY]))
+            return {'input_shape': [config['sequence_length'], config['num_features']],
+                    'num_classes': config['num_classes']}
+    except (OSError, KeyError, ValueError, StopIteration) as e:
+        print(f"⚠️ No se pudo leer la firma de {os.path.basename(path)}: {e}")
+    return {}
+
+
+class ModelRegistry:
+    """
+    Índice persistente de los modelos de una carpeta
+
+    refresh() compara tamaño y fecha de modificación de cada archivo con el
+    índice: solo los modelos nuevos o cambiados se inspeccionan, y los
+    borrados salen del índice.
+    """
+
+    def __init__(self, models_path: str = "models", data_path: str = "data", logs_path: str = "logs"):
+        """
+        Args:
+            models_path: Carpeta de modelos (y del índice)
+            data_path: Carpeta de datos (preprocessing_info.json con las clases)
+            logs_path: Carpeta con los <modelo>_config.json del entrenamiento (accuracy)
+        """
+        self.models_path = models_path
+        self.data_path = data_path
+        self.logs_path = logs_path
+        self.index_path = os.path.join(models_path, INDEX_FILE)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                self.entries = index.get('models', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save_index(self):
+        # Escritura atómica: otro proceso nunca ve un índice a medio escribir
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'models': self.entries}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Sincroniza el índice con la carpeta de modelos
+
+        Returns:
+            Entradas del índice por nombre de archivo
+        """
+        if not os.path.isdir(self.models_path):
+            self.entries = {}
+            return self.entries
+
+        files = sorted(name for name in os.listdir(self.models_path)
+                       if os.path.splitext(name)[1].lower() in MODEL_BACKENDS)
+        changed = set(self.entries) != set(files)
+        entries = {}
+        for name in files:
+            stat = os.stat(os.path.join(self.models_path, name))
+            entry = self.entries.get(name)
+            if entry is None or entry['size_bytes'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                entry = None
+                changed = True
+            entries[name] = entry or {'size_bytes': stat.st_size, 'mtime': stat.st_mtime}
+
+        # Metadatos de los nuevos: primero los .h5 (los exportados heredan de ellos)
+        preprocessing_info = None
+        for name in sorted(entries, key=lambda n: not n.endswith('.h5')):
+            if 'backend' not in entries[name]:
+                if preprocessing_info is None:
+                    preprocessing_info = read_preprocessing_info(
+                        os.path.join(self.data_path, 'metadata', 'preprocessing_info.json')) or {}
+                entries[name].update(self._describe(name, entries, preprocessing_info))
+
+        self.entries = entries
+        if changed:
+            os.makedirs(self.models_path, exist_ok=True)
+            self._save_index()
+        return self.entries
+
+    def _describe(self, name: str, entries: Dict[str, Dict[str, Any]],
+                  preprocessing_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadatos de un modelo nuevo o modificado"""
+        stem, extension = os.path.splitext(name)
+        # Modelo de origen: el .h5 cuyo nombre es prefijo de este (exportaciones de model_export)
+        sources = [other for other in entries if other.endswith('.h5') and other != name
+                   and stem.startswith(os.path.splitext(other)[0])]
+        source = max(sources, key=len) if sources else None
+
+        signature = read_model_signature(os.path.join(self.models_path, name))
+        if not signature and source:
+            signature = {key: entries[source].get(key) for key in ('input_shape', 'num_classes')}
+
+        source_stem = os.path.splitext(source or name)[0]
+        accuracy = None
+        try:
+            with open(os.path.join(self.logs_path, f"{source_stem}_config.json"), 'r', encoding='utf-8') as f:
+                accuracy = json.load(f).get('best_val_accuracy')
+        except (OSError, ValueError):
+            pass
+
+        classes = preprocessing_info.get('label_encoder_classes')
+        if classes is not None and len(classes) != signature.get('num_classes'):
+            classes = None  # Las clases de los datos actuales no corresponden a este modelo
+
+        return {
+            'backend': MODEL_BACKENDS[extension.lower()],
+            'input_shape': signature.get('input_shape'),
+            'num_classes': signature.get('num_classes'),
+            'class_names': list(classes) if classes is not None else None,
+            'val_accuracy': accuracy,
+            'source': source,
+            'created': datetime.fromtimestamp(entries[name]['mtime']).isoformat(timespec='seconds')
+        }
+
+    def list_models(self, backends: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Modelos del índice (refrescado), del más antiguo al más reciente
+
+        Args:
+            backends: Filtrar por backend ('keras', 'tflite', 'onnx', 'numpy')
+        """
+        entries = self.refresh()
+        names = [name for name, entry in entries.items() if backends is None or entry['backend'] in backends]
+        return sorted(names, key=lambda name: (entries[name]['mtime'], name))
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Metadatos de un modelo (KeyError si no está en la carpeta)"""
+        if name not in self.entries:
+            self.refresh()
+        return self.entries[name]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.models_path, name)
+
+    def describe(self, name: str) -> str:
+        """Resumen de una línea para los menús"""
+        entry = self.get(name)
+        shape = entry.get('input_shape')
+        shape_text = 'x'.join('T' if d is None else str(d) for d in shape) if shape else '?'
+        accuracy = entry.get('val_accuracy')
+        return (f"{entry['backend']}, entrada {shape_text}, {entry.get('num_classes') or '?'} clases, "
+                f"val_acc {'-' if accuracy is None else f'{accuracy:.1%}'}, "
+                f"{entry['size_bytes'] / 1024**2:.1f} MB, creado {entry['created'].replace('T', ' ')}")
+
+
+def estimate_engine_memory(engine: InferenceEngine, model_path: str) -> int:
+    """
+    Memoria aproximada de un motor cargado en bytes: los pesos en memoria
+    para Keras y el tamaño del archivo para el resto de backends
+    """
+    model = getattr(engine, 'model', None)
+    if model is not None:
+        return int(sum(np.prod(weight.shape) * weight.dtype.size for weight in model.weights))
+    return os.path.getsize(model_path)
+
+
+class ModelCache:
+    """
+    Caché LRU de motores cargados y calentados
+
+    Al superar max_memory_mb se descartan los menos usados (nunca el que se
+    acaba de cargar). Los motores se cargan fuera del candado global: mientras
+    un modelo carga en segundo plano, los ya cargados siguen disponibles.
+    """
+
+    def __init__(self, registry: ModelRegistry,
+                 max_memory_mb: float = DEFAULT_CACHE_MB,
+                 **engine_options):
+        """
+        Args:
+            registry: Registro de modelos
+            max_memory_mb: Límite de memoria estimada de los motores cargados
+            **engine_options: Opciones de load_inference_engine (jit_compile, num_threads, ...)
+        """
+        self.registry = registry
+        self.max_memory_bytes = int(max_memory_mb * 1024**2)
+        self.engine_options = engine_options
+        self._engines: 'OrderedDict[str, InferenceEngine]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._engines
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, name: str) -> InferenceEngine:
+        """
+        Motor de un modelo: de la caché o recién cargado y calentado
+
+        Args:
+            name: Nombre de archivo del modelo en la carpeta del registro
+
+        Returns:
+            Motor listo para predecir
+        """
+        with self._lock:
+            if name in self._engines:
+                self._engines.move_to_end(name)
+                self.stats['hits'] += 1
+                return self._engines[name]
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        # Un solo hilo carga cada modelo; los demás esperan su resultado
+        with loading:
+            with self._lock:
+                if name in self._engines:
+                    self._engines.move_to_end(name)
+                    self.stats['hits'] += 1
+                    return self._engines[name]
+
+            path = self.registry.path(name)
+            try:
+                engine = load_inference_engine(path, data_path=self.registry.data_path, **self.engine_options)
+                size = estimate_engine_memory(engine, path)
+
+                with self._lock:
+                    self._engines[name] = engine
+                    self._sizes[name] = size
+                    self.stats['misses'] += 1
+                    while len(self._engines) > 1 and sum(self._sizes.values()) > self.max_memory_bytes:
+                        evicted, _ = self._engines.popitem(last=False)
+                        self._sizes.pop(evicted)
+                        self.stats['evictions'] += 1
+            finally:
+                # También si la carga falla: el siguiente get vuelve a intentarlo
+                with self._lock:
+                    self._loading.pop(name, None)
+        return engine
+
+    def clear(self):
+        """Descarta todos los motores (p. ej. al cambiar engine_options)"""
+        with self._lock:
+            self._engines.clear()
+            self._sizes.clear()
+
+
+class ActiveModel:
+    """
+    Puntero al modelo en uso con cambio sin interrupción
+
+    switch() carga el nuevo modelo (por la caché) en un hilo y lo publica con
+    una única asignación de la tupla (nombre, motor): quien lea `engine`
+    durante la carga sigue obteniendo el modelo anterior, nunca un estado
+    intermedio. Cada petición lleva un número de generación y solo se publica
+    la última: una carga lenta anterior no sustituye a un cambio posterior.
+    """
+
+    def __init__(self, cache: ModelCache):
+        self.cache = cache
+        self._active = (None, None)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._active[0]
+
+    @property
+    def engine(self) -> Optional[InferenceEngine]:
+        return self._active[1]
+
+    def switch(self, name: str, background: bool = True,
+               on_ready: Optional[Callable[[Optional[InferenceEngine]], None]] = None) -> Optional[InferenceEngine]:
+        """
+        Cambia el modelo activo
+
+        Args:
+            name: Modelo a activar
+            background: Cargar en un hilo (el modelo actual sigue activo mientras tanto)
+            on_ready: Llamada con el motor nuevo (o None si falló la carga); no se
+                llama si un cambio posterior sustituyó a este
+
+        Returns:
+            El motor nuevo si background=False (None si falló o fue sustituido);
+            None en segundo plano
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+
+        def load():
+            try:
+                engine, error = self.cache.get(name), None
+            except Exception as e:
+                engine, error = None, e
+            with self._lock:
+                if generation != self._generation:
+                    # Hay una petición más reciente: esta carga queda en la caché sin publicarse
+                    return None
+                self.last_error = error
+                if engine is not None:
+                    self._active = (name, engine)
+            if on_ready is not None:
+                on_ready(engine)
+            return engine
+
+        if not background:
+            return load()
+        self._thread = threading.Thread(target=load, name=f"lsp-switch-{name}", daemon=True)
+        self._thread.start()
+        return None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el cambio en curso; True si ya no hay ninguno"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
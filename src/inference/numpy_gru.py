@@ -0,0 +1,228 @@
+"""
+NumPy GRU - Inferencia del clasificador GRU solo con NumPy
+Ejecuta la arquitectura de GRUModelBuilder (LayerNorm → BiGRU → atención →
+Dense) a partir de un NPZ compacto con los pesos, sin TensorFlow: el módulo
+importa en milisegundos y el proceso del kiosco no carga el runtime de TF.
+
+Las dos direcciones de cada BiGRU avanzan juntas: las proyecciones de
+entrada de toda la secuencia se calculan con una sola multiplicación y en
+cada paso la recurrente es un matmul por lotes (2, N, U) @ (2, U, 3U) sobre
+buffers de estado preasignados.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import json
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+NPZ_FORMAT_VERSION = 1
+CONFIG_KEY = '__config__'
+
+
+def export_numpy_weights(model, output_path: str) -> Dict[str, Any]:
+    """
+    Guarda los pesos de un modelo de GRUModelBuilder en un NPZ
+
+    Args:
+        model: Modelo keras construido por GRUModelBuilder
+        output_path: Ruta del archivo .npz
+
+    Returns:
+        Configuración de la arquitectura guardada junto a los pesos
+    """
+    layer_names = {layer.name for layer in model.layers}
+    weights = {}
+
+    def layer_norm(name: str) -> float:
+        layer = model.get_layer(name)
+        weights[f"{name}/gamma"], weights[f"{name}/beta"] = layer.get_weights()
+        return float(layer.epsilon)
+
+    def dense(name: str):
+        weights[f"{name}/kernel"], weights[f"{name}/bias"] = model.get_layer(name).get_weights()
+
+    sequence_length, num_features = model.input_shape[1:]
+    config = {
+        'format_version': NPZ_FORMAT_VERSION,
+        'sequence_length': None if sequence_length is None else int(sequence_length),
+        'num_features': int(num_features),
+        'num_classes': int(model.output_shape[-1]),
+        'input_epsilon': layer_norm('input_normalization'),
+        'gru_layers': [],
+        'use_attention': 'attention_dense' in layer_names,
+        # Modelos con Masking: la atención es la suma ponderada sobre los frames reales
+        'variable_length': 'input_masking' in layer_names
+    }
+
+    i = 1
+    while f"bidirectional_gru_{i}" in layer_names:
+        bidirectional = model.get_layer(f"bidirectional_gru_{i}")
+        directions = (bidirectional.forward_layer, bidirectional.backward_layer)
+        for gru in directions:
+            if (not gru.reset_after or gru.activation.__name__ != 'tanh'
+                    or gru.recurrent_activation.__name__ != 'sigmoid'):
+                raise ValueError(f"{gru.name}: solo se soportan GRU con reset_after=True, tanh y sigmoid")
+        if bidirectional.merge_mode != 'concat':
+            raise ValueError(f"{bidirectional.name}: solo se soporta merge_mode='concat'")
+
+        # (2, ...) = [adelante, atrás]
+        kernels, recurrent_kernels, biases = zip(*(gru.get_weights() for gru in directions))
+        prefix = f"bidirectional_gru_{i}"
+        weights[f"{prefix}/kernel"] = np.stack(kernels)
+        weights[f"{prefix}/recurrent_kernel"] = np.stack(recurrent_kernels)
+        weights[f"{prefix}/bias"] = np.stack(biases)  # (2, 2, 3U): [dirección, entrada/recurrente]
+
+        layer_config = {'units': int(directions[0].units),
+                        'return_sequences': bool(directions[0].return_sequences),
+                        'layer_norm_epsilon': None}
+        if f"layer_norm_{i}" in layer_names:
+            layer_config['layer_norm_epsilon'] = layer_norm(f"layer_norm_{i}")
+        config['gru_layers'].append(layer_config)
+        i += 1
+
+    if config['use_attention']:
+        dense('attention_dense')
+    dense('dense_hidden')
+    dense('classification_output')
+
+    arrays = {name: np.asarray(value, dtype=np.float32) for name, value in weights.items()}
+    np.savez(output_path, **{CONFIG_KEY: np.array(json.dumps(config))}, **arrays)
+    return config
+
+
+def _sigmoid(x: np.ndarray, out: np.ndarray) -> np.ndarray:
+    np.negative(x, out=out)
+    np.exp(out, out=out)
+    out += 1.0
+    return np.reciprocal(out, out=out)
+
+
+def _layer_norm(x: np.ndarray, gamma: np.ndarray, beta: np.ndarray, epsilon: float) -> np.ndarray:
+    mean = x.mean(axis=-1, keepdims=True)
+    variance = x.var(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(variance + epsilon) * gamma + beta
+
+
+def _softmax(x: np.ndarray, axis: int) -> np.ndarray:
+    exp = np.exp(x - x.max(axis=axis, keepdims=True))
+    return exp / exp.sum(axis=axis, keepdims=True)
+
+
+class NumpyGRUClassifier:
+    """
+    Forward pass del clasificador GRU con los pesos de export_numpy_weights
+
+    Los buffers de estado y de compuertas se reservan una vez por tamaño de
+    batch y se reutilizan entre llamadas (la ventana deslizante usa batch 1).
+    """
+
+    def __init__(self, weights: Dict[str, np.ndarray], config: Dict[str, Any]):
+        """
+        Args:
+            weights: Pesos por nombre ('<capa>/<peso>')
+            config: Configuración de la arquitectura
+        """
+        if config.get('format_version') != NPZ_FORMAT_VERSION:
+            raise ValueError(f"Versión de NPZ no soportada: {config.get('format_version')}")
+        self.weights = weights
+        self.config = config
+        self.sequence_length = config['sequence_length']
+        self.num_features = config['num_features']
+        self.num_classes = config['num_classes']
+        self._buffers = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyGRUClassifier':
+        """Carga un NPZ escrito por export_numpy_weights"""
+        with np.load(path, allow_pickle=False) as saved:
+            config = json.loads(str(saved[CONFIG_KEY]))
+            weights = {name: saved[name] for name in saved.files if name != CONFIG_KEY}
+        return cls(weights, config)
+
+    def _gru_buffers(self, layer: int, batch_size: int, units: int) -> Tuple[np.ndarray, ...]:
+        """Estado (2, N, U), proyección recurrente (2, N, 3U) y compuertas (2, N, U)"""
+        key = (layer, batch_size)
+        if key not in self._buffers:
+            self._buffers[key] = (
+                np.empty((2, batch_size, units), dtype=np.float32),      # h
+                np.empty((2, batch_size, 3 * units), dtype=np.float32),  # h @ R + b_r
+                np.empty((2, batch_size, units), dtype=np.float32),      # z
+                np.empty((2, batch_size, units), dtype=np.float32),      # r
+                np.empty((2, batch_size, units), dtype=np.float32),      # candidato
+            )
+        return self._buffers[key]
+
+    def _bidirectional_gru(self, x: np.ndarray, index: int, units: int, return_sequences: bool) -> np.ndarray:
+        prefix = f"bidirectional_gru_{index}"
+        kernel = self.weights[f"{prefix}/kernel"]               # (2, F, 3U)
+        recurrent_kernel = self.weights[f"{prefix}/recurrent_kernel"]  # (2, U, 3U)
+        bias = self.weights[f"{prefix}/bias"]                   # (2, 2, 3U)
+        batch_size, steps, features = x.shape
+
+        # Proyecciones de entrada de ambas direcciones y todos los pasos a la vez;
+        # la dirección hacia atrás se invierte en el tiempo para avanzar con el mismo índice
+        projections = np.matmul(x.reshape(1, batch_size * steps, features), kernel)
+        projections = projections.reshape(2, batch_size, steps, 3 * units)
+        projections += bias[:, 0, None, None, :]
+        projections[1] = projections[1, :, ::-1]
+
+        h, recurrent, z, r, candidate = self._gru_buffers(index, batch_size, units)
+        h.fill(0.0)
+        recurrent_bias = bias[:, 1, None, :]
+        outputs = np.empty((batch_size, steps, 2 * units), dtype=np.float32) if return_sequences else None
+
+        for t in range(steps):
+            step = projections[:, :, t]
+            np.matmul(h, recurrent_kernel, out=recurrent)
+            recurrent += recurrent_bias
+            _sigmoid(step[..., :units] + recurrent[..., :units], out=z)
+            _sigmoid(step[..., units:2 * units] + recurrent[..., units:2 * units], out=r)
+            # reset_after=True: el reset se aplica después de la proyección recurrente
+            np.multiply(r, recurrent[..., 2 * units:], out=candidate)
+            candidate += step[..., 2 * units:]
+            np.tanh(candidate, out=candidate)
+            # h = z * h + (1 - z) * candidato
+            h -= candidate
+            h *= z
+            h += candidate
+            if return_sequences:
+                outputs[:, t, :units] = h[0]
+                outputs[:, steps - 1 - t, units:] = h[1]
+
+        if return_sequences:
+            return outputs
+        return np.concatenate([h[0], h[1]], axis=-1)
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Probabilidades por clase
+
+        Args:
+            batch: Secuencias normalizadas (N, T, F)
+
+        Returns:
+            Array (N, num_classes)
+        """
+        w = self.weights
+        x = _layer_norm(np.asarray(batch, dtype=np.float32), w['input_normalization/gamma'],
+                        w['input_normalization/beta'], self.config['input_epsilon'])
+
+        for index, layer in enumerate(self.config['gru_layers'], start=1):
+            x = self._bidirectional_gru(x, index, layer['units'], layer['return_sequences'])
+            if layer['layer_norm_epsilon'] is not None:
+                x = _layer_norm(x, w[f"layer_norm_{index}/gamma"], w[f"layer_norm_{index}/beta"],
+                                layer['layer_norm_epsilon'])
+
+        if self.config['use_attention']:
+            # Dense(1, tanh) → softmax en el tiempo → promedio ponderado (GlobalAveragePooling1D);
+            # en longitud variable, suma ponderada (los batches no llevan relleno)
+            scores = np.tanh(x @ w['attention_dense/kernel'] + w['attention_dense/bias'])
+            weighted = x * _softmax(scores, axis=1)
+            x = weighted.sum(axis=1) if self.config.get('variable_length') else weighted.mean(axis=1)
+
+        x = np.maximum(x @ w['dense_hidden/kernel'] + w['dense_hidden/bias'], 0.0)
+        return _softmax(x @ w['classification_output/kernel'] + w['classification_output/bias'], axis=-1)
@@ -7,13 +7,15 @@ Versión: 2.0 - Julio 2025
 """
 
 import os
-import cv2
 import time
 import numpy as np
 from datetime import datetime
 from collections import deque
 from typing import List, Tuple, Dict, Any, Optional
 
+from .model_registry import ActiveModel, ModelCache, ModelRegistry
+from .sign_segmenter import SignToken, StreamingSignSegmenter
+
 
 class RealTimeTranslator:
     """
@@ -22,7 +24,12 @@ class RealTimeTranslator:
     
     def __init__(self):
         self.models_path = "models"
+        self.data_path = "data"
         self.sequence_length = 60
+        self.jit_compile = False
+        self.registry = ModelRegistry(self.models_path, self.data_path)
+        self.model_cache = ModelCache(self.registry, jit_compile=self.jit_compile)
+        self.active_model = ActiveModel(self.model_cache)
         self.confidence_threshold = 0.7
         self.prediction_buffer = deque(maxlen=5)  # Buffer para suavizar predicciones
         
@@ -34,6 +41,15 @@ class RealTimeTranslator:
         print("   • Interfaz visual intuitiva")
         print("   • Grabación de sesiones")
     
+    @property
+    def engine(self):
+        """Motor del modelo activo (el anterior sigue aquí durante un cambio)"""
+        return self.active_model.engine
+    
+    @property
+    def model_name(self) -> Optional[str]:
+        return self.active_model.name
+    
     def show_inference_menu(self):
         """Muestra el menú de opciones de inferencia"""
         print("\n" + "="*60)
@@ -55,29 +71,54 @@ class RealTimeTranslator:
             print("❌ Carpeta de modelos no encontrada")
             return []
         
-        model_files = [f for f in os.listdir(self.models_path) if f.endswith('.h5')]
+        model_files = self.registry.list_models()
         
         if not model_files:
-            print("❌ No se encontraron modelos entrenados (.h5)")
+            print("❌ No se encontraron modelos entrenados (.h5 / .tflite / .onnx / .npz)")
             print("💡 Ejecuta primero el módulo de Entrenamiento")
             return []
         
         print(f"🧠 Modelos disponibles ({len(model_files)}):")
         for i, model_file in enumerate(model_files, 1):
-            # Extraer información del nombre del archivo
-            creation_time = "Desconocido"
-            try:
-                file_path = os.path.join(self.models_path, model_file)
-                timestamp = os.path.getctime(file_path)
-                creation_time = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
-            except:
-                pass
-            
-            print(f"   {i}. {model_file}")
-            print(f"      └─ Creado: {creation_time}")
+            status = " (activo)" if model_file == self.model_name else \
+                " (en caché)" if model_file in self.model_cache else ""
+            print(f"   {i}. {model_file}{status}")
+            print(f"      └─ {self.registry.describe(model_file)}")
         
         return model_files
     
+    def load_model(self, model_file: str, background: bool = False) -> bool:
+        """
+        Activa un modelo: de la caché de modelos o cargándolo en su motor (con calentamiento)
+        
+        Args:
+            model_file: Archivo de modelo dentro de models_path
+            background: Cargar en segundo plano; el modelo actual sigue
+                traduciendo hasta que el nuevo esté listo
+            
+        Returns:
+            True si el modelo quedó listo (o su carga quedó en curso)
+        """
+        start = time.perf_counter()
+        cached = model_file in self.model_cache
+        
+        def on_ready(engine):
+            if engine is None:
+                print(f"❌ Error cargando modelo: {self.active_model.last_error}")
+                return
+            self.sequence_length = engine.sequence_length
+            self.prediction_buffer.clear()
+            xla = ', XLA' if self.jit_compile and engine.backend == 'keras' else ''
+            origin = 'desde caché' if cached else \
+                f"calentamiento: {engine.warmup_seconds.get(1, 0.0) * 1000:.0f} ms"
+            print(f"✅ Modelo {model_file} listo en {time.perf_counter() - start:.2f}s "
+                  f"(backend: {engine.backend}{xla}, {origin})")
+        
+        if background:
+            self.active_model.switch(model_file, background=True, on_ready=on_ready)
+            return True
+        return self.active_model.switch(model_file, background=False, on_ready=on_ready) is not None
+    
     def start_live_translation(self):
         """Inicia traducción en tiempo real"""
         print("\n🎥 INICIANDO TRADUCCIÓN EN VIVO")
@@ -104,6 +145,8 @@ class RealTimeTranslator:
             selected_model = models[-1]
         
         print(f"\n🧠 Cargando modelo: {selected_model}")
+        if not self.load_model(selected_model):
+            return
         print("📹 Iniciando cámara...")
         
         # Simulación de traducción en vivo
@@ -147,6 +190,7 @@ class RealTimeTranslator:
         print("="*35)
         
         print("📂 Formatos soportados: .mp4, .avi, .mov, .mkv")
+        print("🧮 También: .npy con features ya extraídas (frames, 157), flujo sin segmentar")
         print("💡 El video debe mostrar señas claras con buena iluminación")
         
         video_path = input("\n📁 Ruta del archivo de video: ").strip()
@@ -159,6 +203,10 @@ class RealTimeTranslator:
             print(f"❌ Archivo no encontrado: {video_path}")
             return
         
+        if video_path.endswith('.npy'):
+            self.translate_feature_stream(np.load(video_path))
+            return
+        
         print(f"📹 Procesando video: {os.path.basename(video_path)}")
         print("⚠️ Funcionalidad en desarrollo")
         print("🔧 Incluirá:")
@@ -167,6 +215,34 @@ class RealTimeTranslator:
         print("   • Traducción secuencial")
         print("   • Exportación de resultados")
     
+    def translate_feature_stream(self, frames: np.ndarray) -> List[SignToken]:
+        """
+        Traduce un flujo continuo de features (varias señas seguidas con
+        pausas): el segmentador clasifica solo los segmentos con movimiento
+        
+        Args:
+            frames: Array (frames, features) en el orden del flujo
+            
+        Returns:
+            Tokens reconocidos, sin repeticiones consecutivas
+        """
+        if self.engine is None:
+            models = self.list_available_models()
+            if not models or not self.load_model(models[-1]):
+                return []
+        
+        segmenter = StreamingSignSegmenter(self.engine, confidence_threshold=self.confidence_threshold)
+        tokens = segmenter.process(frames)
+        summary = segmenter.summary()
+        
+        for token in tokens:
+            print(f"   🎯 '{token.label}' (confianza: {token.confidence:.1%}, "
+                  f"frames {token.start_frame}-{token.end_frame})")
+        print(f"📝 Traducción: {' '.join(token.label for token in tokens) or '(sin señas)'}")
+        print(f"⚡ Clasificaciones: {summary['classified']} en {summary['frames']} frames "
+              f"({summary['idle_ratio']:.0%} de frames en reposo sin clasificar)")
+        return tokens
+    
     def configure_parameters(self):
         """Configura parámetros de traducción"""
         print("\n⚙️ CONFIGURACIÓN DE PARÁMETROS")
@@ -178,12 +254,14 @@ class RealTimeTranslator:
         print(f"   • Buffer de predicciones: {self.prediction_buffer.maxlen}")
         print("   • Suavizado: Activado")
         print("   • Normalización: Automática")
+        print(f"   • Compilación XLA: {'Activada' if self.jit_compile else 'Desactivada'}")
         
         print("\n⚙️ Opciones de configuración:")
         print("   1. Cambiar umbral de confianza")
         print("   2. Ajustar buffer de predicciones")
         print("   3. Configurar suavizado")
         print("   4. Restablecer valores por defecto")
+        print("   5. Activar/desactivar compilación XLA")
         
         choice = input("\n👆 Selecciona opción (Enter para mantener): ").strip()
         
@@ -199,7 +277,19 @@ class RealTimeTranslator:
                 print("❌ Valor inválido")
         elif choice == '4':
             self.confidence_threshold = 0.7
+            if self.jit_compile:
+                self.jit_compile = False
+                self.model_cache.engine_options['jit_compile'] = False
+                self.model_cache.clear()
             print("✅ Configuración restablecida")
+        elif choice == '5':
+            self.jit_compile = not self.jit_compile
+            print(f"✅ Compilación XLA {'activada' if self.jit_compile else 'desactivada'}")
+            # Los motores en caché se compilaron con la opción anterior
+            self.model_cache.engine_options['jit_compile'] = self.jit_compile
+            self.model_cache.clear()
+            if self.model_name:
+                self.load_model(self.model_name)
     
     def change_model(self):
         """Cambia el modelo de traducción"""
@@ -217,11 +307,13 @@ class RealTimeTranslator:
             if 0 <= model_idx < len(models):
                 selected_model = models[model_idx]
                 print(f"\n🔄 Cambiando a modelo: {selected_model}")
-                print("🧠 Cargando nuevo modelo...")
-                print("✅ Modelo cambiado exitosamente")
-                
-                # Aquí iría la lógica real de carga del modelo
-                print("⚠️ Carga real de modelo en desarrollo")
+                if self.engine is None or selected_model in self.model_cache:
+                    if self.load_model(selected_model):
+                        print("✅ Modelo cambiado exitosamente")
+                else:
+                    # Sin interrupción: el modelo actual traduce hasta que el nuevo esté calentado
+                    self.load_model(selected_model, background=True)
+                    print(f"🧠 Cargando en segundo plano; {self.model_name} sigue activo")
             else:
                 print("❌ Número de modelo inválido")
                 
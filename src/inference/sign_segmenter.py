@@ -0,0 +1,199 @@
+"""
+Sign Segmenter - Segmentación de señas en flujos continuos
+Detecta el inicio y el fin de cada seña a partir de la presencia de manos y
+la energía de movimiento (métricas de MotionAnalyzer), invoca el clasificador
+solo sobre los segmentos candidatos y emite un flujo de tokens sin
+repeticiones. Los frames en reposo no se clasifican: en una conversación real
+son la mayoría.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+from collections import deque, namedtuple
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..data_collection.motion_analyzer import MotionAnalyzer
+from ..utils.dtype_policy import FEATURE_DTYPE
+
+
+# Seña reconocida: frames [start_frame, end_frame] del flujo
+SignToken = namedtuple('SignToken', ['label', 'confidence', 'start_frame', 'end_frame'])
+
+
+class StreamingSignSegmenter:
+    """
+    Segmentador en línea frame a frame
+
+    Máquina de dos estados con histéresis:
+    - reposo: se guarda un pre-roll corto; tras min_active_frames frames
+      consecutivos con manos y energía >= start_threshold empieza un segmento
+    - seña: se acumulan frames hasta min_idle_frames frames quietos (energía
+      < end_threshold o sin manos), o hasta max_segment_frames (corte forzado
+      de señas largas; el segmento siguiente continúa sin pre-roll)
+
+    Al cerrar un segmento se descarta la cola quieta y, si alcanza
+    min_segment_frames, se clasifica una sola vez. Un token con la misma
+    etiqueta que el anterior a menos de repeat_gap_frames se fusiona con él.
+    """
+
+    def __init__(self, engine,
+                 motion_analyzer: Optional[MotionAnalyzer] = None,
+                 start_threshold: Optional[float] = None,
+                 end_threshold: Optional[float] = None,
+                 min_active_frames: int = 3,
+                 min_idle_frames: int = 8,
+                 min_segment_frames: int = 8,
+                 max_segment_frames: Optional[int] = None,
+                 pre_roll_frames: int = 5,
+                 confidence_threshold: float = 0.7,
+                 repeat_gap_frames: int = 15):
+        """
+        Args:
+            engine: Motor de inferencia (InferenceEngine) con predict(secuencia)
+            motion_analyzer: Analizador de movimiento (por defecto uno nuevo)
+            start_threshold: Energía para iniciar una seña (por defecto stillness_threshold)
+            end_threshold: Energía por debajo de la cual un frame cuenta como quieto
+                (por defecto la mitad de start_threshold)
+            min_active_frames: Frames activos consecutivos para abrir un segmento
+            min_idle_frames: Frames quietos consecutivos para cerrarlo
+            min_segment_frames: Frames mínimos de un segmento clasificable
+            max_segment_frames: Longitud máxima antes de un corte forzado
+                (por defecto 2 x la ventana del modelo)
+            pre_roll_frames: Frames previos al inicio detectado que se incluyen
+            confidence_threshold: Confianza mínima para emitir un token
+            repeat_gap_frames: Separación mínima para repetir la misma seña
+        """
+        self.engine = engine
+        self.motion_analyzer = motion_analyzer or MotionAnalyzer()
+        self.start_threshold = (self.motion_analyzer.stillness_threshold
+                                if start_threshold is None else start_threshold)
+        self.end_threshold = self.start_threshold / 2 if end_threshold is None else end_threshold
+        self.min_active_frames = min_active_frames
+        self.min_idle_frames = min_idle_frames
+        self.min_segment_frames = min_segment_frames
+        self.max_segment_frames = max_segment_frames or 2 * engine.sequence_length
+        self.pre_roll_frames = pre_roll_frames
+        self.confidence_threshold = confidence_threshold
+        self.repeat_gap_frames = repeat_gap_frames
+        self.reset()
+
+    def reset(self):
+        """Reinicia el estado del flujo y las estadísticas"""
+        self.frame_index = 0
+        self.last_token = None
+        self._prev_frame = None
+        self._pre_roll = deque(maxlen=self.pre_roll_frames)
+        self._active_run = 0
+        self._idle_run = 0
+        self._segment = None
+        self._segment_start = 0
+        self.stats = {'frames': 0, 'segment_frames': 0, 'segments': 0, 'discarded': 0,
+                      'classified': 0, 'tokens': 0, 'suppressed': 0}
+
+    def push(self, frame: np.ndarray) -> Optional[SignToken]:
+        """
+        Procesa un frame de features
+
+        Args:
+            frame: Vector de features (F,) de FeatureExtractor
+
+        Returns:
+            Token si este frame cerró un segmento reconocido, None en otro caso
+        """
+        frame = np.asarray(frame, dtype=FEATURE_DTYPE)
+        present = self.motion_analyzer.hands_present(frame)
+        energy = (self.motion_analyzer.frame_motion_energy(self._prev_frame, frame)
+                  if self._prev_frame is not None else 0.0)
+        self._prev_frame = frame
+        index = self.frame_index
+        self.frame_index += 1
+        self.stats['frames'] += 1
+
+        if self._segment is None:
+            self._pre_roll.append(frame)
+            self._active_run = self._active_run + 1 if present and energy >= self.start_threshold else 0
+            if self._active_run >= self.min_active_frames:
+                self._segment = list(self._pre_roll)
+                self._segment_start = index - len(self._segment) + 1
+                self._idle_run = 0
+            return None
+
+        self._segment.append(frame)
+        self._idle_run = self._idle_run + 1 if not present or energy < self.end_threshold else 0
+        if self._idle_run >= self.min_idle_frames:
+            return self._close_segment(trailing_frames=self._idle_run)
+        if len(self._segment) >= self.max_segment_frames:
+            return self._close_segment(continues=True)
+        return None
+
+    def flush(self) -> Optional[SignToken]:
+        """Cierra el segmento abierto al final del flujo"""
+        if self._segment is None:
+            return None
+        return self._close_segment(trailing_frames=self._idle_run)
+
+    def process(self, frames: Iterable[np.ndarray]) -> List[SignToken]:
+        """
+        Segmenta un flujo completo
+
+        Args:
+            frames: Frames de features en orden
+
+        Returns:
+            Tokens reconocidos (incluido el del segmento final)
+        """
+        tokens = [self.push(frame) for frame in frames]
+        tokens.append(self.flush())
+        return [token for token in tokens if token is not None]
+
+    def _close_segment(self, trailing_frames: int = 0, continues: bool = False) -> Optional[SignToken]:
+        """Clasifica el segmento actual y prepara el estado siguiente"""
+        frames = self._segment[:len(self._segment) - trailing_frames]
+        start = self._segment_start
+        end = start + len(frames) - 1
+
+        if continues:
+            # Seña larga: el siguiente segmento empieza en el próximo frame
+            self._segment = []
+            self._segment_start = self.frame_index
+        else:
+            self._segment = None
+            self._pre_roll.clear()
+            self._active_run = 0
+        self._idle_run = 0
+
+        self.stats['segments'] += 1
+        if len(frames) < self.min_segment_frames:
+            self.stats['discarded'] += 1
+            return None
+        self.stats['segment_frames'] += len(frames)
+        return self._classify(np.stack(frames), start, end)
+
+    def _classify(self, sequence: np.ndarray, start: int, end: int) -> Optional[SignToken]:
+        """Clasifica un segmento y aplica el umbral y la fusión de repeticiones"""
+        if not self.engine.variable_length:
+            # Importación diferida: data_loader carga sklearn/pandas/h5py
+            from ..training.data_loader import adjust_sequence_length
+            sequence = adjust_sequence_length(sequence[np.newaxis], self.engine.sequence_length)[0]
+        label, confidence = self.engine.predict(sequence)
+        self.stats['classified'] += 1
+        if confidence < self.confidence_threshold:
+            return None
+
+        last = self.last_token
+        if last is not None and last.label == label and start - last.end_frame <= self.repeat_gap_frames:
+            self.last_token = last._replace(end_frame=end, confidence=max(last.confidence, confidence))
+            self.stats['suppressed'] += 1
+            return None
+
+        self.last_token = SignToken(label, confidence, start, end)
+        self.stats['tokens'] += 1
+        return self.last_token
+
+    def summary(self) -> Dict[str, Any]:
+        """Estadísticas del flujo con la fracción de frames que no se clasificaron"""
+        frames = max(self.stats['frames'], 1)
+        return dict(self.stats, idle_ratio=1.0 - self.stats['segment_frames'] / frames)
@@ -0,0 +1,204 @@
+"""
+Checkpointing - Checkpoints completos para reanudar entrenamientos
+Guarda periódicamente pesos, estado del optimizador, época, estado de los
+callbacks (early stopping, reducción de LR, mejor modelo), historial y
+estado de los generadores aleatorios. Con el orden de los datos fijado por
+(semilla, época), un entrenamiento interrumpido continúa en la época
+siguiente a la última guardada como si no se hubiera detenido.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import json
+import os
+import random
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+
+STATE_FILENAME = 'state.json'
+# Semilla del orden de los datos cuando se guardan checkpoints sin indicar una
+DEFAULT_CHECKPOINT_SEED = 42
+
+
+def capture_rng_state() -> Dict[str, Any]:
+    """Estado de los generadores de Python, NumPy (global) y TensorFlow (global)"""
+    np_state = np.random.get_state()
+    python_state = random.getstate()
+    return {
+        'python': [python_state[0], list(python_state[1]), python_state[2]],
+        'numpy': [np_state[0], np_state[1].tolist(), int(np_state[2]), int(np_state[3]), float(np_state[4])],
+        'tensorflow': tf.random.get_global_generator().state.numpy().tolist()
+    }
+
+
+def restore_rng_state(state: Dict[str, Any]):
+    """Restaura el estado guardado por capture_rng_state"""
+    version, internal, gauss = state['python']
+    random.setstate((version, tuple(internal), gauss))
+    name, keys, pos, has_gauss, cached = state['numpy']
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached))
+    tf.random.get_global_generator().state.assign(np.array(state['tensorflow'], dtype=np.int64))
+
+
+# Atributos de estado de los callbacks de create_callbacks que cambian entre épocas
+CALLBACK_STATE_ATTRIBUTES = {
+    'EarlyStopping': ('wait', 'best', 'stopped_epoch', 'best_epoch'),
+    'ReduceLROnPlateau': ('wait', 'best', 'cooldown_counter'),
+    'ModelCheckpoint': ('best',),
+}
+
+
+def _to_json_value(value):
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return value
+
+
+def capture_callback_state(callbacks: List[keras.callbacks.Callback]) -> Dict[str, Dict[str, Any]]:
+    """Estado serializable de los callbacks conocidos, por nombre de clase"""
+    state = {}
+    for callback in callbacks:
+        name = type(callback).__name__
+        attributes = CALLBACK_STATE_ATTRIBUTES.get(name)
+        if attributes:
+            state[name] = {attr: _to_json_value(getattr(callback, attr)) for attr in attributes
+                           if hasattr(callback, attr)}
+    return state
+
+
+class ResumeCallbackState(keras.callbacks.Callback):
+    """
+    Restaura el estado de los callbacks al comenzar un entrenamiento reanudado
+
+    Keras reinicia wait/best en on_train_begin; este callback va al final de
+    la lista, así que su on_train_begin se ejecuta después y los sobrescribe.
+    Los mejores pesos de EarlyStopping se restauran desde el checkpoint.
+    """
+
+    def __init__(self, callbacks: List[keras.callbacks.Callback], state: Dict[str, Dict[str, Any]],
+                 best_weights: Optional[List[np.ndarray]] = None):
+        super().__init__()
+        self.targets = callbacks
+        self.state = state
+        self.best_weights = best_weights
+
+    def on_train_begin(self, logs=None):
+        for callback in self.targets:
+            for attr, value in self.state.get(type(callback).__name__, {}).items():
+                setattr(callback, attr, value)
+            if isinstance(callback, keras.callbacks.EarlyStopping) and self.best_weights is not None:
+                callback.best_weights = self.best_weights
+
+
+class ResumableCheckpoint(keras.callbacks.Callback):
+    """
+    Guarda un checkpoint completo cada `every_n_epochs` épocas
+
+    En la carpeta se mantienen los últimos `max_to_keep` checkpoints de
+    tf.train.Checkpoint (modelo + optimizador) y un state.json con la época,
+    la configuración de la ejecución, el estado de callbacks y generadores
+    aleatorios y el historial acumulado.
+    """
+
+    def __init__(self, checkpoint_dir: str, run_config: Dict[str, Any],
+                 callbacks: List[keras.callbacks.Callback], every_n_epochs: int = 1, max_to_keep: int = 2,
+                 previous_history: Optional[Dict[str, List[float]]] = None):
+        """
+        Args:
+            checkpoint_dir: Carpeta de checkpoints de esta ejecución
+            run_config: Configuración necesaria para reconstruir la ejecución
+            callbacks: Callbacks cuyo estado se guarda
+            every_n_epochs: Frecuencia de guardado
+            max_to_keep: Checkpoints de pesos conservados
+            previous_history: Historial de las épocas anteriores a una reanudación
+        """
+        super().__init__()
+        self.checkpoint_dir = checkpoint_dir
+        self.run_config = run_config
+        self.targets = callbacks
+        self.every_n_epochs = max(1, every_n_epochs)
+        self.max_to_keep = max_to_keep
+        self.history = {key: list(values) for key, values in (previous_history or {}).items()}
+        self.manager = None
+
+    def on_train_begin(self, logs=None):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        checkpoint = tf.train.Checkpoint(model=self.model, optimizer=self.model.optimizer)
+        self.manager = tf.train.CheckpointManager(checkpoint, self.checkpoint_dir, max_to_keep=self.max_to_keep)
+
+    def on_epoch_end(self, epoch, logs=None):
+        for key, value in (logs or {}).items():
+            self.history.setdefault(key, []).append(float(value))
+        if (epoch + 1) % self.every_n_epochs == 0:
+            self.save(epoch + 1)
+
+    def save(self, epochs_completed: int):
+        """Escribe pesos + optimizador y, después, state.json (que los referencia)"""
+        prefix = self.manager.save(checkpoint_number=epochs_completed)
+
+        best_weights_file = None
+        for callback in self.targets:
+            if isinstance(callback, keras.callbacks.EarlyStopping) and callback.best_weights is not None:
+                best_weights_file = os.path.join(self.checkpoint_dir, 'early_stopping_best_weights.npz')
+                np.savez(best_weights_file, *callback.best_weights)
+
+        state = {
+            'epoch': epochs_completed,
+            'checkpoint': os.path.basename(prefix),
+            'run': self.run_config,
+            'callbacks': capture_callback_state(self.targets),
+            'early_stopping_best_weights': os.path.basename(best_weights_file) if best_weights_file else None,
+            'learning_rate': float(keras.backend.get_value(self.model.optimizer.learning_rate)),
+            'rng': capture_rng_state(),
+            'history': self.history,
+            'saved': datetime.now().isoformat()
+        }
+        temp_path = os.path.join(self.checkpoint_dir, f".{STATE_FILENAME}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, default=str)
+        os.replace(temp_path, os.path.join(self.checkpoint_dir, STATE_FILENAME))
+
+
+def load_checkpoint_state(checkpoint_dir: str) -> Dict[str, Any]:
+    """Lee state.json de una carpeta de checkpoints"""
+    path = os.path.join(checkpoint_dir, STATE_FILENAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No hay checkpoint reanudable en: {checkpoint_dir}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_checkpoint_runs(checkpoints_root: str) -> List[Dict[str, Any]]:
+    """Ejecuciones con checkpoint reanudable, la más reciente primero"""
+    if not os.path.isdir(checkpoints_root):
+        return []
+    runs = []
+    for name in os.listdir(checkpoints_root):
+        directory = os.path.join(checkpoints_root, name)
+        if os.path.exists(os.path.join(directory, STATE_FILENAME)):
+            state = load_checkpoint_state(directory)
+            runs.append({'name': name, 'path': directory, 'epoch': state['epoch'],
+                         'epochs': state['run'].get('epochs'), 'saved': state['saved']})
+    return sorted(runs, key=lambda run: run['saved'], reverse=True)
+
+
+def restore_model_state(model: keras.Model, checkpoint_dir: str, state: Dict[str, Any]):
+    """Restaura pesos y estado del optimizador (el optimizador se construye antes)"""
+    model.optimizer.build(model.trainable_variables)
+    checkpoint = tf.train.Checkpoint(model=model, optimizer=model.optimizer)
+    checkpoint.restore(os.path.join(checkpoint_dir, state['checkpoint'])).assert_existing_objects_matched()
+    keras.backend.set_value(model.optimizer.learning_rate, state['learning_rate'])
+
+
+def load_early_stopping_weights(checkpoint_dir: str, state: Dict[str, Any]) -> Optional[List[np.ndarray]]:
+    filename = state.get('early_stopping_best_weights')
+    if not filename:
+        return None
+    with np.load(os.path.join(checkpoint_dir, filename)) as saved:
+        return [saved[f"arr_{i}"] for i in range(len(saved.files))]
@@ -11,11 +11,47 @@ import h5py
 import numpy as np
 import pandas as pd
 import json
+import hashlib
 from typing import List, Tuple, Dict, Any, Optional, Union
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from datetime import datetime
 
+from .feature_stats import RunningFeatureStats
+from ..utils.dtype_policy import FEATURE_DTYPE, as_feature_array
+from .streaming_dataset import DEFAULT_BLOCK_ROWS, HDF5StreamingDataset, read_rows
+from .ragged_dataset import DEFAULT_NUM_BUCKETS, RaggedSequenceDataset, read_ragged_rows
+
+
+def adjust_sequence_length(sequences: np.ndarray, sequence_length: int) -> np.ndarray:
+    """
+    Ajusta secuencias (N, T, F) a sequence_length frames: trunca desde el
+    centro o rellena repitiendo el último frame
+    
+    Args:
+        sequences: Array de secuencias
+        sequence_length: Longitud requerida
+        
+    Returns:
+        Secuencias ajustadas
+    """
+    current_length = sequences.shape[1]
+    
+    if current_length == sequence_length:
+        return sequences
+    
+    elif current_length > sequence_length:
+        # Truncar desde el centro
+        start_idx = (current_length - sequence_length) // 2
+        return sequences[:, start_idx:start_idx + sequence_length, :]
+    
+    else:
+        # Padding con repetición del último frame
+        padding_needed = sequence_length - current_length
+        last_frame = sequences[:, -1:, :]
+        padding = np.repeat(last_frame, padding_needed, axis=1)
+        return np.concatenate([sequences, padding], axis=1)
+
 
 class HDF5DataLoader:
     """
@@ -34,11 +70,13 @@ class HDF5DataLoader:
         self.sequence_length = sequence_length
         self.sequences_file = os.path.join(data_path, "sequences.h5")
         self.metadata_path = os.path.join(data_path, "metadata")
+        self.split_file = os.path.join(self.metadata_path, "split_indices.npz")
         
         # Variables de estado
         self.label_encoder = LabelEncoder()
         self.dataset_info = None
         self.labels_map = None
+        self.split = None
         
         print("🗃️ Inicializando Gestor de Datos HDF5")
         print(f"   📁 Ruta de datos: {self.data_path}")
@@ -81,6 +119,18 @@ class HDF5DataLoader:
         
         try:
             with h5py.File(self.sequences_file, 'r') as f:
+                if self._is_ragged_layout(f):
+                    total_sequences = f['y'].shape[0]
+                    print(f"✅ Archivo HDF5 encontrado (longitud variable frames/offset/length)")
+                    print(f"📊 Total de secuencias disponibles: {total_sequences}")
+                    return total_sequences > 0
+                
+                if self._is_flat_layout(f):
+                    total_sequences = f['X'].shape[0]
+                    print(f"✅ Archivo HDF5 encontrado (formato plano X/y)")
+                    print(f"📊 Total de secuencias disponibles: {total_sequences}")
+                    return total_sequences > 0
+                
                 groups = list(f.keys())
                 print(f"✅ Archivo HDF5 encontrado con {len(groups)} grupos")
                 
@@ -119,6 +169,13 @@ class HDF5DataLoader:
         if not self.check_data_availability():
             raise ValueError("Datos no disponibles para entrenamiento")
         
+        with h5py.File(self.sequences_file, 'r') as f:
+            flat_layout = self._is_flat_layout(f)
+            if self._is_ragged_layout(f):
+                raise ValueError("El archivo guarda secuencias de longitud variable: usa create_ragged_datasets")
+        if flat_layout:
+            return self._load_flat_dataset(test_size, val_size, random_state)
+        
         # Cargar todas las secuencias y etiquetas
         X_data = []
         y_data = []
@@ -148,7 +205,7 @@ class HDF5DataLoader:
                         print(f"   ✅ {sign_name}: {len(sequences)} secuencias cargadas")
         
         # Concatenar todos los datos
-        X = np.vstack(X_data)
+        X = np.vstack(X_data).astype(FEATURE_DTYPE, copy=False)
         y = np.array(y_data)
         
         print(f"\n📊 DATOS CARGADOS:")
@@ -179,6 +236,318 @@ class HDF5DataLoader:
         
         return X_train, X_val, X_test, y_train, y_val, y_test
     
+    @staticmethod
+    def _is_flat_layout(f: h5py.File) -> bool:
+        """Indica si el archivo usa el formato plano X/y de DataManager"""
+        return isinstance(f.get('X'), h5py.Dataset) and isinstance(f.get('y'), h5py.Dataset)
+    
+    def is_variable_length(self) -> bool:
+        """Indica si sequences.h5 guarda secuencias de longitud variable"""
+        if not os.path.exists(self.sequences_file):
+            return False
+        with h5py.File(self.sequences_file, 'r') as f:
+            return self._is_ragged_layout(f)
+    
+    @staticmethod
+    def _is_ragged_layout(f: h5py.File) -> bool:
+        """Indica si el archivo usa el layout de longitud variable (frames + offset/length)"""
+        return all(isinstance(f.get(name), h5py.Dataset) for name in ('frames', 'offset', 'length', 'y'))
+    
+    def _decode_labels(self, raw_labels: np.ndarray) -> np.ndarray:
+        """
+        Convierte etiquetas almacenadas (índices o bytes) a nombres de seña
+        
+        Args:
+            raw_labels: Etiquetas tal como están en el HDF5
+            
+        Returns:
+            Array de nombres de seña
+        """
+        raw_labels = np.asarray(raw_labels)
+        if raw_labels.dtype.kind in 'iu':
+            index_to_sign = (self.labels_map or {}).get('index_to_sign', {})
+            unique, inverse = np.unique(raw_labels, return_inverse=True)
+            names = np.array([index_to_sign.get(str(i), str(i)) for i in unique.tolist()])
+            return names[inverse]
+        if raw_labels.dtype.kind == 'S':
+            return np.char.decode(raw_labels, 'utf-8')
+        return raw_labels.astype(str)
+    
+    def _split_rows(self, rows: np.ndarray, labels: np.ndarray, test_size: float,
+                    val_size: float, random_state: int) -> Dict[str, np.ndarray]:
+        """
+        Divide un conjunto de filas en train/val/test (estratificado si es posible)
+        
+        Args:
+            rows: Índices de fila a dividir
+            labels: Etiquetas de esas filas
+            test_size, val_size: Proporciones de test y validación
+            random_state: Semilla aleatoria
+            
+        Returns:
+            Diccionario {'train', 'val', 'test'} con índices ordenados
+        """
+        val_size_adjusted = val_size / (1 - test_size)
+        try:
+            train_val, test = train_test_split(rows, test_size=test_size, random_state=random_state,
+                                               stratify=labels)
+            train_val_labels = labels[np.searchsorted(rows, train_val)]
+            train, val = train_test_split(train_val, test_size=val_size_adjusted,
+                                          random_state=random_state, stratify=train_val_labels)
+        except ValueError:
+            # Muy pocas filas por clase (p. ej. filas recién añadidas): asignación aleatoria
+            rng = np.random.default_rng(random_state)
+            assignment = rng.choice(3, size=len(rows),
+                                    p=[1 - test_size - val_size, val_size, test_size])
+            train, val, test = rows[assignment == 0], rows[assignment == 1], rows[assignment == 2]
+        
+        return {'train': np.sort(train), 'val': np.sort(val), 'test': np.sort(test)}
+    
+    def get_split_indices(self, test_size: float = 0.2, val_size: float = 0.1,
+                          random_state: int = 42, force: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Obtiene la división train/val/test como índices de fila persistidos en disco
+        
+        La división se guarda en metadata/split_indices.npz y se reutiliza mientras
+        los parámetros no cambien. Si el archivo creció, solo las filas nuevas se
+        asignan a un subconjunto; las existentes conservan su asignación.
+        
+        Args:
+            test_size: Proporción para test
+            val_size: Proporción para validación
+            random_state: Semilla aleatoria
+            force: Si regenerar la división aunque exista
+            
+        Returns:
+            Diccionario {'train', 'val', 'test'} con índices de fila ordenados
+        """
+        with h5py.File(self.sequences_file, 'r') as f:
+            if not (self._is_flat_layout(f) or self._is_ragged_layout(f)):
+                raise ValueError("La división por índices requiere el formato plano X/y")
+            labels = np.asarray(f['y'][:])
+        num_rows = len(labels)
+        params = np.array([test_size, val_size, random_state], dtype=np.float64)
+        
+        split = None
+        if not force and os.path.exists(self.split_file):
+            with np.load(self.split_file) as saved:
+                saved_rows = int(saved['num_rows'])
+                if np.allclose(saved['params'], params) and saved_rows <= num_rows:
+                    split = {name: saved[name] for name in ('train', 'val', 'test')}
+            
+            if split is not None and saved_rows < num_rows:
+                new_rows = np.arange(saved_rows, num_rows)
+                new_split = self._split_rows(new_rows, labels[saved_rows:], test_size, val_size,
+                                             random_state + saved_rows)
+                split = {name: np.concatenate([split[name], new_split[name]]) for name in split}
+                print(f"   ➕ {len(new_rows)} filas nuevas asignadas a la división existente")
+                self._save_split(split, num_rows, params)
+        
+        if split is None:
+            split = self._split_rows(np.arange(num_rows), labels, test_size, val_size, random_state)
+            self._save_split(split, num_rows, params)
+            print(f"   💾 División guardada en: {self.split_file}")
+        
+        self.split = split
+        return split
+    
+    def _save_split(self, split: Dict[str, np.ndarray], num_rows: int, params: np.ndarray):
+        """Guarda los índices de la división en metadata/split_indices.npz"""
+        os.makedirs(self.metadata_path, exist_ok=True)
+        np.savez(self.split_file, num_rows=num_rows, params=params,
+                 **{name: indices.astype(np.int64) for name, indices in split.items()})
+    
+    def _encode_all_labels(self) -> np.ndarray:
+        """Ajusta el LabelEncoder sobre todas las filas y devuelve las etiquetas codificadas"""
+        with h5py.File(self.sequences_file, 'r') as f:
+            names = self._decode_labels(f['y'][:])
+        return self.label_encoder.fit_transform(names).astype(np.int32)
+    
+    def _load_flat_dataset(self, test_size: float, val_size: float,
+                           random_state: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                       np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Carga el formato plano X/y leyendo cada subconjunto por bloques directamente
+        en su array final, sin materializar el dataset completo
+        """
+        split = self.get_split_indices(test_size, val_size, random_state)
+        y_encoded = self._encode_all_labels()
+        
+        with h5py.File(self.sequences_file, 'r') as f:
+            subsets = {name: read_rows(f['X'], indices, transform=self._adjust_sequence_length)
+                       for name, indices in split.items()}
+        
+        total = sum(len(indices) for indices in split.values())
+        print(f"\n📊 DATOS CARGADOS:")
+        print(f"   🔢 Forma de X: {(total,) + subsets['train'].shape[1:]}")
+        print(f"   📋 Clases únicas: {len(self.label_encoder.classes_)}")
+        print(f"\n📈 DIVISIÓN DE DATOS:")
+        print(f"   🚂 Entrenamiento: {len(split['train'])} muestras ({len(split['train'])/total*100:.1f}%)")
+        print(f"   ✅ Validación: {len(split['val'])} muestras ({len(split['val'])/total*100:.1f}%)")
+        print(f"   🧪 Test: {len(split['test'])} muestras ({len(split['test'])/total*100:.1f}%)")
+        
+        return (subsets['train'], subsets['val'], subsets['test'],
+                y_encoded[split['train']], y_encoded[split['val']], y_encoded[split['test']])
+    
+    def compute_normalization_stats(self, indices: np.ndarray,
+                                    block_rows: Optional[int] = None,
+                                    incremental: bool = True) -> Dict[str, Any]:
+        """
+        Calcula media y desviación por característica en una sola pasada por bloques
+        
+        Si preprocessing_info.json contiene el acumulador de una ejecución previa
+        sobre las mismas filas de train, solo se procesan las filas añadidas desde
+        entonces y se fusionan con el estado guardado.
+        
+        Args:
+            indices: Filas sobre las que calcular (normalmente el conjunto de train)
+            block_rows: Filas por bloque de lectura
+            incremental: Si reutilizar las estadísticas guardadas
+            
+        Returns:
+            Estadísticas de normalización con el mismo formato que normalize_data
+        """
+        indices = np.sort(np.asarray(indices, dtype=np.int64))
+        accumulator = RunningFeatureStats()
+        pending = indices
+        
+        with h5py.File(self.sequences_file, 'r') as f:
+            dataset = f['X']
+            num_rows = dataset.shape[0]
+            
+            previous = self.load_preprocessing_info() if incremental else None
+            if previous and previous.get('sequence_length') == self.sequence_length:
+                saved = previous['normalization']
+                rows_seen = saved.get('rows_seen', 0)
+                covered = indices[indices < rows_seen]
+                if 0 < rows_seen <= num_rows and saved.get('train_digest') == self._indices_digest(covered):
+                    accumulator = RunningFeatureStats.from_dict(saved)
+                    pending = indices[indices >= rows_seen]
+                    print(f"   ♻️ Estadísticas reutilizadas ({len(covered)} filas), "
+                          f"{len(pending)} filas nuevas")
+            
+            step = block_rows or DEFAULT_BLOCK_ROWS
+            for start in range(0, len(pending), step):
+                accumulator.update(read_rows(dataset, pending[start:start + step], block_rows,
+                                             transform=self._adjust_sequence_length))
+        
+        return accumulator.normalization_stats(rows_seen=num_rows,
+                                               train_digest=self._indices_digest(indices))
+    
+    @staticmethod
+    def _indices_digest(indices: np.ndarray) -> str:
+        """Huella de un conjunto de índices de fila"""
+        return hashlib.sha1(np.asarray(indices, dtype=np.int64).tobytes()).hexdigest()[:16]
+    
+    def create_streaming_datasets(self, batch_size: int = 32, test_size: float = 0.2,
+                                  val_size: float = 0.1, random_state: int = 42,
+                                  normalize: bool = True, block_rows: Optional[int] = None,
+                                  shuffle_buffer_blocks: int = 4) -> Dict[str, Any]:
+        """
+        Crea fuentes de datos por streaming para train/val/test sin cargar el
+        dataset en memoria
+        
+        Args:
+            batch_size: Tamaño del batch
+            test_size: Proporción para test
+            val_size: Proporción para validación
+            random_state: Semilla de la división y de la mezcla
+            normalize: Si normalizar al vuelo con estadísticas de train
+            block_rows: Filas por bloque de lectura (por defecto alineado con los chunks)
+            shuffle_buffer_blocks: Bloques mezclados juntos en train
+            
+        Returns:
+            Diccionario con 'train', 'val', 'test' (HDF5StreamingDataset),
+            'split' y 'normalization_stats'
+        """
+        print("\n🌊 CREANDO DATASETS EN STREAMING...")
+        
+        if not self.check_data_availability():
+            raise ValueError("Datos no disponibles para entrenamiento")
+        
+        split = self.get_split_indices(test_size, val_size, random_state)
+        y_encoded = self._encode_all_labels()
+        norm_stats = self.compute_normalization_stats(split['train'], block_rows) if normalize else None
+        
+        datasets = {}
+        for name, indices in split.items():
+            datasets[name] = HDF5StreamingDataset(
+                self.sequences_file, indices, y_encoded[indices],
+                batch_size=batch_size,
+                shuffle=(name == 'train'),
+                seed=random_state,
+                block_rows=block_rows,
+                shuffle_buffer_blocks=shuffle_buffer_blocks,
+                mean=norm_stats['mean'] if norm_stats else None,
+                std=norm_stats['std'] if norm_stats else None,
+                transform=self._adjust_sequence_length
+            )
+            print(f"   📦 {name}: {len(indices)} muestras, {len(datasets[name])} batches")
+        
+        datasets['split'] = split
+        datasets['normalization_stats'] = norm_stats
+        return datasets
+    
+    def create_ragged_datasets(self, batch_size: int = 32, test_size: float = 0.2,
+                               val_size: float = 0.1, random_state: int = 42,
+                               normalize: bool = True,
+                               num_buckets: int = DEFAULT_NUM_BUCKETS) -> Dict[str, Any]:
+        """
+        Crea fuentes de datos de longitud variable para train/val/test
+        
+        Las secuencias conservan sus frames reales (sin _adjust_sequence_length);
+        train se agrupa en buckets por longitud y la normalización se calcula
+        solo sobre frames reales de train.
+        
+        Args:
+            batch_size: Tamaño del batch
+            test_size: Proporción para test
+            val_size: Proporción para validación
+            random_state: Semilla de la división y de la mezcla
+            normalize: Si normalizar al vuelo con estadísticas de train
+            num_buckets: Buckets por longitud en train
+            
+        Returns:
+            Diccionario con 'train', 'val', 'test' (RaggedSequenceDataset),
+            'split' y 'normalization_stats'
+        """
+        print("\n📏 CREANDO DATASETS DE LONGITUD VARIABLE...")
+        
+        if not self.check_data_availability():
+            raise ValueError("Datos no disponibles para entrenamiento")
+        
+        split = self.get_split_indices(test_size, val_size, random_state)
+        y_encoded = self._encode_all_labels()
+        
+        norm_stats = None
+        if normalize:
+            accumulator = RunningFeatureStats()
+            with h5py.File(self.sequences_file, 'r') as f:
+                for start in range(0, len(split['train']), DEFAULT_BLOCK_ROWS):
+                    rows = split['train'][start:start + DEFAULT_BLOCK_ROWS]
+                    accumulator.update(np.concatenate(read_ragged_rows(f, rows)))
+            norm_stats = accumulator.normalization_stats()
+        
+        datasets = {}
+        for name, indices in split.items():
+            datasets[name] = RaggedSequenceDataset(
+                self.sequences_file, indices, y_encoded[indices],
+                batch_size=batch_size,
+                shuffle=(name == 'train'),
+                seed=random_state,
+                num_buckets=num_buckets,
+                mean=norm_stats['mean'] if norm_stats else None,
+                std=norm_stats['std'] if norm_stats else None
+            )
+            lengths = datasets[name].lengths
+            print(f"   📦 {name}: {len(indices)} muestras, {len(datasets[name])} batches, "
+                  f"{lengths.min() if len(lengths) else 0}-{lengths.max() if len(lengths) else 0} frames")
+        print(f"   🪣 Buckets de train: {datasets['train'].boundaries}")
+        
+        datasets['split'] = split
+        datasets['normalization_stats'] = norm_stats
+        return datasets
+    
     def _adjust_sequence_length(self, sequences: np.ndarray) -> np.ndarray:
         """
         Ajusta la longitud de las secuencias al tamaño requerido
@@ -189,22 +558,7 @@ class HDF5DataLoader:
         Returns:
             Secuencias ajustadas
         """
-        current_length = sequences.shape[1]
-        
-        if current_length == self.sequence_length:
-            return sequences
-        
-        elif current_length > self.sequence_length:
-            # Truncar desde el centro
-            start_idx = (current_length - self.sequence_length) // 2
-            return sequences[:, start_idx:start_idx + self.sequence_length, :]
-        
-        else:
-            # Padding con repetición del último frame
-            padding_needed = self.sequence_length - current_length
-            last_frame = sequences[:, -1:, :]
-            padding = np.repeat(last_frame, padding_needed, axis=1)
-            return np.concatenate([sequences, padding], axis=1)
+        return adjust_sequence_length(sequences, self.sequence_length)
     
     def get_data_statistics(self) -> Dict[str, Any]:
         """
@@ -232,7 +586,36 @@ class HDF5DataLoader:
                 sequence_lengths = []
                 feature_dimensions = []
                 
-                for sign_name in f.keys():
+                flat_layout = self._is_flat_layout(f)
+                ragged_layout = self._is_ragged_layout(f)
+                if ragged_layout:
+                    lengths = f['length'][:]
+                    names, counts = np.unique(self._decode_labels(f['y'][:]), return_counts=True)
+                    for sign_name, count in zip(names.tolist(), counts.tolist()):
+                        stats['signs'][sign_name] = {
+                            'count': count,
+                            'shape': (count, None, f['frames'].shape[1]),
+                            'dtype': str(f['frames'].dtype)
+                        }
+                        stats['class_distribution'][sign_name] = count
+                    stats['total_sequences'] = len(lengths)
+                    sequence_lengths.extend(lengths.tolist())
+                    feature_dimensions.append(f['frames'].shape[1])
+                elif flat_layout:
+                    X_dataset = f['X']
+                    names, counts = np.unique(self._decode_labels(f['y'][:]), return_counts=True)
+                    for sign_name, count in zip(names.tolist(), counts.tolist()):
+                        stats['signs'][sign_name] = {
+                            'count': count,
+                            'shape': (count,) + X_dataset.shape[1:],
+                            'dtype': str(X_dataset.dtype)
+                        }
+                        stats['class_distribution'][sign_name] = count
+                    stats['total_sequences'] = X_dataset.shape[0]
+                    sequence_lengths.extend([X_dataset.shape[1]] * X_dataset.shape[0])
+                    feature_dimensions.append(X_dataset.shape[2])
+                
+                for sign_name in ([] if flat_layout or ragged_layout else f.keys()):
                     group = f[sign_name]
                     
                     if isinstance(group, h5py.Group) and 'sequences' in group:
@@ -285,36 +668,36 @@ class HDF5DataLoader:
         return stats
     
     def normalize_data(self, X_train: np.ndarray, X_val: np.ndarray, 
-                      X_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+                      X_test: np.ndarray,
+                      normalization_stats: Optional[Dict[str, Any]] = None
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
         """
         Normaliza los datos usando estadísticas del conjunto de entrenamiento
         
         Args:
             X_train, X_val, X_test: Conjuntos de datos
+            normalization_stats: Estadísticas ya calculadas (si None, se calculan de X_train)
             
         Returns:
             Datos normalizados y estadísticas de normalización
         """
         print("\n🔧 NORMALIZANDO DATOS...")
         
-        # Calcular estadísticas solo del conjunto de entrenamiento
-        train_mean = np.mean(X_train, axis=(0, 1), keepdims=True)
-        train_std = np.std(X_train, axis=(0, 1), keepdims=True)
+        # Calcular estadísticas solo del conjunto de entrenamiento, por bloques
+        if normalization_stats is None:
+            accumulator = RunningFeatureStats()
+            for start in range(0, len(X_train), DEFAULT_BLOCK_ROWS):
+                accumulator.update(X_train[start:start + DEFAULT_BLOCK_ROWS])
+            normalization_stats = accumulator.normalization_stats()
         
-        # Evitar división por cero
-        train_std = np.where(train_std == 0, 1, train_std)
+        # Estadísticas en FEATURE_DTYPE para que la normalización no promueva a float64
+        train_mean = np.asarray(normalization_stats['mean'], dtype=FEATURE_DTYPE)
+        train_std = np.asarray(normalization_stats['std'], dtype=FEATURE_DTYPE)
         
         # Normalizar todos los conjuntos
-        X_train_norm = (X_train - train_mean) / train_std
-        X_val_norm = (X_val - train_mean) / train_std
-        X_test_norm = (X_test - train_mean) / train_std
-        
-        normalization_stats = {
-            'mean': train_mean,
-            'std': train_std,
-            'method': 'z-score',
-            'computed_on': 'train_set'
-        }
+        X_train_norm = (as_feature_array(X_train) - train_mean) / train_std
+        X_val_norm = (as_feature_array(X_val) - train_mean) / train_std
+        X_test_norm = (as_feature_array(X_test) - train_mean) / train_std
         
         print(f"   ✅ Normalización completada (μ={train_mean.mean():.4f}, σ={train_std.mean():.4f})")
         
@@ -332,23 +715,59 @@ class HDF5DataLoader:
         if output_path is None:
             output_path = os.path.join(self.metadata_path, "preprocessing_info.json")
         
+        # Vectores planos (F,) más el estado del acumulador para actualizaciones incrementales
+        normalization = {
+            'method': normalization_stats['method'],
+            'mean': np.asarray(normalization_stats['mean']).reshape(-1).tolist(),
+            'std': np.asarray(normalization_stats['std']).reshape(-1).tolist()
+        }
+        accumulator = normalization_stats.get('accumulator')
+        if accumulator is not None:
+            normalization['count'] = accumulator.count
+            normalization['m2'] = accumulator.m2.tolist()
+        for key in ('rows_seen', 'train_digest'):
+            if key in normalization_stats:
+                normalization[key] = normalization_stats[key]
+        
         preprocessing_info = {
             'sequence_length': self.sequence_length,
-            'label_encoder_classes': self.label_encoder.classes_.tolist(),
-            'normalization': {
-                'mean': normalization_stats['mean'].tolist(),
-                'std': normalization_stats['std'].tolist(),
-                'method': normalization_stats['method']
-            },
+            'label_encoder_classes': getattr(self.label_encoder, 'classes_', np.array([])).tolist(),
+            'normalization': normalization,
             'created': datetime.now().isoformat(),
-            'version': '2.0'
+            'version': '2.1'
         }
         
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(preprocessing_info, f, indent=2, ensure_ascii=False)
+            json.dump(preprocessing_info, f, ensure_ascii=False, separators=(',', ':'))
         
         print(f"💾 Información de preprocesamiento guardada en: {output_path}")
     
+    def load_preprocessing_info(self, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Carga preprocessing_info.json (formato compacto o el anterior con
+        arrays anidados (1, 1, F))
+        
+        Args:
+            path: Ruta del archivo (por defecto metadata/preprocessing_info.json)
+            
+        Returns:
+            Información con 'mean' y 'std' como arrays (1, 1, F), o None si no existe
+        """
+        if path is None:
+            path = os.path.join(self.metadata_path, "preprocessing_info.json")
+        if not os.path.exists(path):
+            return None
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        
+        normalization = info.get('normalization', {})
+        for key in ('mean', 'std'):
+            if key in normalization:
+                normalization[key] = np.asarray(normalization[key], dtype=np.float64).reshape(1, 1, -1)
+        return info
+    
     def get_class_weights(self, y_train: np.ndarray) -> Dict[int, float]:
         """
         Calcula pesos de clase para manejar desbalance
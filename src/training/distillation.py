@@ -0,0 +1,151 @@
+"""
+Distillation - Destilación de conocimiento a un modelo estudiante
+Entrena un modelo compacto (por defecto 1 capa BiGRU-48 sin atención, con
+el perfil 'fast') sobre las probabilidades suavizadas del modelo maestro.
+El estudiante usa la misma arquitectura de GRUModelBuilder, así que se
+guarda como .h5 y se exporta (TFLite / ONNX / NumPy) igual que el maestro.
+
+Las etiquetas y las probabilidades del maestro viajan juntas en y_true:
+columna 0 la clase, columnas 1..C los objetivos suaves a temperatura T.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from .model_builder import GRUModelBuilder
+
+
+DEFAULT_STUDENT_CONFIG = {
+    'gru_units': 48,
+    'num_gru_layers': 1,
+    'dropout_rate': 0.2,
+    'learning_rate': 0.002,
+    'l2_reg': 0.001,
+    'use_attention': False,
+    'profile': 'fast',
+    'jit_compile': False
+}
+DEFAULT_TEMPERATURE = 4.0
+# Peso de la pérdida con las etiquetas reales (el resto va a los objetivos del maestro)
+DEFAULT_ALPHA = 0.1
+
+_EPSILON = 1e-7
+
+
+def soften_probabilities(probabilities: np.ndarray, temperature: float) -> np.ndarray:
+    """
+    Probabilidades a temperatura T: softmax(log(p) / T), equivalente a
+    softmax(logits / T) para salidas softmax
+
+    Args:
+        probabilities: Probabilidades (N, C)
+        temperature: Temperatura (> 1 suaviza)
+
+    Returns:
+        Array (N, C) en float32
+    """
+    logits = np.log(np.clip(probabilities, _EPSILON, 1.0)) / temperature
+    logits -= logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return (exp / exp.sum(axis=-1, keepdims=True)).astype(np.float32)
+
+
+def pack_distillation_targets(labels: np.ndarray, teacher_probabilities: np.ndarray,
+                              temperature: float) -> np.ndarray:
+    """
+    Objetivos de entrenamiento del estudiante: [clase, p_maestro(T)...]
+
+    Args:
+        labels: Clases (N,)
+        teacher_probabilities: Salida del maestro (N, C)
+        temperature: Temperatura de destilación
+
+    Returns:
+        Array (N, 1 + C) en float32
+    """
+    soft_targets = soften_probabilities(teacher_probabilities, temperature)
+    return np.concatenate([np.asarray(labels, dtype=np.float32)[:, np.newaxis], soft_targets], axis=1)
+
+
+class DistillationLoss(keras.losses.Loss):
+    """
+    alpha * CE(etiqueta, q) + (1 - alpha) * T² * KL(p_maestro(T) || q(T))
+
+    El factor T² mantiene la escala de los gradientes de la parte suave
+    al cambiar la temperatura.
+    """
+
+    def __init__(self, temperature: float = DEFAULT_TEMPERATURE, alpha: float = DEFAULT_ALPHA,
+                 name: str = 'distillation_loss', **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def call(self, y_true, y_pred):
+        labels = tf.cast(y_true[:, 0], tf.int32)
+        soft_targets = y_true[:, 1:]
+        hard_loss = keras.losses.sparse_categorical_crossentropy(labels, y_pred)
+        soft_pred = tf.nn.softmax(tf.math.log(tf.clip_by_value(y_pred, _EPSILON, 1.0)) / self.temperature)
+        soft_loss = keras.losses.kl_divergence(soft_targets, soft_pred)
+        return self.alpha * hard_loss + (1.0 - self.alpha) * self.temperature ** 2 * soft_loss
+
+    def get_config(self) -> Dict[str, Any]:
+        config = super().get_config()
+        config.update({'temperature': self.temperature, 'alpha': self.alpha})
+        return config
+
+
+def distillation_accuracy(y_true, y_pred):
+    """Accuracy sobre la clase real (columna 0 de los objetivos empaquetados)"""
+    labels = tf.cast(y_true[:, 0], tf.int64)
+    return tf.cast(tf.equal(tf.argmax(y_pred, axis=-1), labels), tf.float32)
+
+
+def build_student(input_shape: Tuple[int, int], num_classes: int,
+                  student_config: Optional[Dict[str, Any]] = None,
+                  temperature: float = DEFAULT_TEMPERATURE,
+                  alpha: float = DEFAULT_ALPHA) -> Tuple[keras.Model, Dict[str, Any]]:
+    """
+    Construye el estudiante con GRUModelBuilder y lo compila con DistillationLoss
+
+    Args:
+        input_shape: Forma de entrada (secuencia_length, features)
+        num_classes: Número de clases
+        student_config: Cambios sobre DEFAULT_STUDENT_CONFIG
+        temperature: Temperatura de destilación
+        alpha: Peso de la pérdida con etiquetas reales
+
+    Returns:
+        (modelo, configuración usada)
+    """
+    config = dict(DEFAULT_STUDENT_CONFIG)
+    if student_config:
+        config.update(student_config)
+
+    student = GRUModelBuilder().build_model(input_shape=input_shape, num_classes=num_classes, **config)
+    student.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=config['learning_rate']),
+        loss=DistillationLoss(temperature, alpha),
+        # Mismo nombre que la métrica del maestro: los callbacks vigilan val_accuracy
+        metrics=[keras.metrics.MeanMetricWrapper(distillation_accuracy, name='accuracy')],
+        jit_compile=config['jit_compile']
+    )
+    return student, config
+
+
+def compile_for_inference(student: keras.Model, learning_rate: float):
+    """
+    Recompila el estudiante con la pérdida y métricas del maestro, para que
+    el .h5 guardado se cargue sin objetos personalizados
+    """
+    student.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy', 'top_k_categorical_accuracy']
+    )
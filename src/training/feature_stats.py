@@ -0,0 +1,111 @@
+"""
+Feature Stats - Estadísticas de normalización en una sola pasada
+Acumulador de media y varianza por característica (Welford / Chan) que se
+actualiza por bloques y se puede fusionar, sin materializar el dataset
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import numpy as np
+from typing import Any, Dict, Optional
+
+
+class RunningFeatureStats:
+    """
+    Media y varianza por característica acumuladas por bloques
+
+    Cada bloque se reduce a (n, media, M2) y se combina con el estado actual
+    mediante la fórmula de Chan et al., numéricamente estable y equivalente a
+    calcular sobre todos los datos a la vez.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self.m2: Optional[np.ndarray] = None
+
+    def update(self, block: np.ndarray) -> 'RunningFeatureStats':
+        """
+        Incorpora un bloque de datos
+
+        Args:
+            block: Array (..., features); todos los ejes salvo el último son muestras
+
+        Returns:
+            self, para encadenar llamadas
+        """
+        block = np.asarray(block)
+        block = block.reshape(-1, block.shape[-1])
+        if block.shape[0] == 0:
+            return self
+
+        block_mean = block.mean(axis=0, dtype=np.float64)
+        block_m2 = np.square(block - block_mean).sum(axis=0)
+        self._combine(block.shape[0], block_mean, block_m2)
+        return self
+
+    def merge(self, other: 'RunningFeatureStats') -> 'RunningFeatureStats':
+        """Fusiona otro acumulador (p. ej. calculado sobre filas nuevas)"""
+        if other.count > 0:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def _combine(self, count: int, mean: np.ndarray, m2: np.ndarray):
+        if self.count == 0:
+            self.count = int(count)
+            self.mean = np.array(mean, dtype=np.float64)
+            self.m2 = np.array(m2, dtype=np.float64)
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + np.square(delta) * (self.count * count / total)
+        self.count = int(total)
+
+    @property
+    def variance(self) -> np.ndarray:
+        return self.m2 / max(self.count, 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def normalization_stats(self, **extra) -> Dict[str, Any]:
+        """
+        Estadísticas en el formato usado por HDF5DataLoader.normalize_data
+
+        Returns:
+            {'mean', 'std' (forma (1, 1, F)), 'method', 'computed_on', 'accumulator', ...}
+        """
+        if self.count == 0:
+            raise ValueError("No hay datos acumulados para calcular la normalización")
+        std = np.where(self.std == 0, 1, self.std)
+        stats = {
+            'mean': self.mean.reshape(1, 1, -1),
+            'std': std.reshape(1, 1, -1),
+            'method': 'z-score',
+            'computed_on': 'train_set',
+            'accumulator': self
+        }
+        stats.update(extra)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Estado serializable (listas planas)"""
+        return {
+            'count': self.count,
+            'mean': [] if self.mean is None else self.mean.tolist(),
+            'm2': [] if self.m2 is None else self.m2.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningFeatureStats':
+        """Reconstruye el acumulador desde to_dict()"""
+        stats = cls()
+        if data.get('count', 0) > 0:
+            stats.count = int(data['count'])
+            stats.mean = np.asarray(data['mean'], dtype=np.float64).reshape(-1)
+            stats.m2 = np.asarray(data['m2'], dtype=np.float64).reshape(-1)
+        return stats
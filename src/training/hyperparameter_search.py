@@ -0,0 +1,330 @@
+"""
+Hyperparameter Search - Búsqueda de hiperparámetros con successive halving
+Muestrea configuraciones de GRUModelBuilder, entrena cada una en un proceso
+del pool (con hilos de TensorFlow acotados) sobre los datos preparados en
+caché y solo continúa con la mejor fracción en cada ronda. El resultado es
+una tabla que ordena las pruebas por accuracy de validación frente a
+latencia de inferencia.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# Espacio de búsqueda: lista = valores discretos, ('uniform'|'log', min, max) = continuo
+DEFAULT_SEARCH_SPACE = {
+    'gru_units': [32, 64, 128, 256],
+    'num_gru_layers': [1, 2, 3],
+    'dropout_rate': ('uniform', 0.1, 0.5),
+    'use_attention': [True, False],
+    'learning_rate': ('log', 1e-4, 3e-3),
+}
+
+LATENCY_WARMUP = 3
+LATENCY_RUNS = 20
+
+
+def sample_configs(num_trials: int, space: Optional[Dict[str, Any]] = None,
+                   seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Muestrea configuraciones aleatorias del espacio de búsqueda
+
+    Args:
+        num_trials: Número de configuraciones
+        space: Espacio de búsqueda (por defecto DEFAULT_SEARCH_SPACE)
+        seed: Semilla del muestreo
+
+    Returns:
+        Lista de diccionarios con argumentos para GRUModelBuilder.build_model
+    """
+    space = space or DEFAULT_SEARCH_SPACE
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(num_trials):
+        config = {}
+        for name, domain in space.items():
+            if isinstance(domain, tuple):
+                kind, low, high = domain
+                value = np.exp(rng.uniform(np.log(low), np.log(high))) if kind == 'log' else rng.uniform(low, high)
+                config[name] = round(float(value), 6)
+            else:
+                value = domain[rng.integers(len(domain))]
+                config[name] = value.item() if isinstance(value, np.generic) else value
+        configs.append(config)
+    return configs
+
+
+def halving_schedule(num_trials: int, min_epochs: int, max_epochs: int, eta: int) -> List[Dict[str, int]]:
+    """
+    Rondas de successive halving: (pruebas activas, épocas acumuladas)
+
+    Cada ronda multiplica por eta las épocas y divide por eta las pruebas.
+    """
+    if eta < 2:
+        raise ValueError("eta debe ser al menos 2")
+    # Conteo entero: math.log(1000, 10) = 2.999... perdería la última ronda
+    num_rungs = 1
+    while max(1, min_epochs) * eta**num_rungs <= max_epochs:
+        num_rungs += 1
+    schedule = []
+    for rung in range(num_rungs):
+        schedule.append({
+            'trials': max(1, num_trials // eta**rung),
+            'epochs': min(max_epochs, min_epochs * eta**rung)
+        })
+    return schedule
+
+
+def pareto_front(results: List[Dict[str, Any]]) -> List[int]:
+    """IDs de las pruebas que ninguna otra supera en accuracy y latencia a la vez"""
+    front = []
+    for result in results:
+        dominated = any(
+            other['val_accuracy'] >= result['val_accuracy'] and other['latency_ms'] <= result['latency_ms']
+            and (other['val_accuracy'] > result['val_accuracy'] or other['latency_ms'] < result['latency_ms'])
+            for other in results
+        )
+        if not dominated:
+            front.append(result['trial_id'])
+    return front
+
+
+def format_results_table(results: List[Dict[str, Any]]) -> str:
+    """
+    Tabla de texto: primero las pruebas con más épocas, luego por accuracy
+    (desc) y latencia (asc); ★ = frente de Pareto accuracy/latencia
+    """
+    header = (f"{'#':>3} {'':1} {'val_acc':>7} {'lat_ms':>7} {'params':>9} {'épocas':>6} "
+              f"{'units':>5} {'capas':>5} {'drop':>5} {'att':>3} {'lr':>8}")
+    lines = [header, '-' * len(header)]
+    front = set(pareto_front(results))
+    for result in sorted(results, key=lambda r: (-r['epochs'], -r['val_accuracy'], r['latency_ms'])):
+        config = result['config']
+        lines.append(
+            f"{result['trial_id']:>3} {'★' if result['trial_id'] in front else '':1} "
+            f"{result['val_accuracy']:>7.4f} {result['latency_ms']:>7.2f} {result['params']:>9,} "
+            f"{result['epochs']:>6} {config['gru_units']:>5} {config['num_gru_layers']:>5} "
+            f"{config['dropout_rate']:>5.2f} {'sí' if config['use_attention'] else 'no':>3} "
+            f"{config['learning_rate']:>8.1e}"
+        )
+    return '\n'.join(lines)
+
+
+def _init_worker(threads: int):
+    """Inicializa un proceso del pool: hilos de TensorFlow acotados antes de crear ops"""
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _measure_latency(model, sample: np.ndarray) -> float:
+    """Mediana en ms de una inferencia con batch 1 (grafo trazado, como en inferencia)"""
+    import tensorflow as tf
+
+    sample = tf.constant(sample[None].astype(np.float32))
+    predict = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    for _ in range(LATENCY_WARMUP):
+        predict(sample)
+    timings = []
+    for _ in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        predict(sample)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def run_trial(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Entrena una prueba hasta las épocas de su ronda y la evalúa
+
+    Se ejecuta en un proceso del pool: lee los arrays de la caché con
+    memory-map y continúa desde el modelo guardado en la ronda anterior.
+    """
+    import tensorflow as tf
+    from tensorflow import keras
+    from .model_builder import GRUModelBuilder
+
+    tf.keras.utils.set_random_seed(task['seed'])
+    arrays = {name: np.load(os.path.join(task['cache_path'], f"{name}.npy"), mmap_mode='r')
+              for name in ('X_train', 'y_train', 'X_val', 'y_val')}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if task['epochs_done'] == 0:
+            model = GRUModelBuilder().build_model(input_shape=tuple(task['input_shape']),
+                                                  num_classes=task['num_classes'], **task['config'])
+        else:
+            model = keras.models.load_model(task['model_path'])
+
+    start = time.perf_counter()
+    model.fit(np.asarray(arrays['X_train']), np.asarray(arrays['y_train']),
+              batch_size=task['batch_size'], epochs=task['epochs'], initial_epoch=task['epochs_done'],
+              class_weight=task['class_weights'], verbose=0)
+    train_seconds = time.perf_counter() - start
+
+    val_loss, val_accuracy = model.evaluate(np.asarray(arrays['X_val']), np.asarray(arrays['y_val']),
+                                            batch_size=task['batch_size'], verbose=0)[:2]
+    model.save(task['model_path'])
+
+    return {
+        'trial_id': task['trial_id'],
+        'config': task['config'],
+        'epochs': task['epochs'],
+        'val_accuracy': float(val_accuracy),
+        'val_loss': float(val_loss),
+        'latency_ms': _measure_latency(model, np.asarray(arrays['X_val'][0])),
+        'params': int(model.count_params()),
+        'train_seconds': train_seconds,
+        'model_path': task['model_path']
+    }
+
+
+class HyperparameterSearch:
+    """
+    Búsqueda aleatoria con successive halving sobre configuraciones GRU
+    """
+
+    def __init__(self,
+                 pipeline,
+                 space: Optional[Dict[str, Any]] = None,
+                 num_trials: int = 9,
+                 min_epochs: int = 2,
+                 max_epochs: int = 18,
+                 eta: int = 3,
+                 max_workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None,
+                 batch_size: int = 32,
+                 seed: int = 42,
+                 output_dir: Optional[str] = None):
+        """
+        Args:
+            pipeline: TrainingPipeline cuyos datos (en caché) se usan en todas las pruebas
+            space: Espacio de búsqueda (por defecto DEFAULT_SEARCH_SPACE)
+            num_trials: Configuraciones iniciales
+            min_epochs: Épocas de la primera ronda
+            max_epochs: Épocas máximas de una prueba
+            eta: Factor de reducción entre rondas
+            max_workers: Procesos en paralelo (0 o 1 = en el proceso actual)
+            threads_per_worker: Hilos intra-op por proceso (por defecto CPUs / procesos)
+            batch_size: Tamaño del batch
+            seed: Semilla del muestreo y del entrenamiento
+            output_dir: Carpeta de resultados (por defecto <logs>/hp_search_<fecha>)
+        """
+        self.pipeline = pipeline
+        self.configs = sample_configs(num_trials, space, seed)
+        self.schedule = halving_schedule(num_trials, min_epochs, max_epochs, eta)
+        cpus = os.cpu_count() or 1
+        self.max_workers = min(cpus, 4) if max_workers is None else max_workers
+        self.threads_per_worker = threads_per_worker or max(1, cpus // max(1, self.max_workers))
+        self.batch_size = batch_size
+        self.seed = seed
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = output_dir or os.path.join(pipeline.logs_path, f"hp_search_{timestamp}")
+        self.results: Dict[int, Dict[str, Any]] = {}
+
+    def _create_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Pool compartido por todas las rondas (None = en el proceso actual)"""
+        if self.max_workers <= 1:
+            return None
+        # 'spawn': TensorFlow no es seguro tras fork
+        return ProcessPoolExecutor(max_workers=min(self.max_workers, len(self.configs)),
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(self.threads_per_worker,))
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Ejecuta la búsqueda
+
+        Returns:
+            Resultados de todas las pruebas (la última ronda alcanzada por cada
+            una), ordenados por accuracy de validación y latencia
+        """
+        if getattr(self.pipeline, 'prepared_cache_path', None) is None or self.pipeline.streaming:
+            self.pipeline.prepare_data(use_cache=True)
+        if self.pipeline.streaming:
+            # Archivos de longitud variable: siempre en streaming, sin caché de arrays para los procesos
+            raise ValueError("La búsqueda necesita los datos en memoria (dataset de longitud fija)")
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        print(f"\n🔎 BÚSQUEDA DE HIPERPARÁMETROS: {len(self.configs)} pruebas, "
+              f"{len(self.schedule)} rondas, {self.max_workers} procesos × {self.threads_per_worker} hilos")
+
+        active = list(range(len(self.configs)))
+        epochs_done = {trial_id: 0 for trial_id in active}
+        executor = self._create_executor()
+        try:
+            self._run_rungs(executor, active, epochs_done)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        results = self.ranked_results()
+        self.save_results(results)
+        print(f"\n{format_results_table(results)}")
+        return results
+
+    def _run_rungs(self, executor: Optional[ProcessPoolExecutor], active: List[int],
+                   epochs_done: Dict[int, int]):
+        class_weights = None
+        if getattr(self.pipeline, 'class_weights', None):
+            class_weights = {int(label): float(weight) for label, weight in self.pipeline.class_weights.items()}
+        for rung, step in enumerate(self.schedule):
+            active = active[:step['trials']]
+            tasks = [{
+                'trial_id': trial_id,
+                'config': self.configs[trial_id],
+                'cache_path': self.pipeline.prepared_cache_path,
+                'input_shape': list(self.pipeline.input_shape),
+                'num_classes': int(self.pipeline.num_classes),
+                'epochs_done': epochs_done[trial_id],
+                'epochs': step['epochs'],
+                'batch_size': self.batch_size,
+                # Mismo objetivo que train_model: pesos por clase del conjunto de entrenamiento
+                'class_weights': class_weights,
+                'seed': self.seed + trial_id,
+                'model_path': os.path.join(self.output_dir, f"trial_{trial_id:03d}.h5")
+            } for trial_id in active]
+
+            outputs = executor.map(run_trial, tasks) if executor else map(run_trial, tasks)
+            for result in outputs:
+                result['rung'] = rung
+                self.results[result['trial_id']] = result
+                epochs_done[result['trial_id']] = result['epochs']
+
+            # Las siguientes rondas continúan solo con las mejores pruebas
+            active.sort(key=lambda t: (-self.results[t]['val_accuracy'], self.results[t]['latency_ms']))
+            best = self.results[active[0]]
+            print(f"   🏁 Ronda {rung + 1}/{len(self.schedule)} ({step['epochs']} épocas): "
+                  f"mejor val_acc={best['val_accuracy']:.4f} (prueba {best['trial_id']})")
+
+    def ranked_results(self) -> List[Dict[str, Any]]:
+        front = set(pareto_front(list(self.results.values())))
+        ranked = sorted(self.results.values(), key=lambda r: (-r['epochs'], -r['val_accuracy'], r['latency_ms']))
+        for result in ranked:
+            result['pareto'] = result['trial_id'] in front
+        return ranked
+
+    def best_config(self) -> Dict[str, Any]:
+        """Configuración con mejor accuracy entre las que llegaron a la última ronda"""
+        return dict(self.ranked_results()[0]['config'])
+
+    def save_results(self, results: List[Dict[str, Any]]):
+        """Guarda results.json y la tabla en texto en la carpeta de la búsqueda"""
+        with open(os.path.join(self.output_dir, 'results.json'), 'w', encoding='utf-8') as f:
+            json.dump({'schedule': self.schedule, 'threads_per_worker': self.threads_per_worker,
+                       'results': results}, f, indent=2, ensure_ascii=False)
+        with open(os.path.join(self.output_dir, 'results.txt'), 'w', encoding='utf-8') as f:
+            f.write(format_results_table(results) + '\n')
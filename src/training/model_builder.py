@@ -14,6 +14,17 @@ from typing import Dict, Any, Optional, Tuple
 import numpy as np
 
 
+# Perfiles de arquitectura de las capas GRU
+#   standard: recurrent_dropout en cada GRU (bucle genérico, más lento)
+#   fast: sin recurrent_dropout, reset_after=True y activaciones por defecto, de modo que
+#         TensorFlow usa el kernel GRU fusionado (cuDNN en GPU, grafo compilado en CPU);
+#         la regularización queda en el dropout de entrada de cada GRU y de salida
+MODEL_PROFILES = {
+    'standard': {'recurrent_dropout_factor': 0.5},
+    'fast': {'recurrent_dropout_factor': 0.0},
+}
+
+
 class GRUModelBuilder:
     """
     Constructor de modelos GRU bidireccionales optimizados para LSP
@@ -33,12 +44,16 @@ class GRUModelBuilder:
                    dropout_rate: float = 0.3,
                    learning_rate: float = 0.001,
                    l2_reg: float = 0.01,
-                   use_attention: bool = True) -> keras.Model:
+                   use_attention: bool = True,
+                   profile: str = 'standard',
+                   jit_compile: bool = False) -> keras.Model:
         """
         Construye modelo GRU bidireccional optimizado
         
         Args:
-            input_shape: Forma de entrada (secuencia_length, features)
+            input_shape: Forma de entrada (secuencia_length, features); con
+                secuencia_length None el modelo acepta longitud variable y
+                enmascara los frames de relleno (ceros)
             num_classes: Número de clases a clasificar
             gru_units: Número de unidades GRU por capa
             num_gru_layers: Número de capas GRU
@@ -46,10 +61,17 @@ class GRUModelBuilder:
             learning_rate: Tasa de aprendizaje
             l2_reg: Regularización L2
             use_attention: Si usar mecanismo de atención
+            profile: Perfil de las capas GRU ('standard' o 'fast', ver MODEL_PROFILES)
+            jit_compile: Compilar los pasos de entrenamiento/evaluación con XLA
             
         Returns:
             Modelo compilado
         """
+        if profile not in MODEL_PROFILES:
+            raise ValueError(f"Perfil desconocido: {profile}. Opciones: {', '.join(MODEL_PROFILES)}")
+        recurrent_dropout = dropout_rate * MODEL_PROFILES[profile]['recurrent_dropout_factor']
+        variable_length = input_shape[0] is None
+
         print(f"\n🔧 CONSTRUYENDO MODELO GRU BIDIRECCIONAL")
         print(f"   📐 Input shape: {input_shape}")
         print(f"   🎯 Clases: {num_classes}")
@@ -57,6 +79,12 @@ class GRUModelBuilder:
         print(f"   📚 Capas GRU: {num_gru_layers}")
         print(f"   💧 Dropout: {dropout_rate}")
         print(f"   🎯 Atención: {'✅' if use_attention else '❌'}")
+        if variable_length:
+            print(f"   📏 Longitud variable: ✅ (Masking de los frames de relleno)")
+        print(f"   ⚡ Perfil: {profile}{' + XLA' if jit_compile else ''}")
+        if jit_compile and profile == 'fast' and not tf.config.list_physical_devices('GPU'):
+            # En CPU, XLA sobre el GRU fusionado genera pasos de entrenamiento mucho más lentos
+            print("   ⚠️ XLA con el perfil 'fast' en CPU es más lento; usa el perfil 'standard' o sin XLA")
         
         # Configuración del modelo
         self.model_config = {
@@ -67,14 +95,21 @@ class GRUModelBuilder:
             'dropout_rate': dropout_rate,
             'learning_rate': learning_rate,
             'l2_reg': l2_reg,
-            'use_attention': use_attention
+            'use_attention': use_attention,
+            'profile': profile,
+            'jit_compile': jit_compile,
+            'variable_length': variable_length
         }
         
         # Entrada
         inputs = layers.Input(shape=input_shape, name='sequence_input')
+        x = inputs
+        if variable_length:
+            # La máscara de los frames de relleno llega a las GRU, la atención y el pooling
+            x = layers.Masking(mask_value=0.0, name='input_masking')(x)
         
         # Normalización de entrada
-        x = layers.LayerNormalization(name='input_normalization')(inputs)
+        x = layers.LayerNormalization(name='input_normalization')(x)
         
         # Capas GRU bidireccionales
         for i in range(num_gru_layers):
@@ -86,7 +121,10 @@ class GRUModelBuilder:
                     gru_units,
                     return_sequences=return_sequences,
                     dropout=dropout_rate,
-                    recurrent_dropout=dropout_rate * 0.5,
+                    recurrent_dropout=recurrent_dropout,
+                    reset_after=True,
+                    activation='tanh',
+                    recurrent_activation='sigmoid',
                     kernel_regularizer=regularizers.l2(l2_reg),
                     name=f'gru_layer_{i+1}'
                 ),
@@ -100,7 +138,7 @@ class GRUModelBuilder:
         
         # Mecanismo de atención (opcional)
         if use_attention:
-            x = self._add_attention_layer(x, gru_units * 2)  # *2 porque es bidireccional
+            x = self._add_attention_layer(x, gru_units * 2, masked=variable_length)  # *2 porque es bidireccional
         
         # Capas densas de clasificación
         x = layers.Dense(
@@ -128,7 +166,8 @@ class GRUModelBuilder:
         model.compile(
             optimizer=optimizer,
             loss='sparse_categorical_crossentropy',
-            metrics=['accuracy', 'top_k_categorical_accuracy']
+            metrics=['accuracy', 'top_k_categorical_accuracy'],
+            jit_compile=jit_compile
         )
         
         self.model = model
@@ -141,19 +180,31 @@ class GRUModelBuilder:
         
         return model
     
-    def _add_attention_layer(self, x, units: int):
+    def _add_attention_layer(self, x, units: int, masked: bool = False):
         """
         Añade mecanismo de atención al modelo
         
         Args:
             x: Tensor de entrada
             units: Número de unidades
+            masked: Si x lleva máscara de frames de relleno (modelos de longitud variable)
             
         Returns:
             Tensor con atención aplicada
         """
         # Atención simple basada en densidad
         attention_weights = layers.Dense(1, activation='tanh', name='attention_dense')(x)
+        
+        if masked:
+            # Softmax(axis=1) no admite la máscara (batch, frames) sobre (batch, frames, 1):
+            # exp de la puntuación (acotada por tanh) y dos promedios con máscara dan la suma
+            # ponderada por el softmax de los frames reales, igual con o sin relleno
+            attention_weights = layers.Activation('exponential', name='attention_exp')(attention_weights)
+            attended = layers.Multiply(name='attention_multiply')([x, attention_weights])
+            pooled = layers.GlobalAveragePooling1D(name='attention_pooling')(attended)
+            normalizer = layers.GlobalAveragePooling1D(name='attention_normalizer')(attention_weights)
+            return tf.math.divide(pooled, normalizer)
+        
         attention_weights = layers.Softmax(axis=1, name='attention_softmax')(attention_weights)
         
         # Aplicar pesos de atención
@@ -284,7 +335,9 @@ class GRUModelBuilder:
                            X_val: np.ndarray, 
                            y_val: np.ndarray,
                            batch_size: int = 32,
-                           shuffle_train: bool = True) -> Tuple[tf.data.Dataset, tf.data.Dataset]:
+                           shuffle_train: bool = True,
+                           seed: Optional[int] = None,
+                           initial_epoch: int = 0) -> Tuple[tf.data.Dataset, tf.data.Dataset]:
         """
         Crea generadores de datos optimizados
         
@@ -293,6 +346,9 @@ class GRUModelBuilder:
             X_val, y_val: Datos de validación
             batch_size: Tamaño del batch
             shuffle_train: Si mezclar datos de entrenamiento
+            seed: Si se indica, el orden de cada época depende solo de (seed, época),
+                lo que permite reanudar un entrenamiento con el mismo orden de datos
+            initial_epoch: Primera época que recorrerá el dataset (al reanudar)
             
         Returns:
             Generadores de entrenamiento y validación
@@ -303,10 +359,13 @@ class GRUModelBuilder:
         print(f"   📦 Batch size: {batch_size}")
         
         # Dataset de entrenamiento
-        train_dataset = tf.data.Dataset.from_tensor_slices((X_train, y_train))
-        if shuffle_train:
-            train_dataset = train_dataset.shuffle(buffer_size=len(X_train))
-        train_dataset = train_dataset.batch(batch_size)
+        if shuffle_train and seed is not None:
+            train_dataset = self._epoch_seeded_dataset(X_train, y_train, batch_size, seed, initial_epoch)
+        else:
+            train_dataset = tf.data.Dataset.from_tensor_slices((X_train, y_train))
+            if shuffle_train:
+                train_dataset = train_dataset.shuffle(buffer_size=len(X_train))
+            train_dataset = train_dataset.batch(batch_size)
         train_dataset = train_dataset.prefetch(tf.data.AUTOTUNE)
         
         # Dataset de validación
@@ -316,37 +375,93 @@ class GRUModelBuilder:
         
         return train_dataset, val_dataset
     
-    def get_model_memory_usage(self) -> Dict[str, Any]:
+    @staticmethod
+    def _epoch_seeded_dataset(X: np.ndarray, y: np.ndarray, batch_size: int,
+                              seed: int, initial_epoch: int) -> tf.data.Dataset:
+        """
+        Dataset cuya iteración n-ésima recorre la época initial_epoch + n con la
+        permutación de np.random.default_rng(seed + época)
+        """
+        X_tensor = tf.constant(X)
+        y_tensor = tf.constant(y)
+        state = {'epoch': initial_epoch}
+        
+        def index_batches():
+            order = np.random.default_rng(seed + state['epoch']).permutation(len(X))
+            state['epoch'] += 1
+            for start in range(0, len(order), batch_size):
+                yield order[start:start + batch_size]
+        
+        dataset = tf.data.Dataset.from_generator(
+            index_batches, output_signature=tf.TensorSpec(shape=(None,), dtype=tf.int64))
+        # Cardinalidad conocida: sin ella Keras da un paso extra al agotar el generador
+        num_batches = int(np.ceil(len(X) / batch_size))
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(num_batches))
+        return dataset.map(lambda indices: (tf.gather(X_tensor, indices), tf.gather(y_tensor, indices)))
+    
+    def get_model_memory_usage(self, model: Optional[keras.Model] = None) -> Dict[str, Any]:
         """
         Calcula el uso de memoria estimado del modelo
         
+        Args:
+            model: Modelo a medir (por defecto el último construido)
+        
         Returns:
             Diccionario con información de memoria
         """
-        if self.model is None:
+        model = model if model is not None else self.model
+        if model is None:
             return {"error": "No hay modelo construido"}
         
         # Calcular parámetros
-        total_params = self.model.count_params()
-        trainable_params = sum([tf.reduce_prod(var.shape) for var in self.model.trainable_variables])
+        total_params = model.count_params()
+        trainable_params = sum([tf.reduce_prod(var.shape) for var in model.trainable_variables])
+        weights = model.get_weights()
+        nonzero_params = int(sum(np.count_nonzero(w) for w in weights))
         
         # Estimar memoria (4 bytes por parámetro float32)
         model_size_mb = (total_params * 4) / (1024 * 1024)
+        # Tamaño efectivo: los pesos con clustering se guardan como índices + codebook
+        effective_size_mb = sum(effective_weight_bytes(w) for w in weights) / (1024 * 1024)
         
         # Estimar memoria de activaciones para batch típico
         batch_size = 32
-        input_shape = self.model_config.get('input_shape', (60, 100))
-        activation_memory_mb = (batch_size * input_shape[0] * input_shape[1] * 4) / (1024 * 1024)
+        sequence_length, num_features = model.input_shape[1:]
+        # Longitud variable: se estima con la ventana por defecto de 60 frames
+        sequence_length = sequence_length or 60
+        activation_memory_mb = (batch_size * sequence_length * num_features * 4) / (1024 * 1024)
         
         return {
             'total_parameters': total_params,
             'trainable_parameters': int(trainable_params),
+            'nonzero_parameters': nonzero_params,
             'model_size_mb': round(model_size_mb, 2),
+            'effective_size_mb': round(effective_size_mb, 2),
             'estimated_activation_memory_mb': round(activation_memory_mb, 2),
             'estimated_total_memory_mb': round(model_size_mb + activation_memory_mb * 2, 2)
         }
 
 
+def effective_weight_bytes(weight: np.ndarray, max_codebook: int = 256) -> int:
+    """
+    Bytes necesarios para guardar un peso: float32 denso o, si tiene pocos
+    valores distintos (clustering), índices de ceil(log2(k)) bits más el codebook
+    
+    Args:
+        weight: Array de pesos
+        max_codebook: Máximo de valores distintos para usar codebook
+        
+    Returns:
+        Tamaño en bytes
+    """
+    dense_bytes = weight.size * 4
+    distinct = np.unique(weight).size
+    if distinct > max_codebook or distinct >= weight.size:
+        return dense_bytes
+    bits = max(1, int(np.ceil(np.log2(distinct))))
+    return min(dense_bytes, int(np.ceil(weight.size * bits / 8)) + distinct * 4)
+
+
 def create_optimized_gru_model(input_shape: Tuple[int, int], 
                               num_classes: int,
                               config: Optional[Dict[str, Any]] = None) -> keras.Model:
@@ -370,7 +485,9 @@ def create_optimized_gru_model(input_shape: Tuple[int, int],
         'dropout_rate': 0.3,
         'learning_rate': 0.001,
         'l2_reg': 0.01,
-        'use_attention': True
+        'use_attention': True,
+        'profile': 'standard',
+        'jit_compile': False
     }
     
     if config:
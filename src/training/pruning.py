@@ -0,0 +1,172 @@
+"""
+Pruning - Poda estructurada y clustering de pesos del modelo GRU
+Elimina las unidades GRU (por dirección y capa) y las neuronas de
+dense_hidden de menor magnitud y copia los pesos restantes en un modelo de
+GRUModelBuilder con menos unidades: el modelo resultante es realmente más
+pequeño y más rápido en CPU (la dispersión no estructurada no acelera los
+kernels densos). El clustering opcional comparte k valores por kernel, lo
+que reduce el tamaño efectivo (índices de pocos bits + codebook).
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+from .model_builder import GRUModelBuilder
+
+
+DEFAULT_PRUNING_RATIO = 0.5
+DEFAULT_FINE_TUNE_LEARNING_RATE = 5e-4
+
+
+def infer_model_config(model: keras.Model) -> Dict[str, Any]:
+    """
+    Configuración de build_model de un modelo de GRUModelBuilder ya construido
+
+    Args:
+        model: Modelo keras (p. ej. cargado de un .h5)
+
+    Returns:
+        gru_units, num_gru_layers, dropout_rate, l2_reg, use_attention y profile
+    """
+    layer_names = {layer.name for layer in model.layers}
+    num_gru_layers = sum(1 for name in layer_names if name.startswith('bidirectional_gru_'))
+    gru = model.get_layer('bidirectional_gru_1').forward_layer
+    regularizer = gru.kernel_regularizer
+    return {
+        'gru_units': int(gru.units),
+        'num_gru_layers': num_gru_layers,
+        'dropout_rate': float(model.get_layer('final_dropout').rate),
+        'l2_reg': float(regularizer.l2) if regularizer is not None else 0.0,
+        'use_attention': 'attention_dense' in layer_names,
+        'profile': 'fast' if gru.recurrent_dropout == 0 else 'standard'
+    }
+
+
+def _top_units(scores: np.ndarray, keep: int) -> np.ndarray:
+    """Índices (ordenados) de las keep unidades de mayor puntuación"""
+    return np.sort(np.argsort(scores)[::-1][:keep])
+
+
+def _gate_columns(indices: np.ndarray, units: int) -> np.ndarray:
+    """Columnas de las compuertas z, r y h de las unidades dadas"""
+    return np.concatenate([gate * units + indices for gate in range(3)])
+
+
+def gru_unit_importance(kernel: np.ndarray, recurrent_kernel: np.ndarray, units: int) -> np.ndarray:
+    """
+    Norma L2 de los pesos de cada unidad: sus columnas de entrada y
+    recurrentes en las tres compuertas y su fila recurrente de salida
+    """
+    incoming = (kernel ** 2).reshape(kernel.shape[0], 3, units).sum(axis=(0, 1))
+    recurrent = (recurrent_kernel ** 2).reshape(units, 3, units).sum(axis=(0, 1))
+    outgoing = (recurrent_kernel ** 2).sum(axis=1)
+    return np.sqrt(incoming + recurrent + outgoing)
+
+
+def prune_gru_model(model: keras.Model, ratio: float = DEFAULT_PRUNING_RATIO,
+                    builder: Optional[GRUModelBuilder] = None,
+                    **build_options) -> Tuple[keras.Model, Dict[str, Any]]:
+    """
+    Poda estructurada: quita la fracción ratio de unidades de cada GRU y de dense_hidden
+
+    Args:
+        model: Modelo de GRUModelBuilder entrenado
+        ratio: Fracción de unidades a eliminar (0-1)
+        builder: Constructor para el modelo podado (por defecto uno nuevo)
+        **build_options: Opciones de build_model del modelo podado (learning_rate, jit_compile, ...)
+
+    Returns:
+        (modelo podado y compilado, información de la poda)
+    """
+    if not 0 <= ratio < 1:
+        raise ValueError(f"ratio debe estar en [0, 1): {ratio}")
+
+    config = infer_model_config(model)
+    config.update(build_options)
+    units = config['gru_units']
+    keep = max(1, int(round(units * (1 - ratio))))
+    config['gru_units'] = keep
+
+    builder = builder or GRUModelBuilder()
+    pruned = builder.build_model(input_shape=tuple(model.input_shape[1:]),
+                                 num_classes=model.output_shape[-1], **config)
+    pruned.get_layer('input_normalization').set_weights(model.get_layer('input_normalization').get_weights())
+
+    # Índices de las características que llegan a la capa siguiente
+    features = np.arange(model.input_shape[-1])
+    for i in range(1, config['num_gru_layers'] + 1):
+        source = model.get_layer(f"bidirectional_gru_{i}")
+        target = pruned.get_layer(f"bidirectional_gru_{i}")
+        kept = []
+        for source_gru, target_gru in ((source.forward_layer, target.forward_layer),
+                                       (source.backward_layer, target.backward_layer)):
+            kernel, recurrent_kernel, bias = source_gru.get_weights()
+            indices = _top_units(gru_unit_importance(kernel, recurrent_kernel, units), keep)
+            columns = _gate_columns(indices, units)
+            target_gru.set_weights([kernel[features][:, columns],
+                                    recurrent_kernel[indices][:, columns],
+                                    bias[:, columns]])
+            kept.append(indices)
+        # Salida concatenada [adelante, atrás]
+        features = np.concatenate([kept[0], units + kept[1]])
+
+        if f"layer_norm_{i}" in {layer.name for layer in pruned.layers}:
+            gamma, beta = model.get_layer(f"layer_norm_{i}").get_weights()
+            pruned.get_layer(f"layer_norm_{i}").set_weights([gamma[features], beta[features]])
+
+    if config['use_attention']:
+        kernel, bias = model.get_layer('attention_dense').get_weights()
+        pruned.get_layer('attention_dense').set_weights([kernel[features], bias])
+
+    # dense_hidden tiene gru_units neuronas: se poda con la misma proporción
+    hidden_kernel, hidden_bias = model.get_layer('dense_hidden').get_weights()
+    output_kernel, output_bias = model.get_layer('classification_output').get_weights()
+    hidden_scores = np.sqrt((hidden_kernel ** 2).sum(axis=0) + (output_kernel ** 2).sum(axis=1))
+    hidden = _top_units(hidden_scores, keep)
+    pruned.get_layer('dense_hidden').set_weights([hidden_kernel[features][:, hidden], hidden_bias[hidden]])
+    pruned.get_layer('classification_output').set_weights([output_kernel[hidden], output_bias])
+
+    info = {
+        'ratio': ratio,
+        'gru_units_before': units,
+        'gru_units_after': keep,
+        'parameters_before': int(model.count_params()),
+        'parameters_after': int(pruned.count_params())
+    }
+    return pruned, info
+
+
+def cluster_weights(model: keras.Model, num_clusters: int = 16, iterations: int = 20) -> Dict[str, int]:
+    """
+    Clustering de pesos: k-means 1-D sobre cada kernel, que pasa a tener
+    como mucho num_clusters valores distintos (sesgos y normalizaciones intactos)
+
+    Args:
+        model: Modelo keras (se modifica en el sitio)
+        num_clusters: Valores distintos por kernel
+        iterations: Iteraciones de Lloyd
+
+    Returns:
+        {nombre del peso: valores distintos resultantes}
+    """
+    clustered = {}
+    for weight in model.weights:
+        if 'kernel' not in weight.name or int(np.prod(weight.shape)) <= num_clusters:
+            continue
+        values = weight.numpy().ravel()
+        centroids = np.linspace(values.min(), values.max(), num_clusters)
+        for _ in range(iterations):
+            # Centroides ordenados: la asignación es una búsqueda entre puntos medios
+            assignment = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, values)
+            counts = np.bincount(assignment, minlength=num_clusters)
+            sums = np.bincount(assignment, weights=values, minlength=num_clusters)
+            centroids = np.sort(np.where(counts > 0, sums / np.maximum(counts, 1), centroids))
+        assignment = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, values)
+        weight.assign(centroids[assignment].astype(values.dtype).reshape(weight.shape))
+        clustered[weight.name] = int(np.unique(assignment).size)
+    return clustered
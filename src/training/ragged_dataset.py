@@ -0,0 +1,211 @@
+"""
+Ragged Dataset - Secuencias de longitud variable para tf.data
+Lee el layout de longitud variable de sequences.h5 (frames + offset/length)
+y agrupa las secuencias en buckets por longitud: cada batch se rellena con
+ceros solo hasta la secuencia más larga de su bucket y el modelo (capa
+Masking) ignora ese relleno, así que el cómputo sigue a los frames reales
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import h5py
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+from ..utils.dtype_policy import FEATURE_DTYPE
+from .streaming_dataset import DEFAULT_BLOCK_ROWS, split_into_blocks
+
+
+DEFAULT_NUM_BUCKETS = 4
+# Valor de relleno: el mismo mask_value de la capa Masking del modelo
+PAD_VALUE = 0.0
+
+
+def read_ragged_rows(hf: h5py.File, indices: np.ndarray,
+                     block_rows: int = DEFAULT_BLOCK_ROWS) -> List[np.ndarray]:
+    """
+    Lee las secuencias de un subconjunto de filas del layout de longitud variable
+
+    Las filas de un mismo bloque se leen con una sola lectura del tramo de
+    'frames' que las cubre.
+
+    Args:
+        hf: Archivo HDF5 abierto
+        indices: Índices de fila ordenados ascendentemente
+        block_rows: Filas por bloque de lectura
+
+    Returns:
+        Lista de arrays (frames, features) en FEATURE_DTYPE, en el orden de `indices`
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    offsets = hf['offset'][:]
+    lengths = hf['length'][:].astype(np.int64)
+    frames = hf['frames']
+
+    sequences = []
+    for begin, end in split_into_blocks(indices, block_rows):
+        rows = indices[begin:end]
+        first = int(offsets[rows].min())
+        span = frames[first:int((offsets[rows] + lengths[rows]).max())].astype(FEATURE_DTYPE, copy=False)
+        sequences.extend(span[offsets[row] - first:offsets[row] - first + lengths[row]] for row in rows)
+    return sequences
+
+
+def bucket_boundaries(lengths: np.ndarray, num_buckets: int = DEFAULT_NUM_BUCKETS) -> List[int]:
+    """
+    Límites de los buckets por longitud a partir de los cuantiles
+
+    Con límites en los cuantiles cada bucket recibe una fracción parecida de
+    las secuencias, y el relleno de un batch queda acotado por la dispersión
+    de longitudes dentro de su bucket.
+
+    Args:
+        lengths: Frames de cada secuencia
+        num_buckets: Buckets deseados (los límites repetidos se fusionan)
+
+    Returns:
+        Límites para tf.data bucket_by_sequence_length (bucket i: longitud < límite i)
+    """
+    lengths = np.asarray(lengths)
+    if len(lengths) == 0 or num_buckets <= 1:
+        return []
+    quantiles = np.quantile(lengths, np.linspace(0, 1, num_buckets + 1)[1:-1])
+    boundaries = np.unique(np.floor(quantiles).astype(np.int64) + 1)
+    return [int(b) for b in boundaries if lengths.min() < b <= lengths.max()]
+
+
+class RaggedSequenceDataset:
+    """
+    Fuente de datos de longitud variable sobre un subconjunto de filas
+
+    Misma interfaz que HDF5StreamingDataset (labels, batch_size, seed, epoch,
+    element_shape, num_samples, as_tf_dataset). En train las secuencias se
+    mezclan por época y se agrupan en buckets por longitud; en val/test se
+    conservan en el orden de las filas (las predicciones quedan alineadas
+    con labels).
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 indices: np.ndarray,
+                 labels: np.ndarray,
+                 batch_size: int = 32,
+                 shuffle: bool = True,
+                 seed: int = 42,
+                 num_buckets: int = DEFAULT_NUM_BUCKETS,
+                 block_rows: int = DEFAULT_BLOCK_ROWS,
+                 shuffle_buffer_blocks: int = 4,
+                 mean: Optional[np.ndarray] = None,
+                 std: Optional[np.ndarray] = None):
+        """
+        Args:
+            file_path: Ruta del archivo HDF5 (layout de longitud variable)
+            indices: Filas que forman este subconjunto
+            labels: Etiquetas codificadas, alineadas con `indices`
+            batch_size: Tamaño del batch (en todos los buckets)
+            shuffle: Si mezclar en cada época y agrupar por longitud
+            seed: Semilla base; cada época usa seed + época
+            num_buckets: Buckets por longitud (ver bucket_boundaries)
+            block_rows: Filas por lectura
+            shuffle_buffer_blocks: Bloques que se mezclan juntos
+            mean, std: Estadísticas de normalización z-score (opcional)
+        """
+        order = np.argsort(indices, kind='stable')
+        self.indices = np.asarray(indices, dtype=np.int64)[order]
+        self.labels = np.asarray(labels, dtype=np.int32)[order]
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.block_rows = block_rows
+        self.shuffle_buffer_blocks = max(1, shuffle_buffer_blocks)
+        self.epoch = 0
+
+        self.mean = None if mean is None else np.asarray(mean, dtype=FEATURE_DTYPE).reshape(-1)
+        self.std = None if std is None else np.asarray(std, dtype=FEATURE_DTYPE).reshape(-1)
+
+        with h5py.File(file_path, 'r') as f:
+            self.lengths = f['length'][:][self.indices].astype(np.int64)
+            self.element_shape = (None, f['frames'].shape[1])
+
+        self.boundaries = bucket_boundaries(self.lengths, num_buckets) if shuffle else []
+        self.blocks = split_into_blocks(self.indices, self.block_rows)
+
+    def __len__(self) -> int:
+        """Número de batches por época (cada bucket emite su propio batch incompleto)"""
+        if not self.shuffle:
+            return int(np.ceil(len(self.indices) / self.batch_size))
+        bucket_sizes = np.bincount(np.searchsorted(self.boundaries, self.lengths, side='right'),
+                                   minlength=len(self.boundaries) + 1)
+        return int(np.ceil(bucket_sizes / self.batch_size).sum())
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.indices)
+
+    def _normalize(self, sequence: np.ndarray) -> np.ndarray:
+        if self.mean is not None:
+            sequence = (sequence - self.mean) / self.std
+        return sequence
+
+    def iter_sequences(self, epoch: Optional[int] = None) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Itera las secuencias de una época
+
+        Args:
+            epoch: Época (determina el orden de mezcla); por defecto self.epoch
+
+        Yields:
+            (secuencia normalizada (frames, F) float32, etiqueta)
+        """
+        epoch = self.epoch if epoch is None else epoch
+        rng = np.random.default_rng(self.seed + epoch)
+        block_order = rng.permutation(len(self.blocks)) if self.shuffle else np.arange(len(self.blocks))
+
+        with h5py.File(self.file_path, 'r') as f:
+            for group_start in range(0, len(block_order), self.shuffle_buffer_blocks):
+                positions = np.sort(np.concatenate([
+                    np.arange(*self.blocks[block_id])
+                    for block_id in block_order[group_start:group_start + self.shuffle_buffer_blocks]]))
+                sequences = read_ragged_rows(f, self.indices[positions], self.block_rows)
+                labels = self.labels[positions]
+                order = rng.permutation(len(labels)) if self.shuffle else np.arange(len(labels))
+                for i in order:
+                    yield self._normalize(sequences[i]), labels[i]
+
+    def as_tf_dataset(self, prefetch: bool = True):
+        """
+        Crea un tf.data.Dataset de batches rellenados con PAD_VALUE
+
+        Cada iteración completa del dataset avanza una época, con un orden de
+        mezcla distinto y reproducible.
+        """
+        import tensorflow as tf
+
+        def generator():
+            epoch = self.epoch
+            self.epoch += 1
+            yield from self.iter_sequences(epoch)
+
+        dataset = tf.data.Dataset.from_generator(
+            generator,
+            output_signature=(
+                tf.TensorSpec(shape=self.element_shape, dtype=tf.float32),
+                tf.TensorSpec(shape=(), dtype=tf.int32)
+            )
+        )
+        padding_values = (tf.constant(PAD_VALUE, tf.float32), tf.constant(0, tf.int32))
+        if self.shuffle:
+            dataset = dataset.bucket_by_sequence_length(
+                lambda sequence, label: tf.shape(sequence)[0],
+                bucket_boundaries=self.boundaries,
+                bucket_batch_sizes=[self.batch_size] * (len(self.boundaries) + 1),
+                padding_values=padding_values
+            )
+        else:
+            dataset = dataset.padded_batch(self.batch_size, padding_values=padding_values)
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(len(self)))
+        if prefetch:
+            dataset = dataset.prefetch(tf.data.AUTOTUNE)
+        return dataset
@@ -0,0 +1,249 @@
+"""
+Streaming Dataset - Lectura por bloques de HDF5 para tf.data
+Permite entrenar con datasets más grandes que la RAM: las secuencias se
+leen por bloques alineados con los chunks del archivo, se mezclan dentro de
+un buffer acotado y se normalizan al vuelo
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import h5py
+import numpy as np
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from ..utils.dtype_policy import FEATURE_DTYPE
+
+
+DEFAULT_BLOCK_ROWS = 256
+
+
+def aligned_block_rows(dataset: h5py.Dataset, target_rows: int = DEFAULT_BLOCK_ROWS) -> int:
+    """
+    Calcula un tamaño de bloque (en filas) múltiplo del chunk del dataset
+
+    Args:
+        dataset: Dataset HDF5 de secuencias (filas en el eje 0)
+        target_rows: Tamaño de bloque deseado
+
+    Returns:
+        Número de filas por bloque alineado con los chunks
+    """
+    chunk_rows = dataset.chunks[0] if dataset.chunks else 1
+    return max(chunk_rows, (target_rows // chunk_rows) * chunk_rows)
+
+
+def split_into_blocks(indices: np.ndarray, block_rows: int) -> List[Tuple[int, int]]:
+    """
+    Agrupa índices ordenados por bloque de filas del archivo
+
+    Args:
+        indices: Índices de fila ordenados ascendentemente
+        block_rows: Filas por bloque
+
+    Returns:
+        Lista de (inicio, fin) sobre el array de índices, un par por bloque
+    """
+    if len(indices) == 0:
+        return []
+    block_ids = indices // block_rows
+    boundaries = np.flatnonzero(np.diff(block_ids)) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(indices)]])
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def read_block(dataset: h5py.Dataset, block_indices: np.ndarray) -> np.ndarray:
+    """
+    Lee las filas de un bloque: lectura contigua si el bloque es denso,
+    selección puntual de h5py si es disperso
+    """
+    start, stop = int(block_indices[0]), int(block_indices[-1]) + 1
+    if len(block_indices) * 2 >= stop - start:
+        return dataset[start:stop][block_indices - start]
+    return dataset[block_indices]
+
+
+def read_rows(dataset: h5py.Dataset,
+              indices: np.ndarray,
+              block_rows: Optional[int] = None,
+              transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+              dtype=FEATURE_DTYPE) -> np.ndarray:
+    """
+    Lee un subconjunto de filas bloque a bloque en un array preasignado,
+    sin cargar el dataset completo en memoria
+
+    Args:
+        dataset: Dataset HDF5 de secuencias
+        indices: Índices de fila ordenados ascendentemente
+        block_rows: Filas por bloque (por defecto alineado con los chunks)
+        transform: Transformación aplicada a cada bloque (p. ej. ajuste de longitud)
+        dtype: Tipo de datos del resultado
+
+    Returns:
+        Array con las filas seleccionadas en el orden de `indices`
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    block_rows = block_rows or aligned_block_rows(dataset)
+    out = None
+
+    for begin, end in split_into_blocks(indices, block_rows):
+        rows = read_block(dataset, indices[begin:end])
+        if transform is not None:
+            rows = transform(rows)
+        if out is None:
+            out = np.empty((len(indices),) + rows.shape[1:], dtype=dtype)
+        out[begin:end] = rows
+
+    if out is None:
+        out = np.empty((0,) + dataset.shape[1:], dtype=dtype)
+    return out
+
+
+class HDF5StreamingDataset:
+    """
+    Fuente de datos por streaming sobre un subconjunto de filas de un HDF5
+
+    La memoria máxima está acotada por el buffer de mezcla:
+    shuffle_buffer_blocks * block_rows secuencias.
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 indices: np.ndarray,
+                 labels: np.ndarray,
+                 batch_size: int = 32,
+                 shuffle: bool = True,
+                 seed: int = 42,
+                 block_rows: Optional[int] = None,
+                 shuffle_buffer_blocks: int = 4,
+                 mean: Optional[np.ndarray] = None,
+                 std: Optional[np.ndarray] = None,
+                 transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 dataset_key: str = 'X'):
+        """
+        Args:
+            file_path: Ruta del archivo HDF5
+            indices: Filas que forman este subconjunto
+            labels: Etiquetas codificadas, alineadas con `indices`
+            batch_size: Tamaño del batch
+            shuffle: Si mezclar (orden de bloques + buffer) en cada época
+            seed: Semilla base; cada época usa seed + época
+            block_rows: Filas por lectura (por defecto alineado con los chunks)
+            shuffle_buffer_blocks: Bloques que se mezclan juntos
+            mean, std: Estadísticas de normalización z-score (opcional)
+            transform: Transformación por bloque (p. ej. ajuste de longitud)
+            dataset_key: Nombre del dataset de secuencias en el archivo
+        """
+        order = np.argsort(indices, kind='stable')
+        self.indices = np.asarray(indices, dtype=np.int64)[order]
+        self.labels = np.asarray(labels, dtype=np.int32)[order]
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.shuffle_buffer_blocks = max(1, shuffle_buffer_blocks)
+        self.transform = transform
+        self.dataset_key = dataset_key
+        self.epoch = 0
+
+        self.mean = None if mean is None else np.asarray(mean, dtype=FEATURE_DTYPE).reshape(-1)
+        self.std = None if std is None else np.asarray(std, dtype=FEATURE_DTYPE).reshape(-1)
+
+        with h5py.File(file_path, 'r') as f:
+            dataset = f[dataset_key]
+            self.block_rows = block_rows or aligned_block_rows(dataset)
+            sample = dataset[0:1] if dataset.shape[0] > 0 else np.zeros((1,) + dataset.shape[1:], FEATURE_DTYPE)
+            if transform is not None:
+                sample = transform(sample)
+            self.element_shape = tuple(sample.shape[1:])
+
+        self.blocks = split_into_blocks(self.indices, self.block_rows)
+
+    def __len__(self) -> int:
+        """Número de batches por época"""
+        return int(np.ceil(len(self.indices) / self.batch_size))
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.indices)
+
+    def _normalize(self, batch: np.ndarray) -> np.ndarray:
+        batch = batch.astype(FEATURE_DTYPE, copy=False)
+        if self.mean is not None:
+            batch = (batch - self.mean) / self.std
+        return batch
+
+    def iter_batches(self, epoch: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Itera los batches de una época
+
+        Args:
+            epoch: Época (determina el orden de mezcla); por defecto self.epoch
+
+        Yields:
+            (X_batch float32, y_batch int32)
+        """
+        epoch = self.epoch if epoch is None else epoch
+        rng = np.random.default_rng(self.seed + epoch)
+        block_order = rng.permutation(len(self.blocks)) if self.shuffle else np.arange(len(self.blocks))
+
+        pending_X, pending_y = None, None
+        with h5py.File(self.file_path, 'r') as f:
+            dataset = f[self.dataset_key]
+
+            for group_start in range(0, len(block_order), self.shuffle_buffer_blocks):
+                X_parts, y_parts = [], []
+                for block_id in block_order[group_start:group_start + self.shuffle_buffer_blocks]:
+                    begin, end = self.blocks[block_id]
+                    rows = read_block(dataset, self.indices[begin:end])
+                    if self.transform is not None:
+                        rows = self.transform(rows)
+                    X_parts.append(rows)
+                    y_parts.append(self.labels[begin:end])
+
+                if pending_X is not None:
+                    X_parts.insert(0, pending_X)
+                    y_parts.insert(0, pending_y)
+                X_buffer = np.concatenate(X_parts)
+                y_buffer = np.concatenate(y_parts)
+
+                if self.shuffle:
+                    permutation = rng.permutation(len(y_buffer))
+                    X_buffer, y_buffer = X_buffer[permutation], y_buffer[permutation]
+
+                full = (len(y_buffer) // self.batch_size) * self.batch_size
+                for start in range(0, full, self.batch_size):
+                    stop = start + self.batch_size
+                    yield self._normalize(X_buffer[start:stop]), y_buffer[start:stop]
+                pending_X, pending_y = X_buffer[full:], y_buffer[full:]
+
+        if pending_y is not None and len(pending_y) > 0:
+            yield self._normalize(pending_X), pending_y
+
+    def as_tf_dataset(self, prefetch: bool = True):
+        """
+        Crea un tf.data.Dataset que lee el HDF5 de forma perezosa
+
+        Cada iteración completa del dataset avanza una época, con un orden de
+        mezcla distinto y reproducible.
+        """
+        import tensorflow as tf
+
+        def generator():
+            epoch = self.epoch
+            self.epoch += 1
+            yield from self.iter_batches(epoch)
+
+        dataset = tf.data.Dataset.from_generator(
+            generator,
+            output_signature=(
+                tf.TensorSpec(shape=(None,) + self.element_shape, dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.int32)
+            )
+        )
+        # Cardinalidad conocida: Keras no necesita agotar el generador para contar los pasos
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(len(self)))
+        if prefetch:
+            dataset = dataset.prefetch(tf.data.AUTOTUNE)
+        return dataset
@@ -0,0 +1,159 @@
+"""
+Tensor Cache - Caché direccionada por contenido de los datos preparados
+Guarda los conjuntos train/val/test ya ajustados y normalizados como .npy
+(abiertos con memory-map) junto con las estadísticas de normalización. La
+clave es un hash del estado del archivo HDF5 y de los parámetros de
+preprocesamiento, así que cualquier cambio en los datos o en los parámetros
+produce una entrada nueva en lugar de datos obsoletos.
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import h5py
+import numpy as np
+
+
+CACHE_VERSION = 1
+ARRAY_NAMES = ('X_train', 'X_val', 'X_test', 'y_train', 'y_val', 'y_test')
+
+
+def _file_state(path: str) -> Optional[list]:
+    """(tamaño, mtime en ns) de un archivo, o None si no existe"""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def dataset_fingerprint(sequences_file: str, metadata_path: str) -> Dict[str, Any]:
+    """
+    Estado de los archivos de los que dependen los datos preparados
+
+    Incluye sequences.h5, labels_map.json y, si 'X' es un dataset virtual
+    (vista de shards), los archivos a los que referencia.
+    """
+    fingerprint = {
+        'sequences': _file_state(sequences_file),
+        'labels_map': _file_state(os.path.join(metadata_path, 'labels_map.json'))
+    }
+    with h5py.File(sequences_file, 'r') as f:
+        dataset = f.get('X')
+        if isinstance(dataset, h5py.Dataset) and dataset.is_virtual:
+            base = os.path.dirname(os.path.abspath(sequences_file))
+            sources = sorted({source.file_name for source in dataset.virtual_sources()})
+            fingerprint['virtual_sources'] = {name: _file_state(os.path.join(base, name)) for name in sources}
+    return fingerprint
+
+
+def cache_key(fingerprint: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """Hash estable del estado de los datos y de los parámetros"""
+    payload = json.dumps({'version': CACHE_VERSION, 'data': fingerprint, 'params': params},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:20]
+
+
+class PreparedTensorCache:
+    """
+    Entradas data/cache/<clave>/ con un .npy por array y un info.json
+
+    Cada entrada se escribe en una carpeta temporal y se publica con un
+    rename atómico: una entrada visible siempre está completa.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 3):
+        """
+        Args:
+            cache_dir: Carpeta de la caché
+            max_entries: Entradas conservadas (las más antiguas se eliminan al guardar)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str, mmap: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Carga una entrada
+
+        Args:
+            key: Clave de la entrada
+            mmap: Abrir los arrays con memory-map (solo lectura) en lugar de leerlos
+
+        Returns:
+            {'arrays': {...}, 'info': {...}, 'path': ...} o None si no existe
+        """
+        entry = self.entry_path(key)
+        info_file = os.path.join(entry, 'info.json')
+        if not os.path.exists(info_file):
+            return None
+
+        with open(info_file, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        arrays = {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r' if mmap else None)
+                  for name in info['arrays']}
+        # Marca de uso para la política de eliminación
+        os.utime(info_file)
+        return {'arrays': arrays, 'info': info, 'path': entry}
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray], info: Dict[str, Any],
+             files: Optional[Dict[str, str]] = None) -> str:
+        """
+        Guarda una entrada
+
+        Args:
+            key: Clave de la entrada
+            arrays: Arrays a guardar como .npy
+            info: Información serializable a JSON
+            files: Archivos adicionales a copiar en la entrada {nombre: ruta}
+
+        Returns:
+            Ruta de la entrada
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self.entry_path(key)
+        temp_dir = tempfile.mkdtemp(prefix=f".{key}_", dir=self.cache_dir)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+            for name, path in (files or {}).items():
+                if os.path.exists(path):
+                    shutil.copyfile(path, os.path.join(temp_dir, name))
+
+            info = dict(info, arrays=list(arrays), key=key, created=datetime.now().isoformat())
+            with open(os.path.join(temp_dir, 'info.json'), 'w', encoding='utf-8') as f:
+                json.dump(info, f, indent=2, ensure_ascii=False, default=str)
+
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.replace(temp_dir, entry)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        self.prune()
+        return entry
+
+    def prune(self):
+        """Elimina las entradas menos usadas por encima de max_entries"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = [name for name in os.listdir(self.cache_dir)
+                   if os.path.exists(os.path.join(self.cache_dir, name, 'info.json'))]
+        entries.sort(key=lambda name: os.path.getmtime(os.path.join(self.cache_dir, name, 'info.json')),
+                     reverse=True)
+        for name in entries[self.max_entries:]:
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def clear(self):
+        """Elimina toda la caché"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -22,6 +22,17 @@ class GRUTrainer:
         self.data_path = "data"
         self.models_path = "models"
         self.sequence_length = 60
+        self.hyperparameters_file = os.path.join(self.models_path, "best_hyperparameters.json")
+        self.hyperparameters = {
+            'gru_units': 128,
+            'num_gru_layers': 2,
+            'dropout_rate': 0.3,
+            'learning_rate': 0.001,
+            'use_attention': True
+        }
+        if os.path.exists(self.hyperparameters_file):
+            with open(self.hyperparameters_file, 'r', encoding='utf-8') as f:
+                self.hyperparameters.update(json.load(f).get('config', {}))
         
         print("🧠 Inicializando Entrenador GRU")
         print("📋 Características:")
@@ -110,22 +121,32 @@ class GRUTrainer:
         """Continúa entrenamiento de modelo existente"""
         print("\n🔄 CONTINUANDO ENTRENAMIENTO...")
         
-        # Buscar modelos existentes
-        if not os.path.exists(self.models_path):
-            print("❌ No se encontraron modelos existentes")
+        from .checkpointing import list_checkpoint_runs
+        
+        # Buscar ejecuciones con checkpoint reanudable
+        runs = list_checkpoint_runs(os.path.join(self.models_path, 'checkpoints'))
+        if not runs:
+            print("❌ No se encontraron checkpoints reanudables")
+            print("💡 Los entrenamientos guardan un checkpoint por época en models/checkpoints/")
             return
         
-        model_files = [f for f in os.listdir(self.models_path) if f.endswith('.h5')]
+        print(f"📋 Entrenamientos reanudables:")
+        for i, run in enumerate(runs, 1):
+            print(f"   {i}. {run['name']} - época {run['epoch']}/{run['epochs']} ({run['saved'][:19]})")
         
-        if not model_files:
-            print("❌ No se encontraron archivos de modelos (.h5)")
+        choice = input("\n👆 Selecciona un entrenamiento [1]: ").strip() or '1'
+        if not choice.isdigit() or not 1 <= int(choice) <= len(runs):
+            print("❌ Opción no válida")
             return
+        run = runs[int(choice) - 1]
         
-        print(f"📋 Modelos encontrados:")
-        for i, model_file in enumerate(model_files, 1):
-            print(f"   {i}. {model_file}")
+        extra = input(f"   Total de épocas [{run['epochs']}]: ").strip()
         
-        print("⚠️ Funcionalidad en desarrollo")
+        from .training_pipeline import TrainingPipeline
+        pipeline = TrainingPipeline(data_path=self.data_path, models_path=self.models_path,
+                                    sequence_length=self.sequence_length)
+        info = pipeline.resume(run['path'], epochs=int(extra) if extra else None)
+        print(f"✅ Entrenamiento reanudado completado: {info['final_epoch']} épocas")
     
     def validate_data(self):
         """Valida la calidad de los datos de entrenamiento"""
@@ -147,14 +168,47 @@ class GRUTrainer:
         print("\n⚙️ CONFIGURACIÓN DE HIPERPARÁMETROS")
         print("="*40)
         print("📋 Configuración actual:")
-        print("   • Learning Rate: 0.001")
-        print("   • Batch Size: 32")
-        print("   • Epochs: 100")
-        print("   • GRU Units: 128")
-        print("   • Dropout: 0.3")
-        print("   • Patience: 10")
-        
-        print("\n⚠️ Configuración avanzada en desarrollo")
+        print(f"   • Learning Rate: {self.hyperparameters['learning_rate']:g}")
+        print(f"   • GRU Units: {self.hyperparameters['gru_units']}")
+        print(f"   • Capas GRU: {self.hyperparameters['num_gru_layers']}")
+        print(f"   • Dropout: {self.hyperparameters['dropout_rate']:.2f}")
+        print(f"   • Atención: {'✅' if self.hyperparameters['use_attention'] else '❌'}")
+        
+        answer = input("\n🔎 ¿Ejecutar búsqueda automática de hiperparámetros? (s/N): ").strip().lower()
+        if answer != 's':
+            return
+        
+        num_trials = int(input("   Número de pruebas [9]: ").strip() or 9)
+        max_workers = int(input(f"   Procesos en paralelo [{min(os.cpu_count() or 1, 4)}]: ").strip()
+                          or min(os.cpu_count() or 1, 4))
+        self.run_hyperparameter_search(num_trials=num_trials, max_workers=max_workers)
+    
+    def run_hyperparameter_search(self, **search_options) -> Dict[str, Any]:
+        """
+        Busca hiperparámetros con successive halving y guarda la mejor configuración
+        
+        Args:
+            **search_options: Argumentos de HyperparameterSearch (num_trials, max_workers, ...)
+            
+        Returns:
+            Mejor configuración encontrada
+        """
+        from .training_pipeline import TrainingPipeline
+        from .hyperparameter_search import HyperparameterSearch
+        
+        pipeline = TrainingPipeline(data_path=self.data_path, models_path=self.models_path,
+                                    sequence_length=self.sequence_length)
+        search = HyperparameterSearch(pipeline, **search_options)
+        results = search.run()
+        
+        self.hyperparameters.update(search.best_config())
+        with open(self.hyperparameters_file, 'w', encoding='utf-8') as f:
+            json.dump({'config': self.hyperparameters, 'results_dir': search.output_dir,
+                       'val_accuracy': results[0]['val_accuracy'], 'latency_ms': results[0]['latency_ms'],
+                       'created': datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
+        
+        print(f"\n🏆 Mejor configuración guardada en: {self.hyperparameters_file}")
+        return self.hyperparameters
     
     def show_data_status(self):
         """Muestra estado detallado de los datos"""
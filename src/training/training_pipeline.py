@@ -8,6 +8,7 @@ Versión: 2.0 - Julio 2025
 
 import os
 import json
+import shutil
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -17,6 +18,14 @@ import tensorflow as tf
 from tensorflow import keras
 
 from .data_loader import HDF5DataLoader
+from .tensor_cache import PreparedTensorCache, cache_key, dataset_fingerprint
+from .checkpointing import (DEFAULT_CHECKPOINT_SEED, ResumableCheckpoint, ResumeCallbackState,
+                            list_checkpoint_runs, load_checkpoint_state, load_early_stopping_weights,
+                            restore_model_state, restore_rng_state)
+from .distillation import (DEFAULT_ALPHA, DEFAULT_TEMPERATURE, build_student, compile_for_inference,
+                           pack_distillation_targets)
+from .pruning import DEFAULT_FINE_TUNE_LEARNING_RATE, DEFAULT_PRUNING_RATIO, cluster_weights, prune_gru_model
+from ..utils.dtype_policy import FEATURE_DTYPE
 from .model_builder import GRUModelBuilder, create_optimized_gru_model
 
 
@@ -50,10 +59,18 @@ class TrainingPipeline:
         
         # Componentes del pipeline
         self.data_loader = HDF5DataLoader(data_path, sequence_length)
+        self.tensor_cache = PreparedTensorCache(os.path.join(data_path, 'cache'))
+        self.prepared_cache_path = None
+        self.checkpoints_path = os.path.join(models_path, 'checkpoints')
+        self.data_config = {}
+        self.model_config = {}
         self.model_builder = GRUModelBuilder()
         self.model = None
         self.history = None
         self.training_config = {}
+        self.streaming = False
+        self.input_shape = None
+        self.num_classes = None
         
         print("🚀 PIPELINE DE ENTRENAMIENTO GRU INICIALIZADO")
         print(f"   📁 Datos: {self.data_path}")
@@ -64,7 +81,10 @@ class TrainingPipeline:
                     test_size: float = 0.2,
                     val_size: float = 0.1,
                     random_state: int = 42,
-                    normalize: bool = True) -> Dict[str, Any]:
+                    normalize: bool = True,
+                    streaming: bool = False,
+                    batch_size: int = 32,
+                    use_cache: bool = True) -> Dict[str, Any]:
         """
         Prepara los datos para entrenamiento
         
@@ -73,11 +93,18 @@ class TrainingPipeline:
             val_size: Proporción para validación
             random_state: Semilla aleatoria
             normalize: Si normalizar los datos
+            streaming: Si leer el HDF5 por bloques en lugar de cargarlo en memoria
+                (los archivos de longitud variable se leen siempre así, ver _prepare_ragged_data)
+            batch_size: Tamaño del batch (solo en modo streaming)
+            use_cache: Reutilizar los arrays preparados de data/cache si los datos
+                y los parámetros no cambiaron (solo en memoria)
             
         Returns:
             Diccionario con información de preparación
         """
         print("\n📊 PREPARANDO DATOS PARA ENTRENAMIENTO...")
+        self.data_config = {'test_size': test_size, 'val_size': val_size, 'random_state': random_state,
+                            'normalize': normalize, 'streaming': streaming, 'batch_size': batch_size}
         
         # Verificar disponibilidad
         if not self.data_loader.check_data_availability():
@@ -87,6 +114,28 @@ class TrainingPipeline:
         stats = self.data_loader.get_data_statistics()
         print(f"   📈 Dataset: {stats['total_sequences']} secuencias, {len(stats['signs'])} clases")
         
+        if self.data_loader.is_variable_length():
+            return self._prepare_ragged_data(test_size, val_size, random_state,
+                                             normalize, batch_size, stats)
+        if streaming:
+            return self._prepare_streaming_data(test_size, val_size, random_state,
+                                                normalize, batch_size, stats)
+        self.streaming = False
+        self.prepared_cache_path = None
+        
+        key = None
+        if use_cache:
+            key = cache_key(
+                dataset_fingerprint(self.data_loader.sequences_file, self.data_loader.metadata_path),
+                {'test_size': test_size, 'val_size': val_size, 'random_state': random_state,
+                 'normalize': normalize, 'sequence_length': self.sequence_length,
+                 'dtype': np.dtype(FEATURE_DTYPE).name}
+            )
+            cached = self.tensor_cache.load(key)
+            if cached is not None:
+                print(f"   ⚡ Datos preparados cargados de la caché ({key})")
+                return self._use_cached_data(cached, normalize, stats)
+        
         # Cargar y dividir datos
         X_train, X_val, X_test, y_train, y_val, y_test = self.data_loader.load_dataset(
             test_size=test_size,
@@ -96,13 +145,54 @@ class TrainingPipeline:
         
         # Normalizar si se solicita
         if normalize:
+            # Con división por índices las estadísticas se actualizan de forma incremental
+            norm_stats = None
+            if self.data_loader.split is not None:
+                norm_stats = self.data_loader.compute_normalization_stats(self.data_loader.split['train'])
             X_train, X_val, X_test, norm_stats = self.data_loader.normalize_data(
-                X_train, X_val, X_test
+                X_train, X_val, X_test, norm_stats
             )
             self.data_loader.save_preprocessing_info(norm_stats)
         else:
             norm_stats = None
         
+        if key is not None:
+            preprocessing_file = os.path.join(self.data_loader.metadata_path, 'preprocessing_info.json')
+            self.prepared_cache_path = self.tensor_cache.save(
+                key,
+                {'X_train': X_train, 'X_val': X_val, 'X_test': X_test,
+                 'y_train': y_train, 'y_val': y_val, 'y_test': y_test},
+                {'label_classes': self.data_loader.label_encoder.classes_.tolist(), 'normalize': normalize},
+                files={'preprocessing_info.json': preprocessing_file} if normalize else None
+            )
+            print(f"   💾 Datos preparados guardados en caché ({key})")
+        
+        return self._set_prepared_data(X_train, X_val, X_test, y_train, y_val, y_test, normalize, stats)
+    
+    def _use_cached_data(self, cached: Dict[str, Any], normalize: bool,
+                         stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Usa una entrada de la caché: los arrays quedan mapeados en memoria y se
+        restauran las clases del LabelEncoder y preprocessing_info.json
+        """
+        info = cached['info']
+        self.prepared_cache_path = cached['path']
+        self.data_loader.label_encoder.classes_ = np.array(info['label_classes'])
+        cached_preprocessing = os.path.join(cached['path'], 'preprocessing_info.json')
+        if normalize and os.path.exists(cached_preprocessing):
+            os.makedirs(self.data_loader.metadata_path, exist_ok=True)
+            shutil.copyfile(cached_preprocessing,
+                            os.path.join(self.data_loader.metadata_path, 'preprocessing_info.json'))
+        
+        arrays = cached['arrays']
+        return self._set_prepared_data(arrays['X_train'], arrays['X_val'], arrays['X_test'],
+                                       arrays['y_train'], arrays['y_val'], arrays['y_test'],
+                                       normalize, stats)
+    
+    def _set_prepared_data(self, X_train: np.ndarray, X_val: np.ndarray, X_test: np.ndarray,
+                           y_train: np.ndarray, y_val: np.ndarray, y_test: np.ndarray,
+                           normalize: bool, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Guarda los conjuntos preparados en el pipeline y resume la preparación"""
         # Calcular pesos de clase
         class_weights = self.data_loader.get_class_weights(y_train)
         
@@ -114,6 +204,8 @@ class TrainingPipeline:
         self.y_val = y_val
         self.y_test = y_test
         self.class_weights = class_weights
+        self.input_shape = (X_train.shape[1], X_train.shape[2])
+        self.num_classes = len(np.unique(y_train))
         
         # Información de preparación
         prep_info = {
@@ -136,6 +228,81 @@ class TrainingPipeline:
         print("✅ Datos preparados exitosamente")
         return prep_info
     
+    def _prepare_streaming_data(self, test_size: float, val_size: float, random_state: int,
+                                normalize: bool, batch_size: int,
+                                stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prepara fuentes de datos en streaming: la memoria queda acotada por el
+        buffer de mezcla en lugar del tamaño del dataset
+        """
+        streams = self.data_loader.create_streaming_datasets(
+            batch_size=batch_size,
+            test_size=test_size,
+            val_size=val_size,
+            random_state=random_state,
+            normalize=normalize
+        )
+        if normalize:
+            self.data_loader.save_preprocessing_info(streams['normalization_stats'])
+        return self._set_streams(streams, normalize, stats)
+    
+    def _prepare_ragged_data(self, test_size: float, val_size: float, random_state: int,
+                             normalize: bool, batch_size: int,
+                             stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prepara fuentes de longitud variable: las secuencias conservan sus
+        frames reales, train se agrupa en buckets por longitud y el modelo
+        recibe input_shape (None, features) con una capa Masking
+        """
+        streams = self.data_loader.create_ragged_datasets(
+            batch_size=batch_size,
+            test_size=test_size,
+            val_size=val_size,
+            random_state=random_state,
+            normalize=normalize
+        )
+        if normalize:
+            self.data_loader.save_preprocessing_info(streams['normalization_stats'])
+        prep_info = self._set_streams(streams, normalize, stats)
+        prep_info['variable_length'] = True
+        prep_info['bucket_boundaries'] = self.train_stream.boundaries
+        return prep_info
+    
+    def _set_streams(self, streams: Dict[str, Any], normalize: bool,
+                     stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Guarda las fuentes train/val/test en el pipeline y resume la preparación"""
+        self.streaming = True
+        self.train_stream = streams['train']
+        self.val_stream = streams['val']
+        self.test_stream = streams['test']
+        self.y_train = self.train_stream.labels
+        self.y_val = self.val_stream.labels
+        self.y_test = self.test_stream.labels
+        self.class_weights = self.data_loader.get_class_weights(self.y_train)
+        self.input_shape = self.train_stream.element_shape
+        self.num_classes = len(self.data_loader.label_encoder.classes_)
+        
+        prep_info = {
+            'data_shape': {
+                name: (stream.num_samples,) + stream.element_shape
+                for name, stream in (('train', self.train_stream), ('val', self.val_stream),
+                                     ('test', self.test_stream))
+            },
+            'num_classes': self.num_classes,
+            'class_distribution': {
+                'train': dict(zip(*np.unique(self.y_train, return_counts=True))),
+                'val': dict(zip(*np.unique(self.y_val, return_counts=True))),
+                'test': dict(zip(*np.unique(self.y_test, return_counts=True)))
+            },
+            'normalization': normalize,
+            'streaming': True,
+            'class_weights': self.class_weights,
+            'dataset_stats': stats
+        }
+        
+        print("✅ Datos en streaming preparados exitosamente")
+        return prep_info
+    
     def build_model(self, model_config: Optional[Dict[str, Any]] = None) -> keras.Model:
         """
         Construye el modelo GRU
@@ -148,7 +315,7 @@ class TrainingPipeline:
         """
         print("\n🏗️ CONSTRUYENDO MODELO GRU...")
         
-        if not hasattr(self, 'X_train'):
+        if self.input_shape is None:
             raise ValueError("Debes preparar los datos primero")
         
         # Configuración por defecto
@@ -158,15 +325,17 @@ class TrainingPipeline:
             'dropout_rate': 0.3,
             'learning_rate': 0.001,
             'l2_reg': 0.01,
-            'use_attention': True
+            'use_attention': True,
+            'profile': 'standard',
+            'jit_compile': False
         }
         
         if model_config:
             default_config.update(model_config)
         
         # Obtener formas de entrada
-        input_shape = (self.X_train.shape[1], self.X_train.shape[2])
-        num_classes = len(np.unique(self.y_train))
+        input_shape = tuple(self.input_shape)
+        num_classes = self.num_classes
         
         # Crear modelo
         self.model = self.model_builder.build_model(
@@ -175,6 +344,7 @@ class TrainingPipeline:
             **default_config
         )
         
+        self.model_config = dict(default_config)
         self.training_config.update(default_config)
         self.training_config['input_shape'] = input_shape
         self.training_config['num_classes'] = num_classes
@@ -186,7 +356,10 @@ class TrainingPipeline:
                    batch_size: int = 32,
                    patience: int = 15,
                    save_best: bool = True,
-                   plot_history: bool = True) -> Dict[str, Any]:
+                   plot_history: bool = True,
+                   checkpoint_every: Optional[int] = 1,
+                   seed: Optional[int] = None,
+                   resume_from: Optional[str] = None) -> Dict[str, Any]:
         """
         Entrena el modelo
         
@@ -196,6 +369,11 @@ class TrainingPipeline:
             patience: Paciencia para early stopping
             save_best: Si guardar el mejor modelo
             plot_history: Si graficar el historial
+            checkpoint_every: Guardar un checkpoint reanudable cada N épocas (None = no)
+            seed: Semilla del orden de los datos por época (None = mezcla de tf.data;
+                con checkpoints se usa DEFAULT_CHECKPOINT_SEED para poder reanudar
+                con el mismo orden)
+            resume_from: Carpeta de checkpoints desde la que continuar (ver resume)
             
         Returns:
             Información del entrenamiento
@@ -208,9 +386,21 @@ class TrainingPipeline:
         if self.model is None:
             raise ValueError("Debes construir el modelo primero")
         
-        # Timestamp para archivos únicos
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        model_name = f"gru_lsp_model_{timestamp}"
+        resume_state = load_checkpoint_state(resume_from) if resume_from else None
+        if seed is None and (checkpoint_every or resume_state):
+            seed = resume_state['run']['seed'] if resume_state else DEFAULT_CHECKPOINT_SEED
+        initial_epoch = resume_state['epoch'] if resume_state else 0
+        
+        # Timestamp para archivos únicos (al reanudar se conserva el de la ejecución original)
+        if resume_state:
+            timestamp = resume_state['run']['timestamp']
+            model_name = resume_state['run']['model_name']
+            restore_model_state(self.model, resume_from, resume_state)
+            restore_rng_state(resume_state['rng'])
+            print(f"   ♻️ Reanudando {model_name} desde la época {initial_epoch}")
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            model_name = f"gru_lsp_model_{timestamp}"
         
         # Rutas de archivos
         model_path = os.path.join(self.models_path, f"{model_name}.h5")
@@ -222,12 +412,23 @@ class TrainingPipeline:
             patience=patience
         )
         
-        # Crear generadores de datos
-        train_dataset, val_dataset = self.model_builder.get_data_generators(
-            self.X_train, self.y_train,
-            self.X_val, self.y_val,
-            batch_size=batch_size
-        )
+        # Crear generadores de datos (con semilla, el orden de cada época depende de la semilla y la época)
+        if self.streaming:
+            # El tamaño del batch se fija al preparar los datos en streaming
+            batch_size = self.train_stream.batch_size
+            if seed is not None:
+                self.train_stream.seed = seed
+            self.train_stream.epoch = initial_epoch
+            train_dataset = self.train_stream.as_tf_dataset()
+            val_dataset = self.val_stream.as_tf_dataset()
+        else:
+            train_dataset, val_dataset = self.model_builder.get_data_generators(
+                self.X_train, self.y_train,
+                self.X_val, self.y_val,
+                batch_size=batch_size,
+                seed=seed,
+                initial_epoch=initial_epoch
+            )
         
         # Configuración de entrenamiento
         self.training_config.update({
@@ -236,9 +437,30 @@ class TrainingPipeline:
             'patience': patience,
             'model_name': model_name,
             'model_path': model_path,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            'seed': seed
         })
         
+        # Checkpoints reanudables: todo lo necesario para reconstruir esta ejecución
+        checkpoint = None
+        if checkpoint_every:
+            run_config = {
+                'model_name': model_name, 'model_path': model_path, 'timestamp': timestamp,
+                'epochs': epochs, 'batch_size': batch_size, 'patience': patience, 'seed': seed,
+                'checkpoint_every': checkpoint_every, 'model_config': self.model_config,
+                'data_config': self.data_config, 'sequence_length': self.sequence_length
+            }
+            checkpoint = ResumableCheckpoint(
+                os.path.join(self.checkpoints_path, model_name), run_config, callbacks,
+                every_n_epochs=checkpoint_every,
+                previous_history=resume_state['history'] if resume_state else None
+            )
+        if resume_state:
+            callbacks.append(ResumeCallbackState(callbacks[:], resume_state['callbacks'],
+                                                 load_early_stopping_weights(resume_from, resume_state)))
+        if checkpoint is not None:
+            callbacks.append(checkpoint)
+        
         print(f"\n🎯 Comenzando entrenamiento...")
         start_time = datetime.now()
         
@@ -248,6 +470,7 @@ class TrainingPipeline:
                 train_dataset,
                 validation_data=val_dataset,
                 epochs=epochs,
+                initial_epoch=initial_epoch,
                 callbacks=callbacks,
                 class_weight=self.class_weights,
                 verbose=1
@@ -258,12 +481,19 @@ class TrainingPipeline:
             
         except KeyboardInterrupt:
             print("\n⚠️ Entrenamiento interrumpido por el usuario")
+            if checkpoint_every:
+                print("   💡 Continúa desde el último checkpoint con TrainingPipeline.resume()")
+            self.history = self.model.history
             training_time = datetime.now() - start_time
         
         except Exception as e:
             print(f"\n❌ Error durante entrenamiento: {e}")
             raise
         
+        # Historial completo (épocas anteriores a la reanudación incluidas)
+        if checkpoint is not None:
+            self.history.history = {key: list(values) for key, values in checkpoint.history.items()}
+        
         # Guardar información del entrenamiento
         training_info = {
             'model_name': model_name,
@@ -282,4 +512,556 @@ class TrainingPipeline:
         
         # Graficar historial si se solicita
         if plot_history and self.history:
-            self.plot_training_history(model_name)\n        \n        print(f\"💾 Modelo guardado en: {model_path}\")\n        print(f\"📊 Configuración guardada en: {config_path}\")\n        \n        return training_info\n    \n    def evaluate_model(self, \n                      model_path: Optional[str] = None,\n                      detailed: bool = True) -> Dict[str, Any]:\n        \"\"\"\n        Evalúa el modelo en el conjunto de test\n        \n        Args:\n            model_path: Ruta del modelo (si None, usa el modelo actual)\n            detailed: Si mostrar evaluación detallada\n            \n        Returns:\n            Métricas de evaluación\n        \"\"\"\n        print(\"\\n🧪 EVALUANDO MODELO...\")\n        \n        # Cargar modelo si se especifica ruta\n        if model_path:\n            eval_model = keras.models.load_model(model_path)\n            print(f\"   📂 Modelo cargado desde: {model_path}\")\n        else:\n            eval_model = self.model\n            if eval_model is None:\n                raise ValueError(\"No hay modelo para evaluar\")\n        \n        # Evaluar en conjunto de test\n        test_loss, test_accuracy, test_top_k = eval_model.evaluate(\n            self.X_test, self.y_test, verbose=0\n        )\n        \n        # Predicciones detalladas\n        y_pred_proba = eval_model.predict(self.X_test, verbose=0)\n        y_pred = np.argmax(y_pred_proba, axis=1)\n        \n        # Métricas básicas\n        evaluation = {\n            'test_loss': float(test_loss),\n            'test_accuracy': float(test_accuracy),\n            'test_top_k_accuracy': float(test_top_k)\n        }\n        \n        if detailed:\n            from sklearn.metrics import classification_report, confusion_matrix\n            \n            # Reporte de clasificación\n            class_names = self.data_loader.label_encoder.classes_\n            report = classification_report(\n                self.y_test, y_pred, \n                target_names=class_names,\n                output_dict=True\n            )\n            \n            # Matriz de confusión\n            cm = confusion_matrix(self.y_test, y_pred)\n            \n            evaluation.update({\n                'classification_report': report,\n                'confusion_matrix': cm.tolist(),\n                'class_names': class_names.tolist()\n            })\n            \n            # Mostrar resultados\n            print(f\"\\n📊 RESULTADOS DE EVALUACIÓN:\")\n            print(f\"   🎯 Accuracy: {test_accuracy:.4f}\")\n            print(f\"   📉 Loss: {test_loss:.4f}\")\n            print(f\"   🏆 Top-K Accuracy: {test_top_k:.4f}\")\n            \n            print(f\"\\n📋 Por clase:\")\n            for i, class_name in enumerate(class_names):\n                precision = report[class_name]['precision']\n                recall = report[class_name]['recall']\n                f1 = report[class_name]['f1-score']\n                print(f\"   {class_name}: P={precision:.3f}, R={recall:.3f}, F1={f1:.3f}\")\n        \n        return evaluation\n    \n    def plot_training_history(self, model_name: str):\n        \"\"\"\n        Grafica el historial de entrenamiento\n        \n        Args:\n            model_name: Nombre del modelo para el archivo\n        \"\"\"\n        if self.history is None:\n            print(\"❌ No hay historial de entrenamiento\")\n            return\n        \n        plt.style.use('default')\n        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))\n        fig.suptitle(f'Historial de Entrenamiento - {model_name}', fontsize=16)\n        \n        # Accuracy\n        ax1.plot(self.history.history['accuracy'], label='Train Accuracy', color='blue')\n        ax1.plot(self.history.history['val_accuracy'], label='Val Accuracy', color='orange')\n        ax1.set_title('Accuracy')\n        ax1.set_xlabel('Época')\n        ax1.set_ylabel('Accuracy')\n        ax1.legend()\n        ax1.grid(True, alpha=0.3)\n        \n        # Loss\n        ax2.plot(self.history.history['loss'], label='Train Loss', color='blue')\n        ax2.plot(self.history.history['val_loss'], label='Val Loss', color='orange')\n        ax2.set_title('Loss')\n        ax2.set_xlabel('Época')\n        ax2.set_ylabel('Loss')\n        ax2.legend()\n        ax2.grid(True, alpha=0.3)\n        \n        # Learning Rate (si está disponible)\n        if 'lr' in self.history.history:\n            ax3.plot(self.history.history['lr'], label='Learning Rate', color='green')\n            ax3.set_title('Learning Rate')\n            ax3.set_xlabel('Época')\n            ax3.set_ylabel('LR')\n            ax3.set_yscale('log')\n            ax3.legend()\n            ax3.grid(True, alpha=0.3)\n        else:\n            ax3.text(0.5, 0.5, 'Learning Rate\\nno disponible', \n                    ha='center', va='center', transform=ax3.transAxes)\n        \n        # Top-K Accuracy\n        if 'top_k_categorical_accuracy' in self.history.history:\n            ax4.plot(self.history.history['top_k_categorical_accuracy'], \n                    label='Train Top-K', color='blue')\n            ax4.plot(self.history.history['val_top_k_categorical_accuracy'], \n                    label='Val Top-K', color='orange')\n            ax4.set_title('Top-K Accuracy')\n            ax4.set_xlabel('Época')\n            ax4.set_ylabel('Top-K Accuracy')\n            ax4.legend()\n            ax4.grid(True, alpha=0.3)\n        else:\n            ax4.text(0.5, 0.5, 'Top-K Accuracy\\nno disponible', \n                    ha='center', va='center', transform=ax4.transAxes)\n        \n        plt.tight_layout()\n        \n        # Guardar gráfico\n        plot_path = os.path.join(self.logs_path, f\"{model_name}_history.png\")\n        plt.savefig(plot_path, dpi=300, bbox_inches='tight')\n        print(f\"📊 Gráficos guardados en: {plot_path}\")\n        \n        plt.show()\n    \n    def run_complete_pipeline(self, \n                            model_config: Optional[Dict[str, Any]] = None,\n                            training_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:\n        \"\"\"\n        Ejecuta el pipeline completo de entrenamiento\n        \n        Args:\n            model_config: Configuración del modelo\n            training_config: Configuración del entrenamiento\n            \n        Returns:\n            Resultados completos\n        \"\"\"\n        print(\"🚀 EJECUTANDO PIPELINE COMPLETO DE ENTRENAMIENTO\")\n        print(\"=\" * 60)\n        \n        # Configuraciones por defecto\n        default_training = {\n            'epochs': 100,\n            'batch_size': 32,\n            'patience': 15\n        }\n        \n        if training_config:\n            default_training.update(training_config)\n        \n        try:\n            # 1. Preparar datos\n            data_info = self.prepare_data()\n            \n            # 2. Construir modelo\n            model = self.build_model(model_config)\n            \n            # 3. Entrenar modelo\n            training_info = self.train_model(**default_training)\n            \n            # 4. Evaluar modelo\n            evaluation = self.evaluate_model()\n            \n            # Resultados completos\n            results = {\n                'data_preparation': data_info,\n                'training': training_info,\n                'evaluation': evaluation,\n                'pipeline_completed': True,\n                'timestamp': datetime.now().isoformat()\n            }\n            \n            print(\"\\n🎉 PIPELINE COMPLETADO EXITOSAMENTE\")\n            print(f\"   🎯 Accuracy final: {evaluation['test_accuracy']:.4f}\")\n            print(f\"   📊 Modelo: {training_info['model_name']}\")\n            \n            return results\n            \n        except Exception as e:\n            print(f\"\\n❌ Error en el pipeline: {e}\")\n            raise\n\n\nif __name__ == \"__main__\":\n    # Ejemplo de uso del pipeline\n    print(\"🧪 EJEMPLO DE PIPELINE DE ENTRENAMIENTO\")\n    \n    # Configuración de ejemplo\n    model_config = {\n        'gru_units': 128,\n        'num_gru_layers': 2,\n        'dropout_rate': 0.3,\n        'use_attention': True\n    }\n    \n    training_config = {\n        'epochs': 50,\n        'batch_size': 16,\n        'patience': 10\n    }\n    \n    # Crear y ejecutar pipeline\n    pipeline = TrainingPipeline()\n    \n    try:\n        results = pipeline.run_complete_pipeline(\n            model_config=model_config,\n            training_config=training_config\n        )\n        print(\"\\n✅ Pipeline ejecutado exitosamente\")\n        \n    except Exception as e:\n        print(f\"\\n❌ Error: {e}\")
+            self.plot_training_history(model_name)
+        
+        print(f"💾 Modelo guardado en: {model_path}")
+        print(f"📊 Configuración guardada en: {config_path}")
+        
+        return training_info
+    
+    def resume(self, checkpoint_dir: Optional[str] = None, epochs: Optional[int] = None,
+               plot_history: bool = True) -> Dict[str, Any]:
+        """
+        Continúa un entrenamiento interrumpido desde su último checkpoint
+        
+        Prepara los datos con los mismos parámetros (normalmente desde la caché),
+        reconstruye el modelo, restaura pesos, optimizador, estado de callbacks
+        y generadores aleatorios, y sigue en la época siguiente a la guardada.
+        
+        Args:
+            checkpoint_dir: Carpeta de checkpoints (por defecto la ejecución más reciente)
+            epochs: Nuevo total de épocas (por defecto el de la ejecución original)
+            plot_history: Si graficar el historial al terminar
+            
+        Returns:
+            Información del entrenamiento, como train_model
+        """
+        if checkpoint_dir is None:
+            runs = list_checkpoint_runs(self.checkpoints_path)
+            if not runs:
+                raise FileNotFoundError(f"No hay checkpoints en: {self.checkpoints_path}")
+            checkpoint_dir = runs[0]['path']
+        
+        run = load_checkpoint_state(checkpoint_dir)['run']
+        if run['sequence_length'] != self.sequence_length:
+            raise ValueError(f"El checkpoint usa secuencias de {run['sequence_length']} frames, "
+                             f"el pipeline de {self.sequence_length}")
+        
+        self.prepare_data(**run['data_config'])
+        self.build_model(run['model_config'])
+        return self.train_model(
+            epochs=epochs or run['epochs'],
+            batch_size=run['batch_size'],
+            patience=run['patience'],
+            plot_history=plot_history,
+            checkpoint_every=run['checkpoint_every'],
+            seed=run['seed'],
+            resume_from=checkpoint_dir
+        )
+    
+    def evaluate_model(self, 
+                      model_path: Optional[str] = None,
+                      detailed: bool = True) -> Dict[str, Any]:
+        """
+        Evalúa el modelo en el conjunto de test
+        
+        Args:
+            model_path: Ruta del modelo (si None, usa el modelo actual)
+            detailed: Si mostrar evaluación detallada
+            
+        Returns:
+            Métricas de evaluación
+        """
+        print("\n🧪 EVALUANDO MODELO...")
+        
+        # Cargar modelo si se especifica ruta
+        if model_path:
+            eval_model = keras.models.load_model(model_path)
+            print(f"   📂 Modelo cargado desde: {model_path}")
+        else:
+            eval_model = self.model
+            if eval_model is None:
+                raise ValueError("No hay modelo para evaluar")
+        
+        # Evaluar en conjunto de test
+        if self.streaming:
+            test_dataset = self.test_stream.as_tf_dataset()
+            test_loss, test_accuracy, test_top_k = eval_model.evaluate(test_dataset, verbose=0)
+            y_pred_proba = eval_model.predict(test_dataset.map(lambda X, y: X), verbose=0)
+        else:
+            test_loss, test_accuracy, test_top_k = eval_model.evaluate(
+                self.X_test, self.y_test, verbose=0
+            )
+            y_pred_proba = eval_model.predict(self.X_test, verbose=0)
+        
+        # Predicciones detalladas
+        y_pred = np.argmax(y_pred_proba, axis=1)
+        
+        # Métricas básicas
+        evaluation = {
+            'test_loss': float(test_loss),
+            'test_accuracy': float(test_accuracy),
+            'test_top_k_accuracy': float(test_top_k)
+        }
+        
+        if detailed:
+            from sklearn.metrics import classification_report, confusion_matrix
+            
+            # Reporte de clasificación
+            class_names = self.data_loader.label_encoder.classes_
+            report = classification_report(
+                self.y_test, y_pred, 
+                target_names=class_names,
+                output_dict=True
+            )
+            
+            # Matriz de confusión
+            cm = confusion_matrix(self.y_test, y_pred)
+            
+            evaluation.update({
+                'classification_report': report,
+                'confusion_matrix': cm.tolist(),
+                'class_names': class_names.tolist()
+            })
+            
+            # Mostrar resultados
+            print(f"\n📊 RESULTADOS DE EVALUACIÓN:")
+            print(f"   🎯 Accuracy: {test_accuracy:.4f}")
+            print(f"   📉 Loss: {test_loss:.4f}")
+            print(f"   🏆 Top-K Accuracy: {test_top_k:.4f}")
+            
+            print(f"\n📋 Por clase:")
+            for i, class_name in enumerate(class_names):
+                precision = report[class_name]['precision']
+                recall = report[class_name]['recall']
+                f1 = report[class_name]['f1-score']
+                print(f"   {class_name}: P={precision:.3f}, R={recall:.3f}, F1={f1:.3f}")
+
+        return evaluation
+
+    def distill(self,
+                teacher_path: Optional[str] = None,
+                student_config: Optional[Dict[str, Any]] = None,
+                temperature: float = DEFAULT_TEMPERATURE,
+                alpha: float = DEFAULT_ALPHA,
+                epochs: int = 100,
+                batch_size: int = 32,
+                patience: int = 15,
+                seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Destila el modelo entrenado en un estudiante compacto para tiempo real
+
+        El estudiante aprende de las probabilidades suavizadas del maestro
+        sobre el conjunto de entrenamiento, se guarda como .h5 en models_path
+        (el traductor lo lista junto a los demás) y se compara con el maestro
+        en el conjunto de test: precisión perdida frente a aceleración.
+
+        Args:
+            teacher_path: Modelo maestro .h5 (por defecto el del último entrenamiento)
+            student_config: Cambios sobre DEFAULT_STUDENT_CONFIG (1 capa BiGRU-48)
+            temperature: Temperatura de los objetivos suaves
+            alpha: Peso de la pérdida con las etiquetas reales
+            epochs: Número de épocas
+            batch_size: Tamaño del batch
+            patience: Paciencia para early stopping
+            seed: Semilla del orden de los datos por época (None = mezcla de tf.data)
+
+        Returns:
+            Rutas del estudiante y del reporte, precisión de ambos, caída de
+            precisión y aceleración
+        """
+        from ..inference.inference_engine import KerasInferenceEngine
+        from ..inference.model_export import compare_engines, format_comparison
+
+        if self.input_shape is None:
+            raise ValueError("Debes preparar los datos primero")
+        if self.streaming:
+            raise ValueError("La destilación necesita los datos en memoria (prepare_data sin streaming)")
+        teacher_path = teacher_path or self.training_config.get('model_path')
+        if not teacher_path or not os.path.exists(teacher_path):
+            raise ValueError("No hay modelo maestro para destilar")
+
+        print(f"\n🎓 DESTILACIÓN DE CONOCIMIENTO")
+        print(f"   👨‍🏫 Maestro: {teacher_path}")
+        print(f"   🌡️ Temperatura: {temperature} | α: {alpha}")
+
+        teacher = keras.models.load_model(teacher_path, compile=False)
+        # Los objetivos del maestro ya reflejan el balanceo de clases de su entrenamiento
+        train_targets = pack_distillation_targets(
+            self.y_train, teacher.predict(self.X_train, batch_size=batch_size, verbose=0), temperature)
+        val_targets = pack_distillation_targets(
+            self.y_val, teacher.predict(self.X_val, batch_size=batch_size, verbose=0), temperature)
+
+        student, config = build_student(tuple(self.input_shape), self.num_classes, student_config,
+                                        temperature, alpha)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        student_name = f"gru_lsp_student_{timestamp}"
+        student_path = os.path.join(self.models_path, f"{student_name}.h5")
+        callbacks = self.model_builder.create_callbacks(model_save_path=student_path, patience=patience)
+        train_dataset, val_dataset = self.model_builder.get_data_generators(
+            self.X_train, train_targets, self.X_val, val_targets,
+            batch_size=batch_size, seed=seed
+        )
+
+        start_time = datetime.now()
+        history = student.fit(train_dataset, validation_data=val_dataset, epochs=epochs,
+                              callbacks=callbacks, verbose=1)
+        training_time = datetime.now() - start_time
+
+        # Mejor época según val_accuracy (ModelCheckpoint), guardada sin la pérdida personalizada
+        student.load_weights(student_path)
+        compile_for_inference(student, config['learning_rate'])
+        student.save(student_path)
+
+        engines = {
+            'teacher': (KerasInferenceEngine(teacher), teacher_path),
+            'student': (KerasInferenceEngine(student), student_path)
+        }
+        comparison = compare_engines(engines, self.X_test, self.y_test, reference='teacher')
+        accuracy_drop = comparison['teacher']['accuracy'] - comparison['student']['accuracy']
+        speedup = comparison['student']['speedup']
+
+        print(f"\n📊 MAESTRO vs ESTUDIANTE ({len(self.X_test)} secuencias de test):")
+        print(format_comparison(comparison))
+        print(f"   📉 Caída de precisión: {accuracy_drop * 100:+.2f} puntos | ⚡ Aceleración: x{speedup:.1f}")
+
+        report = {
+            'student_name': student_name,
+            'student_path': student_path,
+            'teacher_path': teacher_path,
+            'training_time': str(training_time),
+            'final_epoch': len(history.history['loss']),
+            'temperature': temperature,
+            'alpha': alpha,
+            'student_config': config,
+            'teacher_parameters': int(teacher.count_params()),
+            'student_parameters': int(student.count_params()),
+            'teacher_accuracy': comparison['teacher']['accuracy'],
+            'student_accuracy': comparison['student']['accuracy'],
+            'accuracy_drop': accuracy_drop,
+            'speedup': speedup,
+            'comparison': comparison
+        }
+        report_path = os.path.join(self.logs_path, f"{student_name}_distillation.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+        print(f"💾 Estudiante guardado en: {student_path}")
+        print(f"📊 Reporte guardado en: {report_path}")
+        report['report_path'] = report_path
+        return report
+
+    def prune(self,
+              model_path: Optional[str] = None,
+              ratio: float = DEFAULT_PRUNING_RATIO,
+              fine_tune_epochs: int = 10,
+              learning_rate: float = DEFAULT_FINE_TUNE_LEARNING_RATE,
+              num_clusters: Optional[int] = None,
+              batch_size: int = 32,
+              patience: int = 5,
+              seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Poda estructurada del modelo entrenado, ajuste fino y clustering opcional
+
+        Guarda <modelo>_pruned.h5 junto a los demás modelos y compara ambos en
+        el conjunto de test: parámetros, tamaño del archivo, tamaño efectivo
+        (get_model_memory_usage), latencia en CPU y precisión.
+
+        Args:
+            model_path: Modelo .h5 (por defecto el del último entrenamiento)
+            ratio: Fracción de unidades GRU y de dense_hidden a eliminar
+            fine_tune_epochs: Épocas de ajuste fino tras la poda (0 = sin ajuste)
+            learning_rate: Tasa de aprendizaje del ajuste fino
+            num_clusters: Valores distintos por kernel tras el ajuste (None = sin clustering)
+            batch_size: Tamaño del batch
+            patience: Paciencia para early stopping
+            seed: Semilla del orden de los datos por época (None = mezcla de tf.data)
+
+        Returns:
+            Ruta del modelo podado y del reporte, y métricas antes/después
+        """
+        from ..inference.inference_engine import KerasInferenceEngine
+        from ..inference.model_export import compare_engines, format_comparison
+
+        if self.input_shape is None:
+            raise ValueError("Debes preparar los datos primero")
+        if self.streaming:
+            raise ValueError("La poda necesita los datos en memoria (prepare_data sin streaming)")
+        model_path = model_path or self.training_config.get('model_path')
+        if not model_path or not os.path.exists(model_path):
+            raise ValueError("No hay modelo entrenado para podar")
+
+        print(f"\n✂️ PODA ESTRUCTURADA ({ratio:.0%} de las unidades)")
+        original = keras.models.load_model(model_path, compile=False)
+        pruned, pruning_info = prune_gru_model(original, ratio, learning_rate=learning_rate)
+        print(f"   🧠 Unidades GRU: {pruning_info['gru_units_before']} → {pruning_info['gru_units_after']}")
+
+        pruned_name = f"{os.path.splitext(os.path.basename(model_path))[0]}_pruned"
+        pruned_path = os.path.join(self.models_path, f"{pruned_name}.h5")
+        history = None
+        if fine_tune_epochs:
+            callbacks = self.model_builder.create_callbacks(model_save_path=pruned_path, patience=patience)
+            train_dataset, val_dataset = self.model_builder.get_data_generators(
+                self.X_train, self.y_train, self.X_val, self.y_val, batch_size=batch_size, seed=seed
+            )
+            history = pruned.fit(train_dataset, validation_data=val_dataset, epochs=fine_tune_epochs,
+                                 callbacks=callbacks, class_weight=self.class_weights, verbose=1)
+            # Mejor época según val_accuracy (ModelCheckpoint)
+            pruned.load_weights(pruned_path)
+
+        if num_clusters:
+            clustered = cluster_weights(pruned, num_clusters)
+            print(f"   🎯 Clustering: {len(clustered)} kernels con {num_clusters} valores")
+        pruned.save(pruned_path)
+
+        engines = {
+            'original': (KerasInferenceEngine(original), model_path),
+            'pruned': (KerasInferenceEngine(pruned), pruned_path)
+        }
+        comparison = compare_engines(engines, self.X_test, self.y_test, reference='original')
+        memory = {
+            'original': self.model_builder.get_model_memory_usage(original),
+            'pruned': self.model_builder.get_model_memory_usage(pruned)
+        }
+
+        print(f"\n📊 ORIGINAL vs PODADO ({len(self.X_test)} secuencias de test):")
+        print(format_comparison(comparison))
+        for name, usage in memory.items():
+            print(f"   {name:<10} {usage['total_parameters']:>10,} parámetros | "
+                  f"efectivo {usage['effective_size_mb']:.2f} MB")
+
+        report = {
+            'model_path': model_path,
+            'pruned_path': pruned_path,
+            'fine_tune_epochs': len(history.history['loss']) if history else 0,
+            'num_clusters': num_clusters,
+            **pruning_info,
+            'accuracy_before': comparison['original']['accuracy'],
+            'accuracy_after': comparison['pruned']['accuracy'],
+            'speedup': comparison['pruned']['speedup'],
+            'memory': memory,
+            'comparison': comparison
+        }
+        report_path = os.path.join(self.logs_path, f"{pruned_name}_pruning.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+        print(f"💾 Modelo podado guardado en: {pruned_path}")
+        print(f"📊 Reporte guardado en: {report_path}")
+        report['report_path'] = report_path
+        return report
+
+    def export_tflite(self, model_path: Optional[str] = None, **export_options) -> Dict[str, Any]:
+        """
+        Exporta el modelo entrenado a TFLite (float16 / int8) con reporte comparativo
+
+        Args:
+            model_path: Modelo .h5 (por defecto el del último entrenamiento)
+            **export_options: Opciones de model_export.export_tflite (quantizations, output_dir, ...)
+
+        Returns:
+            Resultado de export_tflite (rutas y reporte)
+        """
+        from ..inference.model_export import export_tflite
+
+        model_path = model_path or self.training_config.get('model_path')
+        if not model_path or not os.path.exists(model_path):
+            raise ValueError("No hay modelo entrenado para exportar")
+        return export_tflite(model_path, data_path=self.data_path, **export_options)
+
+    def export_onnx(self, model_path: Optional[str] = None, **export_options) -> Dict[str, Any]:
+        """
+        Exporta el modelo entrenado a ONNX (requiere tf2onnx) con reporte comparativo
+
+        Args:
+            model_path: Modelo .h5 (por defecto el del último entrenamiento)
+            **export_options: Opciones de model_export.export_onnx (opset, startup, ...)
+
+        Returns:
+            Resultado de export_onnx (ruta y reporte)
+        """
+        from ..inference.model_export import export_onnx
+
+        model_path = model_path or self.training_config.get('model_path')
+        if not model_path or not os.path.exists(model_path):
+            raise ValueError("No hay modelo entrenado para exportar")
+        return export_onnx(model_path, data_path=self.data_path, **export_options)
+
+    def export_numpy(self, model_path: Optional[str] = None, **export_options) -> Dict[str, Any]:
+        """
+        Exporta los pesos del modelo entrenado a NPZ (backend NumPy) con reporte comparativo
+
+        Args:
+            model_path: Modelo .h5 (por defecto el del último entrenamiento)
+            **export_options: Opciones de model_export.export_numpy (num_samples, startup, ...)
+
+        Returns:
+            Resultado de export_numpy (ruta y reporte)
+        """
+        from ..inference.model_export import export_numpy
+
+        model_path = model_path or self.training_config.get('model_path')
+        if not model_path or not os.path.exists(model_path):
+            raise ValueError("No hay modelo entrenado para exportar")
+        return export_numpy(model_path, data_path=self.data_path, **export_options)
+
+    def plot_training_history(self, model_name: str):
+        """
+        Grafica el historial de entrenamiento
+        
+        Args:
+            model_name: Nombre del modelo para el archivo
+        """
+        if self.history is None:
+            print("❌ No hay historial de entrenamiento")
+            return
+        
+        plt.style.use('default')
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+        fig.suptitle(f'Historial de Entrenamiento - {model_name}', fontsize=16)
+        
+        # Accuracy
+        ax1.plot(self.history.history['accuracy'], label='Train Accuracy', color='blue')
+        ax1.plot(self.history.history['val_accuracy'], label='Val Accuracy', color='orange')
+        ax1.set_title('Accuracy')
+        ax1.set_xlabel('Época')
+        ax1.set_ylabel('Accuracy')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        # Loss
+        ax2.plot(self.history.history['loss'], label='Train Loss', color='blue')
+        ax2.plot(self.history.history['val_loss'], label='Val Loss', color='orange')
+        ax2.set_title('Loss')
+        ax2.set_xlabel('Época')
+        ax2.set_ylabel('Loss')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        
+        # Learning Rate (si está disponible)
+        if 'lr' in self.history.history:
+            ax3.plot(self.history.history['lr'], label='Learning Rate', color='green')
+            ax3.set_title('Learning Rate')
+            ax3.set_xlabel('Época')
+            ax3.set_ylabel('LR')
+            ax3.set_yscale('log')
+            ax3.legend()
+            ax3.grid(True, alpha=0.3)
+        else:
+            ax3.text(0.5, 0.5, 'Learning Rate\nno disponible', 
+                    ha='center', va='center', transform=ax3.transAxes)
+        
+        # Top-K Accuracy
+        if 'top_k_categorical_accuracy' in self.history.history:
+            ax4.plot(self.history.history['top_k_categorical_accuracy'], 
+                    label='Train Top-K', color='blue')
+            ax4.plot(self.history.history['val_top_k_categorical_accuracy'], 
+                    label='Val Top-K', color='orange')
+            ax4.set_title('Top-K Accuracy')
+            ax4.set_xlabel('Época')
+            ax4.set_ylabel('Top-K Accuracy')
+            ax4.legend()
+            ax4.grid(True, alpha=0.3)
+        else:
+            ax4.text(0.5, 0.5, 'Top-K Accuracy\nno disponible', 
+                    ha='center', va='center', transform=ax4.transAxes)
+        
+        plt.tight_layout()
+        
+        # Guardar gráfico
+        plot_path = os.path.join(self.logs_path, f"{model_name}_history.png")
+        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+        print(f"📊 Gráficos guardados en: {plot_path}")
+        
+        plt.show()
+    
+    def run_complete_pipeline(self, 
+                            model_config: Optional[Dict[str, Any]] = None,
+                            training_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Ejecuta el pipeline completo de entrenamiento
+        
+        Args:
+            model_config: Configuración del modelo
+            training_config: Configuración del entrenamiento
+            
+        Returns:
+            Resultados completos
+        """
+        print("🚀 EJECUTANDO PIPELINE COMPLETO DE ENTRENAMIENTO")
+        print("=" * 60)
+        
+        # Configuraciones por defecto
+        default_training = {
+            'epochs': 100,
+            'batch_size': 32,
+            'patience': 15
+        }
+        
+        if training_config:
+            default_training.update(training_config)
+        
+        try:
+            # 1. Preparar datos
+            data_info = self.prepare_data()
+            
+            # 2. Construir modelo
+            model = self.build_model(model_config)
+            
+            # 3. Entrenar modelo
+            training_info = self.train_model(**default_training)
+            
+            # 4. Evaluar modelo
+            evaluation = self.evaluate_model()
+            
+            # Resultados completos
+            results = {
+                'data_preparation': data_info,
+                'training': training_info,
+                'evaluation': evaluation,
+                'pipeline_completed': True,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            print("\n🎉 PIPELINE COMPLETADO EXITOSAMENTE")
+            print(f"   🎯 Accuracy final: {evaluation['test_accuracy']:.4f}")
+            print(f"   📊 Modelo: {training_info['model_name']}")
+            
+            return results
+            
+        except Exception as e:
+            print(f"\n❌ Error en el pipeline: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    # Ejemplo de uso del pipeline
+    print("🧪 EJEMPLO DE PIPELINE DE ENTRENAMIENTO")
+    
+    # Configuración de ejemplo
+    model_config = {
+        'gru_units': 128,
+        'num_gru_layers': 2,
+        'dropout_rate': 0.3,
+        'use_attention': True
+    }
+    
+    training_config = {
+        'epochs': 50,
+        'batch_size': 16,
+        'patience': 10
+    }
+    
+    # Crear y ejecutar pipeline
+    pipeline = TrainingPipeline()
+    
+    try:
+        results = pipeline.run_complete_pipeline(
+            model_config=model_config,
+            training_config=training_config
+        )
+        print("\n✅ Pipeline ejecutado exitosamente")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
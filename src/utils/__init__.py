@@ -4,5 +4,7 @@ Módulos de soporte para el sistema de traducción de señas
 """
 
 from .mediapipe_model_downloader import MediaPipeModelDownloader, setup_mediapipe_models
+from .synthetic_data import SyntheticLandmarkGenerator
+from .profiler import StageProfiler
 
-__all__ = ['MediaPipeModelDownloader', 'setup_mediapipe_models']
+__all__ = ['MediaPipeModelDownloader', 'setup_mediapipe_models', 'SyntheticLandmarkGenerator', 'StageProfiler']
@@ -0,0 +1,99 @@
+"""
+Dtype Policy - Tipos de datos del pipeline de características
+float32 en todo el camino crítico (extracción, buffers, carga y
+normalización) y float16 opcional solo para almacenamiento en HDF5
+"""
+
+import numpy as np
+from typing import Dict, Union
+
+# Tipo de cómputo del camino crítico: coincide con el almacenamiento por
+# defecto y con la entrada del modelo
+FEATURE_DTYPE = np.float32
+
+# Tipos admitidos para el dataset 'X' de sequences.h5
+STORAGE_DTYPES = {
+    'float32': np.float32,
+    'float16': np.float16
+}
+
+
+def resolve_storage_dtype(storage_dtype: Union[str, np.dtype, type]) -> np.dtype:
+    """
+    Valida y normaliza el tipo de almacenamiento
+
+    Args:
+        storage_dtype: 'float32', 'float16' o el tipo numpy equivalente
+
+    Returns:
+        np.dtype de almacenamiento
+    """
+    name = np.dtype(storage_dtype).name
+    if name not in STORAGE_DTYPES:
+        raise ValueError(f"Tipo de almacenamiento no soportado: {name} "
+                         f"(opciones: {', '.join(STORAGE_DTYPES)})")
+    return np.dtype(STORAGE_DTYPES[name])
+
+
+def as_feature_array(data) -> np.ndarray:
+    """Convierte a FEATURE_DTYPE sin copiar si ya lo es"""
+    return np.asarray(data, dtype=FEATURE_DTYPE)
+
+
+def check_feature_dtype(array: np.ndarray, stage: str) -> np.ndarray:
+    """
+    Verifica que una etapa no haya promovido los datos a otro tipo
+
+    Args:
+        array: Datos producidos por la etapa
+        stage: Nombre de la etapa (para el mensaje de error)
+
+    Returns:
+        El mismo array, para usar en línea
+    """
+    if array.dtype != FEATURE_DTYPE:
+        raise TypeError(f"La etapa '{stage}' produjo {array.dtype}, se esperaba {np.dtype(FEATURE_DTYPE).name}")
+    return array
+
+
+def dataset_memory_report(num_sequences: int, sequence_length: int = 60,
+                          feature_dim: int = 157) -> Dict[str, Dict[str, float]]:
+    """
+    Memoria de un dataset (N, T, F) según el tipo de datos
+
+    Args:
+        num_sequences: Número de secuencias
+        sequence_length: Frames por secuencia
+        feature_dim: Características por frame
+
+    Returns:
+        {dtype: {'bytes', 'gb', 'saved_vs_float64_gb'}}
+    """
+    values = num_sequences * sequence_length * feature_dim
+    float64_bytes = values * np.dtype(np.float64).itemsize
+    report = {}
+    for dtype in (np.float64, np.float32, np.float16):
+        size = values * np.dtype(dtype).itemsize
+        report[np.dtype(dtype).name] = {
+            'bytes': size,
+            'gb': size / 1024**3,
+            'saved_vs_float64_gb': (float64_bytes - size) / 1024**3
+        }
+    return report
+
+
+def print_memory_report(num_sequences: int, sequence_length: int = 60, feature_dim: int = 157):
+    """Muestra el reporte de memoria por tipo de datos"""
+    report = dataset_memory_report(num_sequences, sequence_length, feature_dim)
+    print(f"💾 MEMORIA DEL DATASET ({num_sequences:,} × {sequence_length} × {feature_dim})")
+    for name, info in report.items():
+        print(f"   {name:>8}: {info['gb']:8.2f} GB (ahorro vs float64: {info['saved_vs_float64_gb']:.2f} GB)")
+
+    # Al normalizar conviven la entrada (float32 del HDF5) y la salida
+    legacy = report['float32']['gb'] + report['float64']['gb']
+    current = 2 * report['float32']['gb']
+    print(f"   📉 Pico al normalizar: {legacy:.2f} GB (salida float64) vs {current:.2f} GB (salida float32)")
+
+
+if __name__ == "__main__":
+    print_memory_report(100000)
@@ -0,0 +1,122 @@
+"""
+Import Report - Reporte de tiempos de importación
+Ejecuta `python -X importtime` en un proceso nuevo (arranque en frío) y
+resume la salida: tiempo total de cada módulo y los paquetes que más
+aportan, para detectar importaciones pesadas en rutas que no las necesitan.
+
+    python run.py --import-report
+    python -m src.utils.import_report src.inference.real_time_translator
+
+Autor: LSP Team
+Versión: 2.0 - Julio 2025
+"""
+
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+# Paquetes cuyo costo de importación domina el arranque
+HEAVY_PACKAGES = ('tensorflow', 'keras', 'mediapipe', 'cv2', 'matplotlib', 'seaborn',
+                  'sklearn', 'scipy', 'pandas', 'h5py', 'requests')
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Interpreta la salida de -X importtime
+
+    Args:
+        output: stderr del proceso ("import time: self [us] | cumulative | módulo")
+
+    Returns:
+        Lista de {'module', 'self_us', 'cumulative_us', 'depth'} en orden de aparición
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Cabecera "self [us] | cumulative | imported package"
+        name = fields[2].rstrip()
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2
+        })
+    return entries
+
+
+def measure_imports(statement: str, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Mide una importación en un intérprete nuevo
+
+    Args:
+        statement: Código a ejecutar (p. ej. 'import run')
+        cwd: Directorio de trabajo (por defecto el actual)
+
+    Returns:
+        {'statement', 'wall_seconds', 'entries', 'heavy'} donde heavy son los
+        paquetes de HEAVY_PACKAGES que quedaron cargados
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=cwd,
+                            capture_output=True, text=True,
+                            env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3'))
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Falló '{statement}': {result.stderr.strip().splitlines()[-1:]}")
+
+    entries = parse_importtime(result.stderr)
+    loaded = {entry['module'].split('.')[0] for entry in entries}
+    return {'statement': statement, 'wall_seconds': wall_seconds, 'entries': entries,
+            'heavy': [package for package in HEAVY_PACKAGES if package in loaded]}
+
+
+def summarize_packages(entries: Sequence[Dict[str, Any]], top: int = 5) -> List[Dict[str, Any]]:
+    """
+    Tiempo propio acumulado por paquete de primer nivel (sin contar dos
+    veces los submódulos, a diferencia del tiempo acumulado)
+
+    Returns:
+        Los `top` paquetes más costosos: [{'package', 'seconds', 'modules'}]
+    """
+    seconds = defaultdict(float)
+    modules = defaultdict(int)
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        seconds[package] += entry['self_us'] / 1e6
+        modules[package] += 1
+    ranking = sorted(seconds, key=seconds.get, reverse=True)[:top]
+    return [{'package': package, 'seconds': seconds[package], 'modules': modules[package]} for package in ranking]
+
+
+def format_import_report(measurements: Sequence[Dict[str, Any]], top: int = 5) -> str:
+    """Texto del reporte: una sección por importación medida"""
+    lines = []
+    for measurement in measurements:
+        import_seconds = sum(entry['self_us'] for entry in measurement['entries']) / 1e6
+        lines.append(f"📦 {measurement['statement']}: {measurement['wall_seconds']:.2f}s de proceso, "
+                     f"{import_seconds:.2f}s importando ({len(measurement['entries'])} módulos)")
+        if measurement['heavy']:
+            lines.append(f"   ⚠️ Paquetes pesados cargados: {', '.join(measurement['heavy'])}")
+        for package in summarize_packages(measurement['entries'], top):
+            lines.append(f"   {package['package']:<24} {package['seconds'] * 1000:8.1f} ms "
+                         f"({package['modules']} módulos)")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None, cwd: Optional[str] = None) -> int:
+    modules = list(sys.argv[1:] if argv is None else argv) or ['run']
+    measurements = [measure_imports(f"import {module}", cwd=cwd) for module in modules]
+    print("\n⏱️ REPORTE DE IMPORTACIÓN (python -X importtime, proceso nuevo)")
+    print("=" * 60)
+    print(format_import_report(measurements))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
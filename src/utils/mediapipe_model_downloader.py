@@ -4,7 +4,6 @@ Descarga automática de modelos requeridos para el sistema LSP
 """
 
 import os
-import requests
 import hashlib
 from pathlib import Path
 from typing import Dict, Tuple, Optional
@@ -83,6 +82,9 @@ class MediaPipeModelDownloader:
             print(f"   📊 Tamaño: ~{config['size_mb']} MB")
             print(f"   🔗 URL: {config['url']}")
         
+        # requests solo se importa si hay que descargar (no en el arranque del menú)
+        import requests
+        
         try:
             # Realizar descarga con progreso
             response = requests.get(config['url'], stream=True)
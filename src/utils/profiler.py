@@ -0,0 +1,205 @@
+"""
+Stage Profiler - Instrumentación por etapas del bucle de captura
+Temporizadores monotónicos por etapa, percentiles móviles (p50/p95) y
+exportación a formato Chrome trace-event (chrome://tracing, Perfetto)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class _NullStage:
+    """Contexto vacío usado cuando el profiler está desactivado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    """Contexto que mide una etapa y la registra en el profiler"""
+
+    __slots__ = ('profiler', 'name', 'start_ns')
+
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        self.profiler._add_sample(self.name, self.start_ns, end_ns - self.start_ns)
+        return False
+
+
+class StageProfiler:
+    """
+    Profiler ligero por etapas para bucles de tiempo real
+
+    Con enabled=False, stage() devuelve un contexto vacío compartido y
+    begin_frame()/end_frame() retornan de inmediato, por lo que el costo es
+    una llamada a método por etapa.
+    """
+
+    FRAME_STAGE = 'frame_total'
+
+    def __init__(self, enabled: bool = False, window: int = 120, max_trace_events: int = 100000):
+        """
+        Args:
+            enabled: Si el profiler está activo
+            window: Número de muestras por etapa para los percentiles móviles
+            max_trace_events: Eventos máximos conservados para la exportación
+        """
+        self.enabled = enabled
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.trace_events: deque = deque(maxlen=max_trace_events)
+        self.origin_ns = time.perf_counter_ns()
+        self.frame_start_ns: Optional[int] = None
+        self.frame_count = 0
+        self.lock = threading.Lock()
+        self.thread_ids = {'main': 1}
+
+    def set_enabled(self, enabled: bool):
+        """Activa o desactiva la instrumentación"""
+        self.enabled = enabled
+        self.frame_start_ns = None
+
+    def stage(self, name: str):
+        """Contexto que mide una etapa: `with profiler.stage('camera_read'): ...`"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+
+    def begin_frame(self):
+        """Marca el inicio de un frame"""
+        if self.enabled:
+            self.frame_start_ns = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Marca el final de un frame y registra su duración total"""
+        if not self.enabled or self.frame_start_ns is None:
+            return
+        end_ns = time.perf_counter_ns()
+        self._add_sample(self.FRAME_STAGE, self.frame_start_ns, end_ns - self.frame_start_ns)
+        self.frame_start_ns = None
+        self.frame_count += 1
+
+    def record(self, name: str, duration_ms: float, thread: str = 'main'):
+        """
+        Registra una duración medida externamente (p. ej. latencia asíncrona
+        de MediaPipe reportada desde su callback)
+
+        Args:
+            name: Nombre de la etapa
+            duration_ms: Duración en milisegundos
+            thread: Pista del trace donde se dibuja el evento
+        """
+        if not self.enabled:
+            return
+        duration_ns = int(duration_ms * 1e6)
+        self._add_sample(name, time.perf_counter_ns() - duration_ns, duration_ns, thread)
+
+    def _add_sample(self, name: str, start_ns: int, duration_ns: int, thread: str = 'main'):
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(duration_ns / 1e6)
+            tid = self.thread_ids.setdefault(thread, len(self.thread_ids) + 1)
+            self.trace_events.append((name, start_ns, duration_ns, tid))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Estadísticas móviles por etapa
+
+        Returns:
+            {etapa: {'p50', 'p95', 'mean', 'last', 'count'}} en milisegundos
+        """
+        with self.lock:
+            snapshot = {name: np.fromiter(values, dtype=np.float64, count=len(values))
+                        for name, values in self.samples.items() if values}
+        stats = {}
+        for name, values in snapshot.items():
+            p50, p95 = np.percentile(values, [50, 95])
+            stats[name] = {
+                'p50': float(p50),
+                'p95': float(p95),
+                'mean': float(values.mean()),
+                'last': float(values[-1]),
+                'count': int(values.size)
+            }
+        return stats
+
+    def get_fps(self) -> float:
+        """FPS estimado a partir de la mediana de la duración del frame"""
+        frame_stats = self.get_stats().get(self.FRAME_STAGE)
+        if not frame_stats or frame_stats['p50'] <= 0:
+            return 0.0
+        return 1000.0 / frame_stats['p50']
+
+    def export_chrome_trace(self, output_path: str, process_name: str = 'LSP Capture') -> str:
+        """
+        Exporta los eventos en formato Chrome trace-event JSON
+
+        Args:
+            output_path: Ruta del archivo .json
+            process_name: Nombre del proceso mostrado en el visor
+
+        Returns:
+            Ruta del archivo generado
+        """
+        with self.lock:
+            events = list(self.trace_events)
+            thread_ids = dict(self.thread_ids)
+
+        trace_events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0,
+                         'args': {'name': process_name}}]
+        for thread_name, tid in thread_ids.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                                 'args': {'name': thread_name}})
+        for name, start_ns, duration_ns, tid in events:
+            trace_events.append({
+                'name': name,
+                'cat': 'frame' if name == self.FRAME_STAGE else 'stage',
+                'ph': 'X',
+                'ts': (start_ns - self.origin_ns) / 1000.0,
+                'dur': duration_ns / 1000.0,
+                'pid': 1,
+                'tid': tid
+            })
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        return output_path
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumen serializable: frames, FPS y estadísticas por etapa"""
+        return {'frames': self.frame_count, 'fps': self.get_fps(), 'stages': self.get_stats()}
+
+    def reset(self):
+        """Descarta todas las muestras y eventos"""
+        with self.lock:
+            self.samples.clear()
+            self.trace_events.clear()
+            self.frame_count = 0
+            self.origin_ns = time.perf_counter_ns()
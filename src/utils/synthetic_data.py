@@ -0,0 +1,93 @@
+"""
+Synthetic Data Generator
+Genera resultados de MediaPipe, secuencias y datasets sintéticos para
+benchmarks y pruebas sin cámara ni modelos descargados
+"""
+
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Estructuras mínimas compatibles con los resultados de MediaPipe Tasks
+SyntheticLandmark = namedtuple('SyntheticLandmark', ['x', 'y', 'z'])
+SyntheticCategory = namedtuple('SyntheticCategory', ['category_name', 'score'])
+SyntheticHandResults = namedtuple('SyntheticHandResults', ['hand_landmarks', 'handedness'])
+SyntheticPoseResults = namedtuple('SyntheticPoseResults', ['pose_landmarks'])
+
+
+class SyntheticLandmarkGenerator:
+    """
+    Generador reproducible de datos sintéticos con la misma estructura que
+    producen MediaPipe y el FeatureExtractor (secuencias de 60 x 157)
+    """
+
+    def __init__(self, seed: int = 42, sequence_length: int = 60, feature_dim: int = 157):
+        self.rng = np.random.default_rng(seed)
+        self.sequence_length = sequence_length
+        self.feature_dim = feature_dim
+
+    def _landmarks(self, count: int, center: Tuple[float, float], spread: float) -> List[SyntheticLandmark]:
+        """Genera una lista de landmarks alrededor de un centro"""
+        points = self.rng.normal(0.0, spread, size=(count, 3))
+        points[:, 0] += center[0]
+        points[:, 1] += center[1]
+        points[:, :2] = np.clip(points[:, :2], 0.0, 1.0)
+        return [SyntheticLandmark(float(x), float(y), float(z)) for x, y, z in points]
+
+    def hand_results(self, num_hands: int = 2) -> SyntheticHandResults:
+        """Genera un resultado de HandLandmarker con `num_hands` manos"""
+        names = ['Right', 'Left']
+        centers = [(0.35, 0.5), (0.65, 0.5)]
+        hand_landmarks, handedness = [], []
+        for i in range(num_hands):
+            hand_landmarks.append(self._landmarks(21, centers[i % 2], 0.05))
+            score = float(self.rng.uniform(0.8, 1.0))
+            handedness.append([SyntheticCategory(names[i % 2], score)])
+        return SyntheticHandResults(hand_landmarks, handedness)
+
+    def pose_results(self) -> SyntheticPoseResults:
+        """Genera un resultado de PoseLandmarker con los 33 puntos de pose"""
+        return SyntheticPoseResults([self._landmarks(33, (0.5, 0.5), 0.15)])
+
+    def frame_results(self, num_hands: int = 2) -> Tuple[SyntheticHandResults, SyntheticPoseResults]:
+        """Genera el par (hand_results, pose_results) de un frame"""
+        return self.hand_results(num_hands), self.pose_results()
+
+    def sequence(self, length: Optional[int] = None, motion_scale: float = 0.01) -> np.ndarray:
+        """
+        Genera una secuencia suave (caminata aleatoria) en el rango [0, 1]
+
+        Args:
+            length: Número de frames (por defecto sequence_length)
+            motion_scale: Magnitud del movimiento entre frames
+
+        Returns:
+            Array float32 de forma (length, feature_dim)
+        """
+        length = length or self.sequence_length
+        start = self.rng.uniform(0.2, 0.8, size=(1, self.feature_dim))
+        steps = self.rng.normal(0.0, motion_scale, size=(length, self.feature_dim))
+        sequence = np.clip(start + np.cumsum(steps, axis=0), 0.0, 1.0)
+        return sequence.astype(np.float32)
+
+    def dataset(self, num_sequences: int, num_classes: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Genera un dataset etiquetado donde cada clase tiene un patrón propio
+
+        Args:
+            num_sequences: Número total de secuencias
+            num_classes: Número de clases
+
+        Returns:
+            Tuple (X, y) con X float32 (N, length, feature_dim) e y int32 (N,)
+        """
+        y = (np.arange(num_sequences) % num_classes).astype(np.int32)
+        self.rng.shuffle(y)
+        prototypes = self.rng.uniform(0.2, 0.8, size=(num_classes, 1, self.feature_dim))
+        X = np.empty((num_sequences, self.sequence_length, self.feature_dim), dtype=np.float32)
+        for i, label in enumerate(y):
+            noise = self.rng.normal(0.0, 0.05, size=(self.sequence_length, self.feature_dim))
+            X[i] = np.clip(prototypes[label] + noise, 0.0, 1.0)
+        return X, y
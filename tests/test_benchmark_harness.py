@@ -0,0 +1,69 @@
+"""
+Test del harness de benchmarks
+Verifica la medición, la serialización JSON y la detección de regresiones
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import pytest
+
+# Agregar la raíz del repositorio al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.harness import (BenchmarkSuite, BenchmarkSkipped, measure,
+                                compare_results, save_results, load_results)
+
+
+def test_measure_returns_statistics():
+    """Prueba que measure devuelve estadísticas coherentes"""
+    calls = []
+    stats = measure(lambda: calls.append(1), warmup=2, repeats=5, number=3)
+
+    assert len(calls) == 2 + 5 * 3
+    assert stats['repeats'] == 5
+    assert stats['min_ms'] <= stats['median_ms'] <= stats['max_ms']
+
+
+def test_suite_runs_variants_and_skips(tmp_path):
+    """Prueba casos simples, parametrizados y omitidos"""
+    suite = BenchmarkSuite()
+
+    @suite.case('simple', group='g1', warmup=0, repeats=2)
+    def simple(ctx):
+        return lambda: None
+
+    @suite.case('param', group='g2', warmup=0, repeats=2)
+    def param(ctx):
+        return {'a': lambda: None, 'b': lambda: None}
+
+    @suite.case('optional', group='g2', warmup=0, repeats=2)
+    def optional(ctx):
+        raise BenchmarkSkipped("dependencia no instalada")
+
+    report = suite.run(work_dir=str(tmp_path))
+
+    assert set(report['results']) == {'simple', 'param[a]', 'param[b]'}
+    assert 'optional' in report['skipped']
+
+    filtered = suite.run(filters=['g1'], work_dir=str(tmp_path))
+    assert set(filtered['results']) == {'simple'}
+
+
+def test_compare_flags_regressions(tmp_path):
+    """Prueba que la comparación detecta regresiones, mejoras y casos nuevos"""
+    baseline = {'results': {'slow': {'median_ms': 10.0}, 'fast': {'median_ms': 10.0},
+                            'same': {'median_ms': 10.0}, 'gone': {'median_ms': 1.0}}}
+    current = {'results': {'slow': {'median_ms': 12.0}, 'fast': {'median_ms': 5.0},
+                           'same': {'median_ms': 10.5}, 'new': {'median_ms': 1.0}}}
+
+    path = save_results(baseline, str(tmp_path / 'base.json'))
+    rows = {r['name']: r for r in compare_results(load_results(path), current, threshold=0.10)}
+
+    assert rows['slow']['status'] == 'regression'
+    assert rows['fast']['status'] == 'improvement'
+    assert rows['same']['status'] == 'ok'
+    assert rows['new']['status'] == 'new'
+    assert rows['gone']['status'] == 'missing'
+    assert rows['slow']['ratio'] == pytest.approx(1.2)
@@ -0,0 +1,62 @@
+"""
+Test de los checkpoints reanudables
+Verifica que un entrenamiento interrumpido y reanudado termine con los mismos
+pesos e historial que uno sin interrupciones
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.training.checkpointing import list_checkpoint_runs
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+MODEL_CONFIG = {'gru_units': 8, 'num_gru_layers': 1, 'dropout_rate': 0.0, 'use_attention': False}
+
+
+def _pipeline(tmp_path, data_dir, name):
+    return TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / name / 'models'),
+                            logs_path=str(tmp_path / name / 'logs'), sequence_length=10)
+
+
+def _train(pipeline, epochs):
+    pipeline.prepare_data()
+    tf.keras.utils.set_random_seed(0)
+    pipeline.build_model(MODEL_CONFIG)
+    return pipeline.train_model(epochs=epochs, batch_size=8, plot_history=False)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    """2 épocas + reanudación hasta 4 == 4 épocas seguidas"""
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=9)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    reference = _pipeline(tmp_path, data_dir, 'reference')
+    _train(reference, epochs=4)
+
+    interrupted = _pipeline(tmp_path, data_dir, 'resumed')
+    _train(interrupted, epochs=2)
+    runs = list_checkpoint_runs(interrupted.checkpoints_path)
+    assert len(runs) == 1 and runs[0]['epoch'] == 2
+
+    tf.keras.utils.set_random_seed(123)  # el estado aleatorio se restaura desde el checkpoint
+    resumed = _pipeline(tmp_path, data_dir, 'resumed')
+    info = resumed.resume(epochs=4, plot_history=False)
+
+    assert info['final_epoch'] == 4
+    assert info['model_name'] == runs[0]['name']
+    assert int(resumed.model.optimizer.iterations.numpy()) == int(reference.model.optimizer.iterations.numpy())
+    np.testing.assert_allclose(resumed.history.history['loss'], reference.history.history['loss'], rtol=1e-4)
+    for resumed_weights, reference_weights in zip(resumed.model.get_weights(), reference.model.get_weights()):
+        np.testing.assert_allclose(resumed_weights, reference_weights, rtol=1e-4, atol=1e-5)
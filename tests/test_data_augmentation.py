@@ -6,6 +6,7 @@ Versión: 2.1 - Julio 2025
 
 import sys
 import os
+import h5py
 import numpy as np
 import pytest
 
@@ -15,6 +16,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 # Importar clases necesarias
 from src.data_collection.data_augmentation import LSPDataAugmenter, AugmentationIntegrator
 from src.data_collection.data_manager import DataManager
+from src.data_collection.dataset_tools import read_row_tables
 from src.data_collection.sign_config import SignConfig
 from src.data_collection.main_collector import LSPDataCollector
 from src.data_collection.ui_manager import UIManager
@@ -74,6 +76,25 @@ def test_augmentation_needs_calculation(integrator):
     assert needs['GRACIAS'] == 34
     assert needs['A'] == 12
 
+def test_integrator_runs_keep_unique_ids_and_sources(tmp_path):
+    """Dos ejecuciones del integrador no repiten sequence_id y enlazan cada augmentación con su original"""
+    dm = DataManager(data_dir=str(tmp_path))
+    for sequence_id in (1, 2, 3):
+        dm.save_sequence(np.random.rand(60, 157).astype(np.float32), 'HOLA', sequence_id, {})
+    integrator = AugmentationIntegrator(dm, SignConfig())
+
+    first = integrator.auto_augment_dataset()['total_augmented']
+    second = integrator.auto_augment_dataset()['total_augmented']
+    assert first > 0 and second > 0
+
+    with h5py.File(dm.dataset_file, 'r') as hf:
+        tables = read_row_tables(hf)
+    assert len(tables['y']) == 3 + first + second
+    assert len(np.unique(tables['sequence_id'])) == len(tables['y'])
+    augmented = tables['augmented'].astype(bool)
+    assert set(tables['source_id'][augmented].tolist()) <= {1, 2, 3}
+    assert len(os.listdir(dm.metadata_dir)) - 2 == len(tables['y'])  # + labels_map y dataset_info
+
 def test_main_collector_has_augmentation_integrator():
     """Verifica que el colector principal tenga una instancia del integrador."""
     try:
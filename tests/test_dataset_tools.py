@@ -0,0 +1,147 @@
+"""
+Test de las herramientas del archivo sequences.h5
+Verifica el layout con chunk por secuencia y el reempaquetado de archivos
+existentes sin pérdida de datos
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import h5py
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_augmentation import LSPDataAugmenter
+from src.data_collection.data_manager import DataManager
+from src.data_collection.dataset_tools import compact_sequences_file, repack_sequences_file, describe_layout
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_data_manager_uses_per_sequence_chunks(tmp_path):
+    """Los archivos nuevos usan chunks (1, 60, 157) con gzip + shuffle"""
+    generator = SyntheticLandmarkGenerator(seed=0)
+    manager = DataManager(data_dir=str(tmp_path))
+    for i in range(3):
+        manager.save_sequence(generator.sequence(), 'HOLA', i + 1, {})
+
+    layout = describe_layout(manager.dataset_file)['datasets']
+    assert layout['X']['chunks'] == (1, 60, 157)
+    assert layout['X']['compression'] == 'gzip' and layout['X']['shuffle']
+    assert layout['X']['shape'] == (3, 60, 157)
+    assert layout['y']['shape'] == (3,)
+
+
+def test_repack_legacy_file_in_place(tmp_path):
+    """Un archivo con chunks automáticos se reempaqueta conservando los datos"""
+    X, y = SyntheticLandmarkGenerator(seed=1).dataset(20, num_classes=3)
+    path = os.path.join(str(tmp_path), 'sequences.h5')
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('X', data=X, maxshape=(None,) + X.shape[1:], chunks=True, dtype='float32')
+        f.create_dataset('y', data=y, maxshape=(None,), chunks=True, dtype='int32')
+        f.attrs['version'] = '2.1.0'
+
+    result = repack_sequences_file(path, compression='gzip', storage_dtype='float16')
+    assert result['path'] == path
+    assert result['size_after_mb'] < result['size_before_mb']
+    assert not [name for name in os.listdir(str(tmp_path)) if name != 'sequences.h5']
+
+    with h5py.File(path, 'r') as f:
+        assert f['X'].chunks == (1, 60, 157)
+        assert f['X'].dtype == np.float16
+        assert f['X'].maxshape[0] is None
+        assert f.attrs['version'] == '2.1.0'
+        np.testing.assert_allclose(f['X'][:], X, atol=1e-2)
+        np.testing.assert_array_equal(f['y'][:], y)
+
+
+def _collect_mixed_dataset(data_dir):
+    """HOLA/GRACIAS/ADIOS con calidad variable y augmentaciones de HOLA 1 y 2"""
+    generator = SyntheticLandmarkGenerator(seed=3)
+    manager = DataManager(data_dir=data_dir)
+    for sign, qualities in (('HOLA', [90, 60, 85]), ('GRACIAS', [95, 92]), ('ADIOS', [50])):
+        for i, quality in enumerate(qualities):
+            manager.save_sequence(generator.sequence(), sign, i + 1,
+                                  {'quality_score': quality, 'sequence_id': i + 1})
+    for aug_id, source in ((1000, 1), (1001, 2)):
+        manager.save_sequence(generator.sequence(), 'HOLA', aug_id, {
+            'quality_score': 80, 'collection_mode': 'AUGMENTED',
+            'augmentation': {'is_augmented': True, 'original_sequence_id': source}})
+    return manager
+
+
+def test_compact_dataset_by_quality_and_orphans(tmp_path):
+    """Las filas eliminadas desaparecen y las etiquetas se reindexan de forma contigua"""
+    manager = _collect_mixed_dataset(str(tmp_path))
+    kept_hola = manager.load_sequence('HOLA', 3)[0]
+    kept_gracias = manager.load_sequence('GRACIAS', 2)[0]
+
+    report = manager.compact_dataset(min_quality=70, drop_orphaned_augmented=True, dry_run=True)
+    assert report['rows_after'] == 5 and report['removed_by_sign'] == {'HOLA': 2, 'ADIOS': 1}
+    assert describe_layout(manager.dataset_file)['datasets']['X']['shape'][0] == 8
+
+    removed = manager.cleanup_keras_dataset(min_quality=70, drop_orphaned_augmented=True)
+    assert removed == 3
+
+    reloaded = DataManager(data_dir=str(tmp_path))
+    assert reloaded.labels_map['sign_to_index'] == {'HOLA': 0, 'GRACIAS': 1}
+    X, y = reloaded.load_keras_dataset()
+    assert X.shape == (5, 60, 157) and sorted(y.tolist()) == [0, 0, 0, 1, 1]
+    np.testing.assert_array_equal(reloaded.load_sequence('HOLA', 3)[0], kept_hola)
+    np.testing.assert_array_equal(reloaded.load_sequence('GRACIAS', 2)[0], kept_gracias)
+    assert reloaded.load_sequence('HOLA', 2)[0] is None
+    assert reloaded.load_sequence('HOLA', 1001)[0] is None
+    assert reloaded._load_dataset_info()['total_sequences'] == 5
+    assert not os.path.exists(os.path.join(reloaded.metadata_dir, 'ADIOS_1_metadata.json'))
+
+    with h5py.File(manager.dataset_file, 'r') as f:
+        assert f['X'].chunks == (1, 60, 157) and f['X'].compression == 'gzip'
+        assert f['quality'].shape == (5,)
+
+
+def test_cleanup_keeps_augmentations_from_augmenter(tmp_path):
+    """Las augmentaciones de LSPDataAugmenter apuntan a su original y solo quedan huérfanas si se elimina"""
+    generator = SyntheticLandmarkGenerator(seed=4)
+    manager = DataManager(data_dir=str(tmp_path))
+    for _ in range(3):
+        manager.save_sequence(generator.sequence(), 'HOLA', manager.get_next_sequence_id('HOLA'),
+                              {'quality_score': 90})
+
+    augmenter = LSPDataAugmenter()
+    for sequence_id in (1, 2):
+        sequence, metadata = manager.load_sequence('HOLA', sequence_id)
+        for aug_sequence, aug_metadata in augmenter.augment_sequence(sequence, 'word', metadata, 1):
+            assert aug_metadata['augmentation']['original_sequence_id'] == sequence_id
+            manager.save_sequence(aug_sequence, 'HOLA', manager.get_next_sequence_id('HOLA'), aug_metadata)
+    # Augmentación antigua sin ID de origen: desconocido, no huérfana
+    manager.save_sequence(generator.sequence(), 'HOLA', 100, {'collection_mode': 'AUGMENTED'})
+
+    assert manager.cleanup_keras_dataset() == 0
+    # Eliminar la original 2 deja huérfana solo su augmentación (ID 5)
+    report = manager.compact_dataset(predicate=lambda t: t['sequence_id'] == 2, drop_orphaned_augmented=True)
+    assert report['rows_before'] == 6 and report['rows_after'] == 4
+    with h5py.File(manager.dataset_file, 'r') as f:
+        assert sorted(f['sequence_id'][:].tolist()) == [1, 3, 4, 100]
+
+    # El siguiente ID no reutiliza uno existente tras compactar
+    assert manager.get_next_sequence_id('HOLA') == 101
+
+
+def test_compaction_preserves_filter_pipeline(tmp_path):
+    """La copia conserva la cadena de filtros completa (no solo gzip/lzf)"""
+    X, y = SyntheticLandmarkGenerator(seed=5).dataset(6, num_classes=2)
+    path = os.path.join(str(tmp_path), 'sequences.h5')
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('X', data=X, maxshape=(None,) + X.shape[1:], chunks=(1,) + X.shape[1:],
+                         compression='gzip', compression_opts=7, shuffle=True, fletcher32=True)
+        f.create_dataset('y', data=y, maxshape=(None,), chunks=True)
+        before = f['X'].id.get_create_plist()
+        filters = [before.get_filter(i) for i in range(before.get_nfilters())]
+
+    compact_sequences_file(path, np.arange(6) % 2 == 0)
+    with h5py.File(path, 'r') as f:
+        after = f['X'].id.get_create_plist()
+        assert [after.get_filter(i) for i in range(after.get_nfilters())] == filters
+        np.testing.assert_array_equal(f['X'][:], X[::2])
@@ -0,0 +1,66 @@
+"""
+Test de la destilación de conocimiento
+Verifica la pérdida de destilación y que TrainingPipeline.distill guarde un
+estudiante más pequeño que se carga como cualquier modelo del traductor
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.inference.inference_engine import load_inference_engine
+from src.training.distillation import DistillationLoss, pack_distillation_targets
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_distillation_loss_blends_labels_and_soft_targets():
+    labels = np.array([0, 2])
+    teacher = np.array([[0.7, 0.2, 0.1], [0.1, 0.3, 0.6]], dtype=np.float32)
+    student = np.array([[0.5, 0.3, 0.2], [0.2, 0.2, 0.6]], dtype=np.float32)
+    targets = pack_distillation_targets(labels, teacher, temperature=2.0)
+
+    hard_only = DistillationLoss(temperature=2.0, alpha=1.0)(targets, student)
+    expected = keras.losses.SparseCategoricalCrossentropy()(labels, student)
+    np.testing.assert_allclose(hard_only, expected, rtol=1e-5)
+
+    # Estudiante idéntico al maestro: la parte suave es cero
+    soft_only = DistillationLoss(temperature=2.0, alpha=0.0)(targets, teacher)
+    assert abs(float(soft_only)) < 1e-5
+
+
+def test_distill_saves_smaller_student(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=11)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    pipeline.prepare_data()
+    tf.keras.utils.set_random_seed(0)
+    pipeline.build_model({'gru_units': 32, 'num_gru_layers': 2})
+    pipeline.train_model(epochs=1, batch_size=8, plot_history=False, checkpoint_every=None)
+
+    report = pipeline.distill(student_config={'gru_units': 8}, epochs=2, batch_size=8)
+
+    assert report['student_parameters'] < report['teacher_parameters']
+    assert report['accuracy_drop'] == report['teacher_accuracy'] - report['student_accuracy']
+    assert report['speedup'] > 0
+    with open(report['report_path'], 'r', encoding='utf-8') as f:
+        assert json.load(f)['student_path'] == report['student_path']
+
+    # El .h5 se carga sin objetos personalizados y con el mismo motor del traductor
+    keras.models.load_model(report['student_path'])
+    engine = load_inference_engine(report['student_path'], data_path=data_dir)
+    assert engine.predict_proba(generator.sequence(length=10)).shape == (1, 3)
@@ -0,0 +1,71 @@
+"""
+Test de la política de tipos de datos
+Verifica que ninguna etapa del camino crítico promueva float32 a float64 y
+que el almacenamiento float16 se lea de vuelta como float32
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.utils.dtype_policy import FEATURE_DTYPE, check_feature_dtype, dataset_memory_report
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+from src.data_collection.feature_extractor import FeatureExtractor
+from src.data_collection.data_augmentation import LSPDataAugmenter
+from src.data_collection.data_manager import DataManager
+from src.training.data_loader import HDF5DataLoader
+
+
+def test_feature_extraction_stays_float32():
+    """Las características por frame y la secuencia apilada son float32"""
+    generator = SyntheticLandmarkGenerator(seed=0)
+    extractor = FeatureExtractor()
+
+    frames = []
+    for _ in range(5):
+        hand_results, pose_results = generator.frame_results()
+        features, _ = extractor.extract_advanced_landmarks(hand_results, pose_results)
+        frames.append(check_feature_dtype(features, 'feature_extraction'))
+
+    assert frames[0].shape == (157,)
+    assert np.stack(frames).dtype == FEATURE_DTYPE
+
+
+def test_augmentation_and_normalization_do_not_upcast(tmp_path):
+    """Augmentación y normalize_data conservan float32"""
+    X, _ = SyntheticLandmarkGenerator(seed=1).dataset(12, num_classes=3)
+    augmenter = LSPDataAugmenter()
+    for sequence, metadata in augmenter.augment_sequence(X[0], 'word', {}, num_augmentations=6):
+        check_feature_dtype(sequence, f"augmentation:{metadata['augmentation']['technique']}")
+
+    loader = HDF5DataLoader(data_path=str(tmp_path))
+    normalized = loader.normalize_data(X[:8], X[8:10], X[10:])
+    for array in normalized[:3]:
+        check_feature_dtype(array, 'normalize_data')
+
+
+def test_float16_storage_reads_back_as_float32(tmp_path):
+    """Con storage_dtype='float16' el archivo ocupa la mitad y se carga en float32"""
+    sequence = SyntheticLandmarkGenerator(seed=2).sequence()
+    manager = DataManager(data_dir=str(tmp_path), storage_dtype='float16')
+    manager.save_sequence(sequence, 'HOLA', 1, {})
+
+    X, _ = manager.load_keras_dataset()
+    assert X.dtype == FEATURE_DTYPE
+    np.testing.assert_allclose(X[0], sequence, atol=1e-2)
+
+    with pytest.raises(ValueError):
+        DataManager(data_dir=str(tmp_path), storage_dtype='int8')
+
+
+def test_memory_report():
+    """El reporte refleja 8/4/2 bytes por valor"""
+    report = dataset_memory_report(1000, 60, 157)
+    assert report['float64']['bytes'] == 2 * report['float32']['bytes'] == 4 * report['float16']['bytes']
+    assert report['float64']['saved_vs_float64_gb'] == 0
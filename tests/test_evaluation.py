@@ -0,0 +1,101 @@
+"""
+Test de la evaluación de modelos
+Verifica las métricas vectorizadas contra scikit-learn y la evaluación en
+streaming del split de test con perfil de latencia y caché de resultados
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import h5py
+import numpy as np
+import pytest
+from sklearn.metrics import confusion_matrix as sk_confusion_matrix, precision_recall_fscore_support
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.evaluation.evaluate_model import ModelEvaluator
+from src.evaluation.metrics import classification_metrics, confusion_matrix, top_confusions
+from src.inference.inference_engine import load_inference_engine
+from src.inference.numpy_gru import export_numpy_weights
+from src.training.data_loader import HDF5DataLoader
+from src.training.model_builder import GRUModelBuilder
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+SIGNS = ['A', 'B', 'HOLA', 'GRACIAS']
+
+
+def write_flat_dataset(data_path, X, y):
+    """Dataset con el formato de DataManager (X/y + labels_map.json)"""
+    os.makedirs(os.path.join(data_path, 'metadata'), exist_ok=True)
+    with h5py.File(os.path.join(data_path, 'sequences.h5'), 'w') as f:
+        f.create_dataset('X', data=X, chunks=(16,) + X.shape[1:], dtype='float32')
+        f.create_dataset('y', data=y, dtype='int32')
+    with open(os.path.join(data_path, 'metadata', 'labels_map.json'), 'w', encoding='utf-8') as f:
+        json.dump({'index_to_sign': {str(i): sign for i, sign in enumerate(SIGNS)}}, f)
+
+
+def test_metrics_match_sklearn():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 5, 500)
+    y_pred = np.where(rng.random(500) < 0.7, y_true, rng.integers(0, 5, 500))
+    y_pred[y_pred == 4] = 3  # Clase 4 nunca predicha: precisión 0 sin división por cero
+
+    matrix = confusion_matrix(y_true, y_pred, 5)
+    np.testing.assert_array_equal(matrix, sk_confusion_matrix(y_true, y_pred, labels=range(5)))
+
+    metrics = classification_metrics(matrix)
+    precision, recall, f1, support = precision_recall_fscore_support(y_true, y_pred, labels=range(5),
+                                                                     zero_division=0)
+    np.testing.assert_allclose(metrics['precision'], precision)
+    np.testing.assert_allclose(metrics['recall'], recall)
+    np.testing.assert_allclose(metrics['f1'], f1)
+    assert metrics['support'] == support.tolist()
+    assert metrics['macro']['f1'] == pytest.approx(f1.mean())
+    assert metrics['weighted']['f1'] == pytest.approx(np.average(f1, weights=support))
+
+    pairs = top_confusions(matrix, top=3)
+    assert pairs[0]['true'] == '4' and pairs[0]['predicted'] == '3'
+    assert [p['count'] for p in pairs] == sorted((p['count'] for p in pairs), reverse=True)
+
+
+def test_evaluate_streams_test_split_and_caches(tmp_path):
+    data_path, models_path = str(tmp_path / 'data'), str(tmp_path / 'models')
+    X, y = SyntheticLandmarkGenerator(seed=3, sequence_length=20).dataset(150, num_classes=len(SIGNS))
+    write_flat_dataset(data_path, X, y)
+    with open(os.path.join(data_path, 'metadata', 'preprocessing_info.json'), 'w', encoding='utf-8') as f:
+        json.dump({'label_encoder_classes': sorted(SIGNS)}, f)
+
+    os.makedirs(models_path)
+    model = GRUModelBuilder().build_model(input_shape=(20, X.shape[2]), num_classes=len(SIGNS),
+                                          gru_units=8, num_gru_layers=1)
+    export_numpy_weights(model, os.path.join(models_path, 'gru_eval.npz'))
+
+    evaluator = ModelEvaluator()
+    evaluator.models_path, evaluator.data_path = models_path, data_path
+    evaluator.cache_path = str(tmp_path / 'results' / 'evaluation_cache')
+    results = evaluator.evaluate('gru_eval.npz', batch_size=16)
+
+    # Referencia: todo el test en memoria por el mismo motor
+    test_rows = HDF5DataLoader(data_path, sequence_length=20).get_split_indices()['test']
+    engine = load_inference_engine(os.path.join(models_path, 'gru_eval.npz'), data_path=data_path)
+    names = np.array(SIGNS)[y[test_rows]]
+    expected = np.mean(np.array(engine.class_names)[np.argmax(engine.predict_proba(X[test_rows]), axis=1)] == names)
+
+    assert results['cached'] is False and results['num_samples'] == len(test_rows)
+    assert np.sum(results['confusion_matrix']) == len(test_rows)
+    assert results['metrics']['accuracy'] == pytest.approx(expected)
+    assert set(results['latency']) == {'1', '8', '32', '128'}
+    assert all(s['latency_ms_p99'] >= s['latency_ms_p50'] > 0 for s in results['latency'].values())
+
+    again = evaluator.evaluate('gru_eval.npz')
+    assert again['cached'] is True and again['confusion_matrix'] == results['confusion_matrix']
+
+    # El mismo nombre con otro formato no reutiliza el resultado del .npz
+    model.save(os.path.join(models_path, 'gru_eval.h5'))
+    keras_results = evaluator.evaluate('gru_eval.h5', measure_latency=False)
+    assert keras_results['cached'] is False
+    assert evaluator.evaluate('gru_eval.npz')['cached'] is True
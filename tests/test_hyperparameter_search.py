@@ -0,0 +1,115 @@
+"""
+Test de la búsqueda de hiperparámetros
+Verifica el muestreo, el calendario de successive halving, el frente de
+Pareto y una búsqueda completa pequeña sobre los datos en caché
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.training import hyperparameter_search
+from src.training.hyperparameter_search import (HyperparameterSearch, halving_schedule, pareto_front,
+                                                sample_configs)
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+TINY_SPACE = {
+    'gru_units': [8, 16],
+    'num_gru_layers': [1],
+    'dropout_rate': ('uniform', 0.1, 0.3),
+    'use_attention': [True, False],
+    'learning_rate': ('log', 1e-3, 1e-2),
+}
+
+
+def test_sampling_schedule_and_pareto():
+    """Muestreo reproducible, rondas decrecientes y frente de Pareto"""
+    configs = sample_configs(5, TINY_SPACE, seed=1)
+    assert configs == sample_configs(5, TINY_SPACE, seed=1)
+    assert all(1e-3 <= c['learning_rate'] <= 1e-2 and c['gru_units'] in (8, 16) for c in configs)
+
+    assert halving_schedule(9, 2, 18, 3) == [{'trials': 9, 'epochs': 2}, {'trials': 3, 'epochs': 6},
+                                             {'trials': 1, 'epochs': 18}]
+    # Potencias exactas de eta: la última ronda llega a max_epochs
+    assert [step['epochs'] for step in halving_schedule(100, 1, 1000, 10)] == [1, 10, 100, 1000]
+
+    results = [{'trial_id': 0, 'val_accuracy': 0.9, 'latency_ms': 5.0},
+               {'trial_id': 1, 'val_accuracy': 0.8, 'latency_ms': 2.0},
+               {'trial_id': 2, 'val_accuracy': 0.7, 'latency_ms': 3.0}]
+    assert pareto_front(results) == [0, 1]
+
+
+def _make_pipeline(tmp_path):
+    """Pipeline sobre 30 secuencias sintéticas de 3 señas"""
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=8)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    return TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                            logs_path=str(tmp_path / 'logs'), sequence_length=10)
+
+
+def test_search_runs_halving_on_cached_data(tmp_path, monkeypatch):
+    """Una búsqueda en proceso descarta pruebas y guarda la tabla de resultados"""
+    pipeline = _make_pipeline(tmp_path)
+    search = HyperparameterSearch(pipeline, space=TINY_SPACE, num_trials=2, min_epochs=1, max_epochs=2,
+                                  eta=2, max_workers=0, batch_size=8)
+    tasks = []
+    run_trial = hyperparameter_search.run_trial
+    monkeypatch.setattr(hyperparameter_search, 'run_trial', lambda task: tasks.append(task) or run_trial(task))
+    results = search.run()
+
+    # Las pruebas se entrenan con los mismos pesos por clase que train_model
+    assert tasks and pipeline.class_weights
+    assert all(task['class_weights'] == pipeline.class_weights for task in tasks)
+
+    assert pipeline.prepared_cache_path is not None
+    assert [r['epochs'] for r in results] == [2, 1]
+    assert all(0 <= r['val_accuracy'] <= 1 and r['latency_ms'] > 0 for r in results)
+    assert any(r['pareto'] for r in results)
+    assert search.best_config() == results[0]['config']
+
+    with open(os.path.join(search.output_dir, 'results.json'), encoding='utf-8') as f:
+        saved = json.load(f)
+    assert len(saved['results']) == 2
+    assert os.path.exists(results[0]['model_path'])
+
+
+def test_search_runs_trials_in_worker_processes(tmp_path):
+    """Con varios procesos (spawn + hilos acotados) las rondas continúan los modelos de los workers"""
+    pipeline = _make_pipeline(tmp_path)
+    search = HyperparameterSearch(pipeline, space=TINY_SPACE, num_trials=2, min_epochs=1, max_epochs=2,
+                                  eta=2, max_workers=2, threads_per_worker=1, batch_size=8)
+    results = search.run()
+
+    assert [r['epochs'] for r in results] == [2, 1]
+    assert [r['rung'] for r in results] == [1, 0]
+    assert all(0 <= r['val_accuracy'] <= 1 and r['latency_ms'] > 0 for r in results)
+    assert all(os.path.exists(r['model_path']) for r in results)
+
+
+def test_search_rejects_variable_length_data(tmp_path):
+    """Sin caché de arrays (datos en streaming) la búsqueda falla antes de lanzar procesos"""
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=8)
+    manager = DataManager(data_dir=data_dir, variable_length=True)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(length=6 + i % 3), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3],
+                              i // 3 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    search = HyperparameterSearch(pipeline, space=TINY_SPACE, num_trials=2, min_epochs=1, max_epochs=2,
+                                  eta=2, max_workers=2, batch_size=8)
+    with pytest.raises(ValueError, match='longitud fija'):
+        search.run()
@@ -0,0 +1,46 @@
+"""
+Test del motor de inferencia compilado
+Verifica que KerasInferenceEngine aplique la normalización del entrenamiento,
+coincida con el modelo original y no vuelva a trazar tras el calentamiento
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.inference.inference_engine import load_inference_engine
+from src.training.model_builder import GRUModelBuilder
+
+
+def test_engine_matches_model_after_warmup(tmp_path):
+    model = GRUModelBuilder().build_model(input_shape=(10, 6), num_classes=3, gru_units=8,
+                                          num_gru_layers=1, use_attention=False)
+    model_path = str(tmp_path / 'models' / 'gru_lsp_model_test.h5')
+    os.makedirs(os.path.dirname(model_path))
+    model.save(model_path)
+
+    rng = np.random.default_rng(0)
+    mean, std = rng.random(6), rng.random(6) + 0.5
+    os.makedirs(tmp_path / 'data' / 'metadata')
+    with open(tmp_path / 'data' / 'metadata' / 'preprocessing_info.json', 'w', encoding='utf-8') as f:
+        json.dump({'sequence_length': 10, 'label_encoder_classes': ['A', 'B', 'HOLA'],
+                   'normalization': {'method': 'z-score', 'mean': mean.tolist(), 'std': std.tolist()}}, f)
+
+    engine = load_inference_engine(str(tmp_path / 'models'), data_path=str(tmp_path / 'data'),
+                                   warmup_batch_sizes=(1, 4))
+    assert engine.tracing_count == 1
+
+    batch = rng.random((4, 10, 6)).astype(np.float32)
+    expected = model.predict((batch - mean) / std, verbose=0)
+    np.testing.assert_allclose(engine.predict_proba(batch), expected, atol=1e-5)
+
+    sign, confidence = engine.predict(batch[0])
+    assert sign == ['A', 'B', 'HOLA'][int(np.argmax(expected[0]))]
+    assert np.isclose(confidence, expected[0].max(), atol=1e-5)
+    assert engine.tracing_count == 1
@@ -0,0 +1,60 @@
+"""
+Test del servidor de inferencia con micro-batching
+Verifica que las peticiones concurrentes se agrupen en batches con los
+mismos resultados que la predicción directa, las métricas y los errores de
+forma
+Versión: 2.2 - Julio 2025
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.inference.inference_engine import KerasInferenceEngine
+from src.inference.inference_server import InferenceServer
+from src.inference.load_test import HttpConnection, run_load_test
+from src.training.model_builder import GRUModelBuilder
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_server_batches_concurrent_requests():
+    model = GRUModelBuilder().build_model(input_shape=(10, 12), num_classes=3, gru_units=8, num_gru_layers=1)
+    engine = KerasInferenceEngine(model, class_names=['HOLA', 'GRACIAS', 'ADIOS'])
+    sequences = [SyntheticLandmarkGenerator(seed=i, sequence_length=10, feature_dim=12).sequence()
+                 for i in range(16)]
+
+    async def scenario():
+        server = InferenceServer(engine, port=0, max_batch_size=8, max_latency_ms=20)
+        await server.start()
+        try:
+            connections = [await HttpConnection.open(server.host, server.port) for _ in sequences]
+            responses = await asyncio.gather(*(
+                connection.request('POST', '/predict', json.dumps({'sequence': s.tolist()}).encode())
+                for connection, s in zip(connections, sequences)))
+            bad_shape = await connections[0].request('POST', '/predict',
+                                                     json.dumps({'sequence': [[0.0] * 12] * 4}).encode())
+            _, metrics = await connections[0].request('GET', '/metrics')
+            for connection in connections:
+                await connection.close()
+            load = await run_load_test(server.host, server.port, concurrency=4, requests_per_client=5)
+        finally:
+            await server.stop()
+        return responses, bad_shape, metrics, load
+
+    responses, bad_shape, metrics, load = asyncio.run(scenario())
+
+    expected = engine.predict_proba(np.stack(sequences))
+    assert all(status == 200 for status, _ in responses)
+    np.testing.assert_allclose([body['probabilities'] for _, body in responses], expected, atol=1e-5)
+    assert responses[0][1]['label'] in ('HOLA', 'GRACIAS', 'ADIOS')
+
+    assert bad_shape[0] == 400
+    assert metrics['requests'] == 16 and metrics['batches'] < 16
+    assert max(int(size) for size in metrics['batch_size_histogram']) <= 8
+    assert load['errors'] == 0 and load['requests'] == 20 and load['throughput_rps'] > 0
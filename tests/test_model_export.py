@@ -0,0 +1,58 @@
+"""
+Test de la exportación a TFLite
+Verifica que las variantes float16 e int8 se exporten desde un modelo de
+TrainingPipeline, sean más pequeñas, coincidan con el modelo Keras y se
+carguen con el mismo motor de inferencia que usa el traductor
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.inference.inference_engine import load_inference_engine
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_export_tflite_variants(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=5)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    pipeline.prepare_data()
+    tf.keras.utils.set_random_seed(0)
+    pipeline.build_model({'gru_units': 16, 'num_gru_layers': 1, 'use_attention': False})
+    pipeline.train_model(epochs=1, batch_size=8, plot_history=False, checkpoint_every=None)
+
+    result = pipeline.export_tflite(num_samples=20)
+    model_path = pipeline.training_config['model_path']
+
+    assert set(result['models']) == {'float16', 'int8'}
+    report = result['report']
+    for quantization, path in result['models'].items():
+        assert os.path.getsize(path) < os.path.getsize(model_path)
+        assert report[quantization]['agreement'] >= 0.9
+    assert report['float16']['max_abs_diff'] < 1e-2
+    with open(result['report_path'], 'r', encoding='utf-8') as f:
+        assert set(json.load(f)['results']) == {'keras', 'float16', 'int8'}
+
+    keras_engine = load_inference_engine(model_path, data_path=data_dir)
+    tflite_engine = load_inference_engine(result['models']['float16'], data_path=data_dir)
+    assert tflite_engine.backend == 'tflite'
+    assert tflite_engine.class_names == keras_engine.class_names
+
+    sequences = np.stack([generator.sequence(length=10) for _ in range(3)])
+    np.testing.assert_allclose(tflite_engine.predict_proba(sequences), keras_engine.predict_proba(sequences),
+                               atol=1e-2)
@@ -0,0 +1,45 @@
+"""
+Test de los perfiles de modelo
+Verifica que el perfil 'fast' deje las capas GRU aptas para el kernel
+fusionado y que ambos perfiles compartan pesos compatibles
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.training.model_builder import GRUModelBuilder
+
+
+def _gru_layers(model):
+    return [layer.forward_layer for layer in model.layers if layer.name.startswith('bidirectional_gru_')]
+
+
+def test_fast_profile_uses_fused_gru_configuration():
+    builder = GRUModelBuilder()
+    standard = builder.build_model(input_shape=(10, 6), num_classes=3, gru_units=8, profile='standard')
+    fast = builder.build_model(input_shape=(10, 6), num_classes=3, gru_units=8, profile='fast')
+
+    assert all(gru.recurrent_dropout > 0 for gru in _gru_layers(standard))
+    for gru in _gru_layers(fast):
+        assert gru.recurrent_dropout == 0
+        assert gru.reset_after
+        assert gru.activation.__name__ == 'tanh'
+        assert gru.recurrent_activation.__name__ == 'sigmoid'
+    assert builder.model_config['profile'] == 'fast'
+
+    # Misma arquitectura de pesos: un modelo entrenado con un perfil se carga en el otro
+    fast.set_weights(standard.get_weights())
+    batch = np.random.rand(2, 10, 6).astype(np.float32)
+    np.testing.assert_allclose(fast(batch, training=False), standard(batch, training=False), atol=1e-5)
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        GRUModelBuilder().build_model(input_shape=(10, 6), num_classes=3, profile='turbo')
@@ -0,0 +1,118 @@
+"""
+Test del registro de modelos
+Verifica el índice de metadatos (y que solo se recalcule al cambiar un
+archivo), la caché LRU con límite de memoria y el cambio de modelo en
+segundo plano sin interrumpir al modelo activo
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.inference import model_registry
+from src.inference.model_registry import ActiveModel, ModelCache, ModelRegistry
+from src.inference.numpy_gru import export_numpy_weights
+from src.training.model_builder import GRUModelBuilder
+
+
+def _make_models(tmp_path):
+    models, logs, metadata = tmp_path / 'models', tmp_path / 'logs', tmp_path / 'data' / 'metadata'
+    for folder in (models, logs, metadata):
+        folder.mkdir(parents=True)
+    model = GRUModelBuilder().build_model(input_shape=(10, 6), num_classes=3, gru_units=8, num_gru_layers=1)
+    model.save(str(models / 'gru_a.h5'))
+    export_numpy_weights(model, str(models / 'gru_a.npz'))
+    export_numpy_weights(model, str(models / 'gru_b.npz'))
+    (logs / 'gru_a_config.json').write_text(json.dumps({'best_val_accuracy': 0.875}))
+    (metadata / 'preprocessing_info.json').write_text(json.dumps({'label_encoder_classes': ['A', 'B', 'C']}))
+    return ModelRegistry(str(models), str(tmp_path / 'data'), str(logs))
+
+
+def test_registry_index_metadata_and_refresh(tmp_path, monkeypatch):
+    registry = _make_models(tmp_path)
+    assert registry.list_models(backends=('numpy',)) == ['gru_a.npz', 'gru_b.npz']
+
+    keras_entry = registry.get('gru_a.h5')
+    assert keras_entry['input_shape'] == [10, 6] and keras_entry['num_classes'] == 3
+    assert keras_entry['class_names'] == ['A', 'B', 'C'] and keras_entry['val_accuracy'] == 0.875
+    # La exportación hereda la accuracy de su .h5 de origen
+    assert registry.get('gru_a.npz')['source'] == 'gru_a.h5'
+    assert registry.get('gru_a.npz')['val_accuracy'] == 0.875
+    assert registry.get('gru_b.npz')['val_accuracy'] is None
+
+    # Un registro nuevo reutiliza el índice: solo se inspecciona el archivo borrado/cambiado
+    calls = []
+    monkeypatch.setattr(model_registry, 'read_model_signature', lambda path: calls.append(path) or {})
+    os.remove(registry.path('gru_b.npz'))
+    reopened = ModelRegistry(registry.models_path, registry.data_path, registry.logs_path)
+    assert reopened.list_models() == ['gru_a.h5', 'gru_a.npz']
+    assert calls == []
+    assert reopened.get('gru_a.h5')['input_shape'] == [10, 6]
+
+
+def test_cache_lru_eviction_and_background_swap(tmp_path):
+    registry = _make_models(tmp_path)
+    size = os.path.getsize(registry.path('gru_a.npz'))
+    cache = ModelCache(registry, max_memory_mb=1.5 * size / 1024**2)
+
+    first = cache.get('gru_a.npz')
+    assert cache.get('gru_a.npz') is first
+    cache.get('gru_b.npz')  # Excede el límite: sale el menos usado
+    assert 'gru_a.npz' not in cache and 'gru_b.npz' in cache
+    assert cache.stats == {'hits': 1, 'misses': 2, 'evictions': 1}
+
+    active = ActiveModel(cache)
+    old_engine = active.switch('gru_b.npz', background=False)
+
+    gate = threading.Event()
+    load = cache.get
+    cache.get = lambda name: gate.wait() and load(name)
+    active.switch('gru_a.npz')
+    # Mientras el nuevo carga, el modelo anterior sigue activo
+    assert active.engine is old_engine and active.name == 'gru_b.npz'
+    gate.set()
+    assert active.wait(timeout=30)
+    assert active.name == 'gru_a.npz' and active.engine is not old_engine
+    assert active.engine.predict_proba(np.zeros((1, 10, 6), dtype=np.float32)).shape == (1, 3)
+
+
+def test_switch_publishes_latest_request_and_failed_load_is_retried(tmp_path, monkeypatch):
+    registry = _make_models(tmp_path)
+    cache = ModelCache(registry)
+    active = ActiveModel(cache)
+
+    # gru_a tarda más que gru_b, pedido después: al terminar no debe reemplazarlo
+    gate = threading.Event()
+    load = cache.get
+    cache.get = lambda name: (name != 'gru_a.npz' or gate.wait()) and load(name)
+    active.switch('gru_a.npz')
+    slow = active._thread
+    active.switch('gru_b.npz')
+    assert active.wait(timeout=30) and active.name == 'gru_b.npz'
+    gate.set()
+    slow.join(timeout=30)
+    assert active.name == 'gru_b.npz' and 'gru_a.npz' in cache
+
+    calls = []
+    real_load = model_registry.load_inference_engine
+
+    def flaky_load(path, **kwargs):
+        calls.append(path)
+        if len(calls) == 1:
+            raise OSError('lectura interrumpida')
+        return real_load(path, **kwargs)
+
+    monkeypatch.setattr(model_registry, 'load_inference_engine', flaky_load)
+    fresh = ModelCache(registry)
+    with pytest.raises(OSError):
+        fresh.get('gru_b.npz')
+    assert fresh._loading == {}
+    assert fresh.get('gru_b.npz') is not None and len(calls) == 2
@@ -0,0 +1,55 @@
+"""
+Test del backend NumPy
+Verifica que el forward pass de numpy_gru reproduzca al modelo Keras con
+pesos del NPZ exportado y que el motor cargue sin importar TensorFlow
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.inference.inference_engine import load_inference_engine
+from src.inference.model_export import measure_startup
+from src.inference.numpy_gru import NumpyGRUClassifier, export_numpy_weights
+from src.training.model_builder import GRUModelBuilder
+
+
+@pytest.mark.parametrize('num_gru_layers, use_attention', [(2, True), (1, False)])
+def test_numpy_forward_matches_keras(tmp_path, num_gru_layers, use_attention):
+    model = GRUModelBuilder().build_model(input_shape=(12, 6), num_classes=4, gru_units=8,
+                                          num_gru_layers=num_gru_layers, use_attention=use_attention)
+    # Pesos aleatorios en todas las capas (los sesgos y gammas iniciales son triviales)
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.5, w.shape).astype(np.float32) for w in model.get_weights()])
+
+    path = str(tmp_path / 'model.npz')
+    config = export_numpy_weights(model, path)
+    assert len(config['gru_layers']) == num_gru_layers
+    assert config['use_attention'] == use_attention
+
+    classifier = NumpyGRUClassifier.load(path)
+    batch = rng.normal(size=(5, 12, 6)).astype(np.float32)
+    expected = model(batch, training=False).numpy()
+    np.testing.assert_allclose(classifier(batch), expected, atol=1e-5)
+    # Buffers reutilizados: batch 1 y de nuevo batch 5
+    np.testing.assert_allclose(classifier(batch[:1]), expected[:1], atol=1e-5)
+    np.testing.assert_allclose(classifier(batch), expected, atol=1e-5)
+
+
+def test_numpy_engine_loads_without_tensorflow(tmp_path):
+    model = GRUModelBuilder().build_model(input_shape=(10, 6), num_classes=3, gru_units=8, num_gru_layers=1)
+    path = str(tmp_path / 'model.npz')
+    export_numpy_weights(model, path)
+
+    engine = load_inference_engine(path, data_path=str(tmp_path), jit_compile=True)
+    assert engine.backend == 'numpy'
+    assert engine.predict_proba(np.zeros((2, 10, 6), dtype=np.float32)).shape == (2, 3)
+
+    startup = measure_startup(path, str(tmp_path))
+    assert startup['tensorflow_loaded'] is False
@@ -0,0 +1,53 @@
+"""
+Test de la exportación a ONNX
+Verifica que el backend onnxruntime reproduzca las probabilidades del modelo
+Keras sobre secuencias almacenadas en sequences.h5 y que arranque sin cargar
+TensorFlow (se omite si tf2onnx u onnxruntime no están instalados)
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+pytest.importorskip('tf2onnx')
+pytest.importorskip('onnxruntime')
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.inference.inference_engine import load_inference_engine
+from src.inference.model_export import load_representative_sample, measure_startup
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_onnx_backend_matches_keras_on_stored_sequences(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=7)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    pipeline.prepare_data()
+    tf.keras.utils.set_random_seed(0)
+    pipeline.build_model({'gru_units': 16, 'num_gru_layers': 1})
+    pipeline.train_model(epochs=1, batch_size=8, plot_history=False, checkpoint_every=None)
+
+    result = pipeline.export_onnx(report=False)
+    keras_engine = load_inference_engine(pipeline.training_config['model_path'], data_path=data_dir)
+    onnx_engine = load_inference_engine(result['models']['onnx'], data_path=data_dir)
+    assert onnx_engine.backend == 'onnx'
+    assert onnx_engine.class_names == keras_engine.class_names
+
+    X, _ = load_representative_sample(data_dir, keras_engine.class_names, sequence_length=10, num_samples=30)
+    np.testing.assert_allclose(onnx_engine.predict_proba(X), keras_engine.predict_proba(X), atol=1e-5)
+
+    startup = measure_startup(result['models']['onnx'], data_dir)
+    assert startup['tensorflow_loaded'] is False
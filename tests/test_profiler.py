@@ -0,0 +1,71 @@
+"""
+Test del profiler por etapas
+Verifica percentiles móviles, exportación Chrome trace y modo desactivado
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.utils.profiler import StageProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    """Con el profiler desactivado no se registran muestras ni eventos"""
+    profiler = StageProfiler(enabled=False)
+    profiler.begin_frame()
+    with profiler.stage('camera_read'):
+        pass
+    profiler.record('mediapipe_hands', 12.0)
+    profiler.end_frame()
+
+    assert profiler.get_stats() == {}
+    assert profiler.frame_count == 0
+    assert len(profiler.trace_events) == 0
+
+
+def test_rolling_percentiles():
+    """Los percentiles se calculan sobre la ventana móvil de cada etapa"""
+    profiler = StageProfiler(enabled=True, window=10)
+    for value in range(1, 21):
+        profiler.record('stage', float(value))
+
+    stats = profiler.get_stats()['stage']
+    assert stats['count'] == 10
+    assert stats['last'] == 20.0
+    assert stats['p50'] == np.percentile(np.arange(11, 21), 50)
+
+
+def test_frame_timing_and_chrome_trace(tmp_path):
+    """Los frames y etapas se exportan como eventos 'X' del formato trace-event"""
+    profiler = StageProfiler(enabled=True)
+    for _ in range(3):
+        profiler.begin_frame()
+        with profiler.stage('camera_read'):
+            time.sleep(0.001)
+        with profiler.stage('drawing'):
+            pass
+        profiler.end_frame()
+    profiler.record('mediapipe_hands', 5.0, thread='mediapipe')
+
+    assert profiler.frame_count == 3
+    assert profiler.get_fps() > 0
+    assert profiler.get_stats()['camera_read']['p50'] >= 1.0
+
+    path = profiler.export_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(path, 'r', encoding='utf-8') as f:
+        trace = json.load(f)
+
+    complete_events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    names = {e['name'] for e in complete_events}
+    assert names == {'camera_read', 'drawing', StageProfiler.FRAME_STAGE, 'mediapipe_hands'}
+    assert all(e['dur'] >= 0 for e in complete_events)
+    thread_names = {e['args']['name'] for e in trace['traceEvents'] if e['name'] == 'thread_name'}
+    assert thread_names == {'main', 'mediapipe'}
@@ -0,0 +1,70 @@
+"""
+Test de la poda estructurada y el clustering de pesos
+Verifica que la poda sin eliminar unidades reproduzca el modelo, que
+TrainingPipeline.prune guarde un modelo más pequeño y que
+get_model_memory_usage refleje el tamaño efectivo tras el clustering
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.training.model_builder import GRUModelBuilder
+from src.training.pruning import cluster_weights, prune_gru_model
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_prune_keeps_outputs_without_removed_units_and_shrinks_model():
+    builder = GRUModelBuilder()
+    model = builder.build_model(input_shape=(10, 6), num_classes=3, gru_units=64, num_gru_layers=2)
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.5, w.shape).astype(np.float32) for w in model.get_weights()])
+    batch = rng.normal(size=(4, 10, 6)).astype(np.float32)
+
+    # ratio 0: se conservan todas las unidades y las salidas no cambian
+    same, _ = prune_gru_model(model, ratio=0.0)
+    np.testing.assert_allclose(same(batch, training=False), model(batch, training=False), atol=1e-5)
+
+    pruned, info = prune_gru_model(model, ratio=0.5)
+    assert info['gru_units_after'] == 32
+    assert info['parameters_after'] == pruned.count_params() < model.count_params()
+
+    before = builder.get_model_memory_usage(pruned)
+    cluster_weights(pruned, num_clusters=4)
+    after = builder.get_model_memory_usage(pruned)
+    assert np.unique(pruned.get_layer('dense_hidden').get_weights()[0]).size <= 4
+    assert after['total_parameters'] == before['total_parameters']
+    assert after['effective_size_mb'] < before['effective_size_mb']
+
+
+def test_pipeline_prune_reports_before_and_after(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=13)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(30):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS', 'ADIOS'][i % 3], i // 3 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    pipeline.prepare_data()
+    tf.keras.utils.set_random_seed(0)
+    pipeline.build_model({'gru_units': 16, 'num_gru_layers': 1})
+    pipeline.train_model(epochs=1, batch_size=8, plot_history=False, checkpoint_every=None)
+
+    report = pipeline.prune(ratio=0.5, fine_tune_epochs=1, num_clusters=16, batch_size=8)
+
+    assert report['gru_units_after'] == 8
+    assert report['memory']['pruned']['total_parameters'] < report['memory']['original']['total_parameters']
+    assert report['memory']['pruned']['effective_size_mb'] < report['memory']['original']['effective_size_mb']
+    assert os.path.getsize(report['pruned_path']) < os.path.getsize(report['model_path'])
+    assert os.path.exists(report['report_path'])
+    keras.models.load_model(report['pruned_path'])
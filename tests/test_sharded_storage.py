@@ -0,0 +1,156 @@
+"""
+Test del almacenamiento por shards
+Verifica que varias sesiones de captura se lean como un único dataset (vista
+virtual y lector paralelo) y que la integración renumere sin colisiones
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection import sharded_storage
+from src.data_collection.data_manager import DataManager
+from src.data_collection.sharded_storage import (build_manifest, build_virtual_view, merge_shards,
+                                                 ShardedDatasetReader)
+from src.training.data_loader import HDF5DataLoader
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def _record_sessions(data_dir):
+    """Dos estaciones con señas en distinto orden; devuelve las secuencias por (seña, sesión)"""
+    generator = SyntheticLandmarkGenerator(seed=4)
+    recorded = {}
+    for session_id, signs in (('station_a', ['HOLA', 'GRACIAS', 'HOLA']), ('station_b', ['ADIOS', 'HOLA'])):
+        manager = DataManager(data_dir=data_dir, session_id=session_id)
+        for sign in signs:
+            sequence = generator.sequence()
+            sequence_id = manager.get_next_sequence_id(sign)
+            manager.save_sequence(sequence, sign, sequence_id, {'sequence_id': sequence_id})
+            recorded.setdefault(sign, []).append(sequence)
+    manager.save_sequence(generator.sequence(), 'ADIOS', 1000, {
+        'collection_mode': 'AUGMENTED', 'augmentation': {'is_augmented': True, 'original_sequence_id': 1}})
+    return recorded
+
+
+def test_shards_read_as_one_dataset(tmp_path):
+    """La vista virtual y el lector por shards devuelven las mismas filas con etiquetas globales"""
+    data_dir = str(tmp_path)
+    _record_sessions(data_dir)
+
+    manifest = build_manifest(data_dir)
+    assert [shard['rows'] for shard in manifest['shards']] == [3, 3]
+    assert manifest['signs'] == ['HOLA', 'GRACIAS', 'ADIOS']
+
+    reader = ShardedDatasetReader(data_dir, manifest)
+    sequential = reader.read(max_workers=1)
+    np.testing.assert_array_equal(reader.read(max_workers=2), sequential)
+    np.testing.assert_array_equal(reader.labels, [0, 1, 0, 2, 0, 2])
+
+    loader = HDF5DataLoader(data_path=build_virtual_view(data_dir, manifest))
+    assert loader.check_data_availability()
+    names = loader._decode_labels(np.arange(3))
+    assert names.tolist() == ['HOLA', 'GRACIAS', 'ADIOS']
+    with_subset = reader.read(np.array([1, 4]))
+    np.testing.assert_array_equal(with_subset, sequential[[1, 4]])
+
+
+def test_merge_shards_renumbers_sequences(tmp_path):
+    """La integración conserva los datos y no repite sequence_id por seña"""
+    data_dir = str(tmp_path)
+    main = DataManager(data_dir=data_dir)
+    main.save_sequence(SyntheticLandmarkGenerator(seed=5).sequence(), 'GRACIAS', 1, {'sequence_id': 1})
+    recorded = _record_sessions(data_dir)
+
+    summary = merge_shards(data_dir, remove=True)
+    assert summary['merged_rows'] == 6
+    assert build_manifest(data_dir)['shards'] == []
+
+    merged = DataManager(data_dir=data_dir)
+    assert merged.get_collected_sequences_count('HOLA') == 3
+    assert merged.get_collected_sequences_count('GRACIAS') == 2
+    for sequence_id, expected in enumerate(recorded['HOLA'], start=1):
+        np.testing.assert_array_equal(merged.load_sequence('HOLA', sequence_id)[0], expected)
+    np.testing.assert_array_equal(merged.load_sequence('GRACIAS', 2)[0], recorded['GRACIAS'][0])
+
+    # Las augmentaciones siguen la numeración de su seña tras las originales
+    aug_sequence, aug_metadata = merged.load_sequence('ADIOS', 2)
+    assert aug_sequence is not None
+    assert aug_metadata['augmentation']['original_sequence_id'] == 1
+    assert merged._load_dataset_info()['total_sequences'] == 7
+
+
+def test_merge_shards_is_idempotent(tmp_path):
+    """Repetir la integración sin borrar los shards solo añade las filas nuevas"""
+    data_dir = str(tmp_path)
+    _record_sessions(data_dir)
+    assert merge_shards(data_dir)['merged_rows'] == 6
+    assert merge_shards(data_dir)['merged_rows'] == 0
+
+    session = DataManager(data_dir=data_dir, session_id='station_b')
+    session.save_sequence(SyntheticLandmarkGenerator(seed=6).sequence(), 'GRACIAS', 1, {'sequence_id': 1})
+    summary = merge_shards(data_dir)
+    assert summary['merged_rows'] == 1 and summary['shards'] == {'station_a': 0, 'station_b': 1}
+
+    merged = DataManager(data_dir=data_dir)
+    assert merged.get_collected_sequences_count('HOLA') == 3
+    assert merged.get_collected_sequences_count('GRACIAS') == 2
+    with h5py.File(merged.dataset_file, 'r') as hf:
+        assert {name: hf[name].shape[0] for name in ('X', 'y', 'sequence_id', 'source_id')} == {
+            'X': 7, 'y': 7, 'sequence_id': 7, 'source_id': 7}
+    assert [name for name in os.listdir(data_dir) if name.endswith('.h5')] == ['sequences.h5']
+
+
+def test_merge_shards_into_variable_length_file(tmp_path):
+    """Con un sequences.h5 de longitud variable las filas del shard se añaden a 'frames'"""
+    data_dir = str(tmp_path)
+    short = SyntheticLandmarkGenerator(seed=7, sequence_length=12).sequence()
+    DataManager(data_dir=data_dir, variable_length=True).save_sequence(short, 'HOLA', 1, {})
+    recorded = _record_sessions(data_dir)
+
+    assert merge_shards(data_dir)['merged_rows'] == 6
+    merged = DataManager(data_dir=data_dir)
+    with h5py.File(merged.dataset_file, 'r') as hf:
+        assert 'X' not in hf and hf['offset'].shape[0] == hf['y'].shape[0] == 7
+    assert merged.validate_keras_dataset_integrity() == []
+    np.testing.assert_array_equal(merged.load_sequence('HOLA', 1)[0], short)
+    for sequence_id, expected in enumerate(recorded['HOLA'], start=2):
+        np.testing.assert_array_equal(merged.load_sequence('HOLA', sequence_id)[0], expected)
+
+
+def test_failed_merge_rolls_back_rows_and_labels(tmp_path, monkeypatch):
+    """Un fallo a mitad de un shard deja sequences.h5 y labels_map.json como estaban"""
+    data_dir = str(tmp_path)
+    main = DataManager(data_dir=data_dir)
+    main.save_sequence(SyntheticLandmarkGenerator(seed=5).sequence(), 'GRACIAS', 1, {})
+    _record_sessions(data_dir)
+
+    append_rows = sharded_storage._append_shard_rows
+
+    def failing_append(manager, src, dst, *args):
+        new_tables = append_rows(manager, src, dst, *args)
+        if 'station_b' in src.filename:
+            raise OSError('disco lleno')
+        return new_tables
+
+    monkeypatch.setattr(sharded_storage, '_append_shard_rows', failing_append)
+    with pytest.raises(OSError):
+        merge_shards(data_dir)
+    with h5py.File(main.dataset_file, 'r') as hf:
+        # station_a quedó confirmada; station_b se deshizo por completo
+        assert {hf[name].shape[0] for name in ('X', 'y', 'sequence_id', 'source_id')} == {4}
+        assert 'merge_pending' not in hf.attrs
+    assert DataManager(data_dir=data_dir).labels_map['sign_to_index'] == {'GRACIAS': 0, 'HOLA': 1}
+
+    monkeypatch.setattr(sharded_storage, '_append_shard_rows', append_rows)
+    assert merge_shards(data_dir)['shards'] == {'station_a': 0, 'station_b': 3}
+    merged = DataManager(data_dir=data_dir)
+    assert merged.labels_map['sign_to_index'] == {'GRACIAS': 0, 'HOLA': 1, 'ADIOS': 2}
+    assert merged.get_collected_sequences_count('HOLA') == 3
+    assert merged.get_collected_sequences_count('ADIOS') == 2
@@ -0,0 +1,75 @@
+"""
+Test del segmentador de señas en flujos continuos
+Verifica que el clasificador se invoque solo sobre los segmentos con
+movimiento, que las señas largas se corten y que los tokens repetidos se
+fusionen
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.motion_analyzer import MotionAnalyzer
+from src.inference.sign_segmenter import StreamingSignSegmenter
+
+
+class PoseCodeEngine:
+    """Motor de prueba: la seña se lee del primer canal de pose"""
+
+    variable_length = False
+    sequence_length = 30
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, sequence):
+        self.calls.append(sequence.shape)
+        return ('HOLA' if sequence[:, 126].mean() < 0.5 else 'GRACIAS'), 0.9
+
+
+def _idle(count, hands=False):
+    frames = np.zeros((count, 157), dtype=np.float32)
+    frames[:, 126:150] = 0.5
+    if hands:
+        frames[:, :126] = 0.1
+    return frames
+
+
+def _sign(rng, count, pose_code):
+    frames = _idle(count)
+    frames[:, :126] = 0.1 + np.cumsum(rng.normal(0.0, 0.03, size=(count, 126)), axis=0)
+    frames[:, 126] = pose_code
+    return frames
+
+
+def test_segmenter_classifies_only_motion_and_deduplicates():
+    rng = np.random.default_rng(0)
+    stream = np.concatenate([
+        _idle(20),                              # sin manos
+        _sign(rng, 24, 0.2),                    # HOLA
+        _idle(15, hands=True),                  # manos quietas
+        _sign(rng, 20, 0.8),                    # GRACIAS
+        _idle(10),
+        _sign(rng, 150, 0.2),                   # HOLA largo: cortes forzados cada 60 frames
+        _idle(40, hands=True),
+    ])
+    analyzer = MotionAnalyzer()
+    assert analyzer.frame_motion_energy(stream[0], stream[1]) == 0.0
+    assert analyzer.frame_motion_energy(stream[30], stream[31]) > analyzer.stillness_threshold
+
+    engine = PoseCodeEngine()
+    segmenter = StreamingSignSegmenter(engine, analyzer)
+    tokens = segmenter.process(stream)
+
+    assert [token.label for token in tokens] == ['HOLA', 'GRACIAS', 'HOLA']
+    assert tokens[0].start_frame <= 20 and tokens[0].end_frame <= 45
+    # Una clasificación por segmento (los cortes de la seña larga se fusionan), nunca por frame
+    assert len(engine.calls) == 5 and all(shape == (30, 157) for shape in engine.calls)
+    summary = segmenter.summary()
+    assert summary['suppressed'] == 2
+    assert summary['idle_ratio'] > 0.2
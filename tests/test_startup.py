@@ -0,0 +1,51 @@
+"""
+Test del arranque del menú principal
+Verifica que el menú y las comprobaciones de estado no importen paquetes
+pesados y el análisis de la salida de -X importtime
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.utils.import_report import measure_imports, parse_importtime, summarize_packages
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def test_menu_paths_do_not_import_heavy_packages():
+    # Proceso nuevo: en el de pytest otros tests ya importaron TensorFlow
+    code = (
+        "import sys, run\n"
+        "system = run.LSPMainSystem()\n"
+        "statuses = [system._check_module_status(m['module']) for m in system.modules.values()]\n"
+        "import src.inference.real_time_translator, src.training.train_gru, src.evaluation.evaluate_model\n"
+        "heavy = [p for p in ('tensorflow', 'mediapipe', 'cv2', 'sklearn', 'matplotlib', 'requests') if p in sys.modules]\n"
+        "print(statuses, heavy)\n"
+        "assert not heavy, heavy\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    report = measure_imports('import run', cwd=ROOT)
+    assert report['heavy'] == []
+    assert any(entry['module'] == 'run' and entry['depth'] == 0 for entry in report['entries'])
+
+
+def test_parse_importtime_output():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     numpy.core",
+        "import time:       300 |        420 |   numpy",
+        "import time:        50 |        470 | run",
+    ])
+    entries = parse_importtime(output)
+    assert [(e['module'], e['depth']) for e in entries] == [('numpy.core', 2), ('numpy', 1), ('run', 0)]
+    assert summarize_packages(entries)[0] == {'package': 'numpy', 'seconds': pytest.approx(420e-6), 'modules': 2}
@@ -0,0 +1,169 @@
+"""
+Test del lector HDF5 en streaming
+Verifica la división persistida por índices, la lectura por bloques y la
+normalización al vuelo sobre el formato plano X/y de DataManager
+Versión: 2.2 - Julio 2025
+"""
+
+import json
+import os
+import sys
+
+import h5py
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.training.data_loader import HDF5DataLoader
+from src.training.streaming_dataset import HDF5StreamingDataset, read_rows
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+SIGNS = ['A', 'B', 'HOLA', 'GRACIAS']
+
+
+def write_flat_dataset(data_path, X, y, chunk_rows=16):
+    """Escribe un dataset con el formato de DataManager (X/y + labels_map.json)"""
+    os.makedirs(os.path.join(data_path, 'metadata'), exist_ok=True)
+    with h5py.File(os.path.join(data_path, 'sequences.h5'), 'w') as f:
+        f.create_dataset('X', data=X, maxshape=(None,) + X.shape[1:],
+                         chunks=(chunk_rows,) + X.shape[1:], dtype='float32')
+        f.create_dataset('y', data=y, maxshape=(None,), chunks=True, dtype='int32')
+    labels_map = {
+        'sign_to_index': {sign: i for i, sign in enumerate(SIGNS)},
+        'index_to_sign': {str(i): sign for i, sign in enumerate(SIGNS)},
+        'num_classes': len(SIGNS)
+    }
+    with open(os.path.join(data_path, 'metadata', 'labels_map.json'), 'w', encoding='utf-8') as f:
+        json.dump(labels_map, f)
+
+
+def append_rows(data_path, X, y):
+    with h5py.File(os.path.join(data_path, 'sequences.h5'), 'a') as f:
+        start = f['X'].shape[0]
+        f['X'].resize(start + len(X), axis=0)
+        f['X'][start:] = X
+        f['y'].resize(start + len(y), axis=0)
+        f['y'][start:] = y
+
+
+def test_split_is_persisted_and_extended(tmp_path):
+    """La división se reutiliza y las filas nuevas se asignan sin mover las existentes"""
+    X, y = SyntheticLandmarkGenerator(seed=1).dataset(120, num_classes=len(SIGNS))
+    write_flat_dataset(str(tmp_path), X, y)
+
+    loader = HDF5DataLoader(data_path=str(tmp_path))
+    split = loader.get_split_indices()
+    assert os.path.exists(loader.split_file)
+    assert sum(len(v) for v in split.values()) == 120
+    assert np.array_equal(np.sort(np.concatenate(list(split.values()))), np.arange(120))
+
+    again = HDF5DataLoader(data_path=str(tmp_path)).get_split_indices()
+    for name in split:
+        assert np.array_equal(split[name], again[name])
+
+    X_new, y_new = SyntheticLandmarkGenerator(seed=2).dataset(30, num_classes=len(SIGNS))
+    append_rows(str(tmp_path), X_new, y_new)
+    extended = HDF5DataLoader(data_path=str(tmp_path)).get_split_indices()
+    for name in split:
+        assert np.array_equal(extended[name][:len(split[name])], split[name])
+    assert np.array_equal(np.sort(np.concatenate(list(extended.values()))), np.arange(150))
+
+
+def test_streaming_epoch_matches_in_memory_load(tmp_path):
+    """Una época en streaming visita cada fila de train una vez, normalizada con float32"""
+    X, y = SyntheticLandmarkGenerator(seed=3).dataset(200, num_classes=len(SIGNS))
+    write_flat_dataset(str(tmp_path), X, y)
+
+    loader = HDF5DataLoader(data_path=str(tmp_path))
+    X_train, _, _, y_train, _, _ = loader.load_dataset()
+    streams = loader.create_streaming_datasets(batch_size=16, block_rows=32, shuffle_buffer_blocks=2)
+    train = streams['train']
+    stats = streams['normalization_stats']
+
+    assert train.num_samples == len(X_train)
+    assert train.element_shape == X_train.shape[1:]
+
+    batches = list(train.iter_batches(epoch=0))
+    X_stream = np.concatenate([b[0] for b in batches])
+    y_stream = np.concatenate([b[1] for b in batches])
+    assert X_stream.dtype == np.float32 and y_stream.dtype == np.int32
+    assert len(batches) == len(train)
+
+    # Misma multiset de filas y etiquetas que la carga en memoria
+    expected = ((X_train - stats['mean']) / stats['std']).astype(np.float32)
+    order_stream = np.lexsort(X_stream[:, 0, :3].T)
+    order_expected = np.lexsort(expected[:, 0, :3].T)
+    np.testing.assert_allclose(X_stream[order_stream], expected[order_expected], rtol=1e-4, atol=1e-4)
+    assert np.array_equal(y_stream[order_stream], y_train[order_expected])
+
+    # El orden de mezcla cambia entre épocas pero es reproducible
+    epoch1 = np.concatenate([b[1] for b in train.iter_batches(epoch=1)])
+    assert np.array_equal(epoch1, np.concatenate([b[1] for b in train.iter_batches(epoch=1)]))
+    assert not np.array_equal(epoch1, y_stream)
+
+
+def test_read_rows_sparse_and_dense(tmp_path):
+    """read_rows devuelve las filas pedidas tanto en bloques densos como dispersos"""
+    X, y = SyntheticLandmarkGenerator(seed=4).dataset(64, num_classes=len(SIGNS))
+    write_flat_dataset(str(tmp_path), X, y)
+    indices = np.array([0, 1, 2, 3, 17, 40, 63])
+
+    with h5py.File(os.path.join(str(tmp_path), 'sequences.h5'), 'r') as f:
+        rows = read_rows(f['X'], indices, block_rows=16)
+    np.testing.assert_array_equal(rows, X[indices])
+
+    stream = HDF5StreamingDataset(os.path.join(str(tmp_path), 'sequences.h5'), indices, y[indices],
+                                  batch_size=4, shuffle=False)
+    X_stream = np.concatenate([b[0] for b in stream.iter_batches()])
+    np.testing.assert_array_equal(X_stream, X[indices])
+
+
+def test_running_stats_match_numpy_with_large_offset():
+    """El acumulador por bloques coincide con np.mean/np.std incluso con offset grande"""
+    from src.training.feature_stats import RunningFeatureStats
+
+    rng = np.random.default_rng(5)
+    data = (1e4 + rng.normal(size=(37, 60, 8))).astype(np.float32)
+    stats = RunningFeatureStats()
+    for start in range(0, len(data), 5):
+        stats.update(data[start:start + 5])
+
+    reference = data.astype(np.float64)
+    np.testing.assert_allclose(stats.mean, reference.mean(axis=(0, 1)), rtol=1e-10)
+    np.testing.assert_allclose(stats.std, reference.std(axis=(0, 1)), rtol=1e-6)
+
+
+def test_normalization_stats_update_incrementally(tmp_path):
+    """Al añadir filas solo se procesan las nuevas y el resultado coincide con recalcular"""
+    X, y = SyntheticLandmarkGenerator(seed=6).dataset(100, num_classes=len(SIGNS))
+    write_flat_dataset(str(tmp_path), X, y)
+
+    loader = HDF5DataLoader(data_path=str(tmp_path))
+    first = loader.compute_normalization_stats(loader.get_split_indices()['train'])
+    loader.save_preprocessing_info(first)
+    assert loader.load_preprocessing_info()['normalization']['rows_seen'] == 100
+
+    X_new, y_new = SyntheticLandmarkGenerator(seed=7).dataset(40, num_classes=len(SIGNS))
+    append_rows(str(tmp_path), X_new, y_new)
+    train = loader.get_split_indices()['train']
+
+    incremental = loader.compute_normalization_stats(train)
+    full = loader.compute_normalization_stats(train, incremental=False)
+    assert incremental['accumulator'].count == full['accumulator'].count
+    np.testing.assert_allclose(incremental['mean'], full['mean'], rtol=1e-9)
+    np.testing.assert_allclose(incremental['std'], full['std'], rtol=1e-6)
+    assert incremental['rows_seen'] == 140
+
+
+def test_load_legacy_preprocessing_info(tmp_path):
+    """El formato anterior con arrays anidados (1, 1, F) sigue siendo legible"""
+    os.makedirs(os.path.join(str(tmp_path), 'metadata'))
+    legacy = {'sequence_length': 60,
+              'normalization': {'mean': [[[0.5] * 4]], 'std': [[[2.0] * 4]], 'method': 'z-score'}}
+    with open(os.path.join(str(tmp_path), 'metadata', 'preprocessing_info.json'), 'w') as f:
+        json.dump(legacy, f)
+
+    info = HDF5DataLoader(data_path=str(tmp_path)).load_preprocessing_info()
+    assert info['normalization']['mean'].shape == (1, 1, 4)
+    assert float(info['normalization']['std'][0, 0, 0]) == 2.0
@@ -0,0 +1,50 @@
+"""
+Test de la caché de datos preparados
+Verifica que prepare_data reutilice los arrays guardados mientras el archivo
+y los parámetros no cambien, y que cualquier cambio invalide la entrada
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+def test_prepare_data_uses_cache(tmp_path):
+    """La segunda preparación sale de la caché con memory-map y los mismos valores"""
+    data_dir = str(tmp_path / 'data')
+    generator = SyntheticLandmarkGenerator(seed=6)
+    manager = DataManager(data_dir=data_dir)
+    for i in range(40):
+        manager.save_sequence(generator.sequence(), ['HOLA', 'GRACIAS'][i % 2], i // 2 + 1, {})
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'))
+    pipeline.prepare_data()
+    X_train, y_val = np.array(pipeline.X_train), np.array(pipeline.y_val)
+    assert not isinstance(pipeline.X_train, np.memmap)
+    assert len(os.listdir(pipeline.tensor_cache.cache_dir)) == 1
+
+    cached = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                              logs_path=str(tmp_path / 'logs'))
+    cached.prepare_data()
+    assert isinstance(cached.X_train, np.memmap)
+    np.testing.assert_array_equal(cached.X_train, X_train)
+    np.testing.assert_array_equal(cached.y_val, y_val)
+    assert cached.data_loader.label_encoder.classes_.tolist() == ['GRACIAS', 'HOLA']
+    assert cached.input_shape == (60, 157)
+
+    # Otros parámetros o datos nuevos producen una entrada distinta
+    cached.prepare_data(random_state=7)
+    manager.save_sequence(generator.sequence(), 'HOLA', 21, {})
+    cached.prepare_data()
+    assert len(os.listdir(cached.tensor_cache.cache_dir)) == 3
+    assert len(cached.X_train) + len(cached.X_val) + len(cached.X_test) == 41
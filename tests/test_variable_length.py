@@ -0,0 +1,88 @@
+"""
+Test de las secuencias de longitud variable
+Verifica el layout frames + offset/length de DataManager (incluida la
+compactación), el entrenamiento con buckets por longitud y que el modelo
+con Masking prediga lo mismo con y sin frames de relleno
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import h5py
+import numpy as np
+import tensorflow as tf
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.data_manager import DataManager
+from src.inference.inference_engine import load_inference_engine
+from src.inference.numpy_gru import NumpyGRUClassifier, export_numpy_weights
+from src.training.training_pipeline import TrainingPipeline
+from src.utils.synthetic_data import SyntheticLandmarkGenerator
+
+
+SIGNS = ['HOLA', 'GRACIAS', 'ADIOS']
+LENGTHS = [6, 12, 20]
+
+
+def _collect(data_dir, count, seed=5):
+    generator = SyntheticLandmarkGenerator(seed=seed)
+    manager = DataManager(data_dir=data_dir, variable_length=True)
+    sequences = []
+    for i in range(count):
+        sequence = generator.sequence(length=LENGTHS[i % 3])
+        manager.save_sequence(sequence, SIGNS[i % 3], i // 3 + 1, {'quality_score': i})
+        sequences.append(sequence)
+    return manager, sequences
+
+
+def test_ragged_storage_round_trip_and_compaction(tmp_path):
+    manager, sequences = _collect(str(tmp_path / 'data'), 12)
+
+    with h5py.File(manager.dataset_file, 'r') as hf:
+        assert 'X' not in hf
+        assert hf['frames'].shape[0] == sum(len(s) for s in sequences)
+        np.testing.assert_array_equal(hf['length'][:], [len(s) for s in sequences])
+    assert manager.validate_keras_dataset_integrity() == []
+
+    X, y = manager.load_keras_dataset()
+    assert [len(x) for x in X] == [len(s) for s in sequences]
+    loaded, _ = manager.load_sequence('GRACIAS', 2)
+    np.testing.assert_allclose(loaded, sequences[4])
+
+    # La compactación reescribe 'frames' y recalcula los offsets
+    manager.compact_dataset(min_quality=5)
+    assert manager.validate_keras_dataset_integrity() == []
+    loaded, _ = manager.load_sequence('HOLA', 4)
+    np.testing.assert_allclose(loaded, sequences[9])
+
+
+def test_pipeline_trains_with_masking_and_ignores_padding(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    _collect(data_dir, 30)
+
+    pipeline = TrainingPipeline(data_path=data_dir, models_path=str(tmp_path / 'models'),
+                                logs_path=str(tmp_path / 'logs'), sequence_length=10)
+    info = pipeline.prepare_data(batch_size=4)
+    assert info['variable_length'] and pipeline.input_shape[0] is None
+    tf.keras.utils.set_random_seed(0)
+    model = pipeline.build_model({'gru_units': 8, 'num_gru_layers': 2})
+    pipeline.train_model(epochs=1, batch_size=4, plot_history=False, checkpoint_every=None)
+    assert 0.0 <= pipeline.evaluate_model(detailed=False)['test_accuracy'] <= 1.0
+
+    batch = np.random.default_rng(0).normal(size=(2, 7, pipeline.input_shape[1])).astype(np.float32)
+    padded = np.concatenate([batch, np.zeros((2, 5, batch.shape[2]), np.float32)], axis=1)
+    np.testing.assert_allclose(model(padded, training=False), model(batch, training=False), atol=1e-6)
+
+    # El backend NumPy (sin máscara) recibe solo frames reales
+    export_numpy_weights(model, str(tmp_path / 'model.npz'))
+    classifier = NumpyGRUClassifier.load(str(tmp_path / 'model.npz'))
+    np.testing.assert_allclose(classifier(batch), model(batch, training=False), atol=1e-5)
+
+    # El motor acepta cualquier número de frames; sequence_length es la ventana del entrenamiento
+    engine = load_inference_engine(pipeline.training_config['model_path'], data_path=data_dir)
+    assert engine.variable_length and engine.sequence_length == 10
+    assert engine.predict_proba(batch[0]).shape == (1, 3)
+    assert engine.predict_proba(np.zeros((25, batch.shape[2]))).shape == (1, 3)
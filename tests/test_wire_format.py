@@ -0,0 +1,63 @@
+"""
+Test del formato binario de features por frame
+Verifica el tamaño de los mensajes, la reconstrucción de las velocidades
+del layout 'landmarks' frente a FeatureExtractor y la detección de frames
+perdidos
+Versión: 2.2 - Julio 2025
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_collection.feature_extractor import FeatureExtractor
+from src.data_collection.wire_format import FrameDecoder, FrameEncoder, message_size
+from src.utils.synthetic_data import SyntheticHandResults, SyntheticLandmarkGenerator
+
+
+@pytest.mark.parametrize('normalized', [True, False])
+def test_landmarks_layout_rebuilds_extractor_features(normalized):
+    generator = SyntheticLandmarkGenerator(seed=3)
+    extractor = FeatureExtractor(feature_normalization=normalized)
+    frames = []
+    for i in range(30):
+        hand_results, pose_results = generator.frame_results(num_hands=[2, 1, 2][i % 3])
+        if i % 4 == 2:
+            hand_results = SyntheticHandResults([], [])
+        if i % 5 == 3:
+            pose_results = None
+        frames.append(extractor.extract_advanced_landmarks(hand_results, pose_results)[0])
+    frames = np.array(frames)
+
+    encoder = FrameEncoder('landmarks', normalized=normalized)
+    decoder = FrameDecoder()
+    # Dos llamadas: las velocidades continúan desde el último frame recibido
+    first = encoder.encode_frames(frames[:12])
+    assert len(first) == 12 * message_size('landmarks') == 12 * 310
+    sequences, head = decoder.decode_frames(first)
+    _, tail = decoder.decode_frames(encoder.encode_frames(frames[12:]))
+
+    np.testing.assert_array_equal(sequences, np.arange(12))
+    np.testing.assert_allclose(np.vstack([head, tail]), frames, atol=1e-3)
+    assert decoder.dropped_frames == 0
+
+
+def test_features_layout_sequence_numbers_and_errors():
+    frames = SyntheticLandmarkGenerator(seed=4).sequence(length=5)
+    encoder = FrameEncoder('features', start_sequence=2 ** 32 - 2)
+    messages = [encoder.encode(frame) for frame in frames]
+    assert all(len(message) == 324 for message in messages)
+
+    decoder = FrameDecoder()
+    received = [decoder.decode(message) for i, message in enumerate(messages) if i != 2]
+    assert [sequence for sequence, _ in received] == [2 ** 32 - 2, 2 ** 32 - 1, 1, 2]
+    assert decoder.dropped_frames == 1
+    np.testing.assert_allclose(received[-1][1], frames[-1], atol=1e-3)
+
+    with pytest.raises(ValueError):
+        decoder.decode_frames(messages[0][:-1])